@@ -11,20 +11,8 @@ from .config import config_by_name
 from .validators.env import run_all_validations
 
 
-def create_app(test_config: Optional[Dict] = None) -> Flask:
-    load_dotenv(override=True)
-    app = Flask(__name__, instance_relative_config=True)
-
-    # Validate environment variables
-    testing = test_config is not None or os.environ.get('TESTING', 'false').lower() == 'true'
-    try:
-        run_all_validations(testing=testing)
-    except Exception as e:
-        if not testing:
-            raise
-        warnings.warn(f"Environment validation warning (testing mode): {str(e)}")
-
-    # Load config
+def _load_config(app: Flask, test_config: Optional[Dict] = None) -> str:
+    """Config object, instance config, env overrides dan test_config; return nama env"""
     env = os.environ.get('FLASK_ENV', 'development')
     app.config.from_object(config_by_name.get(env, config_by_name['development']))
 
@@ -43,7 +31,10 @@ def create_app(test_config: Optional[Dict] = None) -> Flask:
     if test_config:
         app.config.update(test_config)
 
-    # Initialize Sentry
+    return env
+
+
+def _init_sentry(env: str):
     sentry_dsn = os.environ.get('SENTRY_DSN')
     if sentry_dsn:
         import sentry_sdk
@@ -57,6 +48,50 @@ def create_app(test_config: Optional[Dict] = None) -> Flask:
             release=os.environ.get('SENTRY_RELEASE', 'aldudu-academy@1.0.0'),
         )
 
+
+def create_worker_app(test_config: Optional[Dict] = None) -> Flask:
+    """
+    App ringan untuk Celery worker (satu per worker process).
+
+    Hanya config, Sentry, dan extensions yang dipakai task (db, mail, cache);
+    tanpa validators, Prometheus, middleware, dan blueprints.
+    """
+    load_dotenv(override=True)
+    app = Flask(__name__, instance_relative_config=True)
+    env = _load_config(app, test_config)
+    _init_sentry(env)
+
+    db.init_app(app)
+    mail.init_app(app)
+    cache.init_app(app)
+
+    # Register model mappers
+    from . import models  # noqa: F401
+
+    from .celery_app import init_celery
+    app.extensions['celery'] = init_celery(app)
+    return app
+
+
+def create_app(test_config: Optional[Dict] = None) -> Flask:
+    load_dotenv(override=True)
+    app = Flask(__name__, instance_relative_config=True)
+
+    # Validate environment variables
+    testing = test_config is not None or os.environ.get('TESTING', 'false').lower() == 'true'
+    try:
+        run_all_validations(testing=testing)
+    except Exception as e:
+        if not testing:
+            raise
+        warnings.warn(f"Environment validation warning (testing mode): {str(e)}")
+
+    # Load config
+    env = _load_config(app, test_config)
+
+    # Initialize Sentry
+    _init_sentry(env)
+
     # Initialize Prometheus Metrics
     prometheus_enabled = os.environ.get('PROMETHEUS_ENABLED', 'true').lower() == 'true'
     if prometheus_enabled:
@@ -108,6 +143,10 @@ def create_app(test_config: Optional[Dict] = None) -> Flask:
             registry=metrics_registry
         )
 
+        # Rasch analysis histograms (stage durations, iterations, peak memory)
+        from .services import rasch_telemetry
+        rasch_telemetry.register_metrics(metrics_registry)
+
         # Initialize Flask exporter
         metrics = PrometheusMetrics(
             app,
@@ -9,6 +9,7 @@ Endpoints untuk:
 - Simplified metrics for teachers
 """
 
+import logging
 import math
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
@@ -19,10 +20,15 @@ from app.models.rasch import (
     RaschPersonMeasure,
     RaschItemMeasure,
     RaschThresholdLog,
+    RaschEstimator,
 )
 
+logger = logging.getLogger(__name__)
+
 rasch_bp = Blueprint('rasch', __name__, url_prefix='/api/rasch')
 
+RASCH_ESTIMATORS = {estimator.value for estimator in RaschEstimator}
+
 
 def get_analysis_or_abort(analysis_id, check_permission=True):
     """Get analysis record or abort with 404"""
@@ -50,6 +56,13 @@ def get_analysis_or_abort(analysis_id, check_permission=True):
     return analysis
 
 
+def queue_full_response(error):
+    """503 + Retry-After saat local executor penuh (tanpa broker)"""
+    response = jsonify({'success': False, 'message': str(error)})
+    response.headers['Retry-After'] = '60'
+    return response, 503
+
+
 # ============================================================
 # Threshold & Manual Trigger
 # ============================================================
@@ -138,10 +151,12 @@ def api_manual_trigger_analysis(quiz_id):
 
     Request:
     {
-        "min_persons": 20  // Optional: override default
+        "min_persons": 20,  // Optional: override default
+        "estimator": "prox"  // Optional: jmle | prox | pairwise | cmle
     }
     """
     from app.models.quiz import Quiz
+    from app.services.rasch_executor import RaschQueueFullError
     from app.services.rasch_threshold_service import RaschThresholdService
 
     quiz = Quiz.query.get(quiz_id)
@@ -157,23 +172,68 @@ def api_manual_trigger_analysis(quiz_id):
     # Get override min_persons
     data = request.get_json() or {}
     min_persons = data.get('min_persons')
+    estimator = data.get('estimator')
+    if estimator and estimator not in RASCH_ESTIMATORS:
+        return jsonify({'success': False, 'message': f'Estimator tidak dikenal: {estimator}'}), 400
 
-    # Trigger analysis
+    # Trigger analysis (202: analisis berjalan di background, poll /analyses/<id>/status)
     service = RaschThresholdService()
-    success, message = service.manual_trigger(quiz_id, min_persons)
+    try:
+        success, message, analysis_id = service.manual_trigger(quiz_id, min_persons, estimator=estimator)
+    except RaschQueueFullError as e:
+        return queue_full_response(e)
 
     if success:
         return jsonify({
             'success': True,
-            'message': message
-        })
+            'message': message,
+            'analysis_id': analysis_id,
+        }), 202
     else:
         return jsonify({
             'success': False,
-            'message': message
+            'message': message,
+            'analysis_id': analysis_id,
         }), 400
 
 
+@rasch_bp.route('/course/<int:course_id>/combined-analysis', methods=['POST'])
+@login_required
+def api_trigger_combined_analysis(course_id):
+    """
+    Trigger combined analysis: satu skala ability dari semua quiz
+    Rasch-enabled di course.
+
+    Request (optional):
+    {
+        "name": "Kalibrasi Semester Ganjil"
+    }
+    """
+    from app.services.rasch_executor import RaschQueueFullError
+    from app.services.rasch_threshold_service import RaschThresholdService
+
+    course = Course.query.get(course_id)
+    if not course:
+        return jsonify({'success': False, 'message': 'Kelas tidak ditemukan'}), 404
+    if course.teacher_id != current_user.id and current_user.role != UserRole.SUPER_ADMIN:
+        return jsonify({'success': False, 'message': 'Akses ditolak'}), 403
+
+    data = request.get_json() or {}
+    service = RaschThresholdService()
+    try:
+        success, message, analysis_id = service.trigger_combined(
+            course_id, current_user.id, name=data.get('name')
+        )
+    except RaschQueueFullError as e:
+        return queue_full_response(e)
+
+    return jsonify({
+        'success': success,
+        'message': message,
+        'analysis_id': analysis_id,
+    }), (202 if success else 400)
+
+
 @rasch_bp.route('/quizzes/<int:quiz_id>/process-late-submissions', methods=['POST'])
 @login_required
 def api_process_late_submissions(quiz_id):
@@ -230,8 +290,11 @@ def api_process_late_submissions(quiz_id):
         }), 400
 
     # Check if specific submission requested
-    data = request.get_json() or {}
-    submission_id = data.get('submission_id', type=int)
+    data = request.get_json(silent=True) or {}
+    try:
+        submission_id = int(data['submission_id']) if data.get('submission_id') else None
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'submission_id tidak valid'}), 400
     
     if submission_id:
         # Process single submission
@@ -268,15 +331,21 @@ def api_rerun_analysis(analysis_id):
     """
     Re-run analisis Rasch untuk include late submissions.
     
-    Ini akan menghapus person dan item measures lama dan menjalankan
-    ulang analisis dengan semua submissions terbaru.
+    Ini akan menjalankan ulang analisis dengan semua submissions terbaru;
+    person dan item measures lama diganti setelah analisis baru selesai.
+    Jika input (jawaban, soal, kunci) tidak berubah sejak kalibrasi terakhir,
+    worker memakai ulang hasil yang ada tanpa estimasi ulang; request tidak
+    memuat response matrix.
     
     Request (optional):
     {
-        "min_late_percentage": 10  // Minimum percentage of late submissions to trigger re-run
+        "min_late_percentage": 10,  // Minimum percentage of late submissions to trigger re-run
+        "estimator": "jmle",  // Optional: ganti estimator (mis. refine hasil PROX)
+        "force": false  // Optional: re-run walaupun input tidak berubah
     }
     """
-    from app.models.rasch import RaschItemMeasure, RaschPersonMeasure
+    from app.models.quiz import QuizSubmission
+    from app.services.rasch_executor import RaschQueueFullError
     
     analysis = get_analysis_or_abort(analysis_id)
 
@@ -290,7 +359,20 @@ def api_rerun_analysis(analysis_id):
             'message': 'Hanya analisis completed yang bisa di-re-run'
         }), 400
     
-    # Check late submissions
+    data = request.get_json() or {}
+    estimator = data.get('estimator')
+    if estimator and estimator not in RASCH_ESTIMATORS:
+        return jsonify({'success': False, 'message': f'Estimator tidak dikenal: {estimator}'}), 400
+    # Ganti estimator (mis. PROX -> JMLE) boleh re-run tanpa late submissions
+    refine = bool(estimator) and estimator != getattr(analysis.estimator, 'value', analysis.estimator)
+    force = bool(data.get('force'))
+    # Jawaban/kunci yang diubah tidak terlihat dari jumlah submission; analysis
+    # dengan fingerprint tetap di-queue dan worker membandingkan input-nya
+    # (RaschAnalysisService._reuse_unchanged_results)
+    may_have_changed = bool(analysis.input_fingerprint)
+
+    # Check late submissions (combined analysis selalu boleh di-re-run)
+    late_count = 0
     if analysis.quiz_id:
         submission_count = QuizSubmission.query.filter_by(quiz_id=analysis.quiz_id).count()
         existing_measures = RaschPersonMeasure.query.filter_by(
@@ -298,45 +380,54 @@ def api_rerun_analysis(analysis_id):
         ).count()
         late_count = submission_count - existing_measures
         
-        if late_count <= 0:
+        if late_count <= 0 and not (refine or force or may_have_changed):
             return jsonify({
                 'success': False,
                 'message': 'Tidak ada late submissions untuk di-re-run'
             }), 400
         
         # Check minimum percentage
-        data = request.get_json() or {}
         min_percentage = data.get('min_late_percentage', 0)
         late_percentage = (late_count / submission_count * 100) if submission_count > 0 else 0
         
-        if late_percentage < min_percentage:
+        if late_count > 0 and late_percentage < min_percentage and not (refine or force):
             return jsonify({
                 'success': False,
                 'message': f'Late submissions hanya {late_percentage:.1f}% (minimum: {min_percentage}%)'
             }), 400
     
     try:
-        # Delete old measures
-        RaschPersonMeasure.query.filter_by(rasch_analysis_id=analysis_id).delete()
-        RaschItemMeasure.query.filter_by(rasch_analysis_id=analysis_id).delete()
+        # Measures lama tidak dihapus di sini: _save_results melakukan
+        # delete-and-replace dalam satu transaksi saat hasil baru siap
         
         # Reset analysis status
         analysis.status = RaschAnalysisStatus.PENDING.value
         analysis.status_message = "Re-running analysis dengan data terbaru"
+        if estimator:
+            analysis.estimator = estimator
+        if force:
+            analysis.input_fingerprint = None
         db.session.commit()
         
         # Trigger analysis
         from app.services.rasch_threshold_service import RaschThresholdService
         service = RaschThresholdService()
-        service._trigger_analysis(analysis, check_type='manual')
+        success, message = service._trigger_analysis(analysis, check_type='manual')
+        if not success:
+            return jsonify({'success': False, 'message': message}), 500
         
         return jsonify({
             'success': True,
-            'message': f'Analisis di-re-run dengan {late_count} late submissions',
+            'message': (
+                f'Analisis di-re-run dengan {late_count} late submissions' if late_count > 0
+                else 'Analisis di-re-run; hasil yang ada dipakai jika data tidak berubah'
+            ),
             'analysis_id': analysis_id,
             'late_count': late_count,
-        })
-        
+        }), 202
+
+    except RaschQueueFullError as e:
+        return queue_full_response(e)
     except Exception as e:
         logger.error(f"Error re-running analysis: {e}")
         db.session.rollback()
@@ -436,16 +527,37 @@ def api_get_analysis_status(analysis_id):
         "is_failed": false
     }
     """
+    from app.services.rasch_progress import get_progress_channel
+
     analysis = get_analysis_or_abort(analysis_id)
 
     if not isinstance(analysis, RaschAnalysis):
         return analysis
 
+    progress_percentage = float(analysis.progress_percentage) if analysis.progress_percentage else 0
+    status_message = analysis.status_message
+
+    # Progress JMLE live dari progress channel; row hanya di-update di awal/akhir
+    is_finished = analysis.status in (
+        RaschAnalysisStatus.COMPLETED.value,
+        RaschAnalysisStatus.PARTIAL.value,
+        RaschAnalysisStatus.FAILED.value,
+    )
+    if not is_finished:
+        try:
+            live = get_progress_channel().read(analysis_id)
+        except Exception as e:
+            logger.warning(f"Progress channel read failed for analysis {analysis_id}: {e}")
+            live = None
+        if live:
+            progress_percentage = live['progress_percentage']
+            status_message = live.get('status_message', status_message)
+
     return jsonify({
         'success': True,
         'status': analysis.status,
-        'progress_percentage': float(analysis.progress_percentage) if analysis.progress_percentage else 0,
-        'status_message': analysis.status_message,
+        'progress_percentage': progress_percentage,
+        'status_message': status_message,
         'is_complete': analysis.status == RaschAnalysisStatus.COMPLETED.value,
         'is_failed': analysis.status == RaschAnalysisStatus.FAILED.value,
         'started_at': analysis.started_at.isoformat() if analysis.started_at else None,
@@ -453,6 +565,194 @@ def api_get_analysis_status(analysis_id):
     })
 
 
+@rasch_bp.route('/analyses/<int:analysis_id>/score-table', methods=['GET'])
+@login_required
+def api_get_score_table(analysis_id):
+    """
+    Score-to-measure table: theta dan SE per raw score untuk siswa yang
+    menjawab semua soal (complete response pattern).
+
+    Query params:
+        raw_score: Optional - hanya kembalikan satu baris
+
+    Response:
+    {
+        "success": true,
+        "num_items": 20,
+        "rows": [{"raw_score": 0, "theta": -3.1, "theta_se": 1.02}, ...]
+    }
+    """
+    from app.services.rasch_score_table import get_score_table, lookup
+
+    analysis = get_analysis_or_abort(analysis_id)
+
+    if not isinstance(analysis, RaschAnalysis):
+        return analysis
+
+    table = get_score_table(analysis)
+    if table is None:
+        return jsonify({
+            'success': False,
+            'message': 'Score table hanya tersedia untuk analisis dichotomous yang sudah completed'
+        }), 404
+
+    raw_score = request.args.get('raw_score', type=int)
+    if raw_score is not None:
+        measure = lookup(table, raw_score)
+        if measure is None:
+            return jsonify({
+                'success': False,
+                'message': f"raw_score harus antara 0 dan {len(table['item_ids'])}"
+            }), 400
+        scores = [raw_score]
+    else:
+        scores = range(len(table['theta']))
+
+    return jsonify({
+        'success': True,
+        'num_items': len(table['item_ids']),
+        'rows': [
+            {'raw_score': score, 'theta': table['theta'][score], 'theta_se': table['theta_se'][score]}
+            for score in scores
+        ],
+    })
+
+
+# ============================================================
+# Differential Item Functioning
+# ============================================================
+
+@rasch_bp.route('/analyses/<int:analysis_id>/dif', methods=['POST'])
+@login_required
+def api_start_dif_analysis(analysis_id):
+    """
+    Jalankan analisis DIF (background) terhadap analisis yang sudah completed.
+
+    Request:
+    {
+        "group_by": "course",  // course | field | custom
+        "course_ids": [3, 4],  // group_by=course: kelas yang dibandingkan
+        "group_field": "school_id",  // group_by=field
+        "groups": {"15": "A", "16": "B"},  // group_by=custom: student_id -> group
+        "reference_group": "3"  // optional, default group terbesar
+    }
+
+    Response (202):
+    {
+        "success": true,
+        "dif_id": 7,
+        "status": "queued",
+        "dispatch": "celery"  // celery | local | sync
+    }
+
+    Tanpa broker dan dengan local executor penuh: 503 + Retry-After.
+    """
+    from app.models.rasch import DifGrouping, RaschDifAnalysis
+    from app.services.rasch_dif import enqueue_dif_analysis, validate_grouping
+    from app.services.rasch_executor import RaschQueueFullError
+
+    analysis = get_analysis_or_abort(analysis_id)
+
+    if not isinstance(analysis, RaschAnalysis):
+        return analysis
+
+    if analysis.status != RaschAnalysisStatus.COMPLETED:
+        return jsonify({
+            'success': False,
+            'message': 'DIF hanya bisa dijalankan untuk analisis yang sudah completed'
+        }), 409
+
+    data = request.get_json(silent=True) or {}
+    group_by = data.get('group_by')
+    group_params = {
+        key: data[key] for key in ('course_ids', 'groups') if data.get(key)
+    }
+    try:
+        validate_grouping(group_by, data.get('group_field'), group_params)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    reference_group = data.get('reference_group')
+    dif = RaschDifAnalysis(
+        rasch_analysis_id=analysis.id,
+        group_by=DifGrouping(group_by).value,
+        group_field=data.get('group_field') if group_by == DifGrouping.FIELD.value else None,
+        group_params=group_params or None,
+        reference_group=str(reference_group) if reference_group is not None else None,
+        status=RaschAnalysisStatus.QUEUED.value,
+        created_by=current_user.id,
+    )
+    db.session.add(dif)
+    db.session.commit()
+
+    try:
+        dispatch = enqueue_dif_analysis(dif.id)
+    except RaschQueueFullError as e:
+        # Belum dijadwalkan; row tidak disimpan supaya tidak tertinggal QUEUED
+        db.session.delete(dif)
+        db.session.commit()
+        return queue_full_response(e)
+
+    # Job background belum tentu mulai; hanya fallback sync yang sudah selesai
+    if dispatch == 'sync':
+        db.session.refresh(dif)
+        status = dif.status.value
+    else:
+        status = RaschAnalysisStatus.QUEUED.value
+
+    return jsonify({
+        'success': True,
+        'dif_id': dif.id,
+        'status': status,
+        'dispatch': dispatch,
+    }), 202
+
+
+@rasch_bp.route('/analyses/<int:analysis_id>/dif', methods=['GET'])
+@login_required
+def api_list_dif_analyses(analysis_id):
+    """Daftar analisis DIF untuk analysis (tanpa hasil per item)"""
+    from app.models.rasch import RaschDifAnalysis
+
+    analysis = get_analysis_or_abort(analysis_id)
+
+    if not isinstance(analysis, RaschAnalysis):
+        return analysis
+
+    difs = analysis.dif_analyses.order_by(RaschDifAnalysis.id.desc()).all()
+    return jsonify({
+        'success': True,
+        'dif_analyses': [dif.to_dict(include_items=False) for dif in difs],
+    })
+
+
+@rasch_bp.route('/analyses/<int:analysis_id>/dif/<int:dif_id>', methods=['GET'])
+@login_required
+def api_get_dif_analysis(analysis_id, dif_id):
+    """
+    Hasil DIF per item.
+
+    Query params:
+        flagged_only: true - hanya item dengan DIF besar (kelas C)
+    """
+    from app.models.rasch import RaschDifAnalysis
+
+    analysis = get_analysis_or_abort(analysis_id)
+
+    if not isinstance(analysis, RaschAnalysis):
+        return analysis
+
+    dif = db.session.get(RaschDifAnalysis, dif_id)
+    if dif is None or dif.rasch_analysis_id != analysis.id:
+        return jsonify({'success': False, 'message': 'Analisis DIF tidak ditemukan'}), 404
+
+    result = dif.to_dict()
+    if request.args.get('flagged_only', 'false').lower() == 'true' and result['items']:
+        result['items'] = [item for item in result['items'] if item['dif']]
+
+    return jsonify({'success': True, 'dif': result})
+
+
 # ============================================================
 # Simplified Metrics (Teacher-Friendly)
 # ============================================================
@@ -841,8 +1141,11 @@ def api_delete_analysis(analysis_id):
     if not isinstance(analysis, RaschAnalysis):
         return analysis
     
+    from app.services import rasch_information
+
     db.session.delete(analysis)
     db.session.commit()
+    rasch_information.invalidate(analysis_id)
     
     return jsonify({
         'success': True,
@@ -1110,6 +1413,56 @@ def api_get_wright_map(analysis_id):
 # Bloom Taxonomy Analysis
 # ============================================================
 
+@rasch_bp.route('/analyses/<int:analysis_id>/information', methods=['GET'])
+@login_required
+def api_get_information_curve(analysis_id):
+    """
+    Test Information Function dan conditional SEM pada grid theta.
+
+    Melengkapi Wright Map: menunjukkan di rentang ability mana kuis
+    mengukur dengan presisi (SEM kecil).
+
+    Response:
+    {
+        "analysis_id": 1,
+        "curve": {
+            "theta": [-4.0, -3.9, ...],
+            "information": [0.52, ...],
+            "sem": [1.386, ...],  // null jika informasi 0
+            "peak_theta": 0.3,
+            "max_information": 4.1,
+            "min_sem": 0.494,
+            "target_sem": 0.5,
+            "precise_range": {"min": -0.4, "max": 1.1},  // SEM <= target_sem
+            "num_items": 20,
+            "num_polytomous": 0
+        }
+    }
+    """
+    from app.services.rasch_information import get_information_curve
+
+    analysis = get_analysis_or_abort(analysis_id)
+
+    if not isinstance(analysis, RaschAnalysis):
+        return analysis
+
+    if analysis.status not in (RaschAnalysisStatus.COMPLETED, RaschAnalysisStatus.PARTIAL):
+        return jsonify({
+            'success': False,
+            'message': 'Kurva informasi tersedia setelah analisis selesai'
+        }), 409
+
+    curve = get_information_curve(analysis)
+    if curve is None:
+        return jsonify({'success': False, 'message': 'Analisis belum memiliki item measures'}), 404
+
+    return jsonify({
+        'success': True,
+        'analysis_id': analysis_id,
+        'curve': curve,
+    })
+
+
 @rasch_bp.route('/quizzes/<int:quiz_id>/bloom-summary', methods=['GET'])
 @login_required
 def api_get_bloom_summary(quiz_id):
@@ -1391,6 +1744,11 @@ def api_run_nightly_batch():
         "re_analyses": 2,
         "skipped": 10,
         "failed": 0,
+        "analyses_completed": 7,  // hanya untuk dispatch local/sync
+        "analyses_failed": 0,
+        "requeued_stuck": 1,  // analisis macet yang di-requeue janitor
+        "dispatch": "celery",  // celery | local | sync | null
+        "wall_time": 12.3,
         "details": [...]
     }
     """
@@ -1404,7 +1762,7 @@ def api_run_nightly_batch():
         }), 403
     
     data = request.get_json() or {}
-    course_id = data.get('course_id', type=int)
+    course_id = data.get('course_id')
     
     from app.services.rasch_scheduled_service import run_nightly_analysis
     
@@ -1464,3 +1822,49 @@ def api_run_late_submissions_batch():
             'success': False,
             'message': result.get('error', 'Batch processing failed')
         }), 500
+
+
+@rasch_bp.route('/admin/batch/requeue-stuck', methods=['POST'])
+@login_required
+def api_requeue_stuck_analyses():
+    """
+    Requeue analisis yang macet di PROCESSING (tanpa heartbeat selama
+    RASCH_STUCK_TIMEOUT detik). JMLE melanjutkan dari checkpoint terakhir.
+    
+    Hanya untuk super admin.
+    
+    Request (optional):
+    {
+        "course_id": 123  // Filter by specific course
+    }
+    
+    Response:
+    {
+        "success": true,
+        "requeued": [12, 15],
+        "failed": [9]  // sudah mencapai RASCH_MAX_REQUEUES
+    }
+    """
+    from app.models.user import UserRole
+    
+    # Only super admin
+    if current_user.role != UserRole.SUPER_ADMIN:
+        return jsonify({
+            'success': False,
+            'message': 'Akses ditolak. Hanya super admin yang bisa menjalankan batch processing.'
+        }), 403
+    
+    data = request.get_json(silent=True) or {}
+    course_id = data.get('course_id')
+    
+    from app.services.rasch_scheduled_service import run_rasch_janitor
+    
+    result = run_rasch_janitor(course_id)
+    
+    if result.get('success'):
+        return jsonify(result)
+    else:
+        return jsonify({
+            'success': False,
+            'message': result.get('error', 'Batch processing failed')
+        }), 500
@@ -5,82 +5,153 @@ Digunakan untuk background processing:
 - Rasch Model Analysis
 - Email notifications
 - Report generation
+
+Satu instance `celery` dibuat saat import sehingga task (mis.
+app.workers.rasch_worker.rasch_analysis) ter-register saat modulnya di-import,
+baik di web process (untuk enqueue) maupun di worker. Setiap worker process
+membuat satu Flask app ringan (create_worker_app) yang dipakai ulang oleh
+semua task, termasuk DB engine dan connection pool-nya.
 """
 
-from celery import Celery
-from flask import Flask
+import logging
+import os
+from typing import Optional
+
+from celery import Celery, Task
+from celery.signals import worker_process_init
+from dotenv import load_dotenv
+from flask import Flask, has_app_context
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+DEFAULT_BROKER_URL = 'redis://localhost:6379/0'
+
+_flask_app: Optional[Flask] = None
+
+
+def get_flask_app() -> Flask:
+    """
+    Flask app untuk task di process ini.
+
+    App yang di-bind lewat make_celery() dipakai bila ada; jika tidak
+    (worker dijalankan dengan `celery -A app.celery_app worker`),
+    create_worker_app() dipanggil sekali per process.
+    """
+    global _flask_app
+    if _flask_app is None:
+        from app import create_worker_app
+        _flask_app = create_worker_app()
+    return _flask_app
+
+
+class ContextTask(Task):
+    """Task that runs within Flask app context"""
+
+    def __call__(self, *args, **kwargs):
+        # Eager task / pemanggilan langsung dari request: pakai context yang ada
+        if has_app_context():
+            return self.run(*args, **kwargs)
+        with get_flask_app().app_context():
+            return self.run(*args, **kwargs)
+
+
+celery = Celery(
+    'app',
+    broker=os.environ.get('CELERY_BROKER_URL', DEFAULT_BROKER_URL),
+    backend=os.environ.get('CELERY_RESULT_BACKEND', DEFAULT_BROKER_URL),
+    task_cls=ContextTask,
+    include=[
+        'app.workers.rasch_worker',
+    ]
+)
+
+# Celery configuration
+celery.conf.update(
+    # Task settings
+    task_serializer='json',
+    accept_content=['json'],
+    result_serializer='json',
+    timezone='Asia/Jakarta',
+    enable_utc=True,
+
+    # Execution settings
+    task_track_started=True,
+    task_time_limit=3600,  # 1 hour max
+    task_soft_time_limit=3000,
+
+    # Publish: retry koneksi broker singkat saja, supaya enqueue dari request
+    # cepat gagal (lalu fallback) ketika broker tidak tersedia
+    broker_transport_options={
+        'max_retries': 2,
+        'interval_start': 0,
+        'interval_step': 0.2,
+        'interval_max': 0.5,
+    },
+
+    # Rate limiting
+    worker_prefetch_multiplier=1,
+    worker_max_tasks_per_child=100,
+
+    # Retry settings
+    task_default_retry_delay=60,
+    task_max_retries=3,
+
+    # Result settings
+    result_expires=3600,  # 1 hour
+    result_persistent=True,
+)
 
 
 def make_celery(app: Flask) -> Celery:
     """
-    Create Celery instance with Flask app context.
-    
+    Bind shared Celery instance ke Flask app.
+
+    Broker/backend diambil dari app.config (fallback ke environment);
+    task berjalan dalam app context milik app ini.
+
     Usage:
         celery = make_celery(app)
     """
-    celery = Celery(
-        app.import_name,
-        broker=app.config.get('CELERY_BROKER_URL', 'redis://localhost:6379/0'),
-        backend=app.config.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0'),
-        include=[
-            'app.workers.rasch_worker',
-        ]
-    )
-    
-    # Celery configuration
+    global _flask_app
+    _flask_app = app
+
     celery.conf.update(
-        # Task settings
-        task_serializer='json',
-        accept_content=['json'],
-        result_serializer='json',
-        timezone='Asia/Jakarta',
-        enable_utc=True,
-        
-        # Execution settings
-        task_track_started=True,
-        task_time_limit=3600,  # 1 hour max
-        task_soft_time_limit=3000,
-        
-        # Rate limiting
-        worker_prefetch_multiplier=1,
-        worker_max_tasks_per_child=100,
-        
-        # Retry settings
-        task_default_retry_delay=60,
-        task_max_retries=3,
-        
-        # Result settings
-        result_expires=3600,  # 1 hour
-        result_persistent=True,
+        broker_url=app.config.get('CELERY_BROKER_URL') or celery.conf.broker_url,
+        result_backend=app.config.get('CELERY_RESULT_BACKEND') or celery.conf.result_backend,
+        task_always_eager=app.config.get('CELERY_TASK_ALWAYS_EAGER', False),
     )
-    
-    # Flask context processor
-    class ContextTask(celery.Task):
-        """Task that runs within Flask app context"""
-        
-        def __call__(self, *args, **kwargs):
-            with app.app_context():
-                return self.run(*args, **kwargs)
-    
-    celery.Task = ContextTask
-    
+
+    # Register tasks (idempotent)
+    celery.loader.import_default_modules()
     return celery
 
 
 def init_celery(app: Flask = None) -> Celery:
     """
     Initialize Celery with Flask app.
-    
+
     Usage:
         # In create_app()
         celery = init_celery(app)
     """
     if app is None:
         return None
-    
-    celery = make_celery(app)
-    
-    # Auto-discover tasks
-    celery.autodiscover_tasks(['app.workers'])
-    
-    return celery
+
+    return make_celery(app)
+
+
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """
+    Siapkan Flask app saat child process worker start, bukan saat task pertama.
+
+    Connection pool yang ikut ter-fork dari parent dilepas tanpa ditutup
+    supaya koneksi tidak dipakai bersama antar process.
+    """
+    app = get_flask_app()
+    from app.extensions import db
+    with app.app_context():
+        db.engine.dispose(close=False)
+    logger.info("Celery worker process ready (app=%s)", app.import_name)
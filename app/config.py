@@ -38,6 +38,49 @@ class Config:
     CACHE_REDIS_DB = int(os.environ.get('CACHE_REDIS_DB', '1'))
     CACHE_REDIS_URL = f"redis://{CACHE_REDIS_HOST}:{CACHE_REDIS_PORT}/{CACHE_REDIS_DB}"
 
+    # Celery - broker/backend untuk background jobs (Rasch analysis)
+    CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+    CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+
+    # Rasch Model - estimation engine: 'numpy' (vectorized) or 'python' (reference)
+    RASCH_ENGINE = os.environ.get('RASCH_ENGINE', 'numpy')
+    # Akselerasi outer loop JMLE: 'squarem' atau 'none'
+    RASCH_JMLE_ACCELERATION = os.environ.get('RASCH_JMLE_ACCELERATION', 'squarem')
+    # Re-run: seed JMLE dari kalibrasi terakhir jika item set tidak berubah
+    RASCH_WARM_START = os.environ.get('RASCH_WARM_START', 'true').lower() == 'true'
+    # Soal checkbox dan soal manual dengan points > 1 dikalibrasi sebagai partial credit (PCM)
+    RASCH_PARTIAL_CREDIT = os.environ.get('RASCH_PARTIAL_CREDIT', 'true').lower() == 'true'
+    # JMLE progress channel: Redis hash (kosong = in-memory per proses)
+    RASCH_PROGRESS_REDIS_URL = os.environ.get('RASCH_PROGRESS_REDIS_URL', '')
+    RASCH_PROGRESS_INTERVAL = float(os.environ.get('RASCH_PROGRESS_INTERVAL', '1.0'))  # detik
+    RASCH_PROGRESS_TTL = int(os.environ.get('RASCH_PROGRESS_TTL', '3600'))
+    # Auto-trigger: per-quiz lock (Redis SET NX; kosong = in-process), debounce, sampling log
+    RASCH_TRIGGER_REDIS_URL = os.environ.get('RASCH_TRIGGER_REDIS_URL', os.environ.get('RASCH_PROGRESS_REDIS_URL', ''))
+    RASCH_TRIGGER_LOCK_TTL = int(os.environ.get('RASCH_TRIGGER_LOCK_TTL', '30'))  # detik
+    RASCH_TRIGGER_DEBOUNCE = int(os.environ.get('RASCH_TRIGGER_DEBOUNCE', '30'))  # detik
+    RASCH_THRESHOLD_LOG_EVERY = int(os.environ.get('RASCH_THRESHOLD_LOG_EVERY', '10'))
+    # Fallback tanpa broker: process pool lokal (0 = sync di request), batas analisis in-flight
+    RASCH_LOCAL_WORKERS = int(os.environ.get('RASCH_LOCAL_WORKERS', '2'))
+    RASCH_LOCAL_QUEUE_LIMIT = int(os.environ.get('RASCH_LOCAL_QUEUE_LIMIT', '8'))
+    # Nightly batch tanpa broker: jumlah process paralel (0 = jumlah CPU core)
+    RASCH_BATCH_CONCURRENCY = int(os.environ.get('RASCH_BATCH_CONCURRENCY', '0'))
+    # Checkpoint JMLE ke local storage (kosong = <instance>/rasch_checkpoints; interval 0 = nonaktif)
+    RASCH_CHECKPOINT_DIR = os.environ.get('RASCH_CHECKPOINT_DIR', '')
+    RASCH_CHECKPOINT_INTERVAL = float(os.environ.get('RASCH_CHECKPOINT_INTERVAL', '60'))  # detik
+    # Janitor: PROCESSING tanpa heartbeat selama timeout di-requeue, maksimal N kali
+    RASCH_STUCK_TIMEOUT = int(os.environ.get('RASCH_STUCK_TIMEOUT', '900'))  # detik
+    RASCH_MAX_REQUEUES = int(os.environ.get('RASCH_MAX_REQUEUES', '3'))
+    # Bootstrap CI untuk deltas/thetas (replicates 0 = nonaktif; workers 0 = jumlah CPU core, 1 = in-process)
+    RASCH_BOOTSTRAP_REPLICATES = int(os.environ.get('RASCH_BOOTSTRAP_REPLICATES', '0'))
+    RASCH_BOOTSTRAP_CONFIDENCE = float(os.environ.get('RASCH_BOOTSTRAP_CONFIDENCE', '0.95'))
+    # Harus jauh di bawah task_soft_time_limit worker (3000 detik)
+    RASCH_BOOTSTRAP_TIME_BUDGET = float(os.environ.get('RASCH_BOOTSTRAP_TIME_BUDGET', '600'))  # detik
+    RASCH_BOOTSTRAP_WORKERS = int(os.environ.get('RASCH_BOOTSTRAP_WORKERS', '0'))
+    # Residual PCA (cek unidimensionality): jumlah contrast yang disimpan, 0 = nonaktif
+    RASCH_RESIDUAL_PCA_COMPONENTS = int(os.environ.get('RASCH_RESIDUAL_PCA_COMPONENTS', '3'))
+    # DIF: group dengan persons lebih sedikit dari ini tidak ikut dibandingkan
+    RASCH_DIF_MIN_GROUP_SIZE = int(os.environ.get('RASCH_DIF_MIN_GROUP_SIZE', '10'))
+
     # App
     APP_URL = os.environ.get('APP_URL', 'http://localhost:5000')
 
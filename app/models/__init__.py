@@ -16,6 +16,7 @@ from .rasch import (
     # Enums
     RaschAnalysisStatus,
     RaschAnalysisType,
+    RaschEstimator,
     BloomLevel,
     FitStatus,
     FitCategory,
@@ -23,6 +24,7 @@ from .rasch import (
     DifficultyLevel,
     ThresholdCheckType,
     ThresholdAction,
+    DifGrouping,
     # Models
     QuestionBloomTaxonomy,
     RaschAnalysis,
@@ -30,5 +32,7 @@ from .rasch import (
     RaschItemMeasure,
     RaschThresholdLog,
     RaschRatingScale,
+    RaschDifAnalysis,
+    RaschItemBank,
 )
 from .whats_new import WhatsNew
@@ -24,7 +24,7 @@ from app.helpers import get_jakarta_now
 # Enums
 # ============================================================
 
-class RaschAnalysisStatus(Enum):
+class RaschAnalysisStatus(str, Enum):
     """Status untuk Rasch Analysis"""
     PENDING = 'pending'  # Menunggu threshold
     WAITING = 'waiting'  # Menunggu siswa lain submit
@@ -35,14 +35,22 @@ class RaschAnalysisStatus(Enum):
     PARTIAL = 'partial'  # Sebagian selesai
 
 
-class RaschAnalysisType(Enum):
+class RaschAnalysisType(str, Enum):
     """Tipe analisis Rasch"""
     QUIZ = 'quiz'
     ASSIGNMENT = 'assignment'
     COMBINED = 'combined'
 
 
-class BloomLevel(Enum):
+class RaschEstimator(str, Enum):
+    """Metode estimasi parameter Rasch"""
+    JMLE = 'jmle'  # Joint Maximum Likelihood (default)
+    PROX = 'prox'  # Normal approximation, kalibrasi provisional instan
+    PAIRWISE = 'pairwise'  # Pairwise conditional (Choppin)
+    CMLE = 'cmle'  # Conditional Maximum Likelihood
+
+
+class BloomLevel(str, Enum):
     """Bloom's Revised Taxonomy Levels"""
     REMEMBER = 'remember'  # Mengingat informasi
     UNDERSTAND = 'understand'  # Memahami konsep
@@ -52,14 +60,14 @@ class BloomLevel(Enum):
     CREATE = 'create'  # Mencipta/menghasilkan
 
 
-class FitStatus(Enum):
+class FitStatus(str, Enum):
     """Status fit statistic untuk Rasch"""
     WELL_FITTED = 'well_fitted'  # 0.5 <= MNSQ <= 1.5
     UNDERFIT = 'underfit'  # MNSQ > 1.5 (unpredictable)
     OVERFIT = 'overfit'  # MNSQ < 0.5 (too predictable)
 
 
-class FitCategory(Enum):
+class FitCategory(str, Enum):
     """Kategori fit quality"""
     EXCELLENT = 'excellent'  # 0.8 <= MNSQ <= 1.2
     GOOD = 'good'  # 0.6 <= MNSQ < 0.8 or 1.2 < MNSQ <= 1.4
@@ -67,7 +75,7 @@ class FitCategory(Enum):
     POOR = 'poor'  # MNSQ < 0.5 or MNSQ > 1.5
 
 
-class AbilityLevel(Enum):
+class AbilityLevel(str, Enum):
     """Level kemampuan siswa berdasarkan theta"""
     VERY_LOW = 'very_low'  # θ < -2.0
     LOW = 'low'  # -2.0 <= θ < -0.5
@@ -76,7 +84,7 @@ class AbilityLevel(Enum):
     VERY_HIGH = 'very_high'  # θ > 2.0
 
 
-class DifficultyLevel(Enum):
+class DifficultyLevel(str, Enum):
     """Level kesulitan soal berdasarkan delta"""
     VERY_EASY = 'very_easy'  # δ < -2.0 (p > 0.90)
     EASY = 'easy'  # -2.0 <= δ < -0.5 (p: 0.70-0.90)
@@ -85,19 +93,31 @@ class DifficultyLevel(Enum):
     VERY_DIFFICULT = 'very_difficult'  # δ > 2.0 (p < 0.10)
 
 
-class ThresholdCheckType(Enum):
+class ThresholdCheckType(str, Enum):
     """Tipe threshold check"""
     AUTO = 'auto'  # Automatic check saat submission
     MANUAL = 'manual'  # Manual trigger oleh guru
 
 
-class ThresholdAction(Enum):
+class ThresholdAction(str, Enum):
     """Action yang diambil setelah threshold check"""
     QUEUED = 'queued'  # Masuk antrian analisis
     WAITING = 'waiting'  # Masih menunggu
     IGNORED = 'ignored'  # Diabaikan
 
 
+class DifGrouping(str, Enum):
+    """Atribut pengelompokan persons untuk analisis DIF"""
+    COURSE = 'course'  # Kelas/course yang diikuti siswa (dari course_ids)
+    FIELD = 'field'  # Kolom User, mis. school_id
+    CUSTOM = 'custom'  # Mapping student_id -> group dari request
+
+
+def _enum_values(enum_cls) -> List[str]:
+    """Simpan Enum.value di database, sesuai ENUM di migrations/002_rasch_model*.sql"""
+    return [member.value for member in enum_cls]
+
+
 # ============================================================
 # Models
 # ============================================================
@@ -123,7 +143,7 @@ class QuestionBloomTaxonomy(db.Model):
     
     # Bloom's Revised Taxonomy
     bloom_level: Mapped[str] = mapped_column(
-        db.Enum(BloomLevel), 
+        db.Enum(BloomLevel, values_callable=_enum_values), 
         nullable=False
     )
     bloom_description: Mapped[Optional[str]] = mapped_column(
@@ -205,13 +225,13 @@ class RaschAnalysis(db.Model):
     # Identification
     name: Mapped[str] = mapped_column(db.String(200), nullable=False)
     analysis_type: Mapped[str] = mapped_column(
-        db.Enum(RaschAnalysisType), 
+        db.Enum(RaschAnalysisType, values_callable=_enum_values), 
         nullable=False
     )
     
     # Status tracking
     status: Mapped[str] = mapped_column(
-        db.Enum(RaschAnalysisStatus), 
+        db.Enum(RaschAnalysisStatus, values_callable=_enum_values), 
         nullable=False, 
         default=RaschAnalysisStatus.PENDING,
         index=True
@@ -227,6 +247,14 @@ class RaschAnalysis(db.Model):
     completed_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
     error_message: Mapped[Optional[str]] = mapped_column(db.Text)
     
+    # Liveness selama PROCESSING (UTC); analisis tanpa heartbeat di-requeue janitor
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    requeue_count: Mapped[int] = mapped_column(
+        db.Integer, 
+        default=0,
+        nullable=False
+    )
+    
     # Threshold configuration
     min_persons: Mapped[int] = mapped_column(
         db.Integer, 
@@ -247,6 +275,11 @@ class RaschAnalysis(db.Model):
         db.Integer, 
         default=100
     )
+    estimator: Mapped[str] = mapped_column(
+        db.Enum(RaschEstimator, values_callable=_enum_values), 
+        nullable=False,
+        default=RaschEstimator.JMLE
+    )
     
     # Results summary
     num_persons: Mapped[Optional[int]] = mapped_column(db.Integer)
@@ -255,6 +288,43 @@ class RaschAnalysis(db.Model):
     person_separation_index: Mapped[Optional[float]] = mapped_column(db.Numeric(5, 4))
     item_separation_index: Mapped[Optional[float]] = mapped_column(db.Numeric(5, 4))
     
+    # JMLE run summary
+    iterations: Mapped[Optional[int]] = mapped_column(db.Integer)
+    warm_started: Mapped[bool] = mapped_column(
+        db.Boolean, 
+        default=False
+    )
+    iterations_saved: Mapped[Optional[int]] = mapped_column(db.Integer)  # vs cold start
+    # Max perubahan logit per iterasi (sweep), untuk mengukur efek akselerasi
+    convergence_history: Mapped[Optional[List[float]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    # Durasi per stage, dimensi/density matrix, peak memory (lihat rasch_telemetry)
+    telemetry: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    
+    # PCA standardized residuals (lihat rasch_engine.residual_pca):
+    # {"item_ids": [...], "variance_explained": 0.4, "unidimensional": true,
+    #  "contrasts": [{"eigenvalue": 1.6, "percent_unexplained": 2.7, "loadings": [...]}]}
+    residual_pca: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    
+    # SHA-256 input kalibrasi terakhir yang converged (lihat ResponseData.fingerprint);
+    # re-run dengan fingerprint sama memakai hasil yang ada
+    input_fingerprint: Mapped[Optional[str]] = mapped_column(db.String(64))
+    
+    # Score-to-measure table untuk complete response pattern (dichotomous):
+    # {"item_ids": [...], "theta": [...], "theta_se": [...]}, index = raw score
+    score_table: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    
     # Metadata
     created_by: Mapped[int] = mapped_column(
         db.Integer, 
@@ -303,6 +373,12 @@ class RaschAnalysis(db.Model):
         lazy='dynamic',
         cascade='all, delete-orphan'
     )
+    dif_analyses: Mapped[List['RaschDifAnalysis']] = relationship(
+        'RaschDifAnalysis', 
+        back_populates='analysis', 
+        lazy='dynamic',
+        cascade='all, delete-orphan'
+    )
     
     # Check constraints
     __table_args__ = (
@@ -331,6 +407,13 @@ class RaschAnalysis(db.Model):
             'num_persons': self.num_persons,
             'num_items': self.num_items,
             'cronbach_alpha': float(self.cronbach_alpha) if self.cronbach_alpha else None,
+            'estimator': self.estimator.value if self.estimator else RaschEstimator.JMLE.value,
+            'iterations': self.iterations,
+            'warm_started': bool(self.warm_started),
+            'iterations_saved': self.iterations_saved,
+            'convergence_history': self.convergence_history,
+            'telemetry': self.telemetry,
+            'residual_pca': self.residual_pca,
             'created_by': self.created_by,
             'created_at': self.created_at.isoformat() if self.created_at else None,
         }
@@ -396,6 +479,9 @@ class RaschPersonMeasure(db.Model):
     theta: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
     theta_se: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
     theta_centered: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
+    # Bootstrap percentile interval (lihat rasch_bootstrap; NULL jika nonaktif)
+    theta_ci_low: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
+    theta_ci_high: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
     
     # Fit statistics
     outfit_mnsq: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
@@ -405,15 +491,15 @@ class RaschPersonMeasure(db.Model):
     
     # Fit interpretation
     fit_status: Mapped[Optional[str]] = mapped_column(
-        db.Enum(FitStatus)
+        db.Enum(FitStatus, values_callable=_enum_values)
     )
     fit_category: Mapped[Optional[str]] = mapped_column(
-        db.Enum(FitCategory)
+        db.Enum(FitCategory, values_callable=_enum_values)
     )
     
     # Ability level interpretation
     ability_level: Mapped[Optional[str]] = mapped_column(
-        db.Enum(AbilityLevel)
+        db.Enum(AbilityLevel, values_callable=_enum_values)
     )
     ability_percentile: Mapped[Optional[float]] = mapped_column(db.Numeric(5, 2))
     
@@ -453,6 +539,8 @@ class RaschPersonMeasure(db.Model):
             'percentage': float(self.percentage) if self.percentage else None,
             'theta': float(self.theta) if self.theta else None,
             'theta_se': float(self.theta_se) if self.theta_se else None,
+            'theta_ci_low': float(self.theta_ci_low) if self.theta_ci_low is not None else None,
+            'theta_ci_high': float(self.theta_ci_high) if self.theta_ci_high is not None else None,
             'theta_centered': float(self.theta_centered) if self.theta_centered else None,
             'outfit_mnsq': float(self.outfit_mnsq) if self.outfit_mnsq else None,
             'outfit_zstd': float(self.outfit_zstd) if self.outfit_zstd else None,
@@ -502,6 +590,9 @@ class RaschItemMeasure(db.Model):
     delta: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
     delta_se: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
     delta_centered: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
+    # Bootstrap percentile interval (lihat rasch_bootstrap; NULL jika nonaktif)
+    delta_ci_low: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
+    delta_ci_high: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
     
     # Fit statistics
     outfit_mnsq: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
@@ -511,21 +602,21 @@ class RaschItemMeasure(db.Model):
     
     # Fit interpretation
     fit_status: Mapped[Optional[str]] = mapped_column(
-        db.Enum(FitStatus)
+        db.Enum(FitStatus, values_callable=_enum_values)
     )
     fit_category: Mapped[Optional[str]] = mapped_column(
-        db.Enum(FitCategory)
+        db.Enum(FitCategory, values_callable=_enum_values)
     )
     
     # Difficulty interpretation
     difficulty_level: Mapped[Optional[str]] = mapped_column(
-        db.Enum(DifficultyLevel)
+        db.Enum(DifficultyLevel, values_callable=_enum_values)
     )
     difficulty_percentile: Mapped[Optional[float]] = mapped_column(db.Numeric(5, 2))
     
     # Bloom Taxonomy (cached)
     bloom_level: Mapped[Optional[str]] = mapped_column(
-        db.Enum(BloomLevel)
+        db.Enum(BloomLevel, values_callable=_enum_values)
     )
     
     # Timestamps
@@ -561,6 +652,8 @@ class RaschItemMeasure(db.Model):
             'point_biserial': float(self.point_biserial) if self.point_biserial else None,
             'delta': float(self.delta) if self.delta else None,
             'delta_se': float(self.delta_se) if self.delta_se else None,
+            'delta_ci_low': float(self.delta_ci_low) if self.delta_ci_low is not None else None,
+            'delta_ci_high': float(self.delta_ci_high) if self.delta_ci_high is not None else None,
             'difficulty_level': self.difficulty_level.value if self.difficulty_level else None,
             'difficulty_percentile': float(self.difficulty_percentile) if self.difficulty_percentile else None,
             'bloom_level': self.bloom_level.value if self.bloom_level else None,
@@ -592,7 +685,7 @@ class RaschThresholdLog(db.Model):
     
     # Threshold check
     check_type: Mapped[str] = mapped_column(
-        db.Enum(ThresholdCheckType), 
+        db.Enum(ThresholdCheckType, values_callable=_enum_values), 
         nullable=False
     )
     num_submissions: Mapped[int] = mapped_column(db.Integer, nullable=False)
@@ -601,7 +694,7 @@ class RaschThresholdLog(db.Model):
     
     # Decision
     action_taken: Mapped[Optional[str]] = mapped_column(
-        db.Enum(ThresholdAction)
+        db.Enum(ThresholdAction, values_callable=_enum_values)
     )
     reason: Mapped[Optional[str]] = mapped_column(db.Text)
     
@@ -636,7 +729,8 @@ class RaschRatingScale(db.Model):
     """
     Rating scale parameters untuk Partial Credit Model.
     
-    Digunakan untuk analisis tugas dengan rubric (multiple criteria).
+    Digunakan untuk item polytomous: soal manual dengan partial credit
+    (scale_name = question_<id>) dan tugas dengan rubric (multiple criteria).
     Menyimpan threshold parameters (tau) untuk setiap kategori rating.
     """
     __tablename__ = 'rasch_rating_scales'
@@ -700,3 +794,179 @@ class RaschRatingScale(db.Model):
     
     def __repr__(self) -> str:
         return f'<RaschRatingScale {self.scale_name} ({self.num_categories} categories)>'
+
+
+class RaschDifAnalysis(db.Model):
+    """
+    Differential Item Functioning terhadap RaschAnalysis yang sudah completed.
+
+    Persons dibagi per group (course, kolom User, atau mapping custom);
+    difficulty per group diestimasi dengan theta dari analisis induk sebagai
+    anchor (lihat rasch_dif). Hasil per item disimpan di `items`:
+
+        {"question_id": 12, "delta": 0.4,
+         "groups": {"<label>": {"delta": 0.9, "se": 0.3, "persons": 41}},
+         "comparisons": [{"focal": "<label>", "contrast": 0.6, "p": 0.01,
+                          "flag": "B", "mh_d_dif": -1.2, "mh_flag": "B", ...}],
+         "dif": false}
+    """
+    __tablename__ = 'rasch_dif_analyses'
+    
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    rasch_analysis_id: Mapped[int] = mapped_column(
+        db.Integer, 
+        db.ForeignKey('rasch_analyses.id', ondelete='CASCADE'), 
+        nullable=False,
+        index=True
+    )
+    
+    # Grouping
+    group_by: Mapped[str] = mapped_column(
+        db.Enum(DifGrouping, values_callable=_enum_values), 
+        nullable=False
+    )
+    group_field: Mapped[Optional[str]] = mapped_column(db.String(50))  # untuk group_by=field
+    # course_ids (group_by=course) atau mapping {student_id: group} (group_by=custom)
+    group_params: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    reference_group: Mapped[Optional[str]] = mapped_column(db.String(100))  # None = group terbesar
+    
+    # Status tracking
+    status: Mapped[str] = mapped_column(
+        db.Enum(RaschAnalysisStatus, values_callable=_enum_values), 
+        nullable=False, 
+        default=RaschAnalysisStatus.QUEUED,
+        index=True
+    )
+    error_message: Mapped[Optional[str]] = mapped_column(db.Text)
+    
+    # Results
+    groups: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
+        JSON,
+        nullable=True
+    )  # [{"label", "name", "persons", "reference"}]
+    items: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    num_flagged: Mapped[Optional[int]] = mapped_column(db.Integer)  # item dengan DIF besar (kelas C)
+    
+    # Metadata
+    created_by: Mapped[Optional[int]] = mapped_column(
+        db.Integer, 
+        db.ForeignKey('users.id'), 
+        nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime, 
+        default=get_jakarta_now
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    
+    # Relationships
+    analysis = relationship('RaschAnalysis', back_populates='dif_analyses')
+    
+    def to_dict(self, include_items: bool = True) -> Dict[str, Any]:
+        data = {
+            'id': self.id,
+            'rasch_analysis_id': self.rasch_analysis_id,
+            'group_by': self.group_by.value,
+            'group_field': self.group_field,
+            'reference_group': self.reference_group,
+            'status': self.status.value,
+            'error_message': self.error_message,
+            'groups': self.groups,
+            'num_flagged': self.num_flagged,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+        }
+        if include_items:
+            data['items'] = self.items
+        return data
+    
+    def __repr__(self) -> str:
+        return f'<RaschDifAnalysis Analysis:{self.rasch_analysis_id} by {self.group_by.value}>'
+
+
+class RaschItemBank(db.Model):
+    """
+    Item bank: kalibrasi terbaru per soal lintas analisis dan quiz.
+
+    Satu entry per soal asal (question_id). Soal salinan dipetakan ke entry
+    asalnya lewat content_fingerprint (lihat rasch_item_bank), sehingga quiz
+    baru yang memakai ulang soal bisa langsung di-warm start atau di-score
+    dengan anchor tanpa JMLE ulang. Diperbarui setelah setiap analisis
+    completed; fit_history menyimpan kalibrasi terakhir:
+
+        [{"analysis_id": 3, "delta": 0.41, "delta_se": 0.22,
+          "infit_mnsq": 0.97, "outfit_mnsq": 1.04, "persons": 35,
+          "calibrated_at": "..."}]
+    """
+    __tablename__ = 'rasch_item_bank'
+    
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    question_id: Mapped[int] = mapped_column(
+        db.Integer, 
+        db.ForeignKey('questions.id', ondelete='CASCADE'), 
+        nullable=False,
+        unique=True
+    )
+    # SHA-256 dari tipe, teks, poin, dan opsi soal yang dinormalisasi
+    content_fingerprint: Mapped[str] = mapped_column(db.String(64), nullable=False, index=True)
+    
+    # Kalibrasi terbaru (logit, skala analisis sumber)
+    delta: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
+    delta_se: Mapped[Optional[float]] = mapped_column(db.Numeric(10, 6))
+    exposure_count: Mapped[int] = mapped_column(
+        db.Integer, 
+        default=0, 
+        nullable=False
+    )  # total responden di semua kalibrasi
+    calibration_count: Mapped[int] = mapped_column(
+        db.Integer, 
+        default=0, 
+        nullable=False
+    )
+    last_analysis_id: Mapped[Optional[int]] = mapped_column(
+        db.Integer, 
+        db.ForeignKey('rasch_analyses.id', ondelete='SET NULL'), 
+        nullable=True
+    )
+    fit_history: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(
+        JSON,
+        nullable=True
+    )
+    calibrated_at: Mapped[Optional[datetime]] = mapped_column(db.DateTime)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        db.DateTime, 
+        default=get_jakarta_now
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        db.DateTime, 
+        default=get_jakarta_now, 
+        onupdate=get_jakarta_now
+    )
+    
+    # Relationships
+    question = relationship('Question')
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'question_id': self.question_id,
+            'content_fingerprint': self.content_fingerprint,
+            'delta': float(self.delta) if self.delta is not None else None,
+            'delta_se': float(self.delta_se) if self.delta_se is not None else None,
+            'exposure_count': self.exposure_count,
+            'calibration_count': self.calibration_count,
+            'last_analysis_id': self.last_analysis_id,
+            'fit_history': self.fit_history or [],
+            'calibrated_at': self.calibrated_at.isoformat() if self.calibrated_at else None,
+        }
+    
+    def __repr__(self) -> str:
+        return f'<RaschItemBank Q{self.question_id} δ={self.delta}>'
@@ -17,18 +17,41 @@ JMLE Algorithm:
     3. Iteratively update ability untuk setiap person
     4. Check convergence
     5. Repeat hingga converge atau max iterations
+
+Soal checkbox dan soal manual dengan points > 1 (RASCH_PARTIAL_CREDIT)
+dikalibrasi dengan Partial Credit Model lewat rasch_pcm; lihat modul tersebut.
+
+Combined analysis (RaschAnalysisType.COMBINED) mengkalibrasi semua quiz
+Rasch-enabled dalam satu course ke satu skala ability, memakai sparse
+response structure dari rasch_sparse.
+
+Bootstrap confidence interval (RASCH_BOOTSTRAP_REPLICATES > 0) dihitung
+sebelum hasil disimpan; lihat rasch_bootstrap. PCA standardized residuals
+(rasch_engine.residual_pca) disimpan di RaschAnalysis.residual_pca untuk
+cek unidimensionality.
+
+Analisis completed memperbarui item bank (rasch_item_bank). Quiz tanpa
+kalibrasi sebelumnya dengan item set yang sama di-warm start dari bank.
 """
 
+import functools
 import math
 import logging
+import time
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
-from app import create_app, db
+import numpy as np
+from celery.exceptions import SoftTimeLimitExceeded
+from flask import current_app, has_app_context
+from sqlalchemy import update
+
+from app import db
 from app.models.rasch import (
     RaschAnalysis,
     RaschAnalysisStatus,
+    RaschAnalysisType,
     RaschPersonMeasure,
     RaschItemMeasure,
     FitStatus,
@@ -36,11 +59,30 @@ from app.models.rasch import (
     AbilityLevel,
     DifficultyLevel,
 )
-from app.models.quiz import QuizSubmission, Answer, Question
-from app.models.user import User
+from app.services import rasch_bootstrap
+from app.services import rasch_checkpoint
+from app.services import rasch_engine
+from app.services import rasch_estimators
+from app.services import rasch_information
+from app.services import rasch_item_bank
+from app.services import rasch_pcm
+from app.services import rasch_sparse
+from app.services import rasch_results_writer as results_writer
+from app.services import rasch_score_table
+from app.services import rasch_telemetry
+from app.services.rasch_telemetry import timed
+from app.services.rasch_data_loader import ResponseData, combined_quiz_ids, load_quiz_responses, load_responses
+from app.services.rasch_progress import ProgressReporter
 
 logger = logging.getLogger(__name__)
 
+# Estimation engines: 'numpy' (array-backed) atau 'python' (reference implementation)
+ENGINE_NUMPY = 'numpy'
+ENGINE_PYTHON = 'python'
+
+# Residual PCA combined analysis butuh matrix dense; di atas ini dilewati
+RESIDUAL_PCA_MAX_CELLS = 20_000_000
+
 
 @dataclass
 class RaschResult:
@@ -61,11 +103,60 @@ class RaschAnalysisService:
     Usage:
         service = RaschAnalysisService(analysis_id=1)
         result = service.run_analysis()
+
+        # Reference implementation (pure Python)
+        service = RaschAnalysisService(analysis_id=1, engine='python')
+
+        # Kalibrasi provisional instan
+        service = RaschAnalysisService(analysis_id=1, estimator='prox')
+
+        # JMLE tanpa akselerasi SQUAREM
+        service = RaschAnalysisService(analysis_id=1, acceleration='none')
     """
     
-    def __init__(self, analysis_id: int):
+    def __init__(
+        self,
+        analysis_id: int,
+        engine: Optional[str] = None,
+        warm_start: Optional[bool] = None,
+        estimator: Optional[str] = None,
+        acceleration: Optional[str] = None,
+    ):
         self.analysis_id = analysis_id
         self.analysis: Optional[RaschAnalysis] = None
+
+        # Estimation engine (default dari config RASCH_ENGINE)
+        if engine is None and has_app_context():
+            engine = current_app.config.get('RASCH_ENGINE', ENGINE_NUMPY)
+        self.engine = engine or ENGINE_NUMPY
+        if self.engine not in (ENGINE_NUMPY, ENGINE_PYTHON):
+            raise ValueError(f"Unknown Rasch engine: {self.engine}")
+
+        # Estimator (default dari kolom RaschAnalysis.estimator saat load_data)
+        self.estimator = getattr(estimator, 'value', estimator)
+        if self.estimator is not None:
+            rasch_estimators.get_estimator(self.estimator)
+            if self.estimator != rasch_estimators.ESTIMATOR_JMLE and self.engine == ENGINE_PYTHON:
+                raise ValueError("Python reference engine only supports JMLE")
+
+        # Akselerasi JMLE engine numpy (default dari config RASCH_JMLE_ACCELERATION)
+        if acceleration is None and has_app_context():
+            acceleration = current_app.config.get('RASCH_JMLE_ACCELERATION', rasch_engine.ACCELERATION_SQUAREM)
+        self.acceleration = acceleration or rasch_engine.ACCELERATION_NONE
+        if self.acceleration not in rasch_engine.ACCELERATIONS:
+            raise ValueError(f"Unknown JMLE acceleration: {self.acceleration}")
+
+        # Warm start dari kalibrasi sebelumnya (default dari config RASCH_WARM_START)
+        if warm_start is None:
+            warm_start = current_app.config.get('RASCH_WARM_START', True) if has_app_context() else False
+        self.warm_start = warm_start
+        self.warm_started = False
+        self.warm_start_baseline: Optional[int] = None  # iterasi cold start sebagai pembanding
+
+        # Partial credit untuk soal manual dengan points > 1 (default dari config RASCH_PARTIAL_CREDIT)
+        self.partial_credit = (
+            current_app.config.get('RASCH_PARTIAL_CREDIT', True) if has_app_context() else False
+        )
         
         # JMLE parameters
         self.convergence_threshold = 0.001
@@ -83,7 +174,42 @@ class RaschAnalysisService:
         # Results
         self.person_results: Dict[int, dict] = {}
         self.item_results: Dict[int, dict] = {}
+
+        # Array-backed state (engine='numpy')
+        self.response_data: Optional[ResponseData] = None
+        self.matrix = None  # rasch_engine.ResponseMatrix atau rasch_sparse.SparseResponseMatrix
+        self.initial_measures: Optional[rasch_engine.InitialMeasures] = None
+        self.fit: Optional[rasch_engine.FitStatistics] = None
+        self.convergence_history: Optional[List[float]] = None  # max change per iterasi
+
+        # Partial Credit Model state (hanya jika ada item polytomous)
+        self.max_scores: Optional[np.ndarray] = None  # kategori tertinggi per item
+        self.thresholds: Optional[np.ndarray] = None  # step difficulties (items × K)
+
+        # Out-of-band progress (lihat rasch_progress)
+        self.progress: Optional[ProgressReporter] = None
+
+        # True jika input sama dengan kalibrasi terakhir dan hasilnya dipakai ulang
+        self.unchanged = False
+
+        # Checkpoint JMLE dan heartbeat untuk janitor (lihat rasch_checkpoint)
+        self.checkpoints: Optional[rasch_checkpoint.CheckpointWriter] = None
+        self.resumed_from: Optional[int] = None  # iterasi checkpoint yang dilanjutkan
+        self._last_heartbeat: Optional[float] = None
+
+        # Durasi stage, dimensi matrix, peak memory (lihat rasch_telemetry)
+        self.telemetry = rasch_telemetry.AnalysisTelemetry()
+
+        # Bootstrap CI opsional (default dari config RASCH_BOOTSTRAP_*)
+        self.bootstrap = rasch_bootstrap.BootstrapSettings.from_config()
+        self.intervals: Optional[rasch_bootstrap.BootstrapIntervals] = None
+
+        # Jumlah contrast residual PCA (default dari config RASCH_RESIDUAL_PCA_COMPONENTS; 0 = nonaktif)
+        self.pca_components = (
+            int(current_app.config.get('RASCH_RESIDUAL_PCA_COMPONENTS', 3)) if has_app_context() else 3
+        )
     
+    @timed('load')
     def load_data(self) -> bool:
         """
         Load data dari database untuk analisis.
@@ -100,12 +226,21 @@ class RaschAnalysisService:
             # Update parameters from analysis
             self.convergence_threshold = float(self.analysis.convergence_threshold)
             self.max_iterations = self.analysis.max_iterations
+            if self.estimator is None:
+                self.estimator = getattr(self.analysis.estimator, 'value', self.analysis.estimator)
+            self.estimator = self.estimator or rasch_estimators.ESTIMATOR_JMLE
+            rasch_estimators.get_estimator(self.estimator)
+            if self.estimator != rasch_estimators.ESTIMATOR_JMLE and self.engine == ENGINE_PYTHON:
+                logger.warning(f"Estimator {self.estimator} requires the numpy engine; switching engine")
+                self.engine = ENGINE_NUMPY
             
             # Get quiz or assignment
             if self.analysis.quiz_id:
                 return self._load_quiz_data()
             elif self.analysis.assignment_id:
                 return self._load_assignment_data()
+            elif self.analysis.analysis_type == RaschAnalysisType.COMBINED:
+                return self._load_combined_data()
             else:
                 raise ValueError("Analysis must have quiz_id or assignment_id")
                 
@@ -114,48 +249,96 @@ class RaschAnalysisService:
             return False
     
     def _load_quiz_data(self) -> bool:
-        """Load data dari quiz submissions"""
+        """Load data dari quiz submissions (satu joined query)"""
         try:
             quiz_id = self.analysis.quiz_id
-            
-            # Get all submissions for this quiz
-            submissions = QuizSubmission.query.filter_by(quiz_id=quiz_id).all()
-            
-            if not submissions:
+
+            data = load_quiz_responses(quiz_id, partial_credit=self.partial_credit)
+
+            if not data.num_persons:
                 raise ValueError("No submissions found for quiz")
-            
-            # Get all questions in the quiz
-            questions = Question.query.filter_by(quiz_id=quiz_id).all()
-            self.questions = [q.id for q in questions]
-            
-            if not self.questions:
+
+            if not data.num_items:
                 raise ValueError("No questions found in quiz")
-            
-            # Build response matrix
-            for submission in submissions:
-                student_id = submission.user_id
-                self.students.append(student_id)
-                
-                # Get answers for this submission
-                answers = Answer.query.filter_by(submission_id=submission.id).all()
-                
-                for answer in answers:
-                    question_id = answer.question_id
-                    # Determine if correct (1) or incorrect (0)
-                    is_correct = self._is_answer_correct(answer)
-                    self.response_matrix[(student_id, question_id)] = 1 if is_correct else 0
-            
-            # Update analysis metadata
-            self.analysis.num_persons = len(self.students)
-            self.analysis.num_items = len(self.questions)
-            
-            logger.info(f"Loaded {len(self.students)} students, {len(self.questions)} questions")
+
+            self._set_response_data(data)
             return True
             
         except Exception as e:
             logger.error(f"Error loading quiz data: {e}")
             return False
+
+    def _load_combined_data(self) -> bool:
+        """
+        Load semua quiz Rasch-enabled di course sebagai satu sparse matrix.
+
+        Hanya dichotomous JMLE; estimator lain dan partial credit memakai
+        dense matrix dan tidak cocok untuk item bank satu course.
+        """
+        try:
+            quiz_ids = combined_quiz_ids(self.analysis.course_id)
+            if not quiz_ids:
+                raise ValueError("No Rasch-enabled quizzes in course")
+
+            data = load_responses(quiz_ids)
+
+            if not data.num_persons:
+                raise ValueError("No submissions found for course quizzes")
+
+            if self.estimator != rasch_estimators.ESTIMATOR_JMLE:
+                logger.warning(f"Estimator {self.estimator} needs a dense matrix; using sparse JMLE")
+                self.estimator = rasch_estimators.ESTIMATOR_JMLE
+            self.engine = ENGINE_NUMPY
+
+            self._set_response_data(data, sparse=True)
+            logger.info(
+                f"Combined analysis over {len(quiz_ids)} quizzes: "
+                f"{data.num_responses} responses ({self.matrix.density:.1%} density)"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Error loading combined data: {e}")
+            return False
+
+    def _set_response_data(self, data: ResponseData, sparse: bool = False):
+        """Simpan response data dalam bentuk yang dipakai engine"""
+        self.response_data = data
+        if data.is_polytomous:
+            self._use_partial_credit(data.max_scores)
+        self.students = [int(pid) for pid in data.person_ids]
+        self.questions = [int(qid) for qid in data.item_ids]
+        if sparse:
+            self.matrix = data.to_sparse()
+        elif self.engine == ENGINE_NUMPY:
+            self.matrix = data.to_matrix()
+        else:
+            self.response_matrix = data.to_dict()
+
+        # Update analysis metadata
+        self.analysis.num_persons = len(self.students)
+        self.analysis.num_items = len(self.questions)
+
+        logger.info(f"Loaded {len(self.students)} students, {len(self.questions)} questions")
     
+    @property
+    def is_polytomous(self) -> bool:
+        return self.max_scores is not None
+
+    @property
+    def is_sparse(self) -> bool:
+        return isinstance(self.matrix, rasch_sparse.SparseResponseMatrix)
+
+    def _use_partial_credit(self, max_scores: np.ndarray):
+        """Aktifkan Partial Credit Model (butuh engine numpy, estimator JMLE)"""
+        if self.engine == ENGINE_PYTHON:
+            logger.warning("Partial credit items require the numpy engine; switching engine")
+            self.engine = ENGINE_NUMPY
+        if self.estimator not in (None, rasch_estimators.ESTIMATOR_JMLE):
+            logger.warning(f"Estimator {self.estimator} is dichotomous only; using PCM JMLE")
+            self.estimator = rasch_estimators.ESTIMATOR_JMLE
+        self.max_scores = max_scores
+
     def _load_assignment_data(self) -> bool:
         """Load data dari assignment submissions (rubric-based)"""
         logger.warning("Assignment-based Rasch analysis is not yet implemented")
@@ -165,26 +348,7 @@ class RaschAnalysisService:
             db.session.commit()
         return False
     
-    def _is_answer_correct(self, answer: Answer) -> bool:
-        """Check apakah jawaban benar"""
-        question = answer.question
-        
-        if question.question_type in ['multiple_choice', 'true_false', 'dropdown']:
-            # Check if selected option is correct
-            if answer.selected_option_id:
-                from app.models.quiz import Option
-                option = Option.query.get(answer.selected_option_id)
-                return option.is_correct if option else False
-        elif question.question_type == 'checkbox':
-            # Partial credit untuk checkbox
-            # TODO: Implement partial credit
-            return answer.manual_score > 0 if answer.manual_score else False
-        elif question.question_type in ['long_text', 'upload']:
-            # Manual grading
-            return answer.manual_score > 0 if answer.manual_score else False
-        
-        return False
-    
+    @timed('init')
     def initialize_measures(self):
         """
         Initialize ability dan difficulty measures.
@@ -196,6 +360,10 @@ class RaschAnalysisService:
         menghindari bias kalibrasi. Ability mereka dihitung via ekstrapolasi
         setelah item konvergen.
         """
+        if self.engine == ENGINE_NUMPY:
+            self._initialize_measures_vectorized()
+            return
+
         # Identify students with extreme scores
         self.extreme_high_students = []  # Perfect scores
         self.extreme_low_students = []   # Zero scores
@@ -241,6 +409,181 @@ class RaschAnalysisService:
             f"{len(self.extreme_high_students)} extreme high, {len(self.extreme_low_students)} extreme low"
         )
     
+    def _initialize_measures_vectorized(self):
+        """Initialize measures via rasch_engine dan sinkronkan ke dict state"""
+        if self.matrix is None:
+            self.matrix = rasch_engine.ResponseMatrix.from_dict(
+                self.response_matrix, self.students, self.questions
+            )
+        if self.is_sparse:
+            self.initial_measures = rasch_sparse.initialize_measures(self.matrix)
+        elif self.is_polytomous:
+            self.initial_measures = rasch_pcm.initialize_measures(self.matrix, self.max_scores)
+        else:
+            self.initial_measures = rasch_engine.initialize_measures(self.matrix)
+        self._sync_measures_from_arrays(
+            self.initial_measures.thetas, self.initial_measures.deltas
+        )
+
+        person_ids = self.matrix.person_ids
+        self.extreme_low_students = [
+            person_ids[i] for i in np.flatnonzero(self.initial_measures.extreme_low)
+        ]
+        self.extreme_high_students = [
+            person_ids[i] for i in np.flatnonzero(self.initial_measures.extreme_high)
+        ]
+        self.non_extreme_students = [
+            person_ids[i] for i in np.flatnonzero(self.initial_measures.non_extreme)
+        ]
+
+        logger.info(
+            f"Initialized measures: {len(self.non_extreme_students)} non-extreme students, "
+            f"{len(self.extreme_high_students)} extreme high, {len(self.extreme_low_students)} extreme low"
+        )
+
+    def _load_previous_calibration(self) -> Optional[tuple]:
+        """
+        Measures dari kalibrasi terakhir untuk quiz yang sama.
+
+        Prioritas: measures milik analisis ini (re-run, measures lama belum
+        diganti), lalu analisis completed terbaru lain untuk quiz yang sama.
+
+        Returns:
+            (source_analysis, {student_id: theta}, {question_id: delta}) atau None
+        """
+        if not self.analysis or not self.analysis.quiz_id:
+            return None
+
+        candidates = [self.analysis]
+        latest_completed = RaschAnalysis.query.filter(
+            RaschAnalysis.quiz_id == self.analysis.quiz_id,
+            RaschAnalysis.id != self.analysis_id,
+            RaschAnalysis.status == RaschAnalysisStatus.COMPLETED.value,
+        ).order_by(RaschAnalysis.completed_at.desc()).first()
+        if latest_completed:
+            candidates.append(latest_completed)
+
+        for source in candidates:
+            previous_deltas = {
+                question_id: float(delta)
+                for question_id, delta in db.session.query(
+                    RaschItemMeasure.question_id, RaschItemMeasure.delta,
+                ).filter(
+                    RaschItemMeasure.rasch_analysis_id == source.id,
+                    RaschItemMeasure.delta.isnot(None),
+                )
+            }
+            if not previous_deltas:
+                continue
+
+            previous_thetas = {
+                student_id: float(theta)
+                for student_id, theta in db.session.query(
+                    RaschPersonMeasure.student_id, RaschPersonMeasure.theta,
+                ).filter(
+                    RaschPersonMeasure.rasch_analysis_id == source.id,
+                    RaschPersonMeasure.theta.isnot(None),
+                )
+            }
+            return source, previous_thetas, previous_deltas
+
+        return None
+
+    @timed('init')
+    def apply_warm_start(self) -> bool:
+        """
+        Seed difficulties/abilities dari kalibrasi sebelumnya jika item set sama.
+
+        Dipanggil setelah initialize_measures(). Person baru dan extreme persons
+        tetap memakai starting values biasa.
+
+        Returns:
+            bool: True jika warm start dipakai
+        """
+        if not self.warm_start:
+            return False
+
+        previous = self._load_previous_calibration()
+        if previous is None:
+            return self._warm_start_from_item_bank()
+
+        source, previous_thetas, previous_deltas = previous
+        if set(previous_deltas) != set(self.questions):
+            logger.info(f"Item set changed since analysis {source.id}")
+            return self._warm_start_from_item_bank()
+
+        if self.engine == ENGINE_NUMPY:
+            self.initial_measures = rasch_engine.warm_start_measures(
+                self.matrix, self.initial_measures, previous_thetas, previous_deltas
+            )
+            self._sync_measures_from_arrays(
+                self.initial_measures.thetas, self.initial_measures.deltas
+            )
+        else:
+            for question_id in self.questions:
+                self.difficulties[question_id] = previous_deltas[question_id]
+            for student_id in self.non_extreme_students:
+                if student_id in previous_thetas:
+                    self.abilities[student_id] = previous_thetas[student_id]
+
+        # Jumlah iterasi cold start dari run sebelumnya (untuk iterations_saved)
+        if source.iterations:
+            self.warm_start_baseline = source.iterations + (source.iterations_saved or 0)
+        self.warm_started = True
+
+        seeded = sum(1 for sid in self.non_extreme_students if sid in previous_thetas)
+        logger.info(
+            f"Warm start from analysis {source.id}: {len(previous_deltas)} items, "
+            f"{seeded}/{len(self.non_extreme_students)} persons seeded"
+        )
+        return True
+
+    def _warm_start_from_item_bank(self) -> bool:
+        """
+        Seed difficulties dari item bank (quiz baru atau item set berubah).
+
+        Delta bank digeser ke skala starting values cold start; item tanpa
+        kalibrasi di bank dan semua abilities tetap memakai starting values
+        biasa. Butuh cakupan bank minimal WARM_START_MIN_COVERAGE.
+        """
+        if self.is_polytomous:
+            logger.info("Partial credit analysis; using cold start")
+            return False
+
+        bank_deltas = rasch_item_bank.lookup_difficulties(self.questions)
+        if len(bank_deltas) < rasch_item_bank.WARM_START_MIN_COVERAGE * len(self.questions):
+            logger.info(
+                f"Item bank covers {len(bank_deltas)}/{len(self.questions)} items; using cold start"
+            )
+            return False
+
+        deltas = dict(self.difficulties)
+        deltas.update(rasch_item_bank.align_to_scale(bank_deltas, self.difficulties))
+        if self.engine == ENGINE_NUMPY:
+            self.initial_measures = rasch_engine.warm_start_measures(
+                self.matrix, self.initial_measures, {}, deltas
+            )
+            self._sync_measures_from_arrays(
+                self.initial_measures.thetas, self.initial_measures.deltas
+            )
+        else:
+            self.difficulties = deltas
+        self.warm_started = True
+
+        logger.info(
+            f"Warm start from item bank: {len(bank_deltas)}/{len(self.questions)} items seeded"
+        )
+        return True
+
+    def _sync_measures_from_arrays(self, thetas, deltas):
+        """Copy array measures ke self.abilities / self.difficulties"""
+        self.abilities = {
+            pid: float(theta) for pid, theta in zip(self.matrix.person_ids, thetas)
+        }
+        self.difficulties = {
+            qid: float(delta) for qid, delta in zip(self.matrix.item_ids, deltas)
+        }
+
     def _calculate_raw_score(self, student_id: int) -> int:
         """Calculate raw score untuk siswa"""
         score = 0
@@ -261,9 +604,13 @@ class RaschAnalysisService:
         
         return correct / total if total > 0 else 0.5
     
+    @timed('jmle')
     def run_jmle(self) -> bool:
         """
         Run Joint Maximum Likelihood Estimation algorithm.
+
+        Dengan engine numpy, estimator lain (PROX, pairwise, CMLE) dipilih
+        lewat RaschAnalysis.estimator; lihat rasch_estimators.
         
         Hanya menggunakan non-extreme students untuk kalibrasi difficulty.
         Extreme students akan diekstrapolasi setelah konvergensi.
@@ -271,7 +618,14 @@ class RaschAnalysisService:
         Returns:
             bool: True jika converge
         """
-        logger.info(f"Starting JMLE (max_iter={self.max_iterations}, threshold={self.convergence_threshold})")
+        logger.info(
+            f"Starting {self.estimator or rasch_estimators.ESTIMATOR_JMLE} estimation "
+            f"(engine={self.engine}, max_iter={self.max_iterations}, "
+            f"threshold={self.convergence_threshold})"
+        )
+
+        if self.engine == ENGINE_NUMPY:
+            return self._run_estimator_vectorized()
 
         prev_abilities = {k: v for k, v in self.abilities.items() if k in self.non_extreme_students}
         prev_difficulties = self.difficulties.copy()
@@ -312,6 +666,46 @@ class RaschAnalysisService:
         self._save_results(self.max_iterations, converged=False)
         return False
     
+    def _run_estimator_vectorized(self) -> bool:
+        """Estimasi via rasch_engine/rasch_estimators (JMLE, PROX, pairwise, CMLE)"""
+        if self.initial_measures is None:
+            self._initialize_measures_vectorized()
+
+        if self.is_sparse:
+            estimate = rasch_sparse.run_jmle
+        elif self.is_polytomous:
+            estimate = functools.partial(rasch_pcm.run_pcm, max_scores=self.max_scores)
+        else:
+            estimate = rasch_estimators.get_estimator(self.estimator)
+
+        # Akselerasi dan checkpoint hanya untuk JMLE (dense dan sparse)
+        jmle_options = {}
+        if estimate in (rasch_engine.run_jmle, rasch_sparse.run_jmle):
+            jmle_options = dict(self._resume_from_checkpoint(), acceleration=self.acceleration)
+        result = estimate(
+            self.matrix,
+            self.initial_measures,
+            convergence_threshold=self.convergence_threshold,
+            max_iterations=self.max_iterations,
+            on_iteration=lambda iteration, max_change: self._update_progress(iteration),
+            **jmle_options,
+        )
+        self.convergence_history = result.max_changes
+
+        if result.converged:
+            logger.info(
+                f"Converged at iteration {result.iterations}"
+                + (f" ({result.accelerated_steps} SQUAREM steps)" if result.accelerated_steps else "")
+            )
+        else:
+            logger.warning(f"Did not converge after {self.max_iterations} iterations")
+
+        # Extreme persons sudah diekstrapolasi oleh engine
+        self.thresholds = result.thresholds
+        self._sync_measures_from_arrays(result.thetas, result.deltas)
+        self._save_results(result.iterations, converged=result.converged)
+        return result.converged
+
     def _update_item_difficulties(self):
         """
         Update item difficulties using Newton-Raphson.
@@ -344,9 +738,9 @@ class RaschAnalysisService:
                     sum_expected += p
                     sum_variance += p * (1 - p)
 
-                # Update delta
+                # Update delta (more correct than expected -> easier item)
                 if sum_variance > 0.0001:
-                    delta_new = delta + (sum_observed - sum_expected) / sum_variance
+                    delta_new = delta - (sum_observed - sum_expected) / sum_variance
                     delta = delta_new
                 else:
                     break
@@ -533,8 +927,13 @@ class RaschAnalysisService:
         
         return max_change
     
+    @timed('fit')
     def calculate_fit_statistics(self):
         """Calculate fit statistics (infit, outfit) untuk persons dan items"""
+        if self.engine == ENGINE_NUMPY:
+            self._calculate_fit_statistics_vectorized()
+            return
+
         # Person fit statistics
         for student_id in self.students:
             self.person_results[student_id] = self._calculate_person_fit(student_id)
@@ -543,6 +942,59 @@ class RaschAnalysisService:
         for question_id in self.questions:
             self.item_results[question_id] = self._calculate_item_fit(question_id)
     
+    def _measure_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Abilities/difficulties sebagai array yang sejajar dengan self.matrix"""
+        thetas = np.array([self.abilities[pid] for pid in self.matrix.person_ids], dtype=np.float64)
+        deltas = np.array([self.difficulties[qid] for qid in self.matrix.item_ids], dtype=np.float64)
+        return thetas, deltas
+
+    def _calculate_fit_statistics_vectorized(self):
+        """Fit statistics untuk semua persons dan items dari satu residual matrix"""
+        thetas, deltas = self._measure_arrays()
+        if self.is_sparse:
+            fit = rasch_sparse.calculate_fit_statistics(self.matrix, thetas, deltas)
+        elif self.thresholds is not None:
+            fit = rasch_pcm.calculate_fit_statistics(
+                self.matrix, thetas, self.thresholds, self.max_scores
+            )
+        else:
+            fit = rasch_engine.calculate_fit_statistics(self.matrix, thetas, deltas)
+        self.fit = fit
+
+        self.person_results = {}
+        for i, student_id in enumerate(self.matrix.person_ids):
+            theta = float(thetas[i])
+            outfit_mnsq = float(fit.person_outfit_mnsq[i])
+            self.person_results[student_id] = {
+                'theta': theta,
+                'theta_se': float(fit.theta_se[i]),
+                'outfit_mnsq': outfit_mnsq,
+                'outfit_zstd': float(fit.person_outfit_zstd[i]),
+                'infit_mnsq': float(fit.person_infit_mnsq[i]),
+                'infit_zstd': float(fit.person_infit_zstd[i]),
+                'fit_status': self._interpret_fit_status(outfit_mnsq),
+                'fit_category': self._interpret_fit_category(outfit_mnsq),
+                'ability_level': self._interpret_ability_level(theta),
+            }
+
+        self.item_results = {}
+        for j, question_id in enumerate(self.matrix.item_ids):
+            delta = float(deltas[j])
+            outfit_mnsq = float(fit.item_outfit_mnsq[j])
+            self.item_results[question_id] = {
+                'delta': delta,
+                'delta_se': float(fit.delta_se[j]),
+                'p_value': float(fit.p_values[j]),
+                'point_biserial': float(fit.point_biserial[j]),
+                'outfit_mnsq': outfit_mnsq,
+                'outfit_zstd': float(fit.item_outfit_zstd[j]),
+                'infit_mnsq': float(fit.item_infit_mnsq[j]),
+                'infit_zstd': float(fit.item_infit_zstd[j]),
+                'fit_status': self._interpret_fit_status(outfit_mnsq),
+                'fit_category': self._interpret_fit_category(outfit_mnsq),
+                'difficulty_level': self._interpret_difficulty_level(delta),
+            }
+
     def _calculate_person_fit(self, student_id: int) -> dict:
         """Calculate fit statistics untuk person"""
         theta = self.abilities[student_id]
@@ -774,8 +1226,15 @@ class RaschAnalysisService:
         # Clamp to [-1, 1]
         return max(-1.0, min(1.0, point_biserial))
     
+    @timed('reliability')
     def calculate_reliability(self) -> dict:
         """Calculate reliability indices"""
+        if self.engine == ENGINE_NUMPY:
+            if self.fit is None:
+                self._calculate_fit_statistics_vectorized()
+            thetas, deltas = self._measure_arrays()
+            return rasch_engine.calculate_reliability(self.matrix, thetas, deltas, self.fit)
+
         # Person separation index
         person_variance = self._calculate_variance(list(self.abilities.values()))
         person_se_mean = sum(
@@ -831,93 +1290,268 @@ class RaschAnalysisService:
         mean = sum(values) / len(values)
         return sum((v - mean) ** 2 for v in values) / (len(values) - 1)
     
+    def _person_raw_scores(self) -> Dict[int, int]:
+        """Raw score per student (satu pass atas response data)"""
+        if self.engine == ENGINE_NUMPY and self.matrix is not None:
+            return {
+                pid: int(score)
+                for pid, score in zip(self.matrix.person_ids, self.matrix.raw_scores)
+            }
+        return {sid: self._calculate_raw_score(sid) for sid in self.person_results}
+
+    def _total_possible(self) -> Dict[int, int]:
+        """
+        Skor maksimum per student.
+
+        Combined analysis: jumlah item yang dijawab; quiz: jumlah item
+        (atau jumlah kategori tertinggi untuk partial credit).
+        """
+        if self.is_sparse:
+            return {
+                pid: int(count)
+                for pid, count in zip(self.matrix.person_ids, self.matrix.person_counts)
+            }
+        total = int(self.max_scores.sum()) if self.is_polytomous else len(self.questions)
+        return {student_id: total for student_id in self.person_results}
+
+    def _item_exposures(self) -> Dict[int, int]:
+        """Jumlah responden per item"""
+        if self.engine == ENGINE_NUMPY and self.matrix is not None:
+            return {
+                qid: int(count)
+                for qid, count in zip(self.matrix.item_ids, self.matrix.item_counts)
+            }
+        counts = dict.fromkeys(self.questions, 0)
+        for _, question_id in self.response_matrix:
+            counts[question_id] = counts.get(question_id, 0) + 1
+        return counts
+
+    def _item_bank_rows(self, item_rows: List[dict]) -> List[dict]:
+        """Item dichotomous saja; item partial credit tidak punya satu delta yang bisa di-anchor"""
+        if not self.is_polytomous:
+            return item_rows
+        dichotomous = {qid for qid, m in zip(self.questions, self.max_scores) if m <= 1}
+        return [row for row in item_rows if row['question_id'] in dichotomous]
+
     def _update_progress(self, iteration: int):
-        """Update progress di database"""
-        if self.analysis:
-            progress = (iteration / self.max_iterations) * 100
-            self.analysis.progress_percentage = progress
-            self.analysis.status_message = f"Iteration {iteration}/{self.max_iterations}"
-            db.session.commit()
+        """Publish progress iterasi ke progress channel (tanpa commit ke database)"""
+        if not self.analysis:
+            return
+        if self.progress is None:
+            self.progress = ProgressReporter(self.analysis_id)
+        self.progress.report(iteration, self.max_iterations)
+        self._heartbeat()
+
+    def _heartbeat(self):
+        """
+        Update heartbeat_at paling sering sekali per checkpoint interval.
+
+        Janitor menganggap analisis PROCESSING tanpa heartbeat baru sebagai
+        macet (worker mati) dan me-requeue-nya. Dipanggil dari iterasi JMLE,
+        batas stage fit/PCA/bootstrap, dan loop bootstrap.
+
+        Ditulis lewat connection dan transaksi sendiri sehingga perubahan lain
+        di db.session tidak ikut ter-commit. Karena itu heartbeat hanya
+        dipanggil sebelum row analysis diubah di session (row lock milik
+        session akan membuat UPDATE ini menunggu).
+        """
+        if not self.analysis:
+            return
+        interval = rasch_checkpoint.checkpoint_interval() or rasch_checkpoint.DEFAULT_INTERVAL
+        now = time.monotonic()
+        if self._last_heartbeat is not None and now - self._last_heartbeat < interval:
+            return
+        self._last_heartbeat = now
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    update(RaschAnalysis)
+                    .where(RaschAnalysis.id == self.analysis_id)
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+        except Exception as e:
+            # Heartbeat yang terlewat hanya berisiko requeue, bukan kegagalan analisis
+            logger.warning(f"Analysis {self.analysis_id}: heartbeat failed: {e}")
+
+    def _resume_from_checkpoint(self) -> dict:
+        """
+        Kwargs checkpoint untuk run_jmle; melanjutkan dari checkpoint
+        terakhir jika fingerprint input masih sama.
+        """
+        if self.response_data is None:
+            return {}
+
+        self.checkpoints = rasch_checkpoint.CheckpointWriter(self.analysis_id, self._fingerprint())
+        if not self.checkpoints.enabled:
+            return {}
+
+        initial = self.initial_measures
+        checkpoint = self.checkpoints.resume(len(initial.thetas), len(initial.deltas))
+        if checkpoint is not None and checkpoint.iteration < self.max_iterations:
+            self.initial_measures = rasch_engine.InitialMeasures(
+                thetas=checkpoint.thetas,
+                deltas=checkpoint.deltas,
+                extreme_low=initial.extreme_low,
+                extreme_high=initial.extreme_high,
+            )
+            self.resumed_from = checkpoint.iteration
+            logger.info(f"Analysis {self.analysis_id}: resuming from checkpoint at iteration {checkpoint.iteration}")
+            return {'on_checkpoint': self.checkpoints.write, 'start_iteration': checkpoint.iteration}
+        return {'on_checkpoint': self.checkpoints.write}
+
+    def _mark_started(self):
+        """Satu-satunya update row sebelum JMLE: status, started_at, dan metadata data"""
+        if not self.analysis:
+            return
+        self.analysis.status = RaschAnalysisStatus.PROCESSING.value
+        if not self.analysis.started_at:
+            self.analysis.started_at = datetime.utcnow()
+        self.analysis.heartbeat_at = datetime.utcnow()
+        self.analysis.progress_percentage = 0
+        estimator = (self.estimator or rasch_estimators.ESTIMATOR_JMLE).upper()
+        self.analysis.status_message = f"Running {estimator} ({self.engine} engine)"
+        db.session.commit()
+
+    def _clear_progress(self):
+        """Hapus progress sementara; row rasch_analyses kembali jadi sumber status"""
+        reporter = self.progress or ProgressReporter(self.analysis_id)
+        reporter.clear()
     
+    @timed('save')
     def _save_results(self, iterations: int, converged: bool):
         """Save results ke database"""
         try:
             if not self.analysis:
                 return
-            
-            # Calculate fit statistics
+
+            # Stage komputasi berjalan sebelum row analysis diubah di session,
+            # dengan heartbeat di setiap batas stage (lihat _heartbeat)
+            self._heartbeat()
             self.calculate_fit_statistics()
-            
-            # Calculate reliability
             reliability = self.calculate_reliability()
-            
-            # Save person measures
+            self._heartbeat()
+
+            # Dimensionality check dari standardized residuals
+            residual_pca = self.calculate_residual_pca()
+            self._heartbeat()
+
+            if converged and self.bootstrap.replicates > 0:
+                self.calculate_bootstrap_intervals()
+                self._heartbeat()
+
+            # Raw scores dan percentiles dihitung sekali untuk semua persons
+            raw_scores = self._person_raw_scores()
+            total_possible = self._total_possible()
+            person_ids = list(self.person_results)
+            all_thetas = np.array([self.person_results[s]['theta'] for s in person_ids], dtype=np.float64)
+            percentiles = dict(zip(person_ids, rasch_engine.percentiles_below(all_thetas).tolist()))
+            mean_theta = float(all_thetas.mean()) if all_thetas.size else 0.0
+            mean_delta = sum(self.difficulties.values()) / len(self.difficulties)
+            # Combined analysis mencakup banyak submission per siswa
+            submission_ids = (
+                self.response_data.submission_ids
+                if self.response_data and not self.is_sparse else {}
+            )
+            bloom_levels = results_writer.load_bloom_levels(self.item_results)
+            theta_ci, delta_ci = self._interval_lookup()
+
+            person_rows = []
             for student_id, measure in self.person_results.items():
-                # Get raw score
-                raw_score = self._calculate_raw_score(student_id)
-                total_possible = len(self.questions)
-                percentage = (raw_score / total_possible * 100) if total_possible > 0 else 0
-                
-                # Calculate percentile
-                all_thetas = [self.person_results[s]['theta'] for s in self.students]
-                percentile = sum(1 for t in all_thetas if t < measure['theta']) / len(all_thetas) * 100
-                
-                person = RaschPersonMeasure(
-                    rasch_analysis_id=self.analysis_id,
-                    student_id=student_id,
-                    raw_score=raw_score,
-                    total_possible=total_possible,
-                    percentage=percentage,
-                    theta=measure['theta'],
-                    theta_se=measure['theta_se'],
-                    theta_centered=measure['theta'] - sum(all_thetas) / len(all_thetas),
-                    outfit_mnsq=measure['outfit_mnsq'],
-                    outfit_zstd=measure['outfit_zstd'],
-                    infit_mnsq=measure['infit_mnsq'],
-                    infit_zstd=measure['infit_zstd'],
-                    fit_status=measure['fit_status'],
-                    fit_category=measure['fit_category'],
-                    ability_level=measure['ability_level'],
-                    ability_percentile=percentile,
-                )
-                db.session.add(person)
-            
-            # Save item measures
+                raw_score = raw_scores[student_id]
+                possible = total_possible[student_id]
+                person_rows.append({
+                    'student_id': student_id,
+                    'quiz_submission_id': submission_ids.get(student_id),
+                    'raw_score': raw_score,
+                    'total_possible': possible,
+                    'percentage': (raw_score / possible * 100) if possible > 0 else 0,
+                    'theta': measure['theta'],
+                    'theta_se': measure['theta_se'],
+                    'theta_centered': measure['theta'] - mean_theta,
+                    'outfit_mnsq': measure['outfit_mnsq'],
+                    'outfit_zstd': measure['outfit_zstd'],
+                    'infit_mnsq': measure['infit_mnsq'],
+                    'infit_zstd': measure['infit_zstd'],
+                    'fit_status': measure['fit_status'],
+                    'fit_category': measure['fit_category'],
+                    'ability_level': measure['ability_level'],
+                    'ability_percentile': percentiles[student_id],
+                    'theta_ci_low': theta_ci.get(student_id, (None, None))[0],
+                    'theta_ci_high': theta_ci.get(student_id, (None, None))[1],
+                })
+
+            item_rows = []
             for question_id, measure in self.item_results.items():
-                # Get Bloom taxonomy if exists
-                bloom_level = None
-                from app.models.rasch import QuestionBloomTaxonomy
-                bloom = QuestionBloomTaxonomy.query.filter_by(question_id=question_id).first()
-                if bloom:
-                    bloom_level = bloom.bloom_level.value
-                
-                item = RaschItemMeasure(
-                    rasch_analysis_id=self.analysis_id,
-                    question_id=question_id,
-                    p_value=measure['p_value'],
-                    point_biserial=measure['point_biserial'],
-                    delta=measure['delta'],
-                    delta_se=measure['delta_se'],
-                    delta_centered=measure['delta'] - sum(self.difficulties.values()) / len(self.difficulties),
-                    outfit_mnsq=measure['outfit_mnsq'],
-                    outfit_zstd=measure['outfit_zstd'],
-                    infit_mnsq=measure['infit_mnsq'],
-                    infit_zstd=measure['infit_zstd'],
-                    fit_status=measure['fit_status'],
-                    fit_category=measure['fit_category'],
-                    difficulty_level=measure['difficulty_level'],
-                    bloom_level=bloom_level,
-                )
-                db.session.add(item)
-            
+                item_rows.append({
+                    'question_id': question_id,
+                    'p_value': measure['p_value'],
+                    'point_biserial': measure['point_biserial'],
+                    'delta': measure['delta'],
+                    'delta_se': measure['delta_se'],
+                    'delta_centered': measure['delta'] - mean_delta,
+                    'outfit_mnsq': measure['outfit_mnsq'],
+                    'outfit_zstd': measure['outfit_zstd'],
+                    'infit_mnsq': measure['infit_mnsq'],
+                    'infit_zstd': measure['infit_zstd'],
+                    'fit_status': measure['fit_status'],
+                    'fit_category': measure['fit_category'],
+                    'difficulty_level': measure['difficulty_level'],
+                    'bloom_level': bloom_levels.get(question_id),
+                    'delta_ci_low': delta_ci.get(question_id, (None, None))[0],
+                    'delta_ci_high': delta_ci.get(question_id, (None, None))[1],
+                })
+
+            # Delete-and-replace dalam transaksi yang sama dengan update analysis
+            results_writer.replace_measures(self.analysis_id, person_rows, item_rows)
+            results_writer.replace_rating_scales(self.analysis_id, self._rating_scale_rows())
+
             # Update analysis
             self.analysis.status = RaschAnalysisStatus.COMPLETED.value if converged else RaschAnalysisStatus.PARTIAL.value
             self.analysis.completed_at = datetime.utcnow()
+            self.analysis.progress_percentage = 100
+            self.analysis.iterations = iterations
+            self.analysis.warm_started = self.warm_started
+            self.analysis.iterations_saved = (
+                max(0, self.warm_start_baseline - iterations)
+                if self.warm_started and self.warm_start_baseline else None
+            )
+            self.analysis.convergence_history = (
+                [round(change, 6) if math.isfinite(change) else None for change in self.convergence_history]
+                if self.convergence_history is not None else None
+            )
+            self.analysis.status_message = (
+                f"Converged after {iterations} iterations" if converged
+                else f"Stopped after {iterations} iterations (not converged)"
+            )
+            if self.warm_started:
+                self.analysis.status_message += " (warm start"
+                if self.analysis.iterations_saved is not None:
+                    self.analysis.status_message += f", {self.analysis.iterations_saved} iterations saved"
+                self.analysis.status_message += ")"
+            if self.resumed_from is not None:
+                self.analysis.status_message += f" (resumed from iteration {self.resumed_from})"
+            self.analysis.requeue_count = 0
             self.analysis.cronbach_alpha = reliability['cronbach_alpha']
             self.analysis.person_separation_index = reliability['person_separation_index']
             self.analysis.item_separation_index = reliability['item_separation_index']
+            self.analysis.residual_pca = residual_pca
+            # Raw score -> theta untuk late submissions dengan complete pattern
+            self.analysis.score_table = None if self.is_polytomous else rasch_score_table.build_score_table(
+                self.difficulties,
+                [self.abilities[s] for s in self.non_extreme_students],
+            )
+            # Hanya hasil converged yang boleh dipakai ulang oleh re-run berikutnya
+            self.analysis.input_fingerprint = (
+                self._fingerprint() if converged and self.response_data is not None else None
+            )
             
             db.session.commit()
+            rasch_information.invalidate(self.analysis_id)
+            if converged:
+                rasch_item_bank.record_analysis(self.analysis, self._item_bank_rows(item_rows), self._item_exposures())
+            self._clear_progress()
+            if self.checkpoints is not None:
+                self.checkpoints.clear()
             
             logger.info(f"Results saved: {len(self.person_results)} persons, {len(self.item_results)} items")
             
@@ -926,9 +1560,192 @@ class RaschAnalysisService:
             db.session.rollback()
             raise
     
+    @timed('pca')
+    def calculate_residual_pca(self) -> Optional[dict]:
+        """
+        PCA standardized residuals dari thetas/deltas final (lihat
+        rasch_engine.residual_pca).
+
+        Returns:
+            dict untuk RaschAnalysis.residual_pca, atau None untuk engine
+            python, jika dinonaktifkan, atau matrix combined terlalu besar
+        """
+        if self.pca_components <= 0 or self.engine != ENGINE_NUMPY or self.initial_measures is None:
+            return None
+
+        thetas, deltas = self._measure_arrays()
+        matrix = self.matrix
+        if self.is_sparse:
+            if matrix.num_persons * matrix.num_items > RESIDUAL_PCA_MAX_CELLS:
+                logger.info(f"Analysis {self.analysis_id}: matrix too large for residual PCA, skipped")
+                return None
+            matrix = matrix.to_dense()
+
+        if self.thresholds is not None:
+            max_scores = rasch_pcm.effective_max_scores(matrix, self.max_scores)
+            expected, variances = rasch_pcm.score_moments(
+                rasch_pcm.category_probabilities(thetas, self.thresholds, max_scores)
+            )
+        else:
+            expected = rasch_engine.probability_matrix(thetas, deltas)
+            variances = expected * (1 - expected)
+
+        pca = rasch_engine.residual_pca(
+            matrix.responses,
+            matrix.observed,
+            expected,
+            variances,
+            self.initial_measures.non_extreme,
+            components=self.pca_components,
+        )
+        if not pca.unidimensional:
+            logger.info(
+                f"Analysis {self.analysis_id}: first residual contrast eigenvalue "
+                f"{pca.eigenvalues[0]:.2f} suggests a secondary dimension"
+            )
+        return pca.to_dict(matrix.item_ids)
+
+    @timed('bootstrap')
+    def calculate_bootstrap_intervals(self) -> Optional[rasch_bootstrap.BootstrapIntervals]:
+        """
+        Percentile bootstrap interval untuk deltas dan thetas (lihat rasch_bootstrap).
+
+        Hanya untuk JMLE dichotomous engine numpy dengan matrix dense; selain
+        itu (atau jika RASCH_BOOTSTRAP_REPLICATES = 0) interval tetap NULL.
+        """
+        settings = self.bootstrap
+        if (
+            settings.replicates <= 0
+            or self.engine != ENGINE_NUMPY
+            or self.estimator != rasch_estimators.ESTIMATOR_JMLE
+            or self.is_sparse
+            or self.is_polytomous
+        ):
+            return None
+
+        thetas, deltas = self._measure_arrays()
+        self.intervals = rasch_bootstrap.bootstrap_intervals(
+            self.matrix,
+            self.initial_measures,
+            thetas,
+            deltas,
+            replicates=settings.replicates,
+            confidence=settings.confidence,
+            time_budget=settings.time_budget,
+            workers=settings.workers,
+            seed=self.analysis_id,
+            convergence_threshold=self.convergence_threshold,
+            max_iterations=self.max_iterations,
+            on_progress=self._heartbeat,
+        )
+        if self.intervals is not None:
+            logger.info(
+                f"Analysis {self.analysis_id}: bootstrap intervals from "
+                f"{self.intervals.replicates}/{settings.replicates} replicates"
+            )
+        return self.intervals
+
+    def _interval_lookup(self) -> Tuple[Dict[int, tuple], Dict[int, tuple]]:
+        """(student_id -> (low, high), question_id -> (low, high)) dari self.intervals"""
+        if self.intervals is None:
+            return {}, {}
+        intervals = self.intervals
+        theta_ci = {
+            pid: (float(low), float(high))
+            for pid, low, high in zip(self.matrix.person_ids, intervals.theta_low, intervals.theta_high)
+        }
+        delta_ci = {
+            qid: (float(low), float(high))
+            for qid, low, high in zip(self.matrix.item_ids, intervals.delta_low, intervals.delta_high)
+        }
+        return theta_ci, delta_ci
+
+    def _record_telemetry(self, converged: Optional[bool]):
+        """
+        Simpan ringkasan telemetry run ini ke RaschAnalysis.telemetry dan
+        observe ke Prometheus. Best effort: kegagalan hanya di-log.
+
+        Args:
+            converged: None jika analisis gagal
+        """
+        try:
+            if self.response_data is not None:
+                data = self.response_data
+                self.telemetry.set_matrix(data.num_persons, data.num_items, data.num_responses)
+            elif self.students:
+                self.telemetry.set_matrix(
+                    len(set(self.students)), len(self.questions), len(self.response_matrix)
+                )
+            summary = self.telemetry.finish(
+                iterations=self.analysis.iterations if converged is not None else None,
+                converged=converged,
+                engine=self.engine,
+                estimator=self.estimator,
+                acceleration=self.acceleration,
+                resumed_from=self.resumed_from,
+                bootstrap_replicates=self.intervals.replicates if self.intervals is not None else None,
+            )
+            db.session.query(RaschAnalysis).filter_by(id=self.analysis_id).update(
+                {'telemetry': summary}, synchronize_session=False
+            )
+            db.session.commit()
+            logger.info(f"Analysis {self.analysis_id} telemetry: {summary['stages']} ({summary['total_seconds']}s)")
+        except Exception as e:
+            logger.warning(f"Failed to record telemetry for analysis {self.analysis_id}: {e}")
+            db.session.rollback()
+
+    def _rating_scale_rows(self) -> List[dict]:
+        """Satu RaschRatingScale per item polytomous (thresholds dan statistik kategori)"""
+        if self.thresholds is None:
+            return []
+        thetas, _ = self._measure_arrays()
+        summaries = rasch_pcm.rating_scale_summaries(
+            self.matrix, thetas, self.thresholds, self.max_scores
+        )
+        return [
+            dict(summary, scale_name=f"question_{question_id}")
+            for question_id, summary in summaries.items()
+        ]
+
+    def _fingerprint(self) -> str:
+        """Fingerprint response data yang dimuat plus parameter estimasi"""
+        return self.response_data.fingerprint(
+            self.estimator,
+            self.partial_credit,
+            self.convergence_threshold,
+            self.max_iterations,
+        )
+
+    def input_fingerprint(self) -> Optional[str]:
+        """
+        Fingerprint input analisis saat ini tanpa menjalankan estimasi.
+
+        Returns:
+            None jika data tidak bisa dimuat
+        """
+        if self.response_data is None and not self.load_data():
+            return None
+        return self._fingerprint()
+
+    def _reuse_unchanged_results(self) -> bool:
+        """Tandai completed tanpa estimasi jika input sama dengan kalibrasi terakhir"""
+        if not self.analysis.input_fingerprint or self._fingerprint() != self.analysis.input_fingerprint:
+            return False
+
+        self.unchanged = True
+        self.analysis.status = RaschAnalysisStatus.COMPLETED.value
+        self.analysis.progress_percentage = 100
+        self.analysis.status_message = "Input unchanged since last calibration; results reused"
+        db.session.commit()
+        logger.info(f"Analysis {self.analysis_id}: input unchanged, skipping estimation")
+        return True
+
     def run_analysis(self) -> bool:
         """
         Run complete Rasch analysis.
+
+        Jika input (fingerprint) sama dengan kalibrasi terakhir yang converged,
+        estimasi dilewati dan hasil tersimpan dipakai ulang.
         
         Returns:
             bool: True jika analisis berhasil
@@ -937,20 +1754,37 @@ class RaschAnalysisService:
             # Step 1: Load data
             if not self.load_data():
                 return False
+
+            if self._reuse_unchanged_results():
+                return True
             
-            # Step 2: Initialize measures
+            # Satu commit di awal; progress iterasi lewat rasch_progress
+            self._mark_started()
+
+            # Step 2: Initialize measures (warm start jika ada kalibrasi sebelumnya)
             self.initialize_measures()
+            self.apply_warm_start()
             
             # Step 3: Run JMLE
             converged = self.run_jmle()
+            self._record_telemetry(converged)
             
             logger.info(f"Analysis complete: converged={converged}")
             return True
+
+        except SoftTimeLimitExceeded:
+            # Status tetap PROCESSING dan checkpoint disimpan; retry melanjutkan
+            logger.warning(f"Analysis {self.analysis_id} hit the soft time limit")
+            db.session.rollback()
+            raise
             
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
             if self.analysis:
                 self.analysis.status = RaschAnalysisStatus.FAILED.value
                 self.analysis.error_message = str(e)
+                self.analysis.status_message = "Analysis failed"
                 db.session.commit()
+                self._clear_progress()
+                self._record_telemetry(None)
             return False
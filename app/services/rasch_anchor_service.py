@@ -13,12 +13,25 @@ Formula:
     theta_new = ln(P / (1-P)) + mean(delta_anchored)
     
 dimana P adalah proportion correct siswa baru terhadap soal yang sudah dikalibrasi.
+
+Late submissions di-score sekaligus (score_submissions): responses semua
+siswa dimuat dalam satu query sebagai sparse matrix, Newton-Raphson dengan
+deltas anchor tetap dijalankan untuk semua siswa bersamaan, percentile
+dihitung dari satu sorted theta array, dan measures ditulis dengan satu
+DELETE + satu executemany INSERT. Method per-siswa (calculate_ability dkk.)
+tetap ada sebagai reference implementation.
+
+Soal quiz yang belum ada di analisis (ditambahkan setelah kalibrasi) diambil
+dari item bank (rasch_item_bank) jika soal itu atau soal asalnya pernah
+dikalibrasi.
 """
 
 import math
 import logging
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, insert
 
 from app import db
 from app.models.rasch import (
@@ -30,11 +43,20 @@ from app.models.rasch import (
     FitStatus,
     FitCategory,
 )
-from app.models.quiz import QuizSubmission, Answer, Question
-from app.models.user import User
+from app.models.quiz import QuizSubmission, Question
+from app.services import rasch_engine
+from app.services import rasch_item_bank
+from app.services import rasch_score_table
+from app.services import rasch_sparse
+from app.services.rasch_data_loader import load_quiz_responses
 
 logger = logging.getLogger(__name__)
 
+# Newton-Raphson dengan deltas tetap: 2 x NEWTON_STEPS (= 20 langkah, sama
+# dengan loop per-siswa) dan berhenti jika perubahan maksimum < threshold
+ANCHOR_NEWTON_ROUNDS = 2
+ANCHOR_CONVERGENCE = 0.001
+
 
 class RaschAnchorService:
     """
@@ -51,6 +73,8 @@ class RaschAnchorService:
         
         # Anchor values (item difficulties dari analisis sebelumnya)
         self.anchor_difficulties: Dict[int, float] = {}
+        # Raw score -> theta untuk complete pattern (lihat rasch_score_table)
+        self.score_table: Optional[dict] = None
         
         # Data untuk siswa baru
         self.student_id: Optional[int] = None
@@ -86,7 +110,12 @@ class RaschAnchorService:
             
             for item in item_measures:
                 if item.delta is not None:
-                    self.anchor_difficulties[item.question_id] = item.delta
+                    # Numeric column -> Decimal; theta dihitung sebagai float
+                    self.anchor_difficulties[item.question_id] = float(item.delta)
+            self._add_item_bank_anchors()
+            
+            table = rasch_score_table.get_score_table(self.analysis)
+            self.score_table = table if rasch_score_table.covers(table, self.anchor_difficulties) else None
             
             logger.info(f"Loaded {len(self.anchor_difficulties)} anchor values from analysis {self.analysis_id}")
             return True
@@ -95,6 +124,28 @@ class RaschAnchorService:
             logger.error(f"Error loading anchor values: {e}", exc_info=True)
             return False
     
+    def _add_item_bank_anchors(self):
+        """
+        Soal quiz yang belum dikalibrasi di analisis ini (ditambahkan
+        setelahnya, mis. salinan dari quiz lain) memakai difficulty item bank,
+        digeser ke skala analisis lewat item yang sama.
+        """
+        if not self.analysis.quiz_id:
+            return
+        question_ids = [
+            qid for (qid,) in db.session.query(Question.id).filter(Question.quiz_id == self.analysis.quiz_id)
+        ]
+        if all(qid in self.anchor_difficulties for qid in question_ids):
+            return
+
+        aligned = rasch_item_bank.align_to_scale(
+            rasch_item_bank.lookup_difficulties(question_ids), self.anchor_difficulties
+        )
+        added = {qid: delta for qid, delta in aligned.items() if qid not in self.anchor_difficulties}
+        self.anchor_difficulties.update(added)
+        if added:
+            logger.info(f"Added {len(added)} anchor values from item bank for analysis {self.analysis_id}")
+
     def load_student_responses(self, submission_id: int) -> bool:
         """
         Load responses untuk siswa baru dari submission.
@@ -114,16 +165,14 @@ class RaschAnchorService:
             
             self.student_id = submission.user_id
             
-            # Get all answers for this submission
-            answers = Answer.query.filter_by(submission_id=submission_id).all()
-            
-            for answer in answers:
-                question_id = answer.question_id
-                # Check if this question has anchor value
-                if question_id in self.anchor_difficulties:
-                    # Determine if correct (1) or incorrect (0)
-                    is_correct = self._is_answer_correct(answer)
-                    self.responses[question_id] = 1 if is_correct else 0
+            # Load answers for anchored questions in one joined query
+            data = load_quiz_responses(
+                submission.quiz_id,
+                submission_ids=[submission_id],
+                question_ids=list(self.anchor_difficulties),
+            )
+            question_ids = data.item_ids[data.item_index].tolist()
+            self.responses = dict(zip(question_ids, data.scores.tolist()))
             
             if not self.responses:
                 logger.warning(f"No matching responses found for submission {submission_id}")
@@ -136,22 +185,6 @@ class RaschAnchorService:
             logger.error(f"Error loading student responses: {e}", exc_info=True)
             return False
     
-    def _is_answer_correct(self, answer: Answer) -> bool:
-        """Check apakah jawaban benar"""
-        question = answer.question
-        
-        if question.question_type in ['multiple_choice', 'true_false', 'dropdown']:
-            if answer.selected_option_id:
-                from app.models.quiz import Option
-                option = Option.query.get(answer.selected_option_id)
-                return option.is_correct if option else False
-        elif question.question_type == 'checkbox':
-            return answer.manual_score > 0 if answer.manual_score else False
-        elif question.question_type in ['long_text', 'upload']:
-            return answer.manual_score > 0 if answer.manual_score else False
-        
-        return False
-    
     def calculate_ability(self) -> Optional[float]:
         """
         Calculate ability untuk siswa baru menggunakan anchor values.
@@ -169,6 +202,12 @@ class RaschAnchorService:
         raw_score = sum(self.responses.values())
         total_items = len(self.responses)
         
+        # Complete pattern: theta hanya bergantung pada raw score
+        if self.score_table and total_items == len(self.score_table['item_ids']):
+            measure = rasch_score_table.lookup(self.score_table, raw_score)
+            if measure is not None:
+                return measure[0]
+        
         # Handle extreme scores
         if raw_score == 0:
             # Score 0: extrapolate low
@@ -230,7 +269,7 @@ class RaschAnchorService:
             return 4.0
         
         # Calculate mean and SD
-        thetas = [m.theta for m in existing_measures]
+        thetas = [float(m.theta) for m in existing_measures]
         mean_theta = sum(thetas) / len(thetas)
         
         if len(thetas) > 1:
@@ -260,7 +299,7 @@ class RaschAnchorService:
             return -4.0
         
         # Calculate mean and SD
-        thetas = [m.theta for m in existing_measures]
+        thetas = [float(m.theta) for m in existing_measures]
         mean_theta = sum(thetas) / len(thetas)
         
         if len(thetas) > 1:
@@ -435,7 +474,7 @@ class RaschAnchorService:
                 rasch_analysis_id=self.analysis_id
             ).filter(RaschPersonMeasure.theta.isnot(None)).all()
             
-            theta_values = [m.theta for m in all_thetas]
+            theta_values = [float(m.theta) for m in all_thetas]
             percentile = sum(1 for t in theta_values if t < theta) / len(theta_values) * 100 if theta_values else 50
             
             # Update fields
@@ -475,56 +514,168 @@ class RaschAnchorService:
         Returns:
             dict: Result dengan ability dan fit statistics, atau None jika gagal
         """
+        results = self.score_submissions([submission_id])
+        return results[0] if results else None
+
+    # ------------------------------------------------------------------
+    # Bulk path
+    # ------------------------------------------------------------------
+
+    def estimate_abilities(
+        self,
+        matrix: 'rasch_sparse.SparseResponseMatrix',
+        deltas: np.ndarray,
+        reference_thetas: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Ability semua person sekaligus dengan item difficulties tetap.
+
+        Complete pattern diambil dari score table. Extreme scores lainnya
+        (0 atau benar semua pada item yang dijawab) diberi mean ± 2·SD dari
+        reference_thetas, sama seperti path per-siswa.
+        """
+        raw_scores = matrix.raw_scores
+        counts = matrix.person_counts
+        extreme_low = raw_scores == 0
+        extreme_high = (raw_scores >= counts) & (counts > 0)
+        from_table = np.zeros(matrix.num_persons, dtype=bool)
+        if self.score_table:
+            from_table = (counts == len(self.score_table['item_ids'])) & (raw_scores == np.round(raw_scores))
+        non_extreme = ~(extreme_low | extreme_high | from_table)
+
+        thetas = np.zeros(matrix.num_persons)
+        p = raw_scores[non_extreme] / counts[non_extreme]
+        thetas[non_extreme] = np.log(p / (1 - p))
+
+        for _ in range(ANCHOR_NEWTON_ROUNDS):
+            updated = rasch_sparse.update_person_abilities(matrix, thetas, deltas, non_extreme)
+            change = float(np.abs(updated - thetas).max(initial=0.0))
+            thetas = updated
+            if change < ANCHOR_CONVERGENCE:
+                break
+
+        low, high = (
+            rasch_engine.extreme_ability_bounds(reference_thetas) if reference_thetas.size
+            else rasch_score_table.DEFAULT_EXTREME_BOUNDS
+        )
+        thetas[extreme_high] = high
+        thetas[extreme_low] = low
+        if from_table.any():
+            table_thetas = np.asarray(self.score_table['theta'], dtype=np.float64)
+            thetas[from_table] = table_thetas[raw_scores[from_table].astype(int)]
+        return thetas
+
+    def score_submissions(self, submission_ids: Iterable[int]) -> List[dict]:
+        """
+        Hitung dan simpan ability untuk banyak submission sekaligus.
+
+        Measures lama milik siswa yang sama diganti (delete-and-insert dalam
+        satu transaksi). Submission tanpa jawaban pada item anchor dilewati.
+
+        Args:
+            submission_ids: ID quiz submissions (satu quiz)
+
+        Returns:
+            List[dict]: Result per siswa yang berhasil di-score
+        """
+        submission_ids = list(submission_ids)
+        if not submission_ids:
+            return []
+
         try:
-            # Step 1: Load anchor values
-            if not self.load_anchor_values():
-                return None
-            
-            # Step 2: Load student responses
-            if not self.load_student_responses(submission_id):
-                return None
-            
-            # Step 3: Calculate ability
-            theta = self.calculate_ability()
-            
-            if theta is None:
-                logger.error("Failed to calculate ability")
-                return None
-            
-            # Step 4: Calculate fit statistics
-            fit_stats = self.calculate_fit_statistics(theta)
-            
-            # Step 5: Save to database
-            submission = QuizSubmission.query.get(submission_id)
-            person = self.save_person_measure(theta, fit_stats, submission_id)
-            
-            if person is None:
-                return None
-            
-            # Update analysis num_persons
-            if self.analysis:
-                self.analysis.num_persons = RaschPersonMeasure.query.filter_by(
-                    rasch_analysis_id=self.analysis_id
-                ).count()
-                db.session.commit()
-            
-            logger.info(f"Successfully calculated ability for student {self.student_id}: theta={theta:.3f}")
-            
-            return {
-                'success': True,
-                'student_id': self.student_id,
-                'submission_id': submission_id,
-                'theta': theta,
-                'theta_se': fit_stats['theta_se'],
-                'ability_level': fit_stats['ability_level'],
-                'fit_status': fit_stats['fit_status'],
-                'raw_score': sum(self.responses.values()),
-                'total_items': len(self.responses),
-            }
-            
+            if not self.anchor_difficulties and not self.load_anchor_values():
+                return []
+
+            quiz_id = self.analysis.quiz_id or db.session.query(QuizSubmission.quiz_id).filter(
+                QuizSubmission.id == submission_ids[0]
+            ).scalar()
+            data = load_quiz_responses(
+                quiz_id,
+                submission_ids=submission_ids,
+                question_ids=list(self.anchor_difficulties),
+            )
+            if not data.num_responses:
+                logger.warning(f"No anchored responses found for {len(submission_ids)} submissions")
+                return []
+
+            matrix = data.to_sparse()
+            deltas = np.array([self.anchor_difficulties[qid] for qid in matrix.item_ids], dtype=np.float64)
+            student_ids = list(matrix.person_ids)
+
+            # Theta siswa lain di analisis ini: referensi extreme scores dan percentile
+            reference_thetas = np.array([
+                float(theta) for (theta,) in db.session.query(RaschPersonMeasure.theta).filter(
+                    RaschPersonMeasure.rasch_analysis_id == self.analysis_id,
+                    RaschPersonMeasure.theta.isnot(None),
+                    RaschPersonMeasure.student_id.notin_(student_ids),
+                )
+            ], dtype=np.float64)
+
+            thetas = self.estimate_abilities(matrix, deltas, reference_thetas)
+            fit = rasch_sparse.calculate_fit_statistics(matrix, thetas, deltas)
+
+            all_thetas = np.concatenate([reference_thetas, thetas])
+            percentiles = rasch_engine.percentiles_below(all_thetas)[reference_thetas.size:]
+            mean_theta = float(all_thetas.mean())
+
+            rows = []
+            results = []
+            for index, student_id in enumerate(student_ids):
+                theta = float(thetas[index])
+                raw_score = int(fit.person_raw_scores[index])
+                total_items = int(fit.person_counts[index])
+                outfit_mnsq = float(fit.person_outfit_mnsq[index])
+                ability_level = self._interpret_ability_level(theta)
+                fit_status = self._interpret_fit_status(outfit_mnsq)
+                rows.append({
+                    'rasch_analysis_id': self.analysis_id,
+                    'student_id': student_id,
+                    'quiz_submission_id': data.submission_ids.get(student_id),
+                    'raw_score': raw_score,
+                    'total_possible': total_items,
+                    'percentage': (raw_score / total_items * 100) if total_items > 0 else 0,
+                    'theta': theta,
+                    'theta_se': float(fit.theta_se[index]),
+                    'theta_centered': theta - mean_theta,
+                    'outfit_mnsq': outfit_mnsq,
+                    'outfit_zstd': float(fit.person_outfit_zstd[index]),
+                    'infit_mnsq': float(fit.person_infit_mnsq[index]),
+                    'infit_zstd': float(fit.person_infit_zstd[index]),
+                    'fit_status': fit_status,
+                    'fit_category': self._interpret_fit_category(outfit_mnsq),
+                    'ability_level': ability_level,
+                    'ability_percentile': float(percentiles[index]),
+                })
+                results.append({
+                    'success': True,
+                    'student_id': student_id,
+                    'submission_id': data.submission_ids.get(student_id),
+                    'theta': theta,
+                    'theta_se': float(fit.theta_se[index]),
+                    'ability_level': ability_level,
+                    'fit_status': fit_status,
+                    'raw_score': raw_score,
+                    'total_items': total_items,
+                })
+
+            db.session.execute(
+                delete(RaschPersonMeasure).where(
+                    RaschPersonMeasure.rasch_analysis_id == self.analysis_id,
+                    RaschPersonMeasure.student_id.in_(student_ids),
+                ),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.execute(insert(RaschPersonMeasure), rows)
+            self.analysis.num_persons = reference_thetas.size + len(rows)
+            db.session.commit()
+
+            logger.info(f"Scored {len(rows)} late submissions for analysis {self.analysis_id} with anchor values")
+            return results
+
         except Exception as e:
-            logger.error(f"Error in calculate_ability_for_submission: {e}", exc_info=True)
-            return None
+            logger.error(f"Error scoring late submissions: {e}", exc_info=True)
+            db.session.rollback()
+            return []
 
 
 def process_late_submissions(quiz_id: int) -> dict:
@@ -559,39 +710,25 @@ def process_late_submissions(quiz_id: int) -> dict:
             logger.warning(f"Analysis {analysis_id} is not completed")
             return {'success': False, 'message': 'Analysis not completed'}
         
-        # Get all submissions
-        all_submissions = QuizSubmission.query.filter_by(quiz_id=quiz_id).all()
-        
-        # Get submissions that already have person measures
-        existing_student_ids = db.session.query(RaschPersonMeasure.student_id).filter_by(
-            rasch_analysis_id=analysis_id
-        ).distinct().all()
-        existing_student_ids = set([s[0] for s in existing_student_ids])
-        
-        # Find late submissions
-        late_submissions = [
-            s for s in all_submissions 
-            if s.user_id not in existing_student_ids
-        ]
+        # Late submissions: attempt terakhir siswa tanpa person measure di analisis ini (satu query)
+        measured = db.session.query(RaschPersonMeasure.student_id).filter(
+            RaschPersonMeasure.rasch_analysis_id == analysis_id
+        )
+        late_submissions = db.session.query(func.max(QuizSubmission.id), QuizSubmission.user_id).filter(
+            QuizSubmission.quiz_id == quiz_id,
+            QuizSubmission.user_id.notin_(measured),
+        ).group_by(QuizSubmission.user_id).all()
         
         if not late_submissions:
             logger.info(f"No late submissions found for quiz {quiz_id}")
             return {'success': True, 'processed': 0, 'message': 'No late submissions'}
         
-        # Process each late submission
+        # Score semua late submission sekaligus terhadap anchor values
+        late_students = {user_id for _, user_id in late_submissions}
         service = RaschAnchorService(analysis_id)
-        processed = 0
-        failed = 0
-        
-        for submission in late_submissions:
-            result = service.calculate_ability_for_submission(submission.id)
-            
-            if result and result.get('success'):
-                processed += 1
-                logger.info(f"Processed late submission {submission.id} for student {submission.user_id}")
-            else:
-                failed += 1
-                logger.warning(f"Failed to process late submission {submission.id}")
+        results = service.score_submissions([submission_id for submission_id, _ in late_submissions])
+        processed = len(results)
+        failed = len(late_students) - processed
         
         logger.info(f"Processed {processed} late submissions, {failed} failed")
         
@@ -599,7 +736,8 @@ def process_late_submissions(quiz_id: int) -> dict:
             'success': True,
             'processed': processed,
             'failed': failed,
-            'total_late': len(late_submissions),
+            'total_late': len(late_students),
+            'results': results,
         }
         
     except Exception as e:
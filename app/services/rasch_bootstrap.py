@@ -0,0 +1,255 @@
+"""
+Rasch Bootstrap Confidence Intervals
+
+SE model-based (delta_se / theta_se) kurang bisa dipercaya untuk kelas kecil
+di sekitar min_persons. Stage bootstrap opsional ini me-resample persons
+(dengan pengembalian) sebanyak N kali, mengkalibrasi ulang setiap replicate
+dengan JMLE vectorized (SQUAREM, warm start dari estimasi penuh), dan
+menyimpan percentile interval per item dan per person.
+
+    - Item: delta replicate digeser supaya mean delta sama dengan kalibrasi
+      penuh (lokasi JMLE tidak teridentifikasi)
+    - Person: theta setiap siswa asli dihitung ulang terhadap delta
+      replicate, jadi interval person mencerminkan ketidakpastian kalibrasi
+      item (measurement error per siswa tetap di theta_se)
+    - Replicate dijalankan di process pool (RASCH_BOOTSTRAP_WORKERS) jika
+      estimasi sisa pekerjaan >= POOL_MIN_SECONDS; di proses yang tidak boleh
+      punya child (Celery prefork) otomatis dijalankan in-process
+    - RASCH_BOOTSTRAP_TIME_BUDGET membatasi wall time; interval dihitung dari
+      replicate yang selesai sebelum deadline, supaya tetap di bawah
+      task_soft_time_limit worker
+
+Hanya untuk analisis dichotomous dengan response matrix dense.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app, has_app_context
+
+from app.services import rasch_engine
+from app.services.rasch_engine import InitialMeasures, ResponseMatrix
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_TIME_BUDGET = 600.0  # detik
+MIN_REPLICATES = 20  # di bawah ini percentile interval tidak bermakna
+CHUNK_SIZE = 10  # replicate per task pool
+# Start process pool (spawn + import app) baru sepadan jika sisa pekerjaan lebih lama dari ini
+POOL_MIN_SECONDS = 10.0
+
+
+@dataclass
+class BootstrapIntervals:
+    """Percentile interval sejajar dengan matrix.item_ids / matrix.person_ids"""
+    replicates: int
+    confidence: float
+    delta_low: np.ndarray
+    delta_high: np.ndarray
+    theta_low: np.ndarray
+    theta_high: np.ndarray
+
+
+@dataclass
+class BootstrapSettings:
+    replicates: int
+    confidence: float
+    time_budget: float
+    workers: int
+
+    @classmethod
+    def from_config(cls) -> 'BootstrapSettings':
+        """RASCH_BOOTSTRAP_*; replicates 0 = bootstrap nonaktif"""
+        config = current_app.config if has_app_context() else {}
+        workers = int(config.get('RASCH_BOOTSTRAP_WORKERS', 0))
+        return cls(
+            replicates=int(config.get('RASCH_BOOTSTRAP_REPLICATES', 0)),
+            confidence=float(config.get('RASCH_BOOTSTRAP_CONFIDENCE', DEFAULT_CONFIDENCE)),
+            time_budget=float(config.get('RASCH_BOOTSTRAP_TIME_BUDGET', DEFAULT_TIME_BUDGET)),
+            # 0 = satu worker per CPU core
+            workers=workers or (os.cpu_count() or 1),
+        )
+
+
+def run_replicate(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    seed,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Satu replicate: resample persons, kalibrasi ulang, lalu theta semua
+    person asli terhadap delta replicate.
+
+    Returns:
+        (deltas, thetas) replicate, sejajar dengan matrix
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, matrix.num_persons, matrix.num_persons)
+    sample = ResponseMatrix(
+        matrix.responses[rows], matrix.observed[rows],
+        [matrix.person_ids[i] for i in rows], matrix.item_ids,
+    )
+
+    sample_initial = rasch_engine.initialize_measures(sample)
+    # Warm start: replicate dekat dengan kalibrasi penuh
+    sample_initial.thetas[sample_initial.non_extreme] = thetas[rows][sample_initial.non_extreme]
+    sample_initial.deltas = deltas.copy()
+    result = rasch_engine.run_jmle(
+        sample, sample_initial,
+        convergence_threshold=convergence_threshold,
+        max_iterations=max_iterations,
+        acceleration=rasch_engine.ACCELERATION_SQUAREM,
+    )
+    replicate_deltas = result.deltas - result.deltas.mean() + deltas.mean()
+
+    non_extreme = initial.non_extreme
+    replicate_thetas = rasch_engine.update_person_abilities(matrix, thetas, replicate_deltas, non_extreme)
+    replicate_thetas = rasch_engine.extrapolate_extreme_abilities(
+        replicate_thetas, non_extreme, initial.extreme_high, initial.extreme_low
+    )
+    return replicate_deltas, replicate_thetas
+
+
+# ------------------------------------------------------------------
+# Process pool
+# ------------------------------------------------------------------
+
+_child_state: Optional[tuple] = None
+
+
+def _init_child(state: tuple):
+    """Matrix dan estimasi penuh dikirim sekali per child, bukan per task"""
+    global _child_state
+    _child_state = state
+
+
+def _run_chunk(seeds: list, deadline: float) -> List[Tuple[np.ndarray, np.ndarray]]:
+    return _run_seeds(_child_state, seeds, deadline)
+
+
+def _run_seeds(
+    state: tuple,
+    seeds: list,
+    deadline: float,
+    on_progress: Optional[Callable[[], None]] = None,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    matrix, initial, thetas, deltas, convergence_threshold, max_iterations = state
+    results = []
+    for seed in seeds:
+        if time.time() >= deadline:
+            break
+        results.append(run_replicate(
+            matrix, initial, thetas, deltas, seed, convergence_threshold, max_iterations
+        ))
+        if on_progress is not None:
+            on_progress()
+    return results
+
+
+def _run_in_pool(
+    state: tuple,
+    chunks: List[list],
+    deadline: float,
+    workers: int,
+    on_progress: Optional[Callable[[], None]] = None,
+) -> list:
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_child,
+        initargs=(state,),
+    ) as pool:
+        for chunk_results in pool.map(_run_chunk, chunks, [deadline] * len(chunks)):
+            results.extend(chunk_results)
+            if on_progress is not None:
+                on_progress()
+    return results
+
+
+def bootstrap_intervals(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    replicates: int,
+    confidence: float = DEFAULT_CONFIDENCE,
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_progress: Optional[Callable[[], None]] = None,
+) -> Optional[BootstrapIntervals]:
+    """
+    Percentile bootstrap interval untuk deltas dan thetas.
+
+    Args:
+        matrix: Response matrix kalibrasi penuh
+        initial: Klasifikasi extreme persons kalibrasi penuh
+        thetas, deltas: Estimasi kalibrasi penuh (thetas termasuk ekstrapolasi)
+        replicates: Jumlah resample
+        confidence: Coverage interval (mis. 0.95 -> percentile 2.5 dan 97.5)
+        time_budget: Batas wall time dalam detik (None = tanpa batas)
+        workers: Jumlah process; <= 1 menjalankan replicate in-process
+        seed: Seed untuk hasil yang reproducible
+        on_progress: Dipanggil di proses ini setelah setiap replicate (atau
+            chunk dari pool), mis. untuk heartbeat analisis
+
+    Returns:
+        None jika replicate yang selesai kurang dari MIN_REPLICATES
+    """
+    deadline = time.time() + time_budget if time_budget else float('inf')
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    state = (matrix, initial, thetas, deltas, convergence_threshold, max_iterations)
+
+    # Replicate pertama in-process sekaligus mengukur biaya per replicate
+    started = time.perf_counter()
+    results = _run_seeds(state, seeds[:1], deadline, on_progress)
+    remaining = seeds[len(results):]
+    estimated = (time.perf_counter() - started) * len(remaining)
+
+    pooled = []
+    if workers > 1 and len(remaining) > CHUNK_SIZE and estimated >= POOL_MIN_SECONDS:
+        chunks = [remaining[i:i + CHUNK_SIZE] for i in range(0, len(remaining), CHUNK_SIZE)]
+        try:
+            pooled = _run_in_pool(state, chunks, deadline, workers, on_progress)
+        except Exception as e:
+            # Mis. proses daemon (Celery prefork) tidak boleh membuat child process
+            logger.warning(f"Bootstrap pool unavailable, running in-process: {e}")
+    if pooled:
+        results.extend(pooled)
+    elif remaining:
+        results.extend(_run_seeds(state, remaining, deadline, on_progress))
+
+    if len(results) < MIN_REPLICATES:
+        logger.warning(
+            f"Bootstrap finished only {len(results)}/{replicates} replicates "
+            f"within {time_budget}s; intervals skipped"
+        )
+        return None
+
+    replicate_deltas = np.stack([d for d, _ in results])
+    replicate_thetas = np.stack([t for _, t in results])
+    tail = (1 - confidence) / 2 * 100
+    delta_low, delta_high = np.percentile(replicate_deltas, [tail, 100 - tail], axis=0)
+    theta_low, theta_high = np.percentile(replicate_thetas, [tail, 100 - tail], axis=0)
+    return BootstrapIntervals(
+        replicates=len(results),
+        confidence=confidence,
+        delta_low=delta_low,
+        delta_high=delta_high,
+        theta_low=theta_low,
+        theta_high=theta_high,
+    )
@@ -0,0 +1,184 @@
+"""
+Rasch Estimation Checkpoints
+
+Analisis besar (mis. COMBINED satu course) bisa berjalan lama; jika worker
+di-recycle (worker_max_tasks_per_child), kena time limit, atau mati, semua
+iterasi JMLE hilang. Checkpoint menyimpan state estimasi (thetas, deltas,
+iterasi) ke local storage secara periodik, dan run berikutnya untuk analysis
+yang sama melanjutkan dari checkpoint terakhir.
+
+    - File: <RASCH_CHECKPOINT_DIR>/analysis_<id>.npz, ditulis atomik
+      (tulis ke file sementara lalu os.replace)
+    - Interval: paling sering sekali per RASCH_CHECKPOINT_INTERVAL detik
+      (0 = checkpoint nonaktif)
+    - Checkpoint hanya dipakai jika fingerprint input masih sama
+      (lihat ResponseData.fingerprint); data yang berubah mulai dari awal
+    - Checkpoint dihapus setelah hasil tersimpan
+
+Checkpoint hanya untuk JMLE (dense dan sparse). Selama iterasi, semua
+estimator juga memperbarui RaschAnalysis.heartbeat_at dengan interval yang
+sama; janitor (RaschScheduledBatchService.requeue_stuck_analyses) memakainya
+untuk mendeteksi analisis yang macet di PROCESSING.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60.0  # detik
+
+
+@dataclass
+class Checkpoint:
+    """State estimasi JMLE setelah `iteration` iterasi"""
+    iteration: int
+    thetas: np.ndarray
+    deltas: np.ndarray
+    fingerprint: str
+
+
+def checkpoint_dir() -> str:
+    """Direktori checkpoint (default: <instance_path>/rasch_checkpoints)"""
+    if has_app_context():
+        configured = current_app.config.get('RASCH_CHECKPOINT_DIR')
+        if configured:
+            return configured
+        return os.path.join(current_app.instance_path, 'rasch_checkpoints')
+    return os.path.join(tempfile.gettempdir(), 'rasch_checkpoints')
+
+
+def checkpoint_interval() -> float:
+    if has_app_context():
+        return float(current_app.config.get('RASCH_CHECKPOINT_INTERVAL', DEFAULT_INTERVAL))
+    return DEFAULT_INTERVAL
+
+
+class CheckpointStore:
+    """Checkpoint per analysis sebagai file .npz"""
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or checkpoint_dir()
+
+    def path(self, analysis_id: int) -> str:
+        return os.path.join(self.directory, f"analysis_{analysis_id}.npz")
+
+    def save(self, analysis_id: int, checkpoint: Checkpoint):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    iteration=np.int64(checkpoint.iteration),
+                    thetas=checkpoint.thetas,
+                    deltas=checkpoint.deltas,
+                    fingerprint=np.array(checkpoint.fingerprint),
+                )
+            os.replace(tmp_path, self.path(analysis_id))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, analysis_id: int) -> Optional[Checkpoint]:
+        path = self.path(analysis_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return Checkpoint(
+                    iteration=int(data['iteration']),
+                    thetas=data['thetas'].copy(),
+                    deltas=data['deltas'].copy(),
+                    fingerprint=str(data['fingerprint']),
+                )
+        except Exception as e:
+            # File rusak (mis. disk penuh saat menulis): mulai dari awal
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def clear(self, analysis_id: int):
+        try:
+            os.remove(self.path(analysis_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove checkpoint for analysis {analysis_id}: {e}")
+
+
+class CheckpointWriter:
+    """
+    Rate-limited checkpoint untuk satu run analisis.
+
+    Usage:
+        writer = CheckpointWriter(analysis_id, fingerprint)
+        checkpoint = writer.resume(num_persons, num_items)
+        run_jmle(..., on_checkpoint=writer.write)
+        writer.clear()
+    """
+
+    def __init__(
+        self,
+        analysis_id: int,
+        fingerprint: str,
+        store: Optional[CheckpointStore] = None,
+        interval: Optional[float] = None,
+    ):
+        self.analysis_id = analysis_id
+        self.fingerprint = fingerprint
+        self.store = store if store is not None else CheckpointStore()
+        self.interval = checkpoint_interval() if interval is None else interval
+        self._last_written = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def resume(self, num_persons: int, num_items: int) -> Optional[Checkpoint]:
+        """Checkpoint yang cocok dengan input saat ini, atau None"""
+        if not self.enabled:
+            return None
+        checkpoint = self.store.load(self.analysis_id)
+        if checkpoint is None:
+            return None
+        if (
+            checkpoint.fingerprint != self.fingerprint
+            or checkpoint.thetas.shape != (num_persons,)
+            or checkpoint.deltas.shape != (num_items,)
+        ):
+            logger.info(f"Checkpoint for analysis {self.analysis_id} is stale; starting over")
+            self.store.clear(self.analysis_id)
+            return None
+        return checkpoint
+
+    def write(self, iteration: int, thetas: np.ndarray, deltas: np.ndarray) -> bool:
+        """
+        Simpan checkpoint jika interval sudah lewat.
+
+        Returns:
+            bool: True jika checkpoint ditulis
+        """
+        now = time.monotonic()
+        if not self.enabled or now - self._last_written < self.interval:
+            return False
+        try:
+            self.store.save(self.analysis_id, Checkpoint(iteration, thetas, deltas, self.fingerprint))
+        except Exception as e:
+            # Checkpoint bersifat best effort; jangan gagalkan analisis
+            logger.warning(f"Failed to write checkpoint for analysis {self.analysis_id}: {e}")
+            return False
+
+        self._last_written = now
+        logger.debug(f"Checkpoint analysis {self.analysis_id} at iteration {iteration}")
+        return True
+
+    def clear(self):
+        self.store.clear(self.analysis_id)
@@ -0,0 +1,415 @@
+"""
+Rasch Response Data Loader
+
+Loader bersama untuk membangun persons × items correctness matrix dari
+quiz_submissions/answers/options dalam satu joined query (streamed via
+yield_per), menggantikan pola satu query per submission dan satu
+Option.query.get per jawaban.
+
+Output berupa compact integer-indexed arrays (format COO) plus mapping
+id ↔ index, yang bisa diubah ke dense ResponseMatrix untuk rasch_engine,
+ke SparseResponseMatrix untuk rasch_sparse (combined analysis), atau ke
+dict (student_id, question_id) untuk reference implementation.
+
+Checkbox dinilai dari option ids di Answer.answer_text (disimpan saat
+submit) terhadap kunci jawaban. Dengan partial_credit=True, checkbox dengan
+points > 1 mendapat kredit parsial (benar dipilih - salah dipilih), dan soal
+manual (long_text, upload) dengan points > 1 memakai manual_score; keduanya
+diberi skor kategori 0..m untuk Partial Credit Model (rasch_pcm). Soal lain
+tetap dichotomous.
+
+ResponseData.fingerprint() meng-hash input yang sudah dimuat sehingga re-run
+dengan data identik bisa dilewati.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func
+
+from app import db
+from app.models.quiz import QuizSubmission, Answer, Question, Option
+from app.services.rasch_engine import ResponseMatrix
+from app.services.rasch_sparse import SparseResponseMatrix
+
+logger = logging.getLogger(__name__)
+
+# Tipe soal yang dinilai dari option yang dipilih
+OPTION_SCORED_TYPES = {'multiple_choice', 'true_false', 'dropdown'}
+# Tipe soal yang dinilai dari option ids terpilih (answer_text "3,5")
+CHECKBOX_TYPE = 'checkbox'
+# Tipe soal yang dinilai manual oleh guru
+MANUALLY_SCORED_TYPES = {'long_text', 'upload'}
+# Tipe soal yang bisa polytomous jika points > 1
+PARTIAL_CREDIT_TYPES = MANUALLY_SCORED_TYPES | {CHECKBOX_TYPE}
+
+DEFAULT_BATCH_SIZE = 2000
+
+
+def score_answer(question_type, option_is_correct: Optional[bool], manual_score: Optional[int]) -> int:
+    """
+    Dichotomous score (1/0) untuk satu jawaban.
+
+    question_type boleh berupa QuestionType enum atau string value-nya.
+    """
+    question_type = getattr(question_type, 'value', question_type)
+
+    if question_type in OPTION_SCORED_TYPES:
+        return 1 if option_is_correct else 0
+    if question_type in MANUALLY_SCORED_TYPES:
+        return 1 if manual_score and manual_score > 0 else 0
+    return 0
+
+
+def selected_option_ids(answer_text: Optional[str]) -> Set[int]:
+    """Option ids checkbox dari answer_text ("3,5"); nilai tidak valid diabaikan"""
+    selected = set()
+    for part in (answer_text or '').split(','):
+        part = part.strip()
+        if part.isdigit():
+            selected.add(int(part))
+    return selected
+
+
+def score_checkbox(answer_text: Optional[str], correct_ids: Set[int]) -> int:
+    """Dichotomous: 1 jika pilihan persis sama dengan kunci (sama dengan skor submit)"""
+    return 1 if correct_ids and selected_option_ids(answer_text) == correct_ids else 0
+
+
+def checkbox_partial_score(answer_text: Optional[str], correct_ids: Set[int], points: Optional[int]) -> int:
+    """
+    Kredit parsial checkbox: (benar dipilih - salah dipilih), di-clip ke 0 dan
+    diskalakan ke 0..points terhadap jumlah opsi benar.
+    """
+    if not correct_ids:
+        return 0
+    selected = selected_option_ids(answer_text)
+    net = len(selected & correct_ids) - len(selected - correct_ids)
+    points = points or 1
+    return int(round(points * max(net, 0) / len(correct_ids)))
+
+
+def partial_credit_score(manual_score: Optional[int], points: Optional[int]) -> int:
+    """Skor manual di-clip ke 0..points untuk soal polytomous"""
+    if not manual_score or manual_score < 0:
+        return 0
+    return int(min(manual_score, points or 1))
+
+
+def collapse_categories(
+    item_index: np.ndarray,
+    scores: np.ndarray,
+    num_items: int,
+    polytomous_items: Iterable[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Petakan skor teramati per item polytomous ke kategori berurutan 0..m.
+
+    Skor antara yang tidak pernah diberikan guru (mis. hanya 0, 5, 10 dari
+    10 poin) tidak bisa diestimasi thresholds-nya, jadi skor distinct per
+    item di-rank menjadi kategori berurutan.
+
+    Returns:
+        (kategori per observasi, max kategori per item)
+    """
+    categories = scores.copy()
+    max_scores = np.ones(num_items, dtype=np.int64)
+    for j in polytomous_items:
+        in_item = item_index == j
+        if not in_item.any():
+            continue
+        distinct, ranks = np.unique(scores[in_item], return_inverse=True)
+        categories[in_item] = ranks
+        max_scores[j] = max(len(distinct) - 1, 1)
+    return categories, max_scores
+
+
+@dataclass
+class ResponseData:
+    """
+    Compact response data dalam format COO.
+
+    Attributes:
+        person_ids: student_id per baris (int64)
+        item_ids: question_id per kolom (int64)
+        person_index: index baris untuk setiap observasi (int32)
+        item_index: index kolom untuk setiap observasi (int32)
+        scores: skor untuk setiap observasi (int8)
+        submission_ids: student_id -> quiz_submission_id yang dipakai
+        max_scores: kategori tertinggi per item (int64); None = dichotomous
+    """
+    person_ids: np.ndarray
+    item_ids: np.ndarray
+    person_index: np.ndarray
+    item_index: np.ndarray
+    scores: np.ndarray
+    submission_ids: Dict[int, int] = field(default_factory=dict)
+    max_scores: Optional[np.ndarray] = None
+
+    @property
+    def num_persons(self) -> int:
+        return len(self.person_ids)
+
+    @property
+    def num_items(self) -> int:
+        return len(self.item_ids)
+
+    @property
+    def num_responses(self) -> int:
+        return len(self.scores)
+
+    @property
+    def is_polytomous(self) -> bool:
+        return self.max_scores is not None and bool((self.max_scores > 1).any())
+
+    @property
+    def person_lookup(self) -> Dict[int, int]:
+        """student_id -> row index"""
+        return {int(pid): i for i, pid in enumerate(self.person_ids)}
+
+    @property
+    def item_lookup(self) -> Dict[int, int]:
+        """question_id -> column index"""
+        return {int(qid): j for j, qid in enumerate(self.item_ids)}
+
+    def to_matrix(self) -> ResponseMatrix:
+        """Dense persons × items matrix untuk rasch_engine"""
+        shape = (self.num_persons, self.num_items)
+        responses = np.zeros(shape, dtype=np.float64)
+        observed = np.zeros(shape, dtype=bool)
+        responses[self.person_index, self.item_index] = self.scores
+        observed[self.person_index, self.item_index] = True
+        return ResponseMatrix(
+            responses,
+            observed,
+            [int(pid) for pid in self.person_ids],
+            [int(qid) for qid in self.item_ids],
+        )
+
+    def to_sparse(self) -> SparseResponseMatrix:
+        """COO matrix untuk rasch_sparse (tanpa alokasi persons × items)"""
+        return SparseResponseMatrix(
+            self.person_index.astype(np.int64),
+            self.item_index.astype(np.int64),
+            self.scores.astype(np.float64),
+            [int(pid) for pid in self.person_ids],
+            [int(qid) for qid in self.item_ids],
+        )
+
+    def fingerprint(self, *salt) -> str:
+        """
+        SHA-256 atas item set, (student, question, score) terurut, submission
+        yang dipakai dan salt (mis. estimator). Fingerprint sama berarti
+        kalibrasi akan menghasilkan output yang sama.
+        """
+        persons = self.person_ids[self.person_index].astype(np.int64)
+        items = self.item_ids[self.item_index].astype(np.int64)
+        order = np.lexsort((items, persons))
+        item_order = np.argsort(self.item_ids)
+
+        digest = hashlib.sha256()
+        digest.update(self.item_ids[item_order].astype(np.int64).tobytes())
+        digest.update(persons[order].tobytes())
+        digest.update(items[order].tobytes())
+        digest.update(self.scores[order].astype(np.float64).tobytes())
+        if self.max_scores is not None:
+            digest.update(self.max_scores[item_order].astype(np.int64).tobytes())
+        digest.update(repr(sorted(self.submission_ids.items())).encode())
+        digest.update(repr(salt).encode())
+        return digest.hexdigest()
+
+    def to_dict(self) -> Dict[Tuple[int, int], int]:
+        """Dict (student_id, question_id) -> score untuk reference implementation"""
+        person_ids = self.person_ids[self.person_index].tolist()
+        item_ids = self.item_ids[self.item_index].tolist()
+        return dict(zip(zip(person_ids, item_ids), self.scores.tolist()))
+
+
+def combined_quiz_ids(course_id: int) -> List[int]:
+    """ID quiz Rasch-enabled di course (item set combined analysis)"""
+    from app.models.gradebook import GradeItem
+
+    return [
+        row[0] for row in db.session.query(GradeItem.quiz_id).filter(
+            GradeItem.course_id == course_id,
+            GradeItem.enable_rasch_analysis.is_(True),
+            GradeItem.quiz_id.isnot(None),
+        ).distinct()
+    ]
+
+
+def load_quiz_responses(
+    quiz_id: int,
+    submission_ids: Optional[Iterable[int]] = None,
+    question_ids: Optional[Iterable[int]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    partial_credit: bool = False,
+) -> ResponseData:
+    """
+    Load response data untuk quiz dalam satu joined query.
+
+    Untuk siswa dengan beberapa attempt, hanya submission terakhir yang dipakai
+    (juga jika submission_ids berisi beberapa attempt siswa yang sama).
+
+    Args:
+        quiz_id: ID quiz
+        submission_ids: Optional - batasi ke submission tertentu (late scoring)
+        question_ids: Optional - batasi ke soal tertentu (mis. anchor items)
+        batch_size: Ukuran batch untuk yield_per
+        partial_credit: Skor kategori untuk soal manual dengan points > 1
+
+    Returns:
+        ResponseData
+    """
+    return load_responses(
+        [quiz_id],
+        submission_ids=submission_ids,
+        question_ids=question_ids,
+        batch_size=batch_size,
+        partial_credit=partial_credit,
+    )
+
+
+def load_responses(
+    quiz_ids: Iterable[int],
+    submission_ids: Optional[Iterable[int]] = None,
+    question_ids: Optional[Iterable[int]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    partial_credit: bool = False,
+) -> ResponseData:
+    """
+    Load response data untuk satu atau beberapa quiz dalam satu joined query.
+
+    Untuk combined analysis, setiap siswa menjadi satu person dan soal dari
+    semua quiz menjadi item set gabungan. Per quiz, hanya submission terakhir
+    setiap siswa yang dipakai; submission_ids pada hasil berisi submission
+    terakhir yang dibaca per siswa.
+
+    Args:
+        quiz_ids: ID quiz
+        submission_ids: Optional - batasi ke submission tertentu (late scoring)
+        question_ids: Optional - batasi ke soal tertentu (mis. anchor items)
+        batch_size: Ukuran batch untuk yield_per
+        partial_credit: Skor kategori untuk soal manual dengan points > 1
+
+    Returns:
+        ResponseData
+    """
+    quiz_ids = list(quiz_ids)
+
+    # Item set: semua soal di quiz (termasuk yang belum dijawab)
+    item_query = db.session.query(Question.id, Question.question_type, Question.points).filter(
+        Question.quiz_id.in_(quiz_ids)
+    )
+    if question_ids is not None:
+        item_query = item_query.filter(Question.id.in_(list(question_ids)))
+    item_rows = item_query.order_by(Question.id).all()
+    item_ids = [row[0] for row in item_rows]
+    item_lookup = {qid: j for j, qid in enumerate(item_ids)}
+
+    # Soal polytomous: dinilai manual dengan points > 1
+    polytomous_items = set()
+    if partial_credit:
+        polytomous_items = {
+            j for j, (_, question_type, points) in enumerate(item_rows)
+            if getattr(question_type, 'value', question_type) in PARTIAL_CREDIT_TYPES
+            and (points or 0) > 1
+        }
+
+    # Kunci jawaban checkbox: question_id -> option ids yang benar
+    checkbox_items = [
+        qid for qid, question_type, _ in item_rows
+        if getattr(question_type, 'value', question_type) == CHECKBOX_TYPE
+    ]
+    correct_options: Dict[int, Set[int]] = {qid: set() for qid in checkbox_items}
+    if checkbox_items:
+        for question_id, option_id in db.session.query(Option.question_id, Option.id).filter(
+            Option.question_id.in_(checkbox_items), Option.is_correct.is_(True),
+        ):
+            correct_options[question_id].add(option_id)
+
+    # Submission set: submission terakhir per siswa per quiz (di antara yang
+    # diminta jika submission_ids diberikan); attempt lama tidak digabung
+    latest = db.session.query(func.max(QuizSubmission.id)).filter(QuizSubmission.quiz_id.in_(quiz_ids))
+    if submission_ids is not None:
+        latest = latest.filter(QuizSubmission.id.in_(list(submission_ids)))
+    submission_filter = QuizSubmission.id.in_(
+        latest.group_by(QuizSubmission.quiz_id, QuizSubmission.user_id)
+    )
+
+    rows = (
+        db.session.query(
+            QuizSubmission.id,
+            QuizSubmission.user_id,
+            Answer.question_id,
+            Question.question_type,
+            Option.is_correct,
+            Answer.manual_score,
+            Answer.answer_text,
+            Question.points,
+        )
+        .outerjoin(Answer, Answer.submission_id == QuizSubmission.id)
+        .outerjoin(Question, Question.id == Answer.question_id)
+        .outerjoin(Option, Option.id == Answer.selected_option_id)
+        .filter(QuizSubmission.quiz_id.in_(quiz_ids), submission_filter)
+        .order_by(QuizSubmission.id)
+        .yield_per(batch_size)
+    )
+
+    person_lookup: Dict[int, int] = {}
+    submission_map: Dict[int, int] = {}
+    person_index: List[int] = []
+    item_index: List[int] = []
+    scores: List[int] = []
+
+    for (
+        submission_id, student_id, question_id, question_type,
+        option_is_correct, manual_score, answer_text, points,
+    ) in rows:
+        i = person_lookup.setdefault(student_id, len(person_lookup))
+        submission_map[student_id] = submission_id
+
+        j = item_lookup.get(question_id)
+        if j is None:
+            # Submission tanpa jawaban, atau soal di luar item set
+            continue
+
+        person_index.append(i)
+        item_index.append(j)
+        if question_id in correct_options:
+            scores.append(
+                checkbox_partial_score(answer_text, correct_options[question_id], points)
+                if j in polytomous_items
+                else score_checkbox(answer_text, correct_options[question_id])
+            )
+        elif j in polytomous_items:
+            scores.append(partial_credit_score(manual_score, points))
+        else:
+            scores.append(score_answer(question_type, option_is_correct, manual_score))
+
+    item_index = np.array(item_index, dtype=np.int32)
+    scores = np.array(scores, dtype=np.int16 if polytomous_items else np.int8)
+    max_scores = None
+    if polytomous_items:
+        scores, max_scores = collapse_categories(
+            item_index, scores, len(item_ids), sorted(polytomous_items)
+        )
+
+    data = ResponseData(
+        person_ids=np.array(list(person_lookup), dtype=np.int64),
+        item_ids=np.array(item_ids, dtype=np.int64),
+        person_index=np.array(person_index, dtype=np.int32),
+        item_index=item_index,
+        scores=scores,
+        submission_ids=submission_map,
+        max_scores=max_scores,
+    )
+
+    logger.info(
+        f"Loaded quizzes {quiz_ids}: {data.num_persons} persons, {data.num_items} items, "
+        f"{data.num_responses} responses"
+    )
+    return data
@@ -0,0 +1,541 @@
+"""
+Rasch Differential Item Functioning (DIF)
+
+Apakah sebuah soal lebih sulit untuk satu kelompok siswa (kelas, sekolah,
+atau atribut lain) dibanding kelompok lain dengan ability yang sama?
+Analisis DIF berjalan terhadap RaschAnalysis yang sudah completed:
+
+    - Persons dibagi per group (lihat DifGrouping); group lebih kecil dari
+      RASCH_DIF_MIN_GROUP_SIZE diabaikan
+    - Difficulty per (group, item) diestimasi sekaligus untuk semua group
+      dengan Newton-Raphson, theta tetap di skala person analisis induk
+      (anchor). Extreme persons tidak dipakai, sama seperti kalibrasi.
+    - Rasch contrast: delta_focal - delta_reference (positif = lebih sulit
+      untuk focal group), t = contrast / sqrt(SE_f^2 + SE_r^2)
+    - Mantel-Haenszel: common odds ratio per item, stratifikasi raw score
+      (atau kuantil theta jika tidak semua siswa menjawab semua item);
+      MH D-DIF = -2.35 ln(alpha), negatif = lebih sulit untuk focal group
+    - Klasifikasi ETS A/B/C untuk kedua statistik (p < DIF_SIGNIFICANCE):
+      contrast |0.43| / |0.64| logit, MH |D-DIF| 1.0 / 1.5
+
+Responses dimuat sekali dengan rasch_data_loader (satu joined query) dan
+dihitung dalam format COO (rasch_sparse.SparseResponseMatrix), jadi quiz
+dan combined analysis memakai jalur yang sama.
+
+Job dijalankan di Celery worker (rasch_worker.rasch_dif_analysis); tanpa
+broker dijalankan sync, karena tidak ada iterasi JMLE.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app, has_app_context
+
+from app import db
+from app.models.rasch import (
+    DifGrouping,
+    RaschAnalysis,
+    RaschAnalysisStatus,
+    RaschAnalysisType,
+    RaschDifAnalysis,
+    RaschItemMeasure,
+    RaschPersonMeasure,
+    RaschRatingScale,
+)
+from app.services.rasch_data_loader import combined_quiz_ids, load_quiz_responses, load_responses
+from app.services.rasch_engine import MIN_VARIANCE
+from app.services.rasch_sparse import SparseResponseMatrix
+
+logger = logging.getLogger(__name__)
+
+DIF_SIGNIFICANCE = 0.05
+DEFAULT_MIN_GROUP_SIZE = 10
+NEWTON_MAX_STEPS = 50
+NEWTON_TOLERANCE = 1e-6
+MAX_NEWTON_STEP = 1.0  # logit; mencegah overshoot di sel dengan sedikit observasi
+THETA_STRATA = 10  # kuantil theta untuk Mantel-Haenszel pada data tidak lengkap
+
+# Kolom User yang boleh dipakai untuk group_by=field
+USER_GROUP_FIELDS = ('school_id', 'preferred_language')
+
+# Batas klasifikasi ETS: (B, C)
+CONTRAST_BOUNDS = (0.43, 0.64)
+MH_BOUNDS = (1.0, 1.5)
+
+
+@dataclass
+class GroupDifficulties:
+    """Difficulty anchored per (group, item); NaN jika tidak bisa diestimasi"""
+    deltas: np.ndarray  # groups × items
+    standard_errors: np.ndarray  # groups × items
+    counts: np.ndarray  # groups × items, jumlah observasi
+
+
+@dataclass
+class MantelHaenszel:
+    alpha: np.ndarray  # common odds ratio per item
+    d_dif: np.ndarray  # -2.35 ln(alpha)
+    chi_square: np.ndarray
+    p_values: np.ndarray
+
+
+# ------------------------------------------------------------------
+# Statistik (tanpa database)
+# ------------------------------------------------------------------
+
+def _normal_p(z: np.ndarray) -> np.ndarray:
+    """p two-sided untuk z ~ N(0, 1)"""
+    return np.array([math.erfc(abs(value) / math.sqrt(2)) if np.isfinite(value) else np.nan for value in z])
+
+
+def _chi_square_p(chi_square: np.ndarray) -> np.ndarray:
+    """p untuk chi-square dengan 1 df"""
+    return np.array([
+        math.erfc(math.sqrt(value / 2)) if np.isfinite(value) else np.nan for value in chi_square
+    ])
+
+
+def dif_persons(matrix: SparseResponseMatrix, groups: np.ndarray) -> np.ndarray:
+    """Mask persons yang masuk analisis DIF: punya group dan skor non-extreme"""
+    raw_scores = matrix.raw_scores
+    counts = matrix.person_counts
+    return (groups >= 0) & (raw_scores > 0) & (raw_scores < counts)
+
+
+def group_difficulties(
+    matrix: SparseResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    groups: np.ndarray,
+    num_groups: int,
+) -> GroupDifficulties:
+    """
+    Estimasi difficulty setiap item di setiap group dengan theta tetap.
+
+    Semua sel (group, item) diselesaikan dalam satu Newton-Raphson batched;
+    sel dijumlahkan dengan np.bincount atas index group * items + item.
+
+    Args:
+        matrix: Responses dichotomous (COO)
+        thetas: Ability per person dari analisis induk (anchor)
+        deltas: Difficulty keseluruhan per item (starting values)
+        groups: Index group per person, -1 = tidak ikut
+    """
+    num_items = matrix.num_items
+    num_cells = num_groups * num_items
+
+    included = dif_persons(matrix, groups)[matrix.person_index]
+    person_index = matrix.person_index[included]
+    item_index = matrix.item_index[included]
+    responses = matrix.responses[included]
+    cells = groups[person_index] * num_items + item_index
+    person_thetas = thetas[person_index]
+
+    counts = np.bincount(cells, minlength=num_cells).astype(np.float64)
+    sum_observed = np.bincount(cells, weights=responses, minlength=num_cells)
+    # Sel dengan semua benar / semua salah tidak punya estimasi berhingga
+    estimable = (sum_observed > 0) & (sum_observed < counts)
+
+    cell_deltas = np.tile(np.asarray(deltas, dtype=np.float64), num_groups)
+    variance = np.zeros(num_cells)
+    active = estimable.copy()
+    for _ in range(NEWTON_MAX_STEPS):
+        p = 1.0 / (1.0 + np.exp(-(person_thetas - cell_deltas[cells])))
+        sum_expected = np.bincount(cells, weights=p, minlength=num_cells)
+        variance = np.bincount(cells, weights=p * (1 - p), minlength=num_cells)
+
+        active &= variance > MIN_VARIANCE
+        step = np.divide(
+            sum_observed - sum_expected, variance,
+            out=np.zeros(num_cells), where=active,
+        )
+        cell_deltas -= np.clip(step, -MAX_NEWTON_STEP, MAX_NEWTON_STEP)
+        if np.abs(step).max(initial=0.0) < NEWTON_TOLERANCE:
+            break
+
+    standard_errors = np.divide(
+        1.0, np.sqrt(variance), out=np.full(num_cells, np.nan), where=estimable & (variance > MIN_VARIANCE),
+    )
+    cell_deltas[~estimable] = np.nan
+
+    shape = (num_groups, num_items)
+    return GroupDifficulties(
+        cell_deltas.reshape(shape), standard_errors.reshape(shape), counts.reshape(shape),
+    )
+
+
+def score_strata(matrix: SparseResponseMatrix, thetas: np.ndarray, persons: np.ndarray) -> np.ndarray:
+    """
+    Stratum matching per person untuk Mantel-Haenszel.
+
+    Raw score jika semua persons di `persons` menjawab semua item; selain itu
+    kuantil theta (raw score tidak sebanding antar item set berbeda).
+    """
+    counts = matrix.person_counts
+    if np.all(counts[persons] == matrix.num_items):
+        return matrix.raw_scores.astype(np.int64)
+
+    edges = np.quantile(thetas[persons], np.linspace(0, 1, THETA_STRATA + 1)[1:-1]) if persons.any() else []
+    return np.searchsorted(np.unique(edges), thetas, side='right').astype(np.int64)
+
+
+def mantel_haenszel(
+    matrix: SparseResponseMatrix,
+    strata: np.ndarray,
+    reference: np.ndarray,
+    focal: np.ndarray,
+) -> MantelHaenszel:
+    """
+    Mantel-Haenszel common odds ratio dan chi-square (continuity corrected)
+    untuk semua item sekaligus.
+
+    Args:
+        strata: Stratum per person (lihat score_strata)
+        reference, focal: Mask persons reference / focal group
+    """
+    num_items = matrix.num_items
+    num_strata = int(strata.max()) + 1 if strata.size else 1
+    size = num_strata * num_items
+
+    person_index, item_index, responses = matrix.person_index, matrix.item_index, matrix.responses
+    cells = strata[person_index] * num_items + item_index
+
+    def table(mask):
+        observed = mask[person_index]
+        total = np.bincount(cells[observed], minlength=size).astype(np.float64)
+        correct = np.bincount(cells[observed], weights=responses[observed], minlength=size)
+        return correct.reshape(num_strata, num_items), total.reshape(num_strata, num_items)
+
+    a, n_reference = table(reference)  # reference benar / total
+    c, n_focal = table(focal)  # focal benar / total
+    b, d = n_reference - a, n_focal - c
+    n = n_reference + n_focal
+
+    valid = (n_reference > 0) & (n_focal > 0) & (n > 1)
+    n_safe = np.where(valid, n, 1.0)
+    numerator = np.where(valid, a * d / n_safe, 0.0).sum(axis=0)
+    denominator = np.where(valid, b * c / n_safe, 0.0).sum(axis=0)
+    alpha = np.divide(
+        numerator, denominator,
+        out=np.full(num_items, np.nan), where=(numerator > 0) & (denominator > 0),
+    )
+
+    correct_total = a + c
+    expected = np.where(valid, n_reference * correct_total / n_safe, 0.0).sum(axis=0)
+    variance = np.where(
+        valid,
+        n_reference * n_focal * correct_total * (n - correct_total) / (n_safe ** 2 * np.where(valid, n - 1, 1.0)),
+        0.0,
+    ).sum(axis=0)
+    observed = np.where(valid, a, 0.0).sum(axis=0)
+    chi_square = np.divide(
+        np.maximum(np.abs(observed - expected) - 0.5, 0.0) ** 2, variance,
+        out=np.full(num_items, np.nan), where=variance > 0,
+    )
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d_dif = -2.35 * np.log(alpha)
+    return MantelHaenszel(alpha, d_dif, chi_square, _chi_square_p(chi_square))
+
+
+def classify(magnitude: float, p_value: float, bounds: Tuple[float, float]) -> Optional[str]:
+    """Kelas ETS: A (dapat diabaikan), B (sedang), C (besar); None jika tidak terhitung"""
+    if not (np.isfinite(magnitude) and np.isfinite(p_value)):
+        return None
+    if p_value >= DIF_SIGNIFICANCE or abs(magnitude) < bounds[0]:
+        return 'A'
+    return 'C' if abs(magnitude) >= bounds[1] else 'B'
+
+
+def _rounded(value) -> Optional[float]:
+    return round(float(value), 6) if np.isfinite(value) else None
+
+
+def dif_statistics(
+    matrix: SparseResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    groups: np.ndarray,
+    labels: List[str],
+    reference: int,
+) -> List[dict]:
+    """
+    Statistik DIF per item: difficulty per group dan perbandingan setiap
+    focal group terhadap reference group.
+
+    Returns:
+        list of dict per item, sejajar dengan matrix.item_ids
+    """
+    estimates = group_difficulties(matrix, thetas, deltas, groups, len(labels))
+    persons = dif_persons(matrix, groups)
+    strata = score_strata(matrix, thetas, persons)
+
+    comparisons = {}
+    for focal in range(len(labels)):
+        if focal == reference:
+            continue
+        contrast = estimates.deltas[focal] - estimates.deltas[reference]
+        se = np.sqrt(estimates.standard_errors[focal] ** 2 + estimates.standard_errors[reference] ** 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = contrast / se
+        mh = mantel_haenszel(matrix, strata, persons & (groups == reference), persons & (groups == focal))
+        comparisons[focal] = (contrast, se, t, _normal_p(t), mh)
+
+    items = []
+    for j, question_id in enumerate(matrix.item_ids):
+        item_comparisons = []
+        for focal, (contrast, se, t, p, mh) in comparisons.items():
+            item_comparisons.append({
+                'focal': labels[focal],
+                'contrast': _rounded(contrast[j]),
+                'se': _rounded(se[j]),
+                't': _rounded(t[j]),
+                'p': _rounded(p[j]),
+                'flag': classify(contrast[j], p[j], CONTRAST_BOUNDS),
+                'mh_alpha': _rounded(mh.alpha[j]),
+                'mh_d_dif': _rounded(mh.d_dif[j]),
+                'mh_chi_square': _rounded(mh.chi_square[j]),
+                'mh_p': _rounded(mh.p_values[j]),
+                'mh_flag': classify(mh.d_dif[j], mh.p_values[j], MH_BOUNDS),
+            })
+        items.append({
+            'question_id': int(question_id),
+            'delta': _rounded(deltas[j]),
+            'groups': {
+                label: {
+                    'delta': _rounded(estimates.deltas[g, j]),
+                    'se': _rounded(estimates.standard_errors[g, j]),
+                    'persons': int(estimates.counts[g, j]),
+                }
+                for g, label in enumerate(labels)
+            },
+            'comparisons': item_comparisons,
+            'dif': any('C' in (c['flag'], c['mh_flag']) for c in item_comparisons),
+        })
+    return items
+
+
+# ------------------------------------------------------------------
+# Grouping
+# ------------------------------------------------------------------
+
+def min_group_size() -> int:
+    if has_app_context():
+        return int(current_app.config.get('RASCH_DIF_MIN_GROUP_SIZE', DEFAULT_MIN_GROUP_SIZE))
+    return DEFAULT_MIN_GROUP_SIZE
+
+
+def validate_grouping(group_by: str, group_field: Optional[str], group_params: Optional[dict]):
+    """
+    Raises:
+        ValueError: jika kombinasi grouping tidak valid
+    """
+    group_by = DifGrouping(group_by)
+    params = group_params or {}
+    if group_by == DifGrouping.FIELD and group_field not in USER_GROUP_FIELDS:
+        raise ValueError(f"group_field harus salah satu dari: {', '.join(USER_GROUP_FIELDS)}")
+    if group_by == DifGrouping.COURSE and not params.get('course_ids'):
+        raise ValueError("course_ids wajib untuk group_by=course")
+    if group_by == DifGrouping.CUSTOM and not params.get('groups'):
+        raise ValueError("groups ({student_id: group}) wajib untuk group_by=custom")
+
+
+def load_person_groups(dif: RaschDifAnalysis, student_ids: List[int]) -> Dict[int, Tuple[str, str]]:
+    """
+    Group per siswa dalam satu query.
+
+    Returns:
+        dict: student_id -> (label, display name)
+    """
+    from app.models import Course, User
+    from app.models.course import enrollments
+
+    params = dif.group_params or {}
+    group_by = DifGrouping(dif.group_by)
+
+    if group_by == DifGrouping.CUSTOM:
+        wanted = set(student_ids)
+        return {
+            int(student_id): (str(label), str(label))
+            for student_id, label in params['groups'].items()
+            if int(student_id) in wanted and label is not None
+        }
+
+    if group_by == DifGrouping.FIELD:
+        column = getattr(User, dif.group_field)
+        rows = db.session.query(User.id, column).filter(User.id.in_(student_ids), column.isnot(None))
+        return {student_id: (str(value), str(value)) for student_id, value in rows}
+
+    # COURSE: course pertama (urutan course_ids) yang diikuti siswa
+    course_ids = [int(course_id) for course_id in params['course_ids']]
+    order = {course_id: i for i, course_id in enumerate(course_ids)}
+    rows = (
+        db.session.query(enrollments.c.user_id, Course.id, Course.name)
+        .join(Course, Course.id == enrollments.c.course_id)
+        .filter(enrollments.c.user_id.in_(student_ids), Course.id.in_(course_ids))
+    )
+    groups: Dict[int, Tuple[str, str]] = {}
+    for student_id, course_id, name in sorted(rows, key=lambda row: order[row[1]]):
+        groups.setdefault(student_id, (str(course_id), name))
+    return groups
+
+
+# ------------------------------------------------------------------
+# Job
+# ------------------------------------------------------------------
+
+def _load_inputs(analysis: RaschAnalysis) -> Tuple[SparseResponseMatrix, np.ndarray, np.ndarray]:
+    """
+    Responses (COO), theta per person dan delta per item dari hasil analisis.
+
+    Item polytomous (punya rating scale) tidak ikut; persons tanpa theta
+    tersimpan mendapat NaN dan tidak dipakai.
+    """
+    polytomous = {
+        scale_name for (scale_name,) in db.session.query(RaschRatingScale.scale_name).filter_by(
+            rasch_analysis_id=analysis.id
+        )
+    }
+    deltas = {
+        question_id: float(delta)
+        for question_id, delta in db.session.query(RaschItemMeasure.question_id, RaschItemMeasure.delta).filter(
+            RaschItemMeasure.rasch_analysis_id == analysis.id,
+            RaschItemMeasure.delta.isnot(None),
+        )
+        if f"question_{question_id}" not in polytomous
+    }
+    if not deltas:
+        raise ValueError("Analysis has no dichotomous item measures")
+
+    if analysis.quiz_id:
+        data = load_quiz_responses(analysis.quiz_id, question_ids=deltas)
+    elif analysis.analysis_type == RaschAnalysisType.COMBINED:
+        data = load_responses(combined_quiz_ids(analysis.course_id), question_ids=deltas)
+    else:
+        raise ValueError("DIF requires a quiz or combined analysis")
+
+    matrix = data.to_sparse()
+    stored_thetas = dict(db.session.query(RaschPersonMeasure.student_id, RaschPersonMeasure.theta).filter(
+        RaschPersonMeasure.rasch_analysis_id == analysis.id,
+        RaschPersonMeasure.theta.isnot(None),
+    ))
+    thetas = np.array([
+        float(stored_thetas[pid]) if pid in stored_thetas else np.nan for pid in matrix.person_ids
+    ])
+    return matrix, thetas, np.array([deltas[qid] for qid in matrix.item_ids])
+
+
+def run_dif_analysis(dif_id: int) -> bool:
+    """
+    Jalankan analisis DIF dan simpan hasilnya di RaschDifAnalysis.
+
+    Returns:
+        bool: True jika berhasil
+    """
+    dif = db.session.get(RaschDifAnalysis, dif_id)
+    if dif is None:
+        logger.error(f"DIF analysis {dif_id} not found")
+        return False
+
+    try:
+        dif.status = RaschAnalysisStatus.PROCESSING.value
+        db.session.commit()
+
+        analysis = dif.analysis
+        if analysis.status != RaschAnalysisStatus.COMPLETED:
+            raise ValueError("DIF requires a completed Rasch analysis")
+
+        matrix, thetas, deltas = _load_inputs(analysis)
+        person_groups = load_person_groups(dif, matrix.person_ids)
+
+        # Label group dengan persons cukup; sisanya tidak ikut (-1)
+        sizes: Dict[str, int] = {}
+        names: Dict[str, str] = {}
+        for i, pid in enumerate(matrix.person_ids):
+            if pid in person_groups and np.isfinite(thetas[i]):
+                label, name = person_groups[pid]
+                sizes[label] = sizes.get(label, 0) + 1
+                names[label] = name
+        labels = sorted(label for label, size in sizes.items() if size >= min_group_size())
+        if len(labels) < 2:
+            raise ValueError(f"DIF needs at least 2 groups with {min_group_size()}+ persons")
+
+        if dif.reference_group is None:
+            dif.reference_group = max(labels, key=lambda label: sizes[label])
+        if dif.reference_group not in labels:
+            raise ValueError(f"Reference group {dif.reference_group} has too few persons")
+
+        index = {label: g for g, label in enumerate(labels)}
+        groups = np.array([
+            index.get(person_groups.get(pid, (None,))[0], -1) if np.isfinite(thetas[i]) else -1
+            for i, pid in enumerate(matrix.person_ids)
+        ], dtype=np.int64)
+
+        dif.items = dif_statistics(
+            matrix, np.nan_to_num(thetas), deltas, groups, labels, index[dif.reference_group]
+        )
+        dif.groups = [
+            {
+                'label': label,
+                'name': names[label],
+                'persons': sizes[label],
+                'reference': label == dif.reference_group,
+            }
+            for label in labels
+        ]
+        dif.num_flagged = sum(1 for item in dif.items if item['dif'])
+        dif.status = RaschAnalysisStatus.COMPLETED.value
+        dif.error_message = None
+        dif.completed_at = datetime.utcnow()
+        db.session.commit()
+
+        logger.info(
+            f"DIF analysis {dif_id}: {len(labels)} groups, {matrix.num_items} items, "
+            f"{dif.num_flagged} flagged"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"DIF analysis {dif_id} failed: {e}")
+        db.session.rollback()
+        dif.status = RaschAnalysisStatus.FAILED.value
+        dif.error_message = str(e)
+        dif.completed_at = datetime.utcnow()
+        db.session.commit()
+        return False
+
+
+def enqueue_dif_analysis(dif_id: int) -> str:
+    """
+    Jadwalkan analisis DIF di Celery; tanpa broker di local executor
+    (rasch_executor), dan hanya jika executor dinonaktifkan dijalankan sync.
+
+    Returns:
+        str: 'celery', 'local' atau 'sync'
+
+    Raises:
+        RaschQueueFullError: jika local executor penuh
+    """
+    try:
+        from app.workers.rasch_worker import rasch_dif_analysis
+
+        rasch_dif_analysis.apply_async(kwargs={'dif_id': dif_id}, retry=False)
+        logger.info(f"Enqueued DIF analysis {dif_id} to Celery")
+        return 'celery'
+    except Exception as e:
+        logger.warning(f"Celery not available, using local executor for DIF analysis {dif_id}: {e}")
+
+    from app.services.rasch_executor import get_local_executor
+
+    executor = get_local_executor()
+    if executor is not None:
+        executor.submit_dif(dif_id)
+        return 'local'
+
+    # Local executor dinonaktifkan (RASCH_LOCAL_WORKERS=0)
+    run_dif_analysis(dif_id)
+    return 'sync'
@@ -0,0 +1,886 @@
+"""
+Rasch Array Engine
+
+Implementasi JMLE berbasis NumPy untuk RaschAnalysisService.
+
+Response matrix disimpan sebagai dense array (persons × items) dengan
+missing-data mask, sehingga setiap langkah Newton-Raphson untuk semua item
+(atau semua person) dihitung dalam satu vectorized pass.
+
+Semantik numerik mengikuti implementasi pure-Python di
+rasch_analysis_service.py (reference implementation):
+    - Extreme scores (0 atau sempurna) di-exclude dari iterasi
+    - Maksimal 10 langkah Newton per item/person per iterasi
+    - Langkah Newton berhenti jika Σ P*Q <= 0.0001
+    - Probabilitas di-clamp ke 0/1 untuk |logit| > 20
+
+Outer loop JMLE (iterate_jmle) opsional memakai akselerasi SQUAREM: dari dua
+sweep berturut-turut diekstrapolasi satu langkah panjang, lalu diterima hanya
+jika perubahan sweep berikutnya tidak lebih besar (lihat _squarem_proposal).
+Kriteria konvergensi tetap sama: max perubahan satu sweep < threshold.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Batas numerik yang sama dengan reference implementation
+LOGIT_CLAMP = 20.0
+MIN_VARIANCE = 0.0001
+NEWTON_STEPS = 10
+
+# Akselerasi outer loop JMLE
+ACCELERATION_NONE = 'none'
+ACCELERATION_SQUAREM = 'squarem'
+ACCELERATIONS = (ACCELERATION_NONE, ACCELERATION_SQUAREM)
+SQUAREM_MAX_STEP = 8.0  # batas |alpha| ekstrapolasi
+SQUAREM_MAX_JUMP = 2.0  # damping: max geser ekstrapolasi dari sweep terakhir (logit)
+SQUAREM_STALL_LIMIT = 3  # ekstrapolasi ditolak berturut-turut -> kembali ke sweep biasa
+
+
+@dataclass
+class ResponseMatrix:
+    """
+    Dense persons × items response matrix.
+
+    Attributes:
+        responses: float64 array (persons × items), 0 untuk sel yang kosong
+        observed: bool array (persons × items), True jika ada jawaban
+        person_ids: student_id untuk setiap baris
+        item_ids: question_id untuk setiap kolom
+    """
+    responses: np.ndarray
+    observed: np.ndarray
+    person_ids: List[int]
+    item_ids: List[int]
+
+    @classmethod
+    def from_dict(
+        cls,
+        response_matrix: Dict[Tuple[int, int], int],
+        person_ids: List[int],
+        item_ids: List[int],
+    ) -> 'ResponseMatrix':
+        """Build dari dict (student_id, question_id) -> 1/0 milik service"""
+        # Duplicate student_ids (multiple attempts) dipetakan ke satu baris
+        person_ids = list(dict.fromkeys(person_ids))
+        person_index = {pid: i for i, pid in enumerate(person_ids)}
+        item_index = {qid: j for j, qid in enumerate(item_ids)}
+
+        responses = np.zeros((len(person_ids), len(item_ids)), dtype=np.float64)
+        observed = np.zeros((len(person_ids), len(item_ids)), dtype=bool)
+
+        for (student_id, question_id), value in response_matrix.items():
+            i = person_index.get(student_id)
+            j = item_index.get(question_id)
+            if i is None or j is None:
+                continue
+            responses[i, j] = value
+            observed[i, j] = True
+
+        return cls(responses, observed, person_ids, list(item_ids))
+
+    @property
+    def num_persons(self) -> int:
+        return self.responses.shape[0]
+
+    @property
+    def num_items(self) -> int:
+        return self.responses.shape[1]
+
+    @property
+    def raw_scores(self) -> np.ndarray:
+        """Raw score per person (jumlah jawaban benar)"""
+        return (self.responses * self.observed).sum(axis=1)
+
+    @property
+    def item_counts(self) -> np.ndarray:
+        """Jumlah responden per item"""
+        return self.observed.sum(axis=0)
+
+    @property
+    def p_values(self) -> np.ndarray:
+        """Proportion correct per item (0.5 untuk item tanpa responden)"""
+        counts = self.item_counts
+        correct = (self.responses * self.observed).sum(axis=0)
+        return np.divide(
+            correct, counts,
+            out=np.full(self.num_items, 0.5),
+            where=counts > 0,
+        )
+
+
+@dataclass
+class InitialMeasures:
+    """Starting values dan klasifikasi extreme persons"""
+    thetas: np.ndarray
+    deltas: np.ndarray
+    extreme_low: np.ndarray  # bool mask, raw score 0
+    extreme_high: np.ndarray  # bool mask, perfect score
+
+    @property
+    def non_extreme(self) -> np.ndarray:
+        return ~(self.extreme_low | self.extreme_high)
+
+
+@dataclass
+class JMLEResult:
+    """Hasil estimasi JMLE dalam bentuk array"""
+    thetas: np.ndarray
+    deltas: np.ndarray
+    iterations: int
+    converged: bool
+    max_changes: List[float] = field(default_factory=list)
+    # Jumlah ekstrapolasi SQUAREM yang diterima (0 tanpa akselerasi)
+    accelerated_steps: int = 0
+    # Step difficulties (items × K) untuk Partial Credit Model; None untuk dichotomous
+    thresholds: Optional[np.ndarray] = None
+
+
+def probability_matrix(thetas: np.ndarray, deltas: np.ndarray) -> np.ndarray:
+    """
+    Probabilitas jawaban benar untuk semua pasangan person × item.
+
+    Rasch formula: P(X=1) = exp(theta - delta) / (1 + exp(theta - delta))
+    """
+    logits = thetas[:, None] - deltas[None, :]
+    probabilities = 1.0 / (1.0 + np.exp(-np.clip(logits, -LOGIT_CLAMP, LOGIT_CLAMP)))
+    probabilities[logits > LOGIT_CLAMP] = 1.0
+    probabilities[logits < -LOGIT_CLAMP] = 0.0
+    return probabilities
+
+
+def initialize_measures(matrix: ResponseMatrix) -> InitialMeasures:
+    """
+    Initialize ability dari raw score dan difficulty dari p-value.
+
+    Extreme persons mendapat placeholder ±4.0 yang nanti diekstrapolasi.
+    """
+    total_items = matrix.num_items
+    raw_scores = matrix.raw_scores
+
+    extreme_low = raw_scores == 0
+    extreme_high = raw_scores == total_items
+
+    thetas = np.zeros(matrix.num_persons)
+    thetas[extreme_low] = -4.0
+    thetas[extreme_high] = 4.0
+
+    non_extreme = ~(extreme_low | extreme_high)
+    p = raw_scores[non_extreme] / total_items
+    thetas[non_extreme] = np.log(p / (1 - p))
+
+    p_values = np.clip(matrix.p_values, 0.01, 0.99)
+    deltas = np.log((1 - p_values) / p_values)
+
+    return InitialMeasures(thetas, deltas, extreme_low, extreme_high)
+
+
+def warm_start_measures(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    previous_thetas: Dict[int, float],
+    previous_deltas: Dict[int, float],
+) -> InitialMeasures:
+    """
+    Seed starting values dari kalibrasi sebelumnya.
+
+    Semua item di matrix harus ada di previous_deltas. Person non-extreme yang
+    punya theta sebelumnya memakai nilai itu; person baru tetap memakai
+    raw-score logit dari initialize_measures(). Klasifikasi extreme tidak berubah.
+    """
+    missing = [qid for qid in matrix.item_ids if qid not in previous_deltas]
+    if missing:
+        raise ValueError(f"No previous difficulty for items: {missing}")
+
+    deltas = np.array([previous_deltas[qid] for qid in matrix.item_ids], dtype=np.float64)
+
+    thetas = initial.thetas.copy()
+    non_extreme = initial.non_extreme
+    for i, pid in enumerate(matrix.person_ids):
+        if non_extreme[i] and pid in previous_thetas:
+            thetas[i] = previous_thetas[pid]
+
+    return InitialMeasures(thetas, deltas, initial.extreme_low, initial.extreme_high)
+
+
+def update_item_difficulties(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    person_mask: np.ndarray,
+) -> np.ndarray:
+    """
+    Newton-Raphson update untuk semua item sekaligus (abilities tetap).
+
+    Hanya persons di person_mask (non-extreme) yang dipakai untuk kalibrasi.
+    """
+    responses = matrix.responses[person_mask]
+    observed = matrix.observed[person_mask]
+    person_thetas = thetas[person_mask]
+
+    sum_observed = (responses * observed).sum(axis=0)
+    deltas = deltas.copy()
+    active = observed.any(axis=0)
+
+    for _ in range(NEWTON_STEPS):
+        if not active.any():
+            break
+        p = probability_matrix(person_thetas, deltas) * observed
+        sum_expected = p.sum(axis=0)
+        sum_variance = (p * (1 - p)).sum(axis=0)
+
+        active &= sum_variance > MIN_VARIANCE
+        step = np.divide(
+            sum_observed - sum_expected, sum_variance,
+            out=np.zeros_like(deltas),
+            where=active,
+        )
+        deltas -= step
+
+    return deltas
+
+
+def update_person_abilities(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    person_mask: np.ndarray,
+) -> np.ndarray:
+    """
+    Newton-Raphson update untuk semua person di person_mask (difficulties tetap).
+    """
+    responses = matrix.responses[person_mask]
+    observed = matrix.observed[person_mask]
+
+    sum_observed = (responses * observed).sum(axis=1)
+    person_thetas = thetas[person_mask]
+    active = observed.any(axis=1)
+
+    for _ in range(NEWTON_STEPS):
+        if not active.any():
+            break
+        p = probability_matrix(person_thetas, deltas) * observed
+        sum_expected = p.sum(axis=1)
+        sum_variance = (p * (1 - p)).sum(axis=1)
+
+        active &= sum_variance > MIN_VARIANCE
+        step = np.divide(
+            sum_observed - sum_expected, sum_variance,
+            out=np.zeros_like(person_thetas),
+            where=active,
+        )
+        person_thetas = person_thetas + step
+
+    thetas = thetas.copy()
+    thetas[person_mask] = person_thetas
+    return thetas
+
+
+def extrapolate_extreme_abilities(
+    thetas: np.ndarray,
+    non_extreme: np.ndarray,
+    extreme_high: np.ndarray,
+    extreme_low: np.ndarray,
+) -> np.ndarray:
+    """
+    Extreme high/low persons: mean ± 2*SD dari ability non-extreme persons.
+    """
+    non_extreme_thetas = thetas[non_extreme]
+    if non_extreme_thetas.size == 0:
+        return thetas
+
+    low, high = extreme_ability_bounds(non_extreme_thetas)
+    thetas = thetas.copy()
+    thetas[extreme_high] = high
+    thetas[extreme_low] = low
+    return thetas
+
+
+def extreme_ability_bounds(non_extreme_thetas: np.ndarray) -> Tuple[float, float]:
+    """(mean - 2*SD, mean + 2*SD) untuk ekstrapolasi zero / perfect score"""
+    mean_theta = float(non_extreme_thetas.mean())
+    if non_extreme_thetas.size > 1:
+        variance = float(non_extreme_thetas.var(ddof=1))
+        std_dev = math.sqrt(variance) if variance > 0 else 1.0
+    else:
+        std_dev = 1.0
+    return mean_theta - (2.0 * std_dev), mean_theta + (2.0 * std_dev)
+
+
+def score_to_measure(
+    deltas: np.ndarray,
+    extreme_bounds: Tuple[float, float],
+    convergence_threshold: float = 1e-6,
+    max_iterations: int = 50,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Theta dan SE per raw score (0..L) untuk complete response pattern.
+
+    Dengan difficulties tetap, ability siswa yang menjawab semua L item hanya
+    bergantung pada raw score; semua skor 1..L-1 diselesaikan sekaligus dengan
+    Newton-Raphson. Skor 0 dan L memakai extreme_bounds (lihat
+    extreme_ability_bounds).
+
+    Returns:
+        (thetas, theta_se): masing-masing panjang L + 1, index = raw score
+    """
+    num_items = deltas.size
+    scores = np.arange(1, num_items, dtype=np.float64)
+    thetas = np.log(scores / (num_items - scores)) + float(deltas.mean())
+
+    for _ in range(max_iterations):
+        p = probability_matrix(thetas, deltas)
+        variance = (p * (1 - p)).sum(axis=1)
+        step = np.divide(
+            scores - p.sum(axis=1), variance,
+            out=np.zeros_like(thetas), where=variance > MIN_VARIANCE,
+        )
+        thetas = thetas + step
+        if np.abs(step).max(initial=0.0) < convergence_threshold:
+            break
+
+    low, high = extreme_bounds
+    thetas = np.concatenate([[low], thetas, [high]])
+    p = probability_matrix(thetas, deltas)
+    information = (p * (1 - p)).sum(axis=1)
+    theta_se = np.divide(1.0, np.sqrt(information), out=np.ones_like(information), where=information > 0)
+    return thetas, theta_se
+
+
+def run_jmle(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: Optional[Callable[[int, float], None]] = None,
+    on_checkpoint: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None,
+    start_iteration: int = 0,
+    acceleration: str = ACCELERATION_NONE,
+) -> JMLEResult:
+    """
+    Run JMLE: alternating item/person Newton updates hingga konvergen.
+
+    Args:
+        matrix: Response matrix
+        initial: Starting values dari initialize_measures()
+        convergence_threshold: Max perubahan logit untuk dianggap konvergen
+        max_iterations: Batas iterasi outer loop
+        on_iteration: Callback(iteration, max_change) untuk progress reporting
+        on_checkpoint: Callback(iteration, thetas, deltas) setelah setiap iterasi
+            yang belum konvergen, untuk checkpoint (lihat rasch_checkpoint)
+        start_iteration: Iterasi terakhir yang sudah selesai saat resume dari
+            checkpoint; initial berisi measures dari checkpoint itu
+        acceleration: ACCELERATION_NONE atau ACCELERATION_SQUAREM
+
+    Returns:
+        JMLEResult dengan thetas (sudah termasuk ekstrapolasi extreme persons)
+    """
+    non_extreme = initial.non_extreme
+
+    def sweep(thetas, deltas):
+        deltas = update_item_difficulties(matrix, thetas, deltas, non_extreme)
+        return update_person_abilities(matrix, thetas, deltas, non_extreme), deltas
+
+    result = iterate_jmle(
+        sweep, initial,
+        convergence_threshold=convergence_threshold,
+        max_iterations=max_iterations,
+        on_iteration=on_iteration,
+        on_checkpoint=on_checkpoint,
+        start_iteration=start_iteration,
+        acceleration=acceleration,
+    )
+    result.thetas = extrapolate_extreme_abilities(
+        result.thetas, non_extreme, initial.extreme_high, initial.extreme_low
+    )
+    return result
+
+
+def iterate_jmle(
+    sweep: Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    initial: InitialMeasures,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: Optional[Callable[[int, float], None]] = None,
+    on_checkpoint: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None,
+    start_iteration: int = 0,
+    acceleration: str = ACCELERATION_NONE,
+) -> JMLEResult:
+    """
+    Outer loop JMLE, dipakai bersama oleh engine dense dan sparse.
+
+    Setiap sweep (item update lalu person update) dihitung sebagai satu
+    iterasi, termasuk sweep dari titik ekstrapolasi SQUAREM, sehingga
+    iterations dan max_changes sebanding dengan atau tanpa akselerasi.
+
+    Args:
+        sweep: (thetas, deltas) -> (thetas, deltas) untuk satu iterasi
+        Lainnya: lihat run_jmle
+
+    Returns:
+        JMLEResult tanpa ekstrapolasi extreme persons
+    """
+    if acceleration not in ACCELERATIONS:
+        raise ValueError(f"Unknown JMLE acceleration: {acceleration}")
+
+    non_extreme = initial.non_extreme
+    thetas = initial.thetas.copy()
+    deltas = initial.deltas.copy()
+    max_changes: List[float] = []
+    iteration = start_iteration
+    converged = False
+    accelerate = acceleration == ACCELERATION_SQUAREM
+    accelerated_steps = 0
+    rejected = 0
+
+    def advance(thetas, deltas):
+        nonlocal iteration
+        iteration += 1
+        new_thetas, new_deltas = sweep(thetas, deltas)
+        ability_change = float(np.abs(new_thetas[non_extreme] - thetas[non_extreme]).max(initial=0.0))
+        difficulty_change = float(np.abs(new_deltas - deltas).max(initial=0.0))
+        max_change = max(ability_change, difficulty_change)
+        max_changes.append(max_change)
+        if on_iteration:
+            on_iteration(iteration, max_change)
+        return new_thetas, new_deltas, max_change
+
+    while iteration < max_iterations:
+        thetas_1, deltas_1, max_change = advance(thetas, deltas)
+        if max_change < convergence_threshold or not accelerate or iteration >= max_iterations:
+            thetas, deltas = thetas_1, deltas_1
+            if max_change < convergence_threshold:
+                converged = True
+                break
+        else:
+            thetas_2, deltas_2, max_change_2 = advance(thetas_1, deltas_1)
+            proposal = _squarem_proposal(
+                (thetas, deltas), (thetas_1, deltas_1), (thetas_2, deltas_2), non_extreme
+            )
+            thetas, deltas = thetas_2, deltas_2
+            if max_change_2 < convergence_threshold:
+                converged = True
+                break
+
+            if proposal is not None and iteration < max_iterations:
+                thetas_3, deltas_3, max_change_3 = advance(*proposal)
+                # Tolak ekstrapolasi yang memperburuk perubahan (divergen / overshoot)
+                if max_change_3 <= max_change_2:
+                    thetas, deltas = thetas_3, deltas_3
+                    accelerated_steps += 1
+                    rejected = 0
+                    if max_change_3 < convergence_threshold:
+                        converged = True
+                        break
+                else:
+                    rejected += 1
+                    # Stall: ekstrapolasi terus ditolak, lanjut tanpa akselerasi
+                    accelerate = rejected < SQUAREM_STALL_LIMIT
+
+        if on_checkpoint:
+            on_checkpoint(iteration, thetas, deltas)
+
+    return JMLEResult(
+        thetas=thetas,
+        deltas=deltas,
+        iterations=iteration if converged else max_iterations,
+        converged=converged,
+        max_changes=max_changes,
+        accelerated_steps=accelerated_steps,
+    )
+
+
+def _squarem_proposal(state_0, state_1, state_2, non_extreme: np.ndarray):
+    """
+    Titik ekstrapolasi SQUAREM (Varadhan & Roland, 2008, scheme S3).
+
+    r = x1 - x0, v = x2 - 2*x1 + x0, alpha = -|r| / |v| di-clamp ke
+    [-SQUAREM_MAX_STEP, -1]; x' = x0 - 2*alpha*r + alpha^2*v. Geseran x'
+    dari x2 dibatasi SQUAREM_MAX_JUMP logit (damping).
+
+    Returns:
+        (thetas, deltas), atau None jika ekstrapolasi tidak menambah apa-apa
+        (alpha = -1 berarti x' = x2)
+    """
+    x0, x1, x2 = (
+        np.concatenate([thetas[non_extreme], deltas]) for thetas, deltas in (state_0, state_1, state_2)
+    )
+    r = x1 - x0
+    v = x2 - 2 * x1 + x0
+    r_norm, v_norm = float(np.linalg.norm(r)), float(np.linalg.norm(v))
+    if v_norm == 0 or not math.isfinite(r_norm / v_norm):
+        return None
+    alpha = max(-SQUAREM_MAX_STEP, min(-1.0, -r_norm / v_norm))
+    if alpha == -1.0:
+        return None
+
+    proposal = x0 - 2 * alpha * r + alpha ** 2 * v
+    jump = float(np.abs(proposal - x2).max(initial=0.0))
+    if jump > SQUAREM_MAX_JUMP:
+        proposal = x2 + (proposal - x2) * (SQUAREM_MAX_JUMP / jump)
+
+    num_thetas = int(non_extreme.sum())
+    thetas = state_2[0].copy()
+    thetas[non_extreme] = proposal[:num_thetas]
+    return thetas, proposal[num_thetas:]
+
+
+@dataclass
+class FitStatistics:
+    """
+    Post-estimation statistics untuk semua persons dan items.
+
+    Semua field berupa array yang sejajar dengan matrix.person_ids
+    (prefix person_) atau matrix.item_ids (prefix item_).
+    """
+    person_raw_scores: np.ndarray
+    person_counts: np.ndarray
+    theta_se: np.ndarray
+    person_infit_mnsq: np.ndarray
+    person_infit_zstd: np.ndarray
+    person_outfit_mnsq: np.ndarray
+    person_outfit_zstd: np.ndarray
+    item_counts: np.ndarray
+    delta_se: np.ndarray
+    item_infit_mnsq: np.ndarray
+    item_infit_zstd: np.ndarray
+    item_outfit_mnsq: np.ndarray
+    item_outfit_zstd: np.ndarray
+    p_values: np.ndarray
+    point_biserial: np.ndarray
+    # Variance skor per item untuk Cronbach's alpha; None = p(1 - p) (dichotomous)
+    item_score_variances: Optional[np.ndarray] = None
+
+
+def wilson_hilferty_zstd(mnsq: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """
+    Wilson-Hilferty cube root transformation (vectorized).
+
+    ZSTD = 0 untuk n <= 0 atau mnsq <= 0, sama dengan reference implementation.
+    """
+    mnsq = np.asarray(mnsq, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    valid = (n > 0) & (mnsq > 0)
+
+    q = np.divide(6.0, n, out=np.ones_like(n), where=valid)
+    sqrt_q = np.sqrt(q)
+    zstd = (np.cbrt(mnsq) - 1) * (3 / sqrt_q) + sqrt_q / 3
+    return np.where(valid, zstd, 0.0)
+
+
+def _mean_squares(squared_residuals, variances, standardized, counts, information):
+    """Infit/outfit MNSQ + ZSTD dan model-based SE dari jumlah per baris/kolom"""
+    infit_mnsq = np.divide(
+        squared_residuals, variances,
+        out=np.ones_like(squared_residuals),
+        where=variances > 0,
+    )
+    outfit_mnsq = np.divide(
+        standardized, counts,
+        out=np.ones_like(standardized),
+        where=counts > 0,
+    )
+    se = np.divide(
+        1.0, np.sqrt(information),
+        out=np.ones_like(information),
+        where=information > 0,
+    )
+    return (
+        infit_mnsq,
+        wilson_hilferty_zstd(infit_mnsq, counts),
+        outfit_mnsq,
+        wilson_hilferty_zstd(outfit_mnsq, counts),
+        se,
+    )
+
+
+def point_biserial(matrix: ResponseMatrix) -> np.ndarray:
+    """
+    Point-biserial correlation per item terhadap rest score (raw score tanpa item ini).
+    """
+    observed = matrix.observed
+    responses = matrix.responses * observed
+    rest_scores = (matrix.raw_scores[:, None] - responses) * observed
+
+    counts = observed.sum(axis=0).astype(np.float64)
+    correct = responses.sum(axis=0)
+    incorrect = counts - correct
+
+    sum_correct = (rest_scores * responses).sum(axis=0)
+    sum_all = rest_scores.sum(axis=0)
+    mean_correct = np.divide(sum_correct, correct, out=np.zeros_like(sum_correct), where=correct > 0)
+    mean_incorrect = np.divide(
+        sum_all - sum_correct, incorrect,
+        out=np.zeros_like(sum_all), where=incorrect > 0,
+    )
+
+    mean_all = np.divide(sum_all, counts, out=np.zeros_like(sum_all), where=counts > 0)
+    deviations = (rest_scores - mean_all[None, :]) * observed
+    std_dev = np.sqrt(np.divide(
+        (deviations ** 2).sum(axis=0), counts,
+        out=np.zeros_like(counts), where=counts > 0,
+    ))
+
+    p = np.divide(correct, counts, out=np.zeros_like(counts), where=counts > 0)
+    valid = (correct > 0) & (incorrect > 0) & (std_dev > 0)
+    result = np.divide(
+        (mean_correct - mean_incorrect) * np.sqrt(p * (1 - p)), std_dev,
+        out=np.zeros_like(std_dev), where=valid,
+    )
+    return np.clip(result, -1.0, 1.0)
+
+
+def calculate_fit_statistics(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+) -> FitStatistics:
+    """
+    Hitung semua fit statistics dari satu probability/residual matrix.
+
+    Infit MNSQ = Σ(residual²) / Σ(variance)
+    Outfit MNSQ = (1/N) × Σ(residual² / variance)
+    SE = 1 / √(Σ P*Q)
+    """
+    probabilities = probability_matrix(thetas, deltas)
+    return fit_statistics_from_moments(
+        matrix,
+        probabilities,
+        probabilities * (1 - probabilities),
+        p_values=matrix.p_values,
+        point_biserial=point_biserial(matrix),
+    )
+
+
+def fit_statistics_from_moments(
+    matrix: ResponseMatrix,
+    expected: np.ndarray,
+    variances: np.ndarray,
+    p_values: np.ndarray,
+    point_biserial: np.ndarray,
+) -> FitStatistics:
+    """
+    Fit statistics dari expected score dan variance per sel.
+
+    Dipakai bersama oleh dichotomous (expected = P, variance = PQ) dan
+    Partial Credit Model (expected/variance dari distribusi kategori).
+    """
+    observed = matrix.observed
+    variances = variances * observed
+    residuals_sq = ((matrix.responses - expected) ** 2) * observed
+
+    # Sel dengan variance sangat kecil tidak ikut dalam mean squares
+    informative = variances > MIN_VARIANCE
+    fit_residuals_sq = np.where(informative, residuals_sq, 0.0)
+    fit_variances = np.where(informative, variances, 0.0)
+    standardized_sq = np.divide(
+        residuals_sq, variances,
+        out=np.zeros_like(residuals_sq), where=informative,
+    )
+
+    person_counts = observed.sum(axis=1).astype(np.float64)
+    item_counts = observed.sum(axis=0).astype(np.float64)
+
+    (person_infit, person_infit_z, person_outfit, person_outfit_z, theta_se) = _mean_squares(
+        fit_residuals_sq.sum(axis=1),
+        fit_variances.sum(axis=1),
+        standardized_sq.sum(axis=1),
+        person_counts,
+        variances.sum(axis=1),
+    )
+    (item_infit, item_infit_z, item_outfit, item_outfit_z, delta_se) = _mean_squares(
+        fit_residuals_sq.sum(axis=0),
+        fit_variances.sum(axis=0),
+        standardized_sq.sum(axis=0),
+        item_counts,
+        variances.sum(axis=0),
+    )
+
+    return FitStatistics(
+        person_raw_scores=matrix.raw_scores,
+        person_counts=person_counts,
+        theta_se=theta_se,
+        person_infit_mnsq=person_infit,
+        person_infit_zstd=person_infit_z,
+        person_outfit_mnsq=person_outfit,
+        person_outfit_zstd=person_outfit_z,
+        item_counts=item_counts,
+        delta_se=delta_se,
+        item_infit_mnsq=item_infit,
+        item_infit_zstd=item_infit_z,
+        item_outfit_mnsq=item_outfit,
+        item_outfit_zstd=item_outfit_z,
+        p_values=p_values,
+        point_biserial=point_biserial,
+    )
+
+
+def _separation(measures: np.ndarray, standard_errors: np.ndarray) -> Tuple[float, float]:
+    """Separation index dan reliability dari variance measures vs mean SE²"""
+    variance = float(measures.var(ddof=1)) if measures.size >= 2 else 0.0
+    se_mean = float((standard_errors ** 2).mean()) if standard_errors.size else 0.0
+    separation = math.sqrt(variance / se_mean) if se_mean > 0 else 0.0
+    return separation, separation ** 2 / (1 + separation ** 2)
+
+
+def calculate_reliability(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    fit: FitStatistics,
+) -> Dict[str, float]:
+    """Person/item separation, reliability, dan Cronbach's alpha"""
+    person_separation, person_reliability = _separation(thetas, fit.theta_se)
+    item_separation, item_reliability = _separation(deltas, fit.delta_se)
+
+    n_items = matrix.num_items
+    if fit.item_score_variances is not None:
+        item_variances = fit.item_score_variances.sum()
+    else:
+        item_variances = (fit.p_values * (1 - fit.p_values)).sum()
+    raw_scores = fit.person_raw_scores
+    total_variance = float(raw_scores.var(ddof=1)) if raw_scores.size >= 2 else 0.0
+
+    if total_variance > 0 and n_items > 1:
+        cronbach_alpha = (n_items / (n_items - 1)) * (1 - item_variances / total_variance)
+    else:
+        cronbach_alpha = 0
+
+    return {
+        'person_separation_index': person_separation,
+        'person_reliability': person_reliability,
+        'item_separation_index': item_separation,
+        'item_reliability': item_reliability,
+        'cronbach_alpha': float(cronbach_alpha),
+    }
+
+
+# Eigenvalue contrast pertama >= ini (dalam unit item) menandakan dimensi kedua
+CONTRAST_EIGENVALUE_THRESHOLD = 2.0
+MIN_RESIDUAL_PAIRS = 5  # persons minimum yang menjawab kedua item untuk korelasi
+
+
+@dataclass
+class ResidualPCA:
+    """
+    Principal components dari korelasi standardized residuals antar item.
+
+    Eigenvalue dalam unit item (jumlah semua eigenvalue = jumlah item), sama
+    seperti "contrast" di Winsteps Table 23.
+    """
+    eigenvalues: np.ndarray  # contrast 1..k, menurun
+    loadings: np.ndarray  # k × items
+    total_eigenvalue: float
+    variance_explained: float  # proporsi raw variance yang dijelaskan measures
+    num_persons: int
+
+    @property
+    def unidimensional(self) -> bool:
+        return not self.eigenvalues.size or self.eigenvalues[0] < CONTRAST_EIGENVALUE_THRESHOLD
+
+    def to_dict(self, item_ids: List[int]) -> dict:
+        """Format JSON untuk RaschAnalysis.residual_pca; loadings sejajar dengan item_ids"""
+        return {
+            'item_ids': [int(qid) for qid in item_ids],
+            'persons': self.num_persons,
+            'variance_explained': round(self.variance_explained, 6),
+            'total_eigenvalue': self.total_eigenvalue,
+            'unidimensional': bool(self.unidimensional),
+            'contrasts': [
+                {
+                    'eigenvalue': round(float(eigenvalue), 6),
+                    # Persen dari variance residual (unexplained)
+                    'percent_unexplained': round(float(eigenvalue / self.total_eigenvalue * 100), 4),
+                    'loadings': [round(float(loading), 6) for loading in loadings],
+                }
+                for eigenvalue, loadings in zip(self.eigenvalues, self.loadings)
+            ],
+        }
+
+
+def residual_pca(
+    responses: np.ndarray,
+    observed: np.ndarray,
+    expected: np.ndarray,
+    variances: np.ndarray,
+    person_mask: np.ndarray,
+    components: int = 3,
+) -> ResidualPCA:
+    """
+    PCA standardized residuals untuk cek unidimensionality.
+
+    Z = (X - E) / sqrt(Var) per sel teramati. Korelasi antar item dihitung
+    pairwise dari persons yang menjawab kedua item (dua matrix product,
+    items × items), lalu di-eigendecompose; untuk 1500 × 60 cukup milidetik.
+
+    Args:
+        responses, observed: Response matrix (persons × items)
+        expected, variances: Expected score dan variance model per sel
+        person_mask: Persons yang dipakai (non-extreme)
+        components: Jumlah contrast yang dikembalikan
+    """
+    responses = responses[person_mask]
+    observed = observed[person_mask] & (variances[person_mask] > MIN_VARIANCE)
+    expected = expected[person_mask]
+    weights = observed.astype(np.float64)
+
+    residuals = np.where(observed, responses - expected, 0.0)
+    standardized = np.divide(
+        residuals, np.sqrt(variances[person_mask]),
+        out=np.zeros_like(residuals), where=observed,
+    )
+
+    # Raw variance explained: Σ(E - mean)² / (Σ(E - mean)² + Σ(X - E)²)
+    num_observed = weights.sum()
+    mean_response = (responses * weights).sum() / num_observed if num_observed else 0.0
+    explained = (((expected - mean_response) * weights) ** 2).sum()
+    unexplained = (residuals ** 2).sum()
+    total = explained + unexplained
+    variance_explained = float(explained / total) if total > 0 else 0.0
+
+    # Pairwise Pearson: center per item, lalu jumlah cross-product per pasangan
+    counts = weights.sum(axis=0)
+    means = np.divide(standardized.sum(axis=0), counts, out=np.zeros_like(counts), where=counts > 0)
+    centered = (standardized - means) * weights
+    pair_counts = weights.T @ weights
+    covariance = np.divide(
+        centered.T @ centered, pair_counts,
+        out=np.zeros_like(pair_counts), where=pair_counts >= MIN_RESIDUAL_PAIRS,
+    )
+    sd = np.sqrt(np.diag(covariance))
+    correlation = np.divide(
+        covariance, np.outer(sd, sd),
+        out=np.zeros_like(covariance), where=np.outer(sd, sd) > 0,
+    )
+    np.fill_diagonal(correlation, 1.0)
+
+    eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+    order = np.argsort(eigenvalues)[::-1][:components]
+    eigenvalues = eigenvalues[order]
+    loadings = (eigenvectors[:, order] * np.sqrt(np.clip(eigenvalues, 0.0, None))).T
+    # Tanda eigenvector arbitrer: loading terbesar (absolut) dibuat positif
+    signs = np.sign(loadings[np.arange(len(order)), np.abs(loadings).argmax(axis=1)])
+    loadings *= np.where(signs == 0, 1.0, signs)[:, None]
+
+    return ResidualPCA(
+        eigenvalues=eigenvalues,
+        loadings=loadings,
+        total_eigenvalue=float(correlation.shape[0]),
+        variance_explained=variance_explained,
+        num_persons=int(person_mask.sum()),
+    )
+
+
+def percentiles_below(values: np.ndarray) -> np.ndarray:
+    """
+    Persentase nilai yang lebih kecil (strictly) dari setiap elemen.
+
+    Satu sort + searchsorted: O(N log N) alih-alih O(N²).
+    """
+    if values.size == 0:
+        return values.astype(np.float64)
+    ranks = np.searchsorted(np.sort(values), values, side='left')
+    return ranks / values.size * 100
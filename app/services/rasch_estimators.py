@@ -0,0 +1,358 @@
+"""
+Rasch Estimators
+
+Estimator alternatif untuk JMLE di rasch_engine. Semua estimator menerima
+ResponseMatrix + InitialMeasures dan mengembalikan JMLEResult yang sama,
+sehingga ekstrapolasi extreme persons, fit statistics, dan persistence tidak
+perlu tahu estimator mana yang dipakai.
+
+Estimators:
+    - jmle: Joint Maximum Likelihood (rasch_engine.run_jmle)
+    - prox: Normal approximation (Cohen/Wright-Stone PROX), hampir instan;
+            cocok untuk kalibrasi provisional yang nanti di-refine
+    - pairwise: Pairwise conditional estimation (Choppin) via Bradley-Terry;
+            item difficulties bebas dari person parameters, tanpa bias JMLE
+    - cmle: Conditional Maximum Likelihood dengan elementary symmetric
+            functions, dikelompokkan per pola missing data
+
+Untuk pairwise dan CMLE, abilities dihitung dengan ML (difficulties tetap)
+setelah item dikalibrasi. Difficulties dari PROX, pairwise, dan CMLE
+di-center ke mean 0.
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.services import rasch_engine
+from app.services.rasch_engine import InitialMeasures, JMLEResult, ResponseMatrix
+
+logger = logging.getLogger(__name__)
+
+ESTIMATOR_JMLE = 'jmle'
+ESTIMATOR_PROX = 'prox'
+ESTIMATOR_PAIRWISE = 'pairwise'
+ESTIMATOR_CMLE = 'cmle'
+
+# PROX expansion constant (1.7² pada normal ogive)
+PROX_VARIANCE_SCALE = 2.89
+# Pseudo-count untuk pasangan item pada pairwise estimation
+PAIRWISE_SMOOTHING = 0.5
+
+ProgressCallback = Optional[Callable[[int, float], None]]
+
+
+def _logit_proportions(successes: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """ln(p / (1 - p)) dengan p di-clip ke 0.01-0.99 seperti initialize_measures"""
+    p = np.divide(successes, totals, out=np.full_like(successes, 0.5), where=totals > 0)
+    p = np.clip(p, 0.01, 0.99)
+    return np.log(p / (1 - p))
+
+
+def estimate_abilities(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    person_mask: np.ndarray,
+    convergence_threshold: float,
+    max_iterations: int,
+) -> np.ndarray:
+    """ML abilities untuk persons di person_mask dengan difficulties tetap"""
+    for _ in range(max_iterations):
+        updated = rasch_engine.update_person_abilities(matrix, thetas, deltas, person_mask)
+        change = float(np.abs(updated[person_mask] - thetas[person_mask]).max(initial=0.0))
+        thetas = updated
+        if change < convergence_threshold:
+            break
+    return thetas
+
+
+def _finish(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    iterations: int,
+    converged: bool,
+    max_changes: List[float],
+) -> JMLEResult:
+    """Ekstrapolasi extreme persons dan bungkus ke result format bersama"""
+    thetas = rasch_engine.extrapolate_extreme_abilities(
+        thetas, initial.non_extreme, initial.extreme_high, initial.extreme_low
+    )
+    return JMLEResult(
+        thetas=thetas,
+        deltas=deltas,
+        iterations=iterations,
+        converged=converged,
+        max_changes=max_changes,
+    )
+
+
+def run_prox(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: ProgressCallback = None,
+) -> JMLEResult:
+    """
+    PROX (normal approximation) dengan dukungan missing data.
+
+    Setiap iterasi:
+        theta_n = mean(delta_i) + √(1 + var_n(delta)/2.89) × ln(r_n / (L_n - r_n))
+        delta_i = mean(theta_n) - √(1 + var_i(theta)/2.89) × ln(s_i / (N_i - s_i))
+
+    Dengan data lengkap hasil iterasi pertama sama dengan PROX klasik.
+    """
+    non_extreme = initial.non_extreme
+    responses = matrix.responses[non_extreme] * matrix.observed[non_extreme]
+    observed = matrix.observed[non_extreme].astype(np.float64)
+
+    person_counts = observed.sum(axis=1)
+    item_counts = observed.sum(axis=0)
+    person_logits = _logit_proportions(responses.sum(axis=1), person_counts)
+    item_logits = _logit_proportions(responses.sum(axis=0), item_counts)
+
+    thetas = initial.thetas.copy()
+    person_thetas = person_logits.copy()
+    deltas = item_logits - item_logits.mean() if item_logits.size else item_logits
+    max_changes: List[float] = []
+    converged = False
+    iteration = 0
+
+    for iteration in range(1, max_iterations + 1):
+        # Person: mean dan variance difficulty dari item yang dijawab
+        mean_delta = np.divide(observed @ deltas, person_counts, out=np.zeros_like(person_counts), where=person_counts > 0)
+        mean_delta_sq = np.divide(observed @ deltas ** 2, person_counts, out=np.zeros_like(person_counts), where=person_counts > 0)
+        var_delta = np.maximum(mean_delta_sq - mean_delta ** 2, 0.0)
+        new_person_thetas = mean_delta + np.sqrt(1 + var_delta / PROX_VARIANCE_SCALE) * person_logits
+
+        # Item: mean dan variance ability dari persons yang menjawab
+        mean_theta = np.divide(new_person_thetas @ observed, item_counts, out=np.zeros_like(item_counts), where=item_counts > 0)
+        mean_theta_sq = np.divide(new_person_thetas ** 2 @ observed, item_counts, out=np.zeros_like(item_counts), where=item_counts > 0)
+        var_theta = np.maximum(mean_theta_sq - mean_theta ** 2, 0.0)
+        new_deltas = mean_theta - np.sqrt(1 + var_theta / PROX_VARIANCE_SCALE) * item_logits
+
+        # Center item difficulties; persons ikut digeser
+        shift = new_deltas.mean() if new_deltas.size else 0.0
+        new_deltas = new_deltas - shift
+        new_person_thetas = new_person_thetas - shift
+
+        max_change = max(
+            float(np.abs(new_person_thetas - person_thetas).max(initial=0.0)),
+            float(np.abs(new_deltas - deltas).max(initial=0.0)),
+        )
+        max_changes.append(max_change)
+        person_thetas, deltas = new_person_thetas, new_deltas
+
+        if on_iteration:
+            on_iteration(iteration, max_change)
+        if max_change < convergence_threshold:
+            converged = True
+            break
+
+    thetas[non_extreme] = person_thetas
+    return _finish(
+        matrix, initial, thetas, deltas,
+        iteration if converged else max_iterations, converged, max_changes,
+    )
+
+
+def pairwise_counts(matrix: ResponseMatrix, person_mask: np.ndarray) -> np.ndarray:
+    """
+    n[i, j] = jumlah persons yang benar di item i dan salah di item j.
+    """
+    observed = matrix.observed[person_mask]
+    correct = (matrix.responses[person_mask] * observed)
+    incorrect = ((1 - matrix.responses[person_mask]) * observed)
+    counts = correct.T @ incorrect
+    np.fill_diagonal(counts, 0.0)
+    return counts
+
+
+def run_pairwise(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: ProgressCallback = None,
+) -> JMLEResult:
+    """
+    Pairwise conditional estimation.
+
+    P(i benar, j salah | tepat satu benar) = exp(delta_j - delta_i) / (1 + exp(delta_j - delta_i))
+    tidak bergantung pada theta, sehingga difficulties bisa diestimasi dari
+    tabel pairwise counts saja (model Bradley-Terry, MM algorithm).
+    """
+    non_extreme = initial.non_extreme
+    counts = pairwise_counts(matrix, non_extreme)
+
+    # Smoothing hanya untuk pasangan yang pernah dibandingkan
+    compared = (counts + counts.T) > 0
+    counts = counts + PAIRWISE_SMOOTHING * compared
+    totals = counts + counts.T
+    wins = counts.sum(axis=1)
+
+    # Start: Choppin row-average log ratio
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_ratios = np.where(compared, np.log(counts.T / counts), 0.0)
+    comparisons = compared.sum(axis=1)
+    deltas = np.divide(log_ratios.sum(axis=1), comparisons, out=np.zeros(matrix.num_items), where=comparisons > 0)
+    deltas -= deltas.mean()
+
+    max_changes: List[float] = []
+    converged = False
+    iteration = 0
+
+    for iteration in range(1, max_iterations + 1):
+        easiness = np.exp(-deltas)
+        denominator = (totals / (easiness[:, None] + easiness[None, :])).sum(axis=1)
+        updated = np.divide(wins, denominator, out=easiness.copy(), where=denominator > 0)
+        new_deltas = -np.log(updated)
+        new_deltas -= new_deltas.mean()
+
+        max_change = float(np.abs(new_deltas - deltas).max(initial=0.0))
+        max_changes.append(max_change)
+        deltas = new_deltas
+
+        if on_iteration:
+            on_iteration(iteration, max_change)
+        if max_change < convergence_threshold:
+            converged = True
+            break
+
+    thetas = estimate_abilities(
+        matrix, initial.thetas.copy(), deltas, non_extreme,
+        convergence_threshold, max_iterations,
+    )
+    return _finish(
+        matrix, initial, thetas, deltas,
+        iteration if converged else max_iterations, converged, max_changes,
+    )
+
+
+def elementary_symmetric_functions(easiness: np.ndarray) -> np.ndarray:
+    """
+    Elementary symmetric functions γ_0..γ_L, plus γ tanpa masing-masing item.
+
+    Returns:
+        Array (L + 1) × (L + 1): baris 0 = γ untuk semua item,
+        baris i + 1 = γ tanpa item i
+    """
+    n_items = easiness.size
+    gammas = np.zeros((n_items + 1, n_items + 1))
+    gammas[:, 0] = 1.0
+
+    for j, eps in enumerate(easiness):
+        # Semua baris kecuali "tanpa item j" menambahkan item j
+        excluded = gammas[j + 1].copy()
+        gammas[:, 1:] += eps * gammas[:, :-1]
+        gammas[j + 1] = excluded
+
+    return gammas
+
+
+def run_cmle(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: ProgressCallback = None,
+) -> JMLEResult:
+    """
+    Conditional Maximum Likelihood untuk item difficulties.
+
+    Raw score adalah sufficient statistic untuk theta, sehingga
+    P(x_ni = 1 | r_n) = ε_i γ_{r-1}^(i) / γ_r  dengan ε_i = exp(-delta_i)
+    tidak bergantung pada theta. Persons dikelompokkan per pola item yang
+    dijawab; γ dihitung sekali per pola per iterasi, jadi biaya naik dengan
+    jumlah pola missing data yang berbeda.
+    """
+    non_extreme = initial.non_extreme
+    observed = matrix.observed[non_extreme]
+    responses = matrix.responses[non_extreme] * observed
+    raw_scores = responses.sum(axis=1).astype(np.int64)
+    observed_totals = responses.sum(axis=0)
+
+    patterns, pattern_index = np.unique(observed, axis=0, return_inverse=True)
+    pattern_index = pattern_index.reshape(-1)
+    score_counts = [
+        np.bincount(raw_scores[pattern_index == k], minlength=int(pattern.sum()) + 1)
+        for k, pattern in enumerate(patterns)
+    ]
+
+    deltas = initial.deltas - initial.deltas.mean()
+    max_changes: List[float] = []
+    converged = False
+    iteration = 0
+
+    for iteration in range(1, max_iterations + 1):
+        expected = np.zeros(matrix.num_items)
+        variance = np.zeros(matrix.num_items)
+
+        for pattern, counts in zip(patterns, score_counts):
+            items = np.flatnonzero(pattern)
+            if items.size == 0:
+                continue
+            easiness = np.exp(-deltas[items])
+            gammas = elementary_symmetric_functions(easiness)
+            if not np.all(np.isfinite(gammas)):
+                raise ValueError("CMLE overflow in elementary symmetric functions; use JMLE or PAIRWISE")
+
+            scores = np.flatnonzero(counts)
+            scores = scores[(scores > 0) & (scores < items.size)]
+            if scores.size == 0:
+                continue
+
+            # P[r, i] = ε_i γ_{r-1}^(i) / γ_r
+            probabilities = (
+                easiness[None, :] * gammas[1:, scores - 1].T / gammas[0, scores][:, None]
+            )
+            weights = counts[scores][:, None]
+            expected[items] += (weights * probabilities).sum(axis=0)
+            variance[items] += (weights * probabilities * (1 - probabilities)).sum(axis=0)
+
+        step = np.divide(
+            observed_totals - expected, variance,
+            out=np.zeros_like(deltas), where=variance > rasch_engine.MIN_VARIANCE,
+        )
+        new_deltas = deltas - step
+        new_deltas -= new_deltas.mean()
+
+        max_change = float(np.abs(new_deltas - deltas).max(initial=0.0))
+        max_changes.append(max_change)
+        deltas = new_deltas
+
+        if on_iteration:
+            on_iteration(iteration, max_change)
+        if max_change < convergence_threshold:
+            converged = True
+            break
+
+    thetas = estimate_abilities(
+        matrix, initial.thetas.copy(), deltas, non_extreme,
+        convergence_threshold, max_iterations,
+    )
+    return _finish(
+        matrix, initial, thetas, deltas,
+        iteration if converged else max_iterations, converged, max_changes,
+    )
+
+
+ESTIMATORS: Dict[str, Callable[..., JMLEResult]] = {
+    ESTIMATOR_JMLE: rasch_engine.run_jmle,
+    ESTIMATOR_PROX: run_prox,
+    ESTIMATOR_PAIRWISE: run_pairwise,
+    ESTIMATOR_CMLE: run_cmle,
+}
+
+
+def get_estimator(name: Optional[str]) -> Callable[..., JMLEResult]:
+    """Estimator function berdasarkan nama (default JMLE)"""
+    name = getattr(name, 'value', name) or ESTIMATOR_JMLE
+    try:
+        return ESTIMATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown Rasch estimator: {name}")
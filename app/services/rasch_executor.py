@@ -0,0 +1,381 @@
+"""
+Rasch Local Executor
+
+Fallback tanpa broker: ketika Celery tidak tersedia, analisis dijalankan di
+ProcessPoolExecutor lokal alih-alih di thread gunicorn yang melayani request.
+Request langsung mendapat 202 + analysis_id; JMLE berjalan di child process
+dengan Flask app dan DB session sendiri (create_worker_app).
+
+    - Jumlah child process dibatasi RASCH_LOCAL_WORKERS (0 = nonaktif,
+      kembali ke eksekusi sync di request)
+    - Jumlah analisis in-flight (berjalan + antre) dibatasi
+      RASCH_LOCAL_QUEUE_LIMIT; di atas itu submit ditolak dengan
+      RaschQueueFullError (back-pressure, endpoint menjawab 503)
+
+Child process memakai start method 'spawn' supaya tidak mewarisi connection
+pool dan thread milik proses web. Debounce auto-trigger ditunggu di proses
+web (threading.Timer) sehingga slot child tidak terpakai untuk sleep.
+Analisis yang dibatalkan (shutdown) atau child-nya crash sebelum mulai
+dikembalikan dari QUEUED ke PENDING supaya bisa di-trigger ulang.
+
+Analisis DIF (submit_dif) memakai pool dan queue limit yang sama; DIF yang
+tidak jalan ditandai FAILED (request DIF berikutnya membuat row baru).
+
+run_analyses_in_pool() memakai child yang sama untuk nightly batch: beberapa
+analisis dijalankan paralel dan hasilnya ditunggu.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import Flask, current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_QUEUE_LIMIT = 8
+
+# Config yang diteruskan ke child (sisanya dibaca child dari environment)
+FORWARDED_CONFIG_PREFIXES = ('SQLALCHEMY_', 'RASCH_')
+
+# Jenis job di pool; key in-flight = (jenis, id)
+ANALYSIS_JOB = 'analysis'
+DIF_JOB = 'dif'
+
+
+class RaschQueueFullError(Exception):
+    """Local executor penuh; analisis tidak diterima"""
+
+
+# ------------------------------------------------------------------
+# Child process
+# ------------------------------------------------------------------
+
+_child_app = None
+
+
+def _init_child(config: dict):
+    """Initializer child process: satu worker app per process"""
+    global _child_app
+    from app import create_worker_app
+    _child_app = create_worker_app(config)
+
+
+def _forwarded_config(config) -> dict:
+    return {
+        key: value for key, value in config.items()
+        if key.startswith(FORWARDED_CONFIG_PREFIXES)
+    }
+
+
+def _new_pool(max_workers: int, config: dict) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_child,
+        initargs=(config,),
+    )
+
+
+def _run_in_child(analysis_id: int) -> dict:
+    from app.workers.rasch_worker import run_rasch_analysis_task
+
+    with _child_app.app_context():
+        return run_rasch_analysis_task(analysis_id)
+
+
+def _run_dif_in_child(dif_id: int) -> bool:
+    from app.services.rasch_dif import run_dif_analysis
+
+    with _child_app.app_context():
+        return run_dif_analysis(dif_id)
+
+
+_JOB_FUNCTIONS = {ANALYSIS_JOB: _run_in_child, DIF_JOB: _run_dif_in_child}
+
+
+# ------------------------------------------------------------------
+# Executor
+# ------------------------------------------------------------------
+
+class LocalAnalysisExecutor:
+    """
+    Bounded process pool untuk Rasch analysis.
+
+    Usage:
+        executor = get_local_executor()
+        executor.submit(analysis_id)
+        executor.submit_dif(dif_id)
+
+    Future yang dikembalikan submit() milik executor (bukan future pool),
+    jadi analisis yang masih menunggu debounce bisa dibatalkan dan
+    di-dedupe dengan cara yang sama.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        queue_limit: int = DEFAULT_QUEUE_LIMIT,
+        config: Optional[dict] = None,
+        app: Optional[Flask] = None,
+    ):
+        self.max_workers = max_workers
+        self.queue_limit = max(queue_limit, max_workers)
+        self.config = config or {}
+        # App proses web, untuk mengembalikan status analysis yang tidak jalan
+        self.app = app
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[Tuple[str, int], Future] = {}
+        self._timers: Dict[Tuple[str, int], threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = _new_pool(self.max_workers, self.config)
+        return self._pool
+
+    def submit(self, analysis_id: int, delay: float = 0) -> Future:
+        """
+        Jadwalkan analisis di child process.
+
+        Analysis yang sudah in-flight (termasuk yang menunggu debounce) tidak
+        dijadwalkan dua kali.
+
+        Args:
+            analysis_id: RaschAnalysis.id
+            delay: debounce dalam detik, sama seperti countdown di Celery
+
+        Raises:
+            RaschQueueFullError: jika jumlah analisis in-flight sudah di limit
+        """
+        return self._submit((ANALYSIS_JOB, analysis_id), delay)
+
+    def submit_dif(self, dif_id: int) -> Future:
+        """
+        Jadwalkan analisis DIF (RaschDifAnalysis.id) di child process.
+
+        Raises:
+            RaschQueueFullError: jika jumlah job in-flight sudah di limit
+        """
+        return self._submit((DIF_JOB, dif_id))
+
+    def _submit(self, key: Tuple[str, int], delay: float = 0) -> Future:
+        with self._lock:
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing
+            if len(self._in_flight) >= self.queue_limit:
+                raise RaschQueueFullError(
+                    f"Antrian analisis lokal penuh ({self.queue_limit}), coba lagi nanti"
+                )
+            future = Future()
+            self._in_flight[key] = future
+            if delay > 0:
+                timer = threading.Timer(delay, self._dispatch, (key, future, True))
+                timer.daemon = True
+                self._timers[key] = timer
+
+        future.add_done_callback(lambda f: self._on_done(key, f))
+        kind, job_id = key
+        if delay > 0:
+            timer.start()
+            logger.info(f"Rasch {kind} {job_id} scheduled on local executor in {delay}s")
+        else:
+            self._dispatch(key, future)
+            logger.info(f"Rasch {kind} {job_id} submitted to local executor")
+        return future
+
+    def _dispatch(self, key: Tuple[str, int], future: Future, delayed: bool = False):
+        """Kirim job ke pool; hasil pool diteruskan ke future executor"""
+        kind, job_id = key
+        with self._lock:
+            if delayed and self._timers.pop(key, None) is None:
+                # Dibatalkan selama debounce
+                return
+            try:
+                pool_future = self._get_pool().submit(_JOB_FUNCTIONS[kind], job_id)
+            except RuntimeError as e:
+                # Pool broken atau sedang shutdown
+                pool_future, error = None, e
+
+        if pool_future is None:
+            future.set_exception(error)
+            return
+        pool_future.add_done_callback(lambda f: _transfer(f, future))
+
+    def _on_done(self, key: Tuple[str, int], future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        kind, job_id = key
+        if future.cancelled():
+            error = "dibatalkan sebelum berjalan"
+        else:
+            error = future.exception()
+            if error is None:
+                return
+            # Child mati (mis. OOM). Analysis yang sudah PROCESSING diurus janitor
+            # lewat heartbeat; yang belum mulai dikembalikan ke PENDING.
+            logger.error(f"Local Rasch {kind} {job_id} crashed: {error}")
+            with self._lock:
+                if self._pool is not None and getattr(self._pool, '_broken', False):
+                    self._pool = None
+
+        if kind == DIF_JOB:
+            self._fail_dif(job_id, f"DIF analysis tidak berjalan: {error}")
+        elif future.cancelled():
+            self._reset_queued(job_id, "Analysis dibatalkan sebelum berjalan")
+        else:
+            self._reset_queued(job_id, "Analysis gagal dijalankan, menunggu trigger berikutnya")
+
+    def _fail_dif(self, dif_id: int, message: str):
+        """DIF yang belum selesai ditandai FAILED; request DIF baru membuat row baru"""
+        if self.app is None:
+            logger.warning(f"DIF analysis {dif_id} left unfinished: no app to update status")
+            return
+
+        from datetime import datetime
+        from app import db
+        from app.models.rasch import RaschAnalysisStatus, RaschDifAnalysis
+
+        try:
+            with self.app.app_context():
+                db.session.query(RaschDifAnalysis).filter(
+                    RaschDifAnalysis.id == dif_id,
+                    RaschDifAnalysis.status.in_([
+                        RaschAnalysisStatus.QUEUED.value, RaschAnalysisStatus.PROCESSING.value,
+                    ]),
+                ).update({
+                    'status': RaschAnalysisStatus.FAILED.value,
+                    'error_message': message,
+                    'completed_at': datetime.utcnow(),
+                }, synchronize_session=False)
+                db.session.commit()
+        except Exception as e:
+            logger.error(f"Failed to mark DIF analysis {dif_id} as failed: {e}")
+
+    def _reset_queued(self, analysis_id: int, message: str):
+        """QUEUED -> PENDING untuk analysis yang tidak akan dijalankan future-nya"""
+        if self.app is None:
+            logger.warning(f"Rasch analysis {analysis_id} left QUEUED: no app to reset status")
+            return
+
+        from app import db
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+
+        try:
+            with self.app.app_context():
+                reset = db.session.query(RaschAnalysis).filter_by(
+                    id=analysis_id, status=RaschAnalysisStatus.QUEUED.value,
+                ).update({
+                    'status': RaschAnalysisStatus.PENDING.value,
+                    'status_message': message,
+                }, synchronize_session=False)
+                db.session.commit()
+            if reset:
+                logger.info(f"Rasch analysis {analysis_id} reset to PENDING: {message}")
+        except Exception as e:
+            logger.error(f"Failed to reset Rasch analysis {analysis_id} to PENDING: {e}")
+
+    def shutdown(self, wait: bool = False):
+        """
+        Hentikan pool. Analysis yang masih menunggu debounce selalu dibatalkan;
+        tanpa wait, analysis yang belum mulai di pool juga dibatalkan.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            timers, self._timers = self._timers, {}
+            waiting = [self._in_flight[key] for key in timers if key in self._in_flight]
+        for timer in timers.values():
+            timer.cancel()
+        for future in waiting:
+            future.cancel()
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _transfer(source: Future, target: Future):
+    """Teruskan hasil future pool ke future executor"""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+_executor: Optional[LocalAnalysisExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_local_executor() -> Optional[LocalAnalysisExecutor]:
+    """
+    Executor per proses sesuai RASCH_LOCAL_WORKERS / RASCH_LOCAL_QUEUE_LIMIT.
+
+    Returns:
+        None jika RASCH_LOCAL_WORKERS = 0 (fallback sync di request)
+    """
+    global _executor
+    config = current_app.config if has_app_context() else {}
+    max_workers = int(config.get('RASCH_LOCAL_WORKERS', DEFAULT_MAX_WORKERS))
+    if max_workers <= 0:
+        return None
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = LocalAnalysisExecutor(
+                max_workers=max_workers,
+                queue_limit=int(config.get('RASCH_LOCAL_QUEUE_LIMIT', DEFAULT_QUEUE_LIMIT)),
+                config=_forwarded_config(config),
+                app=current_app._get_current_object() if has_app_context() else None,
+            )
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
+def run_analyses_in_pool(
+    analysis_ids: Iterable[int],
+    max_workers: int,
+    config: Optional[dict] = None,
+) -> Dict[int, dict]:
+    """
+    Jalankan beberapa analisis paralel di child process dan tunggu semuanya.
+
+    Urutan analysis_ids dipertahankan saat submit, jadi caller bisa
+    mendahulukan analisis terbesar supaya wall time lebih pendek.
+
+    Returns:
+        dict: analysis_id -> result dict dari run_rasch_analysis_task
+    """
+    analysis_ids = list(analysis_ids)
+    if not analysis_ids:
+        return {}
+    if config is None:
+        config = _forwarded_config(current_app.config) if has_app_context() else {}
+
+    results: Dict[int, dict] = {}
+    with _new_pool(max(1, min(max_workers, len(analysis_ids))), config) as pool:
+        futures = {pool.submit(_run_in_child, analysis_id): analysis_id for analysis_id in analysis_ids}
+        for future in as_completed(futures):
+            analysis_id = futures[future]
+            try:
+                results[analysis_id] = future.result()
+            except Exception as e:
+                logger.error(f"Batch Rasch analysis {analysis_id} crashed: {e}")
+                results[analysis_id] = {'status': 'failed', 'analysis_id': analysis_id, 'error': str(e)}
+    return results
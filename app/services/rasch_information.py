@@ -0,0 +1,183 @@
+"""
+Rasch Test Information Function
+
+Kurva informasi tes I(theta) dan conditional standard error of measurement
+SEM(theta) = 1 / sqrt(I(theta)) dari item measures tersimpan, supaya guru
+bisa melihat di rentang ability mana kuis mengukur dengan presisi.
+
+    - Item dichotomous: I_i(theta) = P(1 - P) dengan delta tersimpan
+    - Item partial credit: I_i(theta) = variance skor model, dari thresholds
+      di RaschRatingScale (scale_name "question_<id>")
+    - Seluruh grid theta × item dihitung dalam satu vectorized pass
+
+Hasil di-cache per analysis (Flask-Caching). Entry cache menyimpan
+completed_at analysis; re-run menghapus entry (invalidate) dan entry yang
+tertinggal di proses lain tidak dipakai karena completed_at berbeda.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app import db
+from app.extensions import cache
+from app.models.rasch import RaschAnalysis, RaschItemMeasure, RaschRatingScale
+from app.services import rasch_engine, rasch_pcm
+
+logger = logging.getLogger(__name__)
+
+# Grid theta: minimal -4..4, diperlebar sampai GRID_MARGIN di luar delta terjauh
+GRID_RANGE = (-4.0, 4.0)
+GRID_MARGIN = 2.0
+GRID_STEP = 0.1
+# Rentang "presisi": SEM <= TARGET_SEM logit (~reliability 0.75 untuk SD person 1)
+TARGET_SEM = 0.5
+CACHE_TIMEOUT = 3600  # detik
+RATING_SCALE_PREFIX = 'question_'
+
+
+def cache_key(analysis_id: int) -> str:
+    return f'rasch:information:{analysis_id}'
+
+
+def invalidate(analysis_id: int):
+    """Hapus kurva cached; dipanggil setiap kali hasil analysis ditulis ulang"""
+    cache.delete(cache_key(analysis_id))
+
+
+def theta_grid(deltas: np.ndarray) -> np.ndarray:
+    """Grid theta dengan langkah GRID_STEP yang mencakup semua item"""
+    low = min(GRID_RANGE[0], np.floor(deltas.min(initial=0.0) - GRID_MARGIN))
+    high = max(GRID_RANGE[1], np.ceil(deltas.max(initial=0.0) + GRID_MARGIN))
+    points = int(round((high - low) / GRID_STEP)) + 1
+    return np.linspace(low, high, points)
+
+
+def information_function(
+    grid: np.ndarray,
+    deltas: np.ndarray,
+    thresholds: Optional[np.ndarray] = None,
+    max_scores: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Test information pada setiap titik grid.
+
+    Args:
+        grid: (G,) nilai theta
+        deltas: (I,) item difficulties dichotomous
+        thresholds: (J, K) step difficulties item partial credit (optional)
+        max_scores: (J,) kategori tertinggi per item partial credit
+
+    Returns:
+        (G,) jumlah informasi semua item
+    """
+    probabilities = rasch_engine.probability_matrix(grid, deltas)
+    information = (probabilities * (1.0 - probabilities)).sum(axis=1)
+
+    if thresholds is not None and len(thresholds):
+        category_probabilities = rasch_pcm.category_probabilities(grid, thresholds, max_scores)
+        _, variances = rasch_pcm.score_moments(category_probabilities)
+        information += variances.sum(axis=1)
+
+    return information
+
+
+def _precise_range(grid: np.ndarray, sem: np.ndarray) -> Optional[Dict[str, float]]:
+    """Rentang theta (titik grid terluar) dengan SEM <= TARGET_SEM"""
+    precise = np.flatnonzero(sem <= TARGET_SEM)
+    if precise.size == 0:
+        return None
+    return {'min': round(float(grid[precise[0]]), 3), 'max': round(float(grid[precise[-1]]), 3)}
+
+
+def build_information_curve(
+    difficulties: Dict[int, float],
+    rating_scales: Optional[Dict[int, List[float]]] = None,
+) -> Optional[dict]:
+    """
+    Kurva informasi dari item measures.
+
+    Args:
+        difficulties: question_id -> delta
+        rating_scales: question_id -> thresholds untuk item partial credit
+
+    Returns:
+        dict kurva, atau None jika tidak ada item
+    """
+    if not difficulties:
+        return None
+    rating_scales = rating_scales or {}
+
+    dichotomous = np.array(
+        [delta for question_id, delta in difficulties.items() if question_id not in rating_scales],
+        dtype=np.float64,
+    )
+    polytomous = [rating_scales[question_id] for question_id in difficulties if question_id in rating_scales]
+    thresholds = max_scores = None
+    if polytomous:
+        max_scores = np.array([len(steps) for steps in polytomous])
+        thresholds = np.zeros((len(polytomous), int(max_scores.max())))
+        for j, steps in enumerate(polytomous):
+            thresholds[j, :len(steps)] = steps
+
+    locations = np.concatenate([dichotomous] + [np.asarray(steps, dtype=np.float64) for steps in polytomous])
+    grid = theta_grid(locations)
+    information = information_function(grid, dichotomous, thresholds, max_scores)
+    with np.errstate(divide='ignore'):
+        sem = 1.0 / np.sqrt(information)
+
+    peak = int(np.argmax(information))
+    return {
+        'theta': [round(float(t), 3) for t in grid],
+        'information': [round(float(i), 6) for i in information],
+        # SEM tak terhingga (informasi 0) dikirim sebagai null
+        'sem': [round(float(s), 6) if np.isfinite(s) else None for s in sem],
+        'peak_theta': round(float(grid[peak]), 3),
+        'max_information': round(float(information[peak]), 6),
+        'min_sem': round(float(sem[peak]), 6) if np.isfinite(sem[peak]) else None,
+        'target_sem': TARGET_SEM,
+        'precise_range': _precise_range(grid, sem),
+        'num_items': len(difficulties),
+        'num_polytomous': len(polytomous),
+    }
+
+
+def _load_curve(analysis: RaschAnalysis) -> Optional[dict]:
+    difficulties = {
+        question_id: float(delta)
+        for question_id, delta in db.session.query(
+            RaschItemMeasure.question_id, RaschItemMeasure.delta,
+        ).filter(
+            RaschItemMeasure.rasch_analysis_id == analysis.id,
+            RaschItemMeasure.delta.isnot(None),
+        )
+    }
+    rating_scales = {}
+    for scale_name, thresholds in db.session.query(
+        RaschRatingScale.scale_name, RaschRatingScale.thresholds,
+    ).filter(RaschRatingScale.rasch_analysis_id == analysis.id):
+        if scale_name.startswith(RATING_SCALE_PREFIX) and thresholds:
+            rating_scales[int(scale_name[len(RATING_SCALE_PREFIX):])] = thresholds
+
+    return build_information_curve(difficulties, rating_scales)
+
+
+def get_information_curve(analysis: RaschAnalysis) -> Optional[dict]:
+    """
+    Kurva informasi analysis, dari cache jika masih sesuai dengan hasil
+    terakhir.
+
+    Returns:
+        None jika analysis belum punya item measures
+    """
+    version = analysis.completed_at.isoformat() if analysis.completed_at else None
+    cached = cache.get(cache_key(analysis.id))
+    if cached is not None and cached.get('version') == version:
+        return cached['curve']
+
+    curve = _load_curve(analysis)
+    if curve is not None:
+        cache.set(cache_key(analysis.id), {'version': version, 'curve': curve}, timeout=CACHE_TIMEOUT)
+        logger.debug(f"Cached information curve for analysis {analysis.id}")
+    return curve
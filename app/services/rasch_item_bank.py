@@ -0,0 +1,246 @@
+"""
+Rasch Item Bank
+
+Kalibrasi item yang persisten lintas analisis dan quiz (RaschItemBank).
+Setelah setiap analisis completed, delta/SE terbaru, exposure count, dan
+fit history setiap item ditulis ke bank secara incremental (hanya item
+dalam analisis itu). Warm start quiz baru dan anchored scoring membaca
+difficulty dari bank dengan satu query terindeks alih-alih menjalankan
+ulang JMLE.
+
+Soal salinan (duplicate question, quiz yang disalin) dikenali lewat
+content fingerprint: hash dari tipe, teks, poin, dan opsi soal yang
+dinormalisasi (tag HTML, spasi, huruf besar/kecil, urutan opsi, dan sufiks
+"(Salinan)" diabaikan). Resolusi per soal:
+    - Entry milik soal itu sendiri, selama kontennya belum diedit
+    - Entry soal asal dengan fingerprint yang sama
+Soal yang diedit setelah kalibrasi tidak memakai entry lamanya sampai
+dikalibrasi ulang.
+
+Delta tersimpan adalah delta_centered analisis sumber (delta JMLE dikurangi
+mean delta semua item analisis itu), jadi setiap kalibrasi berpusat di 0;
+delta mentah JMLE tidak dipusatkan. Pemakai menggeser nilai bank ke skala
+analisisnya sendiri lewat item yang sama.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_
+
+from app import db
+from app.models.quiz import Option, Question
+from app.models.rasch import RaschAnalysis, RaschItemBank
+
+logger = logging.getLogger(__name__)
+
+FIT_HISTORY_LIMIT = 20  # kalibrasi terakhir yang disimpan per item
+# Warm start dari bank hanya jika bank mencakup minimal proporsi item ini
+WARM_START_MIN_COVERAGE = 0.5
+COPY_SUFFIX = re.compile(r'(\s*\(salinan\))+$')
+HTML_TAG = re.compile(r'<[^>]+>')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Teks soal/opsi untuk fingerprint: tanpa tag HTML, spasi ganda, dan sufiks salinan"""
+    text = ' '.join(HTML_TAG.sub(' ', text or '').split()).casefold()
+    return COPY_SUFFIX.sub('', text)
+
+
+def content_fingerprint(question_type: str, text: str, points: int, options: Iterable[Tuple[str, bool]]) -> str:
+    """SHA-256 hex dari konten soal; options: (option_text, is_correct)"""
+    payload = json.dumps([
+        question_type,
+        normalize_text(text),
+        points,
+        # Urutan opsi tidak mengubah item
+        sorted([normalize_text(option_text), bool(is_correct)] for option_text, is_correct in options),
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def question_fingerprints(question_ids: Iterable[int]) -> Dict[int, str]:
+    """question_id -> content fingerprint (dua query: soal dan opsi)"""
+    question_ids = list(question_ids)
+    if not question_ids:
+        return {}
+
+    options: Dict[int, List[Tuple[str, bool]]] = {}
+    for question_id, option_text, is_correct in db.session.query(
+        Option.question_id, Option.option_text, Option.is_correct,
+    ).filter(Option.question_id.in_(question_ids)):
+        options.setdefault(question_id, []).append((option_text, is_correct))
+
+    fingerprints = {}
+    for question_id, question_type, text, points in db.session.query(
+        Question.id, Question.question_type, Question.question_text, Question.points,
+    ).filter(Question.id.in_(question_ids)):
+        type_name = question_type.value if hasattr(question_type, 'value') else str(question_type)
+        fingerprints[question_id] = content_fingerprint(
+            type_name, text, points, options.get(question_id, [])
+        )
+    return fingerprints
+
+
+def _load_entries(fingerprints: Dict[int, str]) -> Tuple[Dict[int, RaschItemBank], Dict[str, RaschItemBank]]:
+    """
+    Satu query terindeks (question_id unik atau content_fingerprint).
+
+    Returns:
+        (entry per question_id, entry asal per fingerprint); jika beberapa
+        entry punya fingerprint sama, dipilih yang exposure-nya terbesar
+    """
+    if not fingerprints:
+        return {}, {}
+
+    entries = RaschItemBank.query.filter(or_(
+        RaschItemBank.question_id.in_(list(fingerprints)),
+        RaschItemBank.content_fingerprint.in_(set(fingerprints.values())),
+    )).all()
+
+    by_question = {entry.question_id: entry for entry in entries}
+    by_fingerprint: Dict[str, RaschItemBank] = {}
+    for entry in sorted(entries, key=lambda e: (-e.exposure_count, e.id)):
+        by_fingerprint.setdefault(entry.content_fingerprint, entry)
+    return by_question, by_fingerprint
+
+
+def resolve_entries(question_ids: Iterable[int]) -> Dict[int, RaschItemBank]:
+    """question_id -> entry bank yang berlaku (milik sendiri atau soal asal)"""
+    fingerprints = question_fingerprints(question_ids)
+    by_question, by_fingerprint = _load_entries(fingerprints)
+
+    resolved = {}
+    for question_id, fingerprint in fingerprints.items():
+        entry = by_question.get(question_id)
+        if entry is None or entry.content_fingerprint != fingerprint:
+            entry = by_fingerprint.get(fingerprint)
+        if entry is not None and entry.delta is not None:
+            resolved[question_id] = entry
+    return resolved
+
+
+def lookup_difficulties(question_ids: Iterable[int]) -> Dict[int, float]:
+    """question_id -> delta dari bank; soal tanpa kalibrasi tidak disertakan"""
+    return {
+        question_id: float(entry.delta)
+        for question_id, entry in resolve_entries(question_ids).items()
+    }
+
+
+def align_to_scale(bank_deltas: Dict[int, float], reference: Dict[int, float]) -> Dict[int, float]:
+    """
+    Geser delta bank ke skala reference.
+
+    Offset = mean(reference - bank) atas item yang ada di keduanya; tanpa
+    item bersama nilai bank (berpusat di 0, lihat record_analysis) dipakai
+    apa adanya.
+    """
+    common = [qid for qid in bank_deltas if qid in reference]
+    offset = (
+        sum(reference[qid] - bank_deltas[qid] for qid in common) / len(common)
+        if common else 0.0
+    )
+    return {qid: delta + offset for qid, delta in bank_deltas.items()}
+
+
+def _finite(value) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return round(value, 6) if math.isfinite(value) else None
+
+
+def record_analysis(analysis: RaschAnalysis, items: List[dict], exposures: Dict[int, int]) -> int:
+    """
+    Tulis kalibrasi analysis ke item bank (incremental, satu commit).
+
+    Re-run analysis yang sama mengganti entry fit history-nya dan tidak
+    menghitung exposure dua kali. Kegagalan hanya di-log; hasil analisis
+    sudah tersimpan.
+
+    Args:
+        analysis: RaschAnalysis yang baru completed
+        items: dict per item dengan question_id, delta_centered, delta_se, infit_mnsq, outfit_mnsq
+        exposures: question_id -> jumlah responden di analysis ini
+
+    Returns:
+        Jumlah entry bank yang diperbarui
+    """
+    try:
+        fingerprints = question_fingerprints(item['question_id'] for item in items)
+        by_question, by_fingerprint = _load_entries(fingerprints)
+        calibrated_at = analysis.completed_at
+        used = set()
+        updated = 0
+
+        for item in items:
+            question_id = item['question_id']
+            fingerprint = fingerprints.get(question_id)
+            # Delta mentah bergantung pada titik nol analysis; bank menyimpan versi centered
+            delta = _finite(item['delta_centered'])
+            if fingerprint is None or delta is None:
+                continue
+
+            entry = by_question.get(question_id)
+            if entry is None:
+                # Salinan memperbarui entry asalnya, kecuali soal asal (atau
+                # salinan lain) juga dikalibrasi di analysis ini
+                origin = by_fingerprint.get(fingerprint)
+                if origin is not None and origin.question_id not in fingerprints and id(origin) not in used:
+                    entry = origin
+            if entry is None:
+                entry = RaschItemBank(
+                    question_id=question_id,
+                    content_fingerprint=fingerprint,
+                    exposure_count=0,
+                    calibration_count=0,
+                )
+                db.session.add(entry)
+                by_question[question_id] = entry
+                by_fingerprint.setdefault(fingerprint, entry)
+            if entry.question_id == question_id:
+                # Konten soal bisa diedit sejak kalibrasi terakhir
+                entry.content_fingerprint = fingerprint
+            used.add(id(entry))
+
+            persons = int(exposures.get(question_id, 0))
+            history = []
+            for record in entry.fit_history or []:
+                if record['analysis_id'] == analysis.id:
+                    entry.exposure_count -= record['persons']
+                    entry.calibration_count -= 1
+                else:
+                    history.append(record)
+            history.append({
+                'analysis_id': analysis.id,
+                'question_id': question_id,
+                'delta': delta,
+                'delta_se': _finite(item.get('delta_se')),
+                'infit_mnsq': _finite(item.get('infit_mnsq')),
+                'outfit_mnsq': _finite(item.get('outfit_mnsq')),
+                'persons': persons,
+                'calibrated_at': calibrated_at.isoformat() if calibrated_at else None,
+            })
+
+            entry.fit_history = history[-FIT_HISTORY_LIMIT:]
+            entry.exposure_count = max(0, entry.exposure_count) + persons
+            entry.calibration_count = max(0, entry.calibration_count) + 1
+            entry.delta = delta
+            entry.delta_se = _finite(item.get('delta_se'))
+            entry.last_analysis_id = analysis.id
+            entry.calibrated_at = calibrated_at
+            updated += 1
+
+        db.session.commit()
+        logger.info(f"Item bank updated from analysis {analysis.id}: {updated} items")
+        return updated
+
+    except Exception as e:
+        logger.error(f"Error updating item bank from analysis {analysis.id}: {e}", exc_info=True)
+        db.session.rollback()
+        return 0
@@ -0,0 +1,392 @@
+"""
+Rasch Partial Credit Model Engine
+
+Polytomous Rasch (Partial Credit Model, Masters 1982) di atas layout
+array yang sama dengan rasch_engine: responses berisi kategori skor
+0..m_i per person × item, observed adalah missing-data mask.
+
+Model:
+    P(X_ni = k) ∝ exp(Σ_{j=1..k} (theta_n - delta_ij)),  k = 0..m_i
+
+delta_ij adalah step difficulty (threshold) ke-j item i; lokasi item
+(delta_i) adalah rata-rata thresholds-nya. Untuk m_i = 1 model ini sama
+dengan dichotomous Rasch.
+
+Probabilitas kategori untuk semua persons × items × categories dihitung
+dalam satu batched array (persons × items × (K + 1)), sehingga kalibrasi
+polytomous sama cepatnya dengan dichotomous JMLE.
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services import rasch_engine
+from app.services.rasch_engine import (
+    FitStatistics,
+    InitialMeasures,
+    JMLEResult,
+    ResponseMatrix,
+)
+
+logger = logging.getLogger(__name__)
+
+# Batas Newton step per iterasi (logit) dan batas nilai threshold
+MAX_STEP = 1.0
+THRESHOLD_BOUND = 10.0
+# Pseudo-count untuk inisialisasi thresholds dari frekuensi kategori
+CATEGORY_SMOOTHING = 0.5
+
+
+def effective_max_scores(matrix: ResponseMatrix, max_scores: np.ndarray) -> np.ndarray:
+    """
+    Kategori tertinggi yang benar-benar teramati per item (minimal 1).
+
+    Kategori atas yang tidak pernah dipakai tidak bisa diestimasi, jadi
+    tidak ikut dalam model.
+    """
+    observed_max = np.where(matrix.observed, matrix.responses, 0).max(axis=0, initial=0)
+    return np.clip(np.minimum(max_scores, observed_max), 1, None).astype(np.int64)
+
+
+def category_mask(max_scores: np.ndarray) -> np.ndarray:
+    """bool (items × (K + 1)): True untuk kategori 0..m_i yang valid"""
+    categories = np.arange(int(max_scores.max(initial=1)) + 1)
+    return categories[None, :] <= max_scores[:, None]
+
+
+def category_probabilities(
+    thetas: np.ndarray,
+    thresholds: np.ndarray,
+    max_scores: np.ndarray,
+) -> np.ndarray:
+    """
+    P(X_ni = k) untuk semua persons × items × categories.
+
+    Args:
+        thetas: (N,)
+        thresholds: (I, K) step difficulties; kolom > m_i diabaikan
+        max_scores: (I,) kategori tertinggi per item
+
+    Returns:
+        (N, I, K + 1) array; kategori tidak valid bernilai 0
+    """
+    n_items, n_steps = thresholds.shape
+    valid = category_mask(max_scores)
+
+    # Σ_{j≤k} delta_ij, dengan 0 untuk k = 0
+    cumulative = np.zeros((n_items, n_steps + 1))
+    cumulative[:, 1:] = np.cumsum(np.where(valid[:, 1:], thresholds, 0.0), axis=1)
+
+    categories = np.arange(n_steps + 1)
+    logits = categories[None, None, :] * thetas[:, None, None] - cumulative[None, :, :]
+    logits = np.where(valid[None, :, :], logits, -np.inf)
+    logits -= logits.max(axis=2, keepdims=True)
+
+    weights = np.exp(logits)
+    return weights / weights.sum(axis=2, keepdims=True)
+
+
+def score_moments(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Expected score dan variance per person × item"""
+    categories = np.arange(probabilities.shape[2])
+    expected = (probabilities * categories).sum(axis=2)
+    second_moment = (probabilities * categories ** 2).sum(axis=2)
+    return expected, np.maximum(second_moment - expected ** 2, 0.0)
+
+
+def _max_raw_scores(matrix: ResponseMatrix, max_scores: np.ndarray) -> np.ndarray:
+    """Skor maksimum yang mungkin per person (dari item yang dijawab)"""
+    return matrix.observed @ max_scores.astype(np.float64)
+
+
+def initialize_measures(matrix: ResponseMatrix, max_scores: np.ndarray) -> InitialMeasures:
+    """
+    Initialize ability dari proporsi skor dan lokasi item dari rata-rata skor.
+
+    Extreme persons: skor 0 atau skor maksimum dari item yang dijawab.
+    """
+    max_scores = effective_max_scores(matrix, max_scores)
+    raw_scores = matrix.raw_scores
+    max_raw = _max_raw_scores(matrix, max_scores)
+
+    extreme_low = raw_scores == 0
+    extreme_high = raw_scores >= max_raw
+
+    thetas = np.zeros(matrix.num_persons)
+    thetas[extreme_low] = -4.0
+    thetas[extreme_high] = 4.0
+    non_extreme = ~(extreme_low | extreme_high)
+    p = raw_scores[non_extreme] / max_raw[non_extreme]
+    thetas[non_extreme] = np.log(p / (1 - p))
+
+    counts = matrix.observed.sum(axis=0)
+    mean_scores = np.divide(
+        (matrix.responses * matrix.observed).sum(axis=0), counts * max_scores,
+        out=np.full(matrix.num_items, 0.5), where=counts > 0,
+    )
+    p_items = np.clip(mean_scores, 0.01, 0.99)
+    deltas = np.log((1 - p_items) / p_items)
+
+    return InitialMeasures(thetas, deltas, extreme_low, extreme_high)
+
+
+def initialize_thresholds(
+    matrix: ResponseMatrix,
+    max_scores: np.ndarray,
+    person_mask: np.ndarray,
+) -> np.ndarray:
+    """Step difficulties awal: log rasio frekuensi kategori berdekatan"""
+    n_steps = int(max_scores.max(initial=1))
+    responses = matrix.responses[person_mask]
+    observed = matrix.observed[person_mask]
+
+    frequencies = np.stack([
+        ((responses == k) & observed).sum(axis=0) for k in range(n_steps + 1)
+    ], axis=1).astype(np.float64) + CATEGORY_SMOOTHING
+
+    thresholds = np.log(frequencies[:, :-1] / frequencies[:, 1:])
+    valid = category_mask(max_scores)[:, 1:]
+    return np.where(valid, thresholds, np.nan)
+
+
+def item_locations(thresholds: np.ndarray) -> np.ndarray:
+    """Lokasi item (delta_i) = rata-rata step difficulties yang valid"""
+    return np.nanmean(thresholds, axis=1)
+
+
+def _clip_step(step: np.ndarray) -> np.ndarray:
+    return np.clip(step, -MAX_STEP, MAX_STEP)
+
+
+def update_thresholds(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    thresholds: np.ndarray,
+    max_scores: np.ndarray,
+    person_mask: np.ndarray,
+) -> np.ndarray:
+    """
+    Newton-Raphson untuk semua step difficulties sekaligus (abilities tetap).
+
+    Untuk step k item i:
+        observed = #(x_ni >= k), expected = Σ P(X_ni >= k)
+        delta_ik -= (observed - expected) / Σ P(X>=k)(1 - P(X>=k))
+    """
+    responses = matrix.responses[person_mask]
+    observed = matrix.observed[person_mask]
+    person_thetas = thetas[person_mask]
+    n_steps = thresholds.shape[1]
+    steps = np.arange(1, n_steps + 1)
+    valid = category_mask(max_scores)[:, 1:]
+
+    at_least = (responses[:, :, None] >= steps[None, None, :]) & observed[:, :, None]
+    sum_observed = at_least.sum(axis=0)
+    thresholds = thresholds.copy()
+
+    for _ in range(rasch_engine.NEWTON_STEPS):
+        probabilities = category_probabilities(person_thetas, thresholds, max_scores)
+        # P(X >= k) untuk k = 1..K
+        tail = np.flip(np.cumsum(np.flip(probabilities, axis=2), axis=2), axis=2)[:, :, 1:]
+        tail = tail * observed[:, :, None]
+        sum_expected = tail.sum(axis=0)
+        sum_variance = (tail * (1 - tail)).sum(axis=0)
+
+        active = valid & (sum_variance > rasch_engine.MIN_VARIANCE)
+        if not active.any():
+            break
+        step = np.divide(
+            sum_observed - sum_expected, sum_variance,
+            out=np.zeros_like(sum_variance), where=active,
+        )
+        thresholds = np.where(
+            valid,
+            np.clip(thresholds - _clip_step(step), -THRESHOLD_BOUND, THRESHOLD_BOUND),
+            np.nan,
+        )
+
+    return thresholds
+
+
+def update_person_abilities(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    thresholds: np.ndarray,
+    max_scores: np.ndarray,
+    person_mask: np.ndarray,
+) -> np.ndarray:
+    """Newton-Raphson untuk semua person di person_mask (thresholds tetap)"""
+    responses = matrix.responses[person_mask]
+    observed = matrix.observed[person_mask]
+    sum_observed = (responses * observed).sum(axis=1)
+    person_thetas = thetas[person_mask]
+
+    for _ in range(rasch_engine.NEWTON_STEPS):
+        expected, variance = score_moments(
+            category_probabilities(person_thetas, thresholds, max_scores)
+        )
+        sum_expected = (expected * observed).sum(axis=1)
+        sum_variance = (variance * observed).sum(axis=1)
+
+        active = sum_variance > rasch_engine.MIN_VARIANCE
+        if not active.any():
+            break
+        step = np.divide(
+            sum_observed - sum_expected, sum_variance,
+            out=np.zeros_like(person_thetas), where=active,
+        )
+        person_thetas = person_thetas + _clip_step(step)
+
+    thetas = thetas.copy()
+    thetas[person_mask] = person_thetas
+    return thetas
+
+
+def run_pcm(
+    matrix: ResponseMatrix,
+    initial: InitialMeasures,
+    max_scores: np.ndarray,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: Optional[Callable[[int, float], None]] = None,
+) -> JMLEResult:
+    """
+    JMLE untuk Partial Credit Model.
+
+    Returns:
+        JMLEResult dengan deltas = lokasi item dan thresholds = step
+        difficulties (items × K, NaN untuk kategori di luar m_i)
+    """
+    max_scores = effective_max_scores(matrix, max_scores)
+    non_extreme = initial.non_extreme
+    thetas = initial.thetas.copy()
+    thresholds = initialize_thresholds(matrix, max_scores, non_extreme)
+    max_changes: List[float] = []
+    converged = False
+    iteration = 0
+
+    for iteration in range(1, max_iterations + 1):
+        prev_thetas = thetas[non_extreme]
+        prev_thresholds = thresholds
+
+        thresholds = update_thresholds(matrix, thetas, thresholds, max_scores, non_extreme)
+        thetas = update_person_abilities(matrix, thetas, thresholds, max_scores, non_extreme)
+
+        ability_change = float(np.abs(thetas[non_extreme] - prev_thetas).max(initial=0.0))
+        threshold_change = float(np.nanmax(np.abs(thresholds - prev_thresholds), initial=0.0))
+        max_change = max(ability_change, threshold_change)
+        max_changes.append(max_change)
+
+        if on_iteration:
+            on_iteration(iteration, max_change)
+        if max_change < convergence_threshold:
+            converged = True
+            break
+
+    thetas = rasch_engine.extrapolate_extreme_abilities(
+        thetas, non_extreme, initial.extreme_high, initial.extreme_low
+    )
+    return JMLEResult(
+        thetas=thetas,
+        deltas=item_locations(thresholds),
+        iterations=iteration if converged else max_iterations,
+        converged=converged,
+        max_changes=max_changes,
+        thresholds=thresholds,
+    )
+
+
+def _pearson_with_rest_score(matrix: ResponseMatrix) -> np.ndarray:
+    """Korelasi skor item dengan rest score (raw score tanpa item ini)"""
+    observed = matrix.observed
+    counts = observed.sum(axis=0).astype(np.float64)
+    scores = matrix.responses * observed
+    rest = (matrix.raw_scores[:, None] - scores) * observed
+
+    mean_score = np.divide(scores.sum(axis=0), counts, out=np.zeros_like(counts), where=counts > 0)
+    mean_rest = np.divide(rest.sum(axis=0), counts, out=np.zeros_like(counts), where=counts > 0)
+    score_dev = (scores - mean_score) * observed
+    rest_dev = (rest - mean_rest) * observed
+
+    covariance = (score_dev * rest_dev).sum(axis=0)
+    norm = np.sqrt((score_dev ** 2).sum(axis=0) * (rest_dev ** 2).sum(axis=0))
+    correlation = np.divide(covariance, norm, out=np.zeros_like(covariance), where=norm > 0)
+    return np.clip(correlation, -1.0, 1.0)
+
+
+def calculate_fit_statistics(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    thresholds: np.ndarray,
+    max_scores: np.ndarray,
+) -> FitStatistics:
+    """
+    Fit statistics PCM dalam format yang sama dengan rasch_engine.
+
+    p_values berisi rata-rata skor / skor maksimum item; point_biserial
+    berisi korelasi item-rest (Pearson).
+    """
+    max_scores = effective_max_scores(matrix, max_scores)
+    expected, variance = score_moments(category_probabilities(thetas, thresholds, max_scores))
+
+    observed = matrix.observed
+    counts = observed.sum(axis=0)
+    scores = matrix.responses * observed
+    mean_scores = np.divide(scores.sum(axis=0), counts, out=np.zeros(matrix.num_items), where=counts > 0)
+    mean_sq = np.divide((scores ** 2).sum(axis=0), counts, out=np.zeros(matrix.num_items), where=counts > 0)
+
+    fit = rasch_engine.fit_statistics_from_moments(
+        matrix,
+        expected,
+        variance,
+        p_values=np.divide(
+            mean_scores, max_scores,
+            out=np.full(matrix.num_items, 0.5), where=counts > 0,
+        ),
+        point_biserial=_pearson_with_rest_score(matrix),
+    )
+    fit.item_score_variances = np.maximum(mean_sq - mean_scores ** 2, 0.0)
+    return fit
+
+
+def rating_scale_summaries(
+    matrix: ResponseMatrix,
+    thetas: np.ndarray,
+    thresholds: np.ndarray,
+    max_scores: np.ndarray,
+) -> Dict[int, dict]:
+    """
+    Struktur skala per item polytomous untuk RaschRatingScale.
+
+    Returns:
+        question_id -> {num_categories, thresholds, category_observations,
+        category_averages (rata-rata theta per kategori)}
+    """
+    max_scores = effective_max_scores(matrix, max_scores)
+    summaries = {}
+
+    for j, question_id in enumerate(matrix.item_ids):
+        m = int(max_scores[j])
+        if m < 2:
+            continue
+        observed = matrix.observed[:, j]
+        responses = matrix.responses[observed, j]
+        person_thetas = thetas[observed]
+
+        observations = {}
+        averages = {}
+        for k in range(m + 1):
+            in_category = responses == k
+            observations[str(k)] = int(in_category.sum())
+            if in_category.any():
+                averages[str(k)] = round(float(person_thetas[in_category].mean()), 6)
+
+        summaries[question_id] = {
+            'num_categories': m + 1,
+            'thresholds': [round(float(t), 6) for t in thresholds[j, :m]],
+            'category_observations': observations,
+            'category_averages': averages,
+        }
+
+    return summaries
@@ -0,0 +1,196 @@
+"""
+Rasch Progress Channel
+
+Progress JMLE dipublikasikan di luar database (out of band) supaya iterasi
+tidak melakukan commit ke rasch_analyses setiap kali, dan tidak berebut row
+lock dengan guru yang polling /analyses/<id>/status.
+
+Backend:
+    - Redis hash ``rasch:progress:<analysis_id>`` jika RASCH_PROGRESS_REDIS_URL
+      di-set dan Redis bisa dihubungi
+    - In-memory dict (per proses) sebagai stand-in jika Redis tidak ada
+
+Row rasch_analyses tetap menjadi sumber kebenaran; channel ini hanya berisi
+progress sementara dan di-clear saat analisis selesai atau gagal.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rasch:progress:'
+DEFAULT_INTERVAL = 1.0  # detik
+DEFAULT_TTL = 3600  # detik
+
+
+class InMemoryProgressChannel:
+    """Stand-in per proses ketika Redis tidak tersedia"""
+
+    def __init__(self, ttl: int = DEFAULT_TTL):
+        self.ttl = ttl
+        self._entries: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, analysis_id: int, progress: float, message: str, status: Optional[str] = None):
+        entry = {
+            'progress_percentage': round(float(progress), 2),
+            'status_message': message,
+            'updated_at': time.time(),
+        }
+        if status:
+            entry['status'] = status
+        with self._lock:
+            self._entries[analysis_id] = entry
+
+    def read(self, analysis_id: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(analysis_id)
+            if entry and time.time() - entry['updated_at'] > self.ttl:
+                del self._entries[analysis_id]
+                return None
+            return dict(entry) if entry else None
+
+    def clear(self, analysis_id: int):
+        with self._lock:
+            self._entries.pop(analysis_id, None)
+
+
+class RedisProgressChannel:
+    """Progress disimpan sebagai Redis hash dengan TTL"""
+
+    def __init__(self, client, ttl: int = DEFAULT_TTL):
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, analysis_id: int) -> str:
+        return f"{KEY_PREFIX}{analysis_id}"
+
+    def publish(self, analysis_id: int, progress: float, message: str, status: Optional[str] = None):
+        mapping = {
+            'progress_percentage': round(float(progress), 2),
+            'status_message': message,
+            'updated_at': time.time(),
+        }
+        if status:
+            mapping['status'] = status
+        key = self._key(analysis_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, self.ttl)
+        pipe.execute()
+
+    def read(self, analysis_id: int) -> Optional[dict]:
+        raw = self.client.hgetall(self._key(analysis_id))
+        if not raw:
+            return None
+        entry = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in raw.items()
+        }
+        entry['progress_percentage'] = float(entry.get('progress_percentage', 0))
+        entry['updated_at'] = float(entry.get('updated_at', 0))
+        return entry
+
+    def clear(self, analysis_id: int):
+        self.client.delete(self._key(analysis_id))
+
+
+_channels: Dict[str, object] = {}
+_channels_lock = threading.Lock()
+
+
+def get_progress_channel():
+    """
+    Channel sesuai konfigurasi RASCH_PROGRESS_REDIS_URL.
+
+    Instance di-cache per URL; fallback ke InMemoryProgressChannel jika URL
+    kosong, package redis tidak ada, atau Redis tidak bisa dihubungi.
+    """
+    url = ''
+    ttl = DEFAULT_TTL
+    if has_app_context():
+        url = current_app.config.get('RASCH_PROGRESS_REDIS_URL') or ''
+        ttl = int(current_app.config.get('RASCH_PROGRESS_TTL', DEFAULT_TTL))
+
+    with _channels_lock:
+        channel = _channels.get(url)
+        if channel is not None:
+            return channel
+
+        channel = None
+        if url:
+            try:
+                import redis
+                client = redis.from_url(url, socket_timeout=1)
+                client.ping()
+                channel = RedisProgressChannel(client, ttl=ttl)
+            except Exception as e:
+                logger.warning(f"Redis progress channel unavailable ({e}), using in-memory channel")
+
+        if channel is None:
+            channel = InMemoryProgressChannel(ttl=ttl)
+
+        _channels[url] = channel
+        return channel
+
+
+class ProgressReporter:
+    """
+    Rate-limited progress publisher untuk satu analysis.
+
+    Iterasi pertama dan terakhir selalu dipublikasikan; di antaranya paling
+    sering satu kali per `interval` detik.
+    """
+
+    def __init__(self, analysis_id: int, channel=None, interval: Optional[float] = None):
+        self.analysis_id = analysis_id
+        self.channel = channel if channel is not None else get_progress_channel()
+        if interval is None:
+            interval = DEFAULT_INTERVAL
+            if has_app_context():
+                interval = float(current_app.config.get('RASCH_PROGRESS_INTERVAL', DEFAULT_INTERVAL))
+        self.interval = interval
+        self._last_published: Optional[float] = None
+
+    def report(self, iteration: int, max_iterations: int) -> bool:
+        """
+        Publish progress iterasi jika interval sudah lewat.
+
+        Returns:
+            bool: True jika progress dipublikasikan
+        """
+        now = time.monotonic()
+        is_boundary = iteration <= 1 or iteration >= max_iterations
+        if (
+            not is_boundary
+            and self._last_published is not None
+            and now - self._last_published < self.interval
+        ):
+            return False
+
+        progress = (iteration / max_iterations) * 100 if max_iterations else 0
+        try:
+            self.channel.publish(
+                self.analysis_id,
+                progress,
+                f"Iteration {iteration}/{max_iterations}",
+                status='processing',
+            )
+        except Exception as e:
+            # Progress bersifat informatif; jangan gagalkan analisis
+            logger.warning(f"Failed to publish progress for analysis {self.analysis_id}: {e}")
+            return False
+
+        self._last_published = now
+        return True
+
+    def clear(self):
+        try:
+            self.channel.clear(self.analysis_id)
+        except Exception as e:
+            logger.warning(f"Failed to clear progress for analysis {self.analysis_id}: {e}")
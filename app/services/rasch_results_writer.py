@@ -0,0 +1,123 @@
+"""
+Rasch Results Writer
+
+Bulk persistence untuk RaschPersonMeasure, RaschItemMeasure dan
+RaschRatingScale (Partial Credit Model).
+
+Semua measures ditulis dengan satu executemany INSERT per tabel (bukan satu
+ORM object per baris), dan Bloom levels untuk semua soal di-preload dalam
+satu query. Re-run memakai delete-and-replace: measures lama dihapus dengan
+satu DELETE per tabel di transaksi yang sama dengan INSERT, sehingga hasil
+lama tetap terlihat sampai hasil baru siap.
+
+Writer tidak melakukan commit; caller yang menentukan batas transaksi.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert
+
+from app import db
+from app.models.rasch import (
+    QuestionBloomTaxonomy,
+    RaschItemMeasure,
+    RaschPersonMeasure,
+    RaschRatingScale,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def load_bloom_levels(question_ids: Iterable[int]) -> Dict[int, str]:
+    """question_id -> bloom level value, dalam satu query"""
+    question_ids = list(question_ids)
+    if not question_ids:
+        return {}
+
+    rows = db.session.query(
+        QuestionBloomTaxonomy.question_id,
+        QuestionBloomTaxonomy.bloom_level,
+    ).filter(QuestionBloomTaxonomy.question_id.in_(question_ids))
+
+    return {
+        question_id: getattr(bloom_level, 'value', bloom_level)
+        for question_id, bloom_level in rows
+    }
+
+
+def delete_measures(analysis_id: int) -> Tuple[int, int]:
+    """
+    Hapus semua person dan item measures milik analysis (satu DELETE per tabel).
+
+    Returns:
+        (jumlah person rows, jumlah item rows) yang dihapus
+    """
+    persons = db.session.execute(
+        delete(RaschPersonMeasure).where(RaschPersonMeasure.rasch_analysis_id == analysis_id),
+        execution_options={'synchronize_session': False},
+    )
+    items = db.session.execute(
+        delete(RaschItemMeasure).where(RaschItemMeasure.rasch_analysis_id == analysis_id),
+        execution_options={'synchronize_session': False},
+    )
+    return persons.rowcount, items.rowcount
+
+
+def replace_measures(
+    analysis_id: int,
+    person_rows: List[dict],
+    item_rows: List[dict],
+) -> Tuple[int, int]:
+    """
+    Delete-and-replace semua measures untuk analysis.
+
+    Args:
+        analysis_id: ID RaschAnalysis
+        person_rows: Column mappings untuk RaschPersonMeasure (tanpa rasch_analysis_id)
+        item_rows: Column mappings untuk RaschItemMeasure (tanpa rasch_analysis_id)
+
+    Returns:
+        (jumlah person rows, jumlah item rows) yang ditulis
+    """
+    deleted_persons, deleted_items = delete_measures(analysis_id)
+
+    if person_rows:
+        db.session.execute(
+            insert(RaschPersonMeasure),
+            [dict(row, rasch_analysis_id=analysis_id) for row in person_rows],
+        )
+    if item_rows:
+        db.session.execute(
+            insert(RaschItemMeasure),
+            [dict(row, rasch_analysis_id=analysis_id) for row in item_rows],
+        )
+
+    logger.info(
+        f"Analysis {analysis_id}: replaced {deleted_persons}/{deleted_items} measures with "
+        f"{len(person_rows)} person and {len(item_rows)} item rows"
+    )
+    return len(person_rows), len(item_rows)
+
+
+def replace_rating_scales(analysis_id: int, scale_rows: List[dict]) -> int:
+    """
+    Delete-and-replace rating scales (thresholds PCM) untuk analysis.
+
+    Args:
+        analysis_id: ID RaschAnalysis
+        scale_rows: Column mappings untuk RaschRatingScale (tanpa rasch_analysis_id)
+
+    Returns:
+        Jumlah rows yang ditulis
+    """
+    db.session.execute(
+        delete(RaschRatingScale).where(RaschRatingScale.rasch_analysis_id == analysis_id),
+        execution_options={'synchronize_session': False},
+    )
+    if scale_rows:
+        db.session.execute(
+            insert(RaschRatingScale),
+            [dict(row, rasch_analysis_id=analysis_id) for row in scale_rows],
+        )
+    return len(scale_rows)
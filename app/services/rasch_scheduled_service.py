@@ -9,11 +9,17 @@ Usage:
     - Dipanggil via cron job atau scheduled task
     - Jalankan setiap malam untuk memproses quiz yang mencapai threshold
     - Optional: Re-run analisis yang sudah ada untuk include late submissions
+    - Janitor: requeue analisis yang macet di PROCESSING (worker mati)
 """
 
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import distinct, func
 
 from app import db
 from app.models.rasch import (
@@ -38,13 +44,27 @@ class RaschScheduledBatchService:
     - Skip quizzes yang sudah dianalisis dengan data lengkap
     """
     
-    def __init__(self):
+    def __init__(self, concurrency: Optional[int] = None):
         self.default_min_persons = 30
         self.late_submission_threshold = 5  # Min late submissions untuk re-run
+        if concurrency is None:
+            configured = current_app.config.get('RASCH_BATCH_CONCURRENCY', 0) if has_app_context() else 0
+            # 0 = satu worker per CPU core
+            concurrency = int(configured) or (os.cpu_count() or 1)
+        self.concurrency = concurrency
+        config = current_app.config if has_app_context() else {}
+        self.stuck_timeout = int(config.get('RASCH_STUCK_TIMEOUT', 900))  # detik tanpa heartbeat
+        self.max_requeues = int(config.get('RASCH_MAX_REQUEUES', 3))
         
     def run_nightly_batch(self, course_id: Optional[int] = None) -> dict:
         """
         Run nightly batch processing untuk semua quiz yang eligible.
+
+        Candidate quiz dipilih dengan satu query, keputusan per quiz dibuat di
+        memory, lalu analisis yang perlu dijalankan di-dispatch sebagai unit
+        independen: Celery group jika broker tersedia, jika tidak process pool
+        lokal dengan RASCH_BATCH_CONCURRENCY worker (hasilnya ditunggu dan
+        digabung ke summary).
         
         Args:
             course_id: Optional - filter untuk course tertentu
@@ -53,6 +73,7 @@ class RaschScheduledBatchService:
             dict: Summary hasil processing
         """
         logger.info("Starting nightly Rasch batch processing...")
+        started = time.perf_counter()
         
         results = {
             'started_at': datetime.utcnow().isoformat(),
@@ -60,27 +81,46 @@ class RaschScheduledBatchService:
             're_analyses': 0,
             'skipped': 0,
             'failed': 0,
+            'analyses_completed': 0,
+            'analyses_failed': 0,
+            'analyses_unchanged': 0,
+            'requeued_stuck': 0,
+            'dispatch': None,
             'details': [],
         }
         
         try:
-            # Get all quizzes with Rasch enabled
-            query = GradeItem.query.filter_by(enable_rasch_analysis=True)
-            
-            if course_id:
-                # Filter by course via quiz relationship
-                grade_items = query.all()
-                grade_items = [gi for gi in grade_items if gi.quiz and gi.quiz.course_id == course_id]
-            else:
-                grade_items = query.all()
-            
-            logger.info(f"Found {len(grade_items)} quizzes with Rasch enabled")
-            
-            for grade_item in grade_items:
-                if not grade_item.quiz:
-                    continue
-                
-                result = self._process_quiz(grade_item)
+            # Analisis macet di-requeue dulu supaya tidak di-skip sebagai "already processing"
+            janitor = self.requeue_stuck_analyses(course_id)
+            results['requeued_stuck'] = len(janitor.get('requeued', []))
+
+            candidates = self._load_candidates(course_id)
+            logger.info(f"Found {len(candidates)} quizzes with Rasch enabled")
+
+            details = [self._process_quiz(candidate) for candidate in candidates]
+            db.session.commit()
+
+            # Analisis terbesar didahulukan supaya worker tidak menunggu ekor panjang
+            to_run = sorted(
+                (d for d in details if d['action'] in ('new_analysis', 're_analysis')),
+                key=lambda d: d.get('submission_count', 0),
+                reverse=True,
+            )
+            dispatch, run_results = self._dispatch([d['analysis_id'] for d in to_run])
+            results['dispatch'] = dispatch
+
+            for result in details:
+                run_result = run_results.get(result.get('analysis_id'))
+                if run_result is not None:
+                    result['run_status'] = run_result.get('status')
+                    if run_result.get('status') == 'completed':
+                        results['analyses_completed'] += 1
+                        # Fingerprint sama: tidak ada estimasi ulang
+                        if run_result.get('unchanged'):
+                            results['analyses_unchanged'] += 1
+                    else:
+                        results['analyses_failed'] += 1
+                        result['error'] = run_result.get('error')
                 results['details'].append(result)
                 
                 if result['action'] == 'new_analysis':
@@ -93,100 +133,201 @@ class RaschScheduledBatchService:
                     results['failed'] += 1
             
             results['completed_at'] = datetime.utcnow().isoformat()
+            results['wall_time'] = round(time.perf_counter() - started, 3)
             results['success'] = True
             
             logger.info(
                 f"Nightly batch completed: {results['new_analyses']} new, "
                 f"{results['re_analyses']} re-analyses, {results['skipped']} skipped, "
-                f"{results['failed']} failed"
+                f"{results['failed']} failed, {results['analyses_unchanged']} unchanged "
+                f"(dispatch={dispatch}, {results['wall_time']}s)"
             )
             
             return results
             
         except Exception as e:
             logger.error(f"Nightly batch failed: {e}", exc_info=True)
+            db.session.rollback()
             results['success'] = False
             results['error'] = str(e)
             return results
+
+    def requeue_stuck_analyses(self, course_id: Optional[int] = None) -> dict:
+        """
+        Janitor: requeue analisis PROCESSING yang heartbeat-nya (atau
+        started_at jika belum ada heartbeat) lebih lama dari RASCH_STUCK_TIMEOUT.
+
+        Worker yang mati meninggalkan status PROCESSING selamanya; analisis
+        seperti ini di-QUEUED ulang dan JMLE melanjutkan dari checkpoint
+        terakhir. Setelah RASCH_MAX_REQUEUES kali, analisis ditandai FAILED.
+
+        Returns:
+            dict: {'success', 'requeued': [analysis_id, ...], 'failed': [analysis_id, ...]}
+        """
+        from app.services.rasch_threshold_service import RaschThresholdService
+
+        results = {'success': True, 'requeued': [], 'failed': []}
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stuck_timeout)
+        last_seen = func.coalesce(RaschAnalysis.heartbeat_at, RaschAnalysis.started_at)
+
+        try:
+            query = RaschAnalysis.query.filter(
+                RaschAnalysis.status == RaschAnalysisStatus.PROCESSING.value,
+                (last_seen < cutoff) | last_seen.is_(None),
+            )
+            if course_id:
+                query = query.filter(RaschAnalysis.course_id == course_id)
+
+            for analysis in query.all():
+                if (analysis.requeue_count or 0) >= self.max_requeues:
+                    analysis.status = RaschAnalysisStatus.FAILED.value
+                    analysis.error_message = (
+                        f"Analysis stalled {self.max_requeues} times without a heartbeat"
+                    )
+                    analysis.status_message = "Analysis failed"
+                    analysis.completed_at = datetime.utcnow()
+                    results['failed'].append(analysis.id)
+                else:
+                    analysis.requeue_count = (analysis.requeue_count or 0) + 1
+                    analysis.status = RaschAnalysisStatus.QUEUED.value
+                    analysis.status_message = (
+                        f"Requeued after stalling (attempt {analysis.requeue_count}/{self.max_requeues})"
+                    )
+                    results['requeued'].append(analysis.id)
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Stuck analysis janitor failed: {e}", exc_info=True)
+            db.session.rollback()
+            return {'success': False, 'error': str(e), 'requeued': [], 'failed': []}
+
+        threshold_service = RaschThresholdService()
+        for analysis_id in results['requeued']:
+            try:
+                threshold_service._enqueue_analysis(analysis_id)
+            except Exception as e:
+                # Tetap bisa di-trigger ulang oleh batch berikutnya
+                logger.error(f"Failed to requeue analysis {analysis_id}: {e}")
+                db.session.rollback()
+                db.session.query(RaschAnalysis).filter_by(id=analysis_id).update(
+                    {'status': RaschAnalysisStatus.PENDING.value}, synchronize_session=False
+                )
+                db.session.commit()
+
+        if results['requeued'] or results['failed']:
+            logger.warning(
+                f"Janitor: requeued {len(results['requeued'])} stuck analyses, "
+                f"failed {len(results['failed'])} after {self.max_requeues} requeues"
+            )
+        return results
+
+    def _load_candidates(self, course_id: Optional[int] = None) -> List[Any]:
+        """
+        Semua quiz Rasch-enabled beserta analysis, jumlah submission dan
+        jumlah person measure, dalam satu query.
+
+        submission_count menghitung siswa, bukan attempt: data loader hanya
+        memakai attempt terakhir per siswa, jadi retake bukan late submission.
+        """
+        from app.models.course import Course
+
+        submissions = (
+            db.session.query(
+                QuizSubmission.quiz_id.label('quiz_id'),
+                func.count(distinct(QuizSubmission.user_id)).label('submission_count'),
+            )
+            .group_by(QuizSubmission.quiz_id)
+            .subquery()
+        )
+        measures = (
+            db.session.query(
+                RaschPersonMeasure.rasch_analysis_id.label('analysis_id'),
+                func.count(RaschPersonMeasure.id).label('measure_count'),
+            )
+            .group_by(RaschPersonMeasure.rasch_analysis_id)
+            .subquery()
+        )
+
+        query = (
+            db.session.query(
+                GradeItem.id.label('grade_item_id'),
+                Quiz.id.label('quiz_id'),
+                Quiz.name.label('quiz_name'),
+                Quiz.course_id.label('course_id'),
+                Course.teacher_id.label('teacher_id'),
+                RaschAnalysis.id.label('analysis_id'),
+                RaschAnalysis.status.label('analysis_status'),
+                RaschAnalysis.min_persons.label('min_persons'),
+                func.coalesce(submissions.c.submission_count, 0).label('submission_count'),
+                func.coalesce(measures.c.measure_count, 0).label('measure_count'),
+            )
+            .join(Quiz, Quiz.id == GradeItem.quiz_id)
+            .join(Course, Course.id == Quiz.course_id)
+            .outerjoin(RaschAnalysis, RaschAnalysis.id == GradeItem.rasch_analysis_id)
+            .outerjoin(submissions, submissions.c.quiz_id == Quiz.id)
+            .outerjoin(measures, measures.c.analysis_id == RaschAnalysis.id)
+            .filter(GradeItem.enable_rasch_analysis.is_(True))
+        )
+        if course_id:
+            query = query.filter(Quiz.course_id == course_id)
+        return query.order_by(Quiz.id).all()
     
-    def _process_quiz(self, grade_item: GradeItem) -> dict:
+    def _process_quiz(self, candidate) -> dict:
         """
-        Process single quiz for batch analysis.
+        Tentukan aksi batch untuk satu quiz (tanpa commit dan tanpa dispatch).
         
         Args:
-            grade_item: GradeItem record
+            candidate: Row dari _load_candidates
             
         Returns:
             dict: Processing result
         """
-        quiz = grade_item.quiz
-        
-        if not quiz:
-            return {
-                'quiz_id': grade_item.quiz_id,
-                'action': 'skipped',
-                'reason': 'Quiz not found',
-            }
-        
-        # Count submissions
-        submission_count = QuizSubmission.query.filter_by(quiz_id=quiz.id).count()
+        submission_count = candidate.submission_count
         
         if submission_count == 0:
             return {
-                'quiz_id': quiz.id,
+                'quiz_id': candidate.quiz_id,
                 'action': 'skipped',
                 'reason': 'No submissions',
             }
         
-        # Check existing analysis
-        existing_analysis = None
-        if grade_item.rasch_analysis_id:
-            existing_analysis = RaschAnalysis.query.get(grade_item.rasch_analysis_id)
-        
         # Determine action
-        if existing_analysis and existing_analysis.status == RaschAnalysisStatus.COMPLETED.value:
+        status = candidate.analysis_status
+        if status == RaschAnalysisStatus.COMPLETED.value:
             # Check if we should re-run
-            return self._handle_completed_analysis(grade_item, existing_analysis, submission_count)
-        elif existing_analysis and existing_analysis.status in [
+            return self._handle_completed_analysis(candidate)
+        elif status in [
             RaschAnalysisStatus.PROCESSING.value,
             RaschAnalysisStatus.QUEUED.value,
         ]:
             return {
-                'quiz_id': quiz.id,
+                'quiz_id': candidate.quiz_id,
                 'action': 'skipped',
-                'reason': f'Analysis already {existing_analysis.status}',
+                'reason': f'Analysis already {getattr(status, "value", status)}',
             }
         else:
             # New analysis
-            return self._handle_new_analysis(grade_item, submission_count)
+            return self._handle_new_analysis(candidate)
     
-    def _handle_completed_analysis(
-        self, 
-        grade_item: GradeItem, 
-        analysis: RaschAnalysis,
-        submission_count: int
-    ) -> dict:
+    def _handle_completed_analysis(self, candidate) -> dict:
         """
         Handle quiz yang sudah memiliki analisis completed.
         
         Decide apakah perlu re-run berdasarkan jumlah late submissions.
         """
-        # Count how many students already have measures
-        existing_measures = RaschPersonMeasure.query.filter_by(
-            rasch_analysis_id=analysis.id
-        ).count()
+        submission_count = candidate.submission_count
+        existing_measures = candidate.measure_count
         
         # Calculate late submissions
         late_count = submission_count - existing_measures
         
         if late_count < self.late_submission_threshold:
             logger.info(
-                f"Quiz {grade_item.quiz_id}: Skipping re-analysis "
+                f"Quiz {candidate.quiz_id}: Skipping re-analysis "
                 f"(only {late_count} late submissions, threshold={self.late_submission_threshold})"
             )
             return {
-                'quiz_id': grade_item.quiz_id,
-                'quiz_name': grade_item.quiz.name,
+                'quiz_id': candidate.quiz_id,
+                'quiz_name': candidate.quiz_name,
                 'action': 'skipped',
                 'reason': f'Only {late_count} late submissions (threshold={self.late_submission_threshold})',
                 'submission_count': submission_count,
@@ -199,12 +340,12 @@ class RaschScheduledBatchService:
         
         if late_percentage < 10:  # Less than 10% new submissions
             logger.info(
-                f"Quiz {grade_item.quiz_id}: Skipping re-analysis "
+                f"Quiz {candidate.quiz_id}: Skipping re-analysis "
                 f"(late submissions only {late_percentage}%)"
             )
             return {
-                'quiz_id': grade_item.quiz_id,
-                'quiz_name': grade_item.quiz.name,
+                'quiz_id': candidate.quiz_id,
+                'quiz_name': candidate.quiz_name,
                 'action': 'skipped',
                 'reason': f'Late submissions only {late_percentage:.1f}%',
                 'submission_count': submission_count,
@@ -214,59 +355,42 @@ class RaschScheduledBatchService:
         
         # Re-run analysis
         logger.info(
-            f"Quiz {grade_item.quiz_id}: Re-running analysis with {late_count} late submissions"
+            f"Quiz {candidate.quiz_id}: Re-running analysis with {late_count} late submissions"
         )
-        
-        try:
-            # Delete old person and item measures (keep analysis record)
-            RaschPersonMeasure.query.filter_by(rasch_analysis_id=analysis.id).delete()
-            
-            from app.models.rasch import RaschItemMeasure
-            RaschItemMeasure.query.filter_by(rasch_analysis_id=analysis.id).delete()
-            
-            # Reset analysis status
-            analysis.status = RaschAnalysisStatus.PENDING.value
-            analysis.num_persons = submission_count
-            analysis.status_message = f"Re-running analysis with {late_count} new submissions"
-            db.session.commit()
-            
-            # Trigger analysis
-            self._trigger_analysis(analysis.id)
-            
-            return {
-                'quiz_id': grade_item.quiz_id,
-                'quiz_name': grade_item.quiz.name,
-                'action': 're_analysis',
-                'reason': f'{late_count} late submissions ({late_percentage:.1f}%)',
-                'submission_count': submission_count,
-                'existing_measures': existing_measures,
-                'late_count': late_count,
-                'analysis_id': analysis.id,
-            }
-            
-        except Exception as e:
-            logger.error(f"Error re-running analysis for quiz {grade_item.quiz_id}: {e}")
-            db.session.rollback()
-            return {
-                'quiz_id': grade_item.quiz_id,
-                'action': 'failed',
-                'reason': str(e),
-            }
+
+        # Measures lama diganti (delete-and-replace) oleh _save_results
+        # saat analisis baru selesai, jadi tidak dihapus di sini
+        analysis = db.session.get(RaschAnalysis, candidate.analysis_id)
+        analysis.status = RaschAnalysisStatus.QUEUED.value
+        analysis.num_persons = submission_count
+        analysis.status_message = f"Re-running analysis with {late_count} new submissions"
+
+        return {
+            'quiz_id': candidate.quiz_id,
+            'quiz_name': candidate.quiz_name,
+            'action': 're_analysis',
+            'reason': f'{late_count} late submissions ({late_percentage:.1f}%)',
+            'submission_count': submission_count,
+            'existing_measures': existing_measures,
+            'late_count': late_count,
+            'analysis_id': analysis.id,
+        }
     
-    def _handle_new_analysis(self, grade_item: GradeItem, submission_count: int) -> dict:
+    def _handle_new_analysis(self, candidate) -> dict:
         """
-        Handle quiz yang belum memiliki analisis.
+        Handle quiz yang belum memiliki analisis (atau analisisnya belum pernah selesai).
         """
-        min_persons = grade_item.rasch_analysis.min_persons if grade_item.rasch_analysis else self.default_min_persons
+        submission_count = candidate.submission_count
+        min_persons = candidate.min_persons or self.default_min_persons
         
         if submission_count < min_persons:
             remaining = min_persons - submission_count
             logger.info(
-                f"Quiz {grade_item.quiz_id}: Skipping (need {remaining} more submissions)"
+                f"Quiz {candidate.quiz_id}: Skipping (need {remaining} more submissions)"
             )
             return {
-                'quiz_id': grade_item.quiz_id,
-                'quiz_name': grade_item.quiz.name if grade_item.quiz else None,
+                'quiz_id': candidate.quiz_id,
+                'quiz_name': candidate.quiz_name,
                 'action': 'skipped',
                 'reason': f'Need {remaining} more submissions to reach threshold',
                 'submission_count': submission_count,
@@ -275,40 +399,40 @@ class RaschScheduledBatchService:
         
         # Create and trigger new analysis
         logger.info(
-            f"Quiz {grade_item.quiz_id}: Creating new analysis with {submission_count} submissions"
+            f"Quiz {candidate.quiz_id}: Creating new analysis with {submission_count} submissions"
         )
-        
+
         try:
-            from app.models.rasch import RaschAnalysis, RaschAnalysisType, RaschAnalysisStatus
-            from app.models.user import User
-            
-            # Create analysis record
-            quiz = grade_item.quiz
-            analysis = RaschAnalysis(
-                name=f"Rasch Analysis - {quiz.name}",
-                course_id=quiz.course_id,
-                quiz_id=quiz.id,
-                analysis_type=RaschAnalysisType.QUIZ,
-                status=RaschAnalysisStatus.PENDING,
-                min_persons=min_persons,
-                auto_trigger=True,
-                num_persons=submission_count,
-                created_by=quiz.teacher_id,
-            )
-            
-            db.session.add(analysis)
-            db.session.commit()
-            
-            # Link to grade_item
-            grade_item.rasch_analysis_id = analysis.id
-            db.session.commit()
-            
-            # Trigger analysis
-            self._trigger_analysis(analysis.id)
+            with db.session.begin_nested():
+                if candidate.analysis_id:
+                    # Analisis waiting/pending/failed dipakai ulang, bukan diduplikasi
+                    analysis = db.session.get(RaschAnalysis, candidate.analysis_id)
+                    analysis.status = RaschAnalysisStatus.QUEUED.value
+                    analysis.num_persons = submission_count
+                else:
+                    analysis = RaschAnalysis(
+                        name=f"Rasch Analysis - {candidate.quiz_name}",
+                        course_id=candidate.course_id,
+                        quiz_id=candidate.quiz_id,
+                        analysis_type=RaschAnalysisType.QUIZ,
+                        status=RaschAnalysisStatus.QUEUED,
+                        min_persons=min_persons,
+                        auto_trigger=True,
+                        num_persons=submission_count,
+                        created_by=candidate.teacher_id,
+                    )
+                    db.session.add(analysis)
+                    db.session.flush()
+
+                    # Link to grade_item
+                    db.session.query(GradeItem).filter_by(id=candidate.grade_item_id).update(
+                        {'rasch_analysis_id': analysis.id}, synchronize_session=False
+                    )
+                analysis.status_message = "Queued by nightly batch"
             
             return {
-                'quiz_id': grade_item.quiz_id,
-                'quiz_name': quiz.name,
+                'quiz_id': candidate.quiz_id,
+                'quiz_name': candidate.quiz_name,
                 'action': 'new_analysis',
                 'reason': f'Threshold met ({submission_count} >= {min_persons})',
                 'submission_count': submission_count,
@@ -317,40 +441,49 @@ class RaschScheduledBatchService:
             }
             
         except Exception as e:
-            logger.error(f"Error creating new analysis for quiz {grade_item.quiz_id}: {e}")
-            db.session.rollback()
+            logger.error(f"Error creating new analysis for quiz {candidate.quiz_id}: {e}")
             return {
-                'quiz_id': grade_item.quiz_id,
+                'quiz_id': candidate.quiz_id,
                 'action': 'failed',
                 'reason': str(e),
             }
-    
-    def _trigger_analysis(self, analysis_id: int):
-        """Trigger Celery worker untuk analisis"""
+
+    def _dispatch(self, analysis_ids: List[int]) -> Tuple[Optional[str], Dict[int, dict]]:
+        """
+        Jalankan analisis batch.
+
+        Returns:
+            Tuple[str, dict]: (dispatch mode, analysis_id -> result). Untuk
+            Celery hasilnya belum tersedia (dict kosong); status akhir ada di
+            rasch_analyses.
+        """
+        if not analysis_ids:
+            return None, {}
+
+        if self._dispatch_celery(analysis_ids):
+            return 'celery', {}
+
+        if self.concurrency <= 1 or len(analysis_ids) == 1:
+            # Satu analisis: jalankan di proses ini, hemat biaya start child process
+            from app.workers.rasch_worker import run_rasch_analysis_task
+            return 'sync', {analysis_id: run_rasch_analysis_task(analysis_id) for analysis_id in analysis_ids}
+
+        from app.services.rasch_executor import run_analyses_in_pool
+        logger.info(f"Running {len(analysis_ids)} analyses in local pool (concurrency={self.concurrency})")
+        return 'local', run_analyses_in_pool(analysis_ids, self.concurrency)
+
+    def _dispatch_celery(self, analysis_ids: List[int]) -> bool:
+        """Kirim semua analisis sebagai Celery group; False jika broker tidak tersedia"""
         try:
+            from celery import group
             from app.workers.rasch_worker import rasch_analysis
-            
-            if rasch_analysis:
-                rasch_analysis.delay(analysis_id=analysis_id)
-                logger.info(f"Enqueued analysis {analysis_id} to Celery")
-                return
-        except Exception as e:
-            logger.warning(f"Celery not available, running sync: {e}")
-        
-        # Fallback: run synchronously
-        self._run_analysis_sync(analysis_id)
-    
-    def _run_analysis_sync(self, analysis_id: int):
-        """Run analysis synchronously (fallback)"""
-        from app.services.rasch_analysis_service import RaschAnalysisService
-        
-        try:
-            service = RaschAnalysisService(analysis_id=analysis_id)
-            service.run_analysis()
-            logger.info(f"Sync analysis {analysis_id} completed")
+
+            group(rasch_analysis.s(analysis_id=analysis_id) for analysis_id in analysis_ids).apply_async(retry=False)
+            logger.info(f"Enqueued {len(analysis_ids)} batch analyses to Celery")
+            return True
         except Exception as e:
-            logger.error(f"Sync analysis failed: {e}")
-            raise
+            logger.warning(f"Celery not available, running batch locally: {e}")
+            return False
     
     def process_late_submissions_batch(self, course_id: Optional[int] = None) -> dict:
         """
@@ -451,6 +584,20 @@ def run_nightly_analysis(course_id: Optional[int] = None) -> dict:
     return service.run_nightly_batch(course_id)
 
 
+def run_rasch_janitor(course_id: Optional[int] = None) -> dict:
+    """
+    Requeue analisis Rasch yang macet di PROCESSING.
+
+    Juga dijalankan di awal nightly batch; jadwal terpisah memperpendek
+    waktu tunggu jika worker mati di siang hari.
+
+    Usage (cron):
+        */15 * * * * cd /path/to/app && python -c "from app.services.rasch_scheduled_service import run_rasch_janitor; run_rasch_janitor()"
+    """
+    service = RaschScheduledBatchService()
+    return service.requeue_stuck_analyses(course_id)
+
+
 def run_late_submissions_processing(course_id: Optional[int] = None) -> dict:
     """
     Process late submissions using anchor values.
@@ -0,0 +1,125 @@
+"""
+Rasch Score-to-Measure Table
+
+Untuk siswa yang menjawab semua item terkalibrasi, ability Rasch hanya
+bergantung pada raw score. Tabel theta/SE per raw score dibangun sekali per
+analisis dichotomous yang selesai dan disimpan di RaschAnalysis.score_table,
+sehingga late submission dengan complete pattern dan pertanyaan "skor N
+setara theta berapa" cukup berupa lookup.
+
+Format tabel (JSON):
+    {"item_ids": [...], "theta": [...], "theta_se": [...]}
+    theta[r] / theta_se[r] untuk raw score r = 0..len(item_ids)
+
+Skor 0 dan sempurna memakai ekstrapolasi mean ± 2*SD dari ability
+non-extreme persons, sama seperti rasch_engine.extrapolate_extreme_abilities.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from app import db
+from app.models.rasch import (
+    RaschAnalysis,
+    RaschAnalysisStatus,
+    RaschItemMeasure,
+    RaschPersonMeasure,
+    RaschRatingScale,
+)
+from app.services import rasch_engine
+
+logger = logging.getLogger(__name__)
+
+# Fallback ekstrapolasi jika tidak ada non-extreme person (sama dengan anchor service)
+DEFAULT_EXTREME_BOUNDS = (-4.0, 4.0)
+
+
+def build_score_table(difficulties: Dict[int, float], non_extreme_thetas: Iterable[float]) -> Optional[dict]:
+    """
+    Bangun score-to-measure table dari item difficulties.
+
+    Args:
+        difficulties: question_id -> delta
+        non_extreme_thetas: ability persons dengan skor non-extreme
+
+    Returns:
+        dict tabel, atau None jika tidak ada item
+    """
+    if not difficulties:
+        return None
+
+    item_ids = sorted(difficulties)
+    deltas = np.array([difficulties[qid] for qid in item_ids], dtype=np.float64)
+    reference = np.asarray(list(non_extreme_thetas), dtype=np.float64)
+    bounds = rasch_engine.extreme_ability_bounds(reference) if reference.size else DEFAULT_EXTREME_BOUNDS
+
+    thetas, theta_se = rasch_engine.score_to_measure(deltas, bounds)
+    return {
+        'item_ids': item_ids,
+        'theta': [round(float(t), 6) for t in thetas],
+        'theta_se': [round(float(se), 6) for se in theta_se],
+    }
+
+
+def covers(table: Optional[dict], question_ids: Iterable[int]) -> bool:
+    """True jika question_ids persis item set tabel (complete pattern)"""
+    return bool(table) and sorted(question_ids) == table['item_ids']
+
+
+def lookup(table: dict, raw_score: float) -> Optional[Tuple[float, float]]:
+    """
+    (theta, theta_se) untuk raw score, atau None jika di luar 0..L
+    atau bukan bilangan bulat.
+    """
+    index = int(raw_score)
+    if index != raw_score or not 0 <= index < len(table['theta']):
+        return None
+    return table['theta'][index], table['theta_se'][index]
+
+
+def get_score_table(analysis: RaschAnalysis) -> Optional[dict]:
+    """
+    Score table milik analysis; dibangun dari measures tersimpan dan
+    di-commit jika belum ada (analisis sebelum kolom score_table).
+
+    Returns:
+        None jika analysis belum completed atau memuat item polytomous
+    """
+    if analysis.score_table:
+        return analysis.score_table
+    if analysis.status != RaschAnalysisStatus.COMPLETED:
+        return None
+
+    # Item partial credit punya rating scale; raw score tidak dipetakan per item
+    has_rating_scales = db.session.query(RaschRatingScale.id).filter_by(
+        rasch_analysis_id=analysis.id
+    ).first() is not None
+    if has_rating_scales:
+        return None
+
+    difficulties = {
+        question_id: float(delta)
+        for question_id, delta in db.session.query(
+            RaschItemMeasure.question_id, RaschItemMeasure.delta,
+        ).filter(
+            RaschItemMeasure.rasch_analysis_id == analysis.id,
+            RaschItemMeasure.delta.isnot(None),
+        )
+    }
+    non_extreme_thetas = [
+        float(theta) for (theta,) in db.session.query(RaschPersonMeasure.theta).filter(
+            RaschPersonMeasure.rasch_analysis_id == analysis.id,
+            RaschPersonMeasure.theta.isnot(None),
+            RaschPersonMeasure.raw_score > 0,
+            RaschPersonMeasure.raw_score < RaschPersonMeasure.total_possible,
+        )
+    ]
+
+    table = build_score_table(difficulties, non_extreme_thetas)
+    if table is not None:
+        analysis.score_table = table
+        db.session.commit()
+        logger.info(f"Built score table for analysis {analysis.id} ({len(table['item_ids'])} items)")
+    return table
@@ -0,0 +1,327 @@
+"""
+Rasch Sparse Engine
+
+JMLE dan fit statistics untuk response data yang sangat jarang, mis.
+combined analysis satu course (ratusan quiz, setiap siswa hanya menjawab
+sebagian kecil item).
+
+Response disimpan dalam format COO (person_index, item_index, score) dan
+setiap langkah hanya menghitung sel yang teramati: probabilitas dihitung
+per observasi dan dijumlahkan per person/item dengan np.bincount. Memory
+dan waktu sebanding dengan jumlah responses, bukan persons × items.
+
+Semantik numerik sama dengan rasch_engine, kecuali extreme persons:
+skor sempurna berarti benar di semua item yang dijawab (bukan semua item
+di analisis), karena tidak ada siswa yang menjawab seluruh item bank.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from app.services import rasch_engine
+from app.services.rasch_engine import (
+    LOGIT_CLAMP,
+    MIN_VARIANCE,
+    NEWTON_STEPS,
+    FitStatistics,
+    InitialMeasures,
+    JMLEResult,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SparseResponseMatrix:
+    """
+    Response data dalam format COO.
+
+    Attributes:
+        person_index: index baris per observasi (int)
+        item_index: index kolom per observasi (int)
+        responses: skor 0/1 per observasi (float64)
+        person_ids: student_id per baris
+        item_ids: question_id per kolom
+    """
+    person_index: np.ndarray
+    item_index: np.ndarray
+    responses: np.ndarray
+    person_ids: List[int]
+    item_ids: List[int]
+
+    @property
+    def num_persons(self) -> int:
+        return len(self.person_ids)
+
+    @property
+    def num_items(self) -> int:
+        return len(self.item_ids)
+
+    @property
+    def num_responses(self) -> int:
+        return len(self.responses)
+
+    @property
+    def density(self) -> float:
+        cells = self.num_persons * self.num_items
+        return self.num_responses / cells if cells else 0.0
+
+    def person_sum(self, values: np.ndarray) -> np.ndarray:
+        """Jumlah nilai per observasi untuk setiap person"""
+        return np.bincount(self.person_index, weights=values, minlength=self.num_persons)
+
+    def item_sum(self, values: np.ndarray) -> np.ndarray:
+        """Jumlah nilai per observasi untuk setiap item"""
+        return np.bincount(self.item_index, weights=values, minlength=self.num_items)
+
+    @property
+    def raw_scores(self) -> np.ndarray:
+        return self.person_sum(self.responses)
+
+    @property
+    def person_counts(self) -> np.ndarray:
+        return np.bincount(self.person_index, minlength=self.num_persons).astype(np.float64)
+
+    @property
+    def item_counts(self) -> np.ndarray:
+        return np.bincount(self.item_index, minlength=self.num_items).astype(np.float64)
+
+    def to_dense(self) -> rasch_engine.ResponseMatrix:
+        """Dense persons × items matrix (alokasi penuh; hanya untuk matrix kecil)"""
+        shape = (self.num_persons, self.num_items)
+        responses = np.zeros(shape, dtype=np.float64)
+        observed = np.zeros(shape, dtype=bool)
+        responses[self.person_index, self.item_index] = self.responses
+        observed[self.person_index, self.item_index] = True
+        return rasch_engine.ResponseMatrix(responses, observed, self.person_ids, self.item_ids)
+
+    @property
+    def p_values(self) -> np.ndarray:
+        """Proporsi benar per item (0.5 untuk item tanpa jawaban)"""
+        counts = self.item_counts
+        return np.divide(
+            self.item_sum(self.responses), counts,
+            out=np.full(self.num_items, 0.5), where=counts > 0,
+        )
+
+
+def cell_probabilities(
+    matrix: SparseResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+) -> np.ndarray:
+    """P(X=1) untuk setiap observasi, dengan clamp yang sama seperti rasch_engine"""
+    logits = thetas[matrix.person_index] - deltas[matrix.item_index]
+    probabilities = 1.0 / (1.0 + np.exp(-np.clip(logits, -LOGIT_CLAMP, LOGIT_CLAMP)))
+    probabilities[logits > LOGIT_CLAMP] = 1.0
+    probabilities[logits < -LOGIT_CLAMP] = 0.0
+    return probabilities
+
+
+def initialize_measures(matrix: SparseResponseMatrix) -> InitialMeasures:
+    """
+    Initialize ability dari proporsi benar pada item yang dijawab dan
+    difficulty dari p-value.
+    """
+    raw_scores = matrix.raw_scores
+    counts = matrix.person_counts
+
+    extreme_low = raw_scores == 0
+    extreme_high = (raw_scores == counts) & (counts > 0)
+
+    thetas = np.zeros(matrix.num_persons)
+    thetas[extreme_low] = -4.0
+    thetas[extreme_high] = 4.0
+
+    non_extreme = ~(extreme_low | extreme_high)
+    p = raw_scores[non_extreme] / counts[non_extreme]
+    thetas[non_extreme] = np.log(p / (1 - p))
+
+    p_values = np.clip(matrix.p_values, 0.01, 0.99)
+    deltas = np.log((1 - p_values) / p_values)
+
+    return InitialMeasures(thetas, deltas, extreme_low, extreme_high)
+
+
+def update_item_difficulties(
+    matrix: SparseResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    cell_mask: np.ndarray,
+) -> np.ndarray:
+    """Newton-Raphson untuk semua item, hanya dari observasi di cell_mask"""
+    weights = cell_mask.astype(np.float64)
+    sum_observed = matrix.item_sum(matrix.responses * weights)
+    deltas = deltas.copy()
+    active = matrix.item_sum(weights) > 0
+
+    for _ in range(NEWTON_STEPS):
+        if not active.any():
+            break
+        p = cell_probabilities(matrix, thetas, deltas) * weights
+        sum_expected = matrix.item_sum(p)
+        sum_variance = matrix.item_sum(p * (1 - p))
+
+        active &= sum_variance > MIN_VARIANCE
+        step = np.divide(
+            sum_observed - sum_expected, sum_variance,
+            out=np.zeros_like(deltas), where=active,
+        )
+        deltas -= step
+
+    return deltas
+
+
+def update_person_abilities(
+    matrix: SparseResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+    person_mask: np.ndarray,
+) -> np.ndarray:
+    """Newton-Raphson untuk semua person di person_mask (difficulties tetap)"""
+    sum_observed = matrix.raw_scores
+    thetas = thetas.copy()
+    active = person_mask & (matrix.person_counts > 0)
+
+    for _ in range(NEWTON_STEPS):
+        if not active.any():
+            break
+        p = cell_probabilities(matrix, thetas, deltas)
+        sum_expected = matrix.person_sum(p)
+        sum_variance = matrix.person_sum(p * (1 - p))
+
+        active &= sum_variance > MIN_VARIANCE
+        step = np.divide(
+            sum_observed - sum_expected, sum_variance,
+            out=np.zeros_like(thetas), where=active,
+        )
+        thetas += step
+
+    return thetas
+
+
+def run_jmle(
+    matrix: SparseResponseMatrix,
+    initial: InitialMeasures,
+    convergence_threshold: float = 0.001,
+    max_iterations: int = 100,
+    on_iteration: Optional[Callable[[int, float], None]] = None,
+    on_checkpoint: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None,
+    start_iteration: int = 0,
+    acceleration: str = rasch_engine.ACCELERATION_NONE,
+) -> JMLEResult:
+    """
+    JMLE atas observasi saja; signature dan hasil sama dengan rasch_engine.run_jmle.
+    """
+    non_extreme = initial.non_extreme
+    cell_mask = non_extreme[matrix.person_index]
+
+    def sweep(thetas, deltas):
+        deltas = update_item_difficulties(matrix, thetas, deltas, cell_mask)
+        return update_person_abilities(matrix, thetas, deltas, non_extreme), deltas
+
+    result = rasch_engine.iterate_jmle(
+        sweep, initial,
+        convergence_threshold=convergence_threshold,
+        max_iterations=max_iterations,
+        on_iteration=on_iteration,
+        on_checkpoint=on_checkpoint,
+        start_iteration=start_iteration,
+        acceleration=acceleration,
+    )
+    result.thetas = rasch_engine.extrapolate_extreme_abilities(
+        result.thetas, non_extreme, initial.extreme_high, initial.extreme_low
+    )
+    return result
+
+
+def point_biserial(matrix: SparseResponseMatrix) -> np.ndarray:
+    """Point-biserial per item terhadap rest score, sama dengan rasch_engine.point_biserial"""
+    responses = matrix.responses
+    rest_scores = matrix.raw_scores[matrix.person_index] - responses
+
+    counts = matrix.item_counts
+    correct = matrix.item_sum(responses)
+    incorrect = counts - correct
+
+    sum_correct = matrix.item_sum(rest_scores * responses)
+    sum_all = matrix.item_sum(rest_scores)
+    mean_correct = np.divide(sum_correct, correct, out=np.zeros_like(sum_correct), where=correct > 0)
+    mean_incorrect = np.divide(
+        sum_all - sum_correct, incorrect,
+        out=np.zeros_like(sum_all), where=incorrect > 0,
+    )
+
+    mean_all = np.divide(sum_all, counts, out=np.zeros_like(sum_all), where=counts > 0)
+    deviations = rest_scores - mean_all[matrix.item_index]
+    std_dev = np.sqrt(np.divide(
+        matrix.item_sum(deviations ** 2), counts,
+        out=np.zeros_like(counts), where=counts > 0,
+    ))
+
+    p = np.divide(correct, counts, out=np.zeros_like(counts), where=counts > 0)
+    valid = (correct > 0) & (incorrect > 0) & (std_dev > 0)
+    result = np.divide(
+        (mean_correct - mean_incorrect) * np.sqrt(p * (1 - p)), std_dev,
+        out=np.zeros_like(std_dev), where=valid,
+    )
+    return np.clip(result, -1.0, 1.0)
+
+
+def calculate_fit_statistics(
+    matrix: SparseResponseMatrix,
+    thetas: np.ndarray,
+    deltas: np.ndarray,
+) -> FitStatistics:
+    """Infit/outfit, SE, p-values dan point-biserial dari observasi saja"""
+    probabilities = cell_probabilities(matrix, thetas, deltas)
+    variances = probabilities * (1 - probabilities)
+    residuals_sq = (matrix.responses - probabilities) ** 2
+
+    # Sel dengan variance sangat kecil tidak ikut dalam mean squares
+    informative = variances > MIN_VARIANCE
+    fit_residuals_sq = np.where(informative, residuals_sq, 0.0)
+    fit_variances = np.where(informative, variances, 0.0)
+    standardized_sq = np.divide(
+        residuals_sq, variances,
+        out=np.zeros_like(residuals_sq), where=informative,
+    )
+
+    person_counts = matrix.person_counts
+    item_counts = matrix.item_counts
+
+    (person_infit, person_infit_z, person_outfit, person_outfit_z, theta_se) = rasch_engine._mean_squares(
+        matrix.person_sum(fit_residuals_sq),
+        matrix.person_sum(fit_variances),
+        matrix.person_sum(standardized_sq),
+        person_counts,
+        matrix.person_sum(variances),
+    )
+    (item_infit, item_infit_z, item_outfit, item_outfit_z, delta_se) = rasch_engine._mean_squares(
+        matrix.item_sum(fit_residuals_sq),
+        matrix.item_sum(fit_variances),
+        matrix.item_sum(standardized_sq),
+        item_counts,
+        matrix.item_sum(variances),
+    )
+
+    return FitStatistics(
+        person_raw_scores=matrix.raw_scores,
+        person_counts=person_counts,
+        theta_se=theta_se,
+        person_infit_mnsq=person_infit,
+        person_infit_zstd=person_infit_z,
+        person_outfit_mnsq=person_outfit,
+        person_outfit_zstd=person_outfit_z,
+        item_counts=item_counts,
+        delta_se=delta_se,
+        item_infit_mnsq=item_infit,
+        item_infit_zstd=item_infit_z,
+        item_outfit_mnsq=item_outfit,
+        item_outfit_zstd=item_outfit_z,
+        p_values=matrix.p_values,
+        point_biserial=point_biserial(matrix),
+    )
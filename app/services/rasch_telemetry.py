@@ -0,0 +1,175 @@
+"""
+Rasch Analysis Telemetry
+
+Setiap run analisis mencatat durasi per stage, dimensi dan density response
+matrix, serta peak memory worker. Ringkasannya disimpan di
+RaschAnalysis.telemetry (JSON) dan di-observe ke Prometheus histograms,
+sehingga regresi performa terlihat dan ukuran worker bisa ditentukan dari
+data nyata.
+
+Stage (waktu eksklusif; stage bersarang tidak dihitung dua kali):
+    load, init, jmle, fit, reliability, pca, bootstrap, save
+
+Trace max change per iterasi ada di RaschAnalysis.convergence_history.
+
+Prometheus:
+    - aldudu_rasch_stage_seconds{stage}
+    - aldudu_rasch_iterations
+    - aldudu_rasch_peak_rss_megabytes
+
+Histograms didaftarkan ke registry app web (create_app). Analisis berjalan di
+Celery worker atau child process; set PROMETHEUS_MULTIPROC_DIR (direktori
+bersama, sebelum proses start) supaya observasi dari proses-proses itu
+teragregasi di /metrics.
+"""
+
+import functools
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('load', 'init', 'jmle', 'fit', 'reliability', 'pca', 'bootstrap', 'save')
+
+STAGE_SECONDS = Histogram(
+    'aldudu_rasch_stage_seconds',
+    'Rasch analysis stage duration',
+    ['stage'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+    registry=None,
+)
+ITERATIONS = Histogram(
+    'aldudu_rasch_iterations',
+    'Rasch estimation iterations per analysis',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    registry=None,
+)
+PEAK_RSS_MEGABYTES = Histogram(
+    'aldudu_rasch_peak_rss_megabytes',
+    'Peak resident memory of the process after a Rasch analysis',
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192),
+    registry=None,
+)
+METRICS = (STAGE_SECONDS, ITERATIONS, PEAK_RSS_MEGABYTES)
+
+
+def register_metrics(registry):
+    """Daftarkan Rasch histograms ke registry Prometheus milik app"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.MultiProcessCollector(registry)
+        return
+    for metric in METRICS:
+        registry.register(metric)
+
+
+def peak_rss_megabytes() -> Optional[float]:
+    """Peak RSS proses ini (ru_maxrss), atau None jika tidak tersedia (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: kilobytes, macOS: bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def timed(stage: str):
+    """Decorator untuk method RaschAnalysisService: waktu dicatat ke self.telemetry"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.telemetry.stage(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class AnalysisTelemetry:
+    """
+    Timer stage untuk satu run analisis.
+
+    Usage:
+        telemetry = AnalysisTelemetry()
+        with telemetry.stage('load'):
+            ...
+        telemetry.set_matrix(num_persons, num_items, num_responses)
+        summary = telemetry.finish(iterations=12, converged=True)
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.matrix: Optional[dict] = None
+        self._stack: List[List] = []  # [stage, started_at] yang sedang berjalan
+        self._started = time.perf_counter()
+        self._rss_before = peak_rss_megabytes()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Catat waktu eksklusif stage; stage luar di-pause selama stage dalam"""
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1])
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            current = self._stack.pop()
+            self._add(current[0], now - current[1])
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def _add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def set_matrix(self, num_persons: int, num_items: int, num_responses: int):
+        cells = num_persons * num_items
+        self.matrix = {
+            'persons': num_persons,
+            'items': num_items,
+            'responses': num_responses,
+            'density': round(num_responses / cells, 4) if cells else 0.0,
+        }
+
+    def finish(self, iterations: Optional[int] = None, **details) -> dict:
+        """
+        Ringkasan JSON-able untuk RaschAnalysis.telemetry, sekaligus observe
+        ke Prometheus.
+        """
+        peak = peak_rss_megabytes()
+        summary = {
+            'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            'total_seconds': round(time.perf_counter() - self._started, 4),
+            'matrix': self.matrix,
+            'iterations': iterations,
+            'peak_rss_mb': peak,
+            # > 0 hanya jika analisis ini menaikkan high-water mark proses
+            'rss_growth_mb': (
+                round(peak - self._rss_before, 1)
+                if peak is not None and self._rss_before is not None else None
+            ),
+        }
+        summary.update(details)
+        self._observe(summary)
+        return summary
+
+    def _observe(self, summary: dict):
+        try:
+            for name, seconds in summary['stages'].items():
+                STAGE_SECONDS.labels(stage=name).observe(seconds)
+            if summary['iterations'] is not None:
+                ITERATIONS.observe(summary['iterations'])
+            if summary['peak_rss_mb'] is not None:
+                PEAK_RSS_MEGABYTES.observe(summary['peak_rss_mb'])
+        except Exception as e:
+            # Metrics tidak boleh menggagalkan analisis
+            logger.warning(f"Failed to record Rasch metrics: {e}")
@@ -3,12 +3,19 @@ Rasch Threshold Checker
 
 Mekanisme untuk auto-trigger Rasch analysis saat threshold terpenuhi.
 Dipanggil setiap kali ada siswa submit quiz.
+
+Burst submit untuk quiz yang sama di-coalesce: threshold check berjalan di
+bawah per-quiz lock (app.services.rasch_trigger), auto-trigger di-queue dengan
+debounce countdown sehingga satu burst menghasilkan satu kalibrasi, dan
+RaschThresholdLog hanya ditulis untuk perubahan state dan sampel check.
 """
 
 import logging
 from datetime import datetime
 from typing import Optional, Tuple
 
+from flask import current_app, has_app_context
+
 from app import db
 from app.models.rasch import (
     RaschAnalysis,
@@ -19,6 +26,7 @@ from app.models.rasch import (
     ThresholdAction,
 )
 from app.models.quiz import Quiz, QuizSubmission
+from app.services.rasch_executor import RaschQueueFullError
 
 logger = logging.getLogger(__name__)
 
@@ -51,9 +59,21 @@ class RaschThresholdService:
     """
     Service untuk threshold checking dan auto-trigger Rasch analysis.
     """
+
+    # Status yang tidak di-trigger ulang oleh auto check
+    SKIP_STATUSES = (
+        RaschAnalysisStatus.COMPLETED.value,
+        RaschAnalysisStatus.PROCESSING.value,
+        RaschAnalysisStatus.QUEUED.value,
+    )
     
     def __init__(self):
         self.default_min_persons = 30  # Default threshold
+        config = current_app.config if has_app_context() else {}
+        # Auto-trigger di-queue dengan countdown ini supaya burst submit masuk satu kalibrasi
+        self.debounce_seconds = int(config.get('RASCH_TRIGGER_DEBOUNCE', 30))
+        # Check yang threshold-nya belum terpenuhi hanya di-log setiap N submission
+        self.log_every = max(int(config.get('RASCH_THRESHOLD_LOG_EVERY', 10)), 1)
     
     def check_and_trigger(
         self,
@@ -67,13 +87,9 @@ class RaschThresholdService:
         Returns:
             Tuple[bool, str]: (threshold_met, message)
         """
+        from app.services.rasch_trigger import mark_pending, pop_pending, quiz_trigger_lock
+
         try:
-            # Get quiz
-            quiz = Quiz.query.get(quiz_id)
-            
-            if not quiz:
-                return False, "Quiz not found"
-            
             # Check if quiz has grade_item with Rasch enabled
             from app.models.gradebook import GradeItem
             grade_item = GradeItem.query.filter_by(quiz_id=quiz_id).first()
@@ -82,53 +98,95 @@ class RaschThresholdService:
                 logger.debug(f"Quiz {quiz_id} does not have Rasch analysis enabled")
                 return False, "Rasch analysis not enabled for this quiz"
 
-            # Count submissions
-            submission_count = QuizSubmission.query.filter_by(quiz_id=quiz_id).count()
+            # Fast path tanpa lock: analisis sudah selesai (late submission) atau sedang berjalan
+            analysis = self._find_quiz_analysis(quiz_id)
+            if analysis is not None and analysis.status in self.SKIP_STATUSES:
+                return self._skip_active_analysis(analysis, submission_id)
+
+            with quiz_trigger_lock(quiz_id) as acquired:
+                if not acquired:
+                    # Request lain sedang check quiz ini; ia akan cek ulang sebelum melepas lock
+                    mark_pending(quiz_id)
+                    logger.debug(f"Threshold check for quiz {quiz_id} coalesced into running check")
+                    return False, "Threshold check sedang berjalan untuk quiz ini"
 
-            # Get or create analysis record
-            analysis = self._get_or_create_analysis(quiz_id, grade_item)
+                result = self._check_threshold(quiz_id, grade_item, submission_id, check_type)
+
+                # Submit yang ter-coalesce selama check di atas mungkin belum terhitung
+                if not result[0] and pop_pending(quiz_id):
+                    db.session.expire_all()
+                    result = self._check_threshold(quiz_id, grade_item, None, check_type)
+                return result
+
+        except RaschQueueFullError as e:
+            # Analysis kembali PENDING; submit berikutnya akan mencoba lagi
+            logger.warning(f"Auto-trigger for quiz {quiz_id} deferred: {e}")
+            return False, str(e)
+        except Exception as e:
+            logger.error(f"Error in threshold check: {e}", exc_info=True)
+            return False, f"Error: {str(e)}"
+
+    def _find_quiz_analysis(self, quiz_id: int) -> Optional[RaschAnalysis]:
+        return RaschAnalysis.query.filter_by(
+            quiz_id=quiz_id,
+            analysis_type=RaschAnalysisType.QUIZ.value
+        ).first()
+
+    def _skip_active_analysis(self, analysis: RaschAnalysis, submission_id: Optional[int]) -> Tuple[bool, str]:
+        """Analysis sudah completed/processing/queued: proses late submission atau skip"""
+        if analysis.status == RaschAnalysisStatus.COMPLETED.value:
+            # Process late submission using anchor values
+            return self._process_late_submission(analysis, submission_id)
+        logger.debug(f"Skipping threshold check for quiz {analysis.quiz_id} - analysis already active")
+        return False, "Analisis Rasch sedang berjalan atau sudah selesai"
+
+    def _check_threshold(
+        self,
+        quiz_id: int,
+        grade_item,
+        submission_id: Optional[int],
+        check_type: str,
+    ) -> Tuple[bool, str]:
+        """Threshold check dan trigger; dipanggil di bawah per-quiz lock"""
+        # Count submissions
+        submission_count = QuizSubmission.query.filter_by(quiz_id=quiz_id).count()
 
-            # Check if analysis should be skipped (already completed/processing/queued)
-            if getattr(analysis, '_skip_trigger', False):
-                # Analysis is already completed/processing - check for late submission
-                if analysis.status == RaschAnalysisStatus.COMPLETED.value:
-                    # Process late submission using anchor values
-                    return self._process_late_submission(analysis, submission_id)
-                logger.info(f"Skipping threshold check for quiz {quiz_id} - analysis already active")
-                return False, "Analisis Rasch sedang berjalan atau sudah selesai"
+        # Get or create analysis record
+        analysis = self._get_or_create_analysis(quiz_id, grade_item)
 
-            # Get threshold from analysis
-            min_persons = analysis.min_persons or self.default_min_persons
+        # Check if analysis should be skipped (already completed/processing/queued)
+        if getattr(analysis, '_skip_trigger', False):
+            return self._skip_active_analysis(analysis, submission_id)
 
-            # Check threshold
-            threshold_met = submission_count >= min_persons
+        # Get threshold from analysis
+        min_persons = analysis.min_persons or self.default_min_persons
 
-            # Log threshold check
+        # Check threshold
+        threshold_met = submission_count >= min_persons
+
+        if threshold_met:
+            # Trigger analysis (log 'queued' ditulis oleh _trigger_analysis)
+            analysis.num_persons = submission_count
+            return self._trigger_analysis(analysis, check_type)
+
+        # Update status to waiting; log sampel check dalam commit yang sama
+        remaining = min_persons - submission_count
+        analysis.status = RaschAnalysisStatus.WAITING.value
+        analysis.status_message = f"Menunggu {remaining} siswa lagi untuk memulai analisis"
+        analysis.progress_percentage = (submission_count / min_persons) * 100
+        if submission_count % self.log_every == 0:
             self._log_threshold_check(
                 analysis_id=analysis.id,
                 check_type=check_type,
                 num_submissions=submission_count,
                 min_required=min_persons,
-                threshold_met=threshold_met
+                threshold_met=False,
+                commit=False,
             )
+        db.session.commit()
 
-            if threshold_met:
-                # Trigger analysis
-                return self._trigger_analysis(analysis, check_type)
-            else:
-                # Update status to waiting
-                remaining = min_persons - submission_count
-                analysis.status = RaschAnalysisStatus.WAITING.value
-                analysis.status_message = f"Menunggu {remaining} siswa lagi untuk memulai analisis"
-                analysis.progress_percentage = (submission_count / min_persons) * 100
-                db.session.commit()
-
-                logger.info(f"Threshold not met for quiz {quiz_id}: {submission_count}/{min_persons}")
-                return False, f"Menunggu {remaining} siswa lagi untuk memulai analisis Rasch"
-
-        except Exception as e:
-            logger.error(f"Error in threshold check: {e}", exc_info=True)
-            return False, f"Error: {str(e)}"
+        logger.info(f"Threshold not met for quiz {quiz_id}: {submission_count}/{min_persons}")
+        return False, f"Menunggu {remaining} siswa lagi untuk memulai analisis Rasch"
     
     def _get_or_create_analysis(self, quiz_id: int, grade_item) -> RaschAnalysis:
         """Get existing analysis or create new one"""
@@ -169,7 +227,7 @@ class RaschThresholdService:
             status=RaschAnalysisStatus.PENDING,
             min_persons=30,  # Default
             auto_trigger=True,
-            created_by=quiz.teacher_id,  # Assuming teacher_id is the creator
+            created_by=quiz.course.teacher_id,
         )
         
         db.session.add(analysis)
@@ -183,29 +241,45 @@ class RaschThresholdService:
         return analysis
     
     def _trigger_analysis(self, analysis: RaschAnalysis, check_type: str) -> Tuple[bool, str]:
-        """Trigger Rasch analysis"""
+        """
+        Trigger Rasch analysis.
+
+        Auto trigger di-queue dengan debounce countdown: status QUEUED langsung
+        di-commit sehingga submit lain dalam burst melewati check, dan kalibrasi
+        berjalan setelah burst dengan data semua submission tersebut.
+        """
         try:
-            # Update status
+            countdown = self.debounce_seconds if check_type == 'auto' and self.debounce_seconds > 0 else None
+
+            # Update status dan log action dalam satu commit
             analysis.status = RaschAnalysisStatus.QUEUED.value
-            analysis.status_message = "Analysis queued for processing"
-            db.session.commit()
-            
-            # Log action
+            if countdown:
+                analysis.status_message = f"Analysis queued, mulai dalam {countdown} detik"
+            else:
+                analysis.status_message = "Analysis queued for processing"
             self._log_threshold_check(
                 analysis_id=analysis.id,
                 check_type=check_type,
                 num_submissions=analysis.num_persons or 0,
                 min_required=analysis.min_persons,
                 threshold_met=True,
-                action_taken='queued'
+                action_taken='queued',
+                commit=False,
             )
+            db.session.commit()
             
             # Trigger Celery task
-            self._enqueue_analysis(analysis.id)
+            self._enqueue_analysis(analysis.id, countdown=countdown)
             
             logger.info(f"Triggered Rasch analysis {analysis.id}")
             return True, "Rasch analysis started"
-            
+
+        except RaschQueueFullError:
+            # Back-pressure: belum dijalankan, jadi jangan tandai FAILED
+            analysis.status = RaschAnalysisStatus.PENDING.value
+            analysis.status_message = "Antrian analisis penuh, menunggu slot"
+            db.session.commit()
+            raise
         except Exception as e:
             logger.error(f"Error triggering analysis: {e}")
             analysis.status = RaschAnalysisStatus.FAILED.value
@@ -213,21 +287,30 @@ class RaschThresholdService:
             db.session.commit()
             return False, f"Error triggering analysis: {str(e)}"
     
-    def _enqueue_analysis(self, analysis_id: int):
+    def _enqueue_analysis(self, analysis_id: int, countdown: Optional[int] = None):
         """Enqueue analysis to Celery worker"""
         try:
             # Try to use Celery
             from app.workers.rasch_worker import rasch_analysis
-            
-            # Check if Celery is available
-            if rasch_analysis:
-                rasch_analysis.delay(analysis_id=analysis_id)
-                logger.info(f"Enqueued Rasch analysis {analysis_id} to Celery")
-                return
+
+            # retry=False: broker mati langsung jatuh ke sync, tidak menahan request
+            rasch_analysis.apply_async(
+                kwargs={'analysis_id': analysis_id}, countdown=countdown, retry=False,
+            )
+            logger.info(f"Enqueued Rasch analysis {analysis_id} to Celery")
+            return
         except Exception as e:
-            logger.warning(f"Celery not available, running sync: {e}")
-        
-        # Fallback: run synchronously
+            logger.warning(f"Celery not available, using local executor: {e}")
+
+        # Fallback: process pool lokal, di luar thread request
+        from app.services.rasch_executor import get_local_executor
+
+        executor = get_local_executor()
+        if executor is not None:
+            executor.submit(analysis_id, delay=countdown or 0)
+            return
+
+        # Local executor dinonaktifkan (RASCH_LOCAL_WORKERS=0): run synchronously
         self._run_analysis_sync(analysis_id)
     
     def _run_analysis_sync(self, analysis_id: int):
@@ -284,9 +367,10 @@ class RaschThresholdService:
         min_required: int,
         threshold_met: bool,
         action_taken: Optional[str] = None,
-        reason: Optional[str] = None
+        reason: Optional[str] = None,
+        commit: bool = True,
     ):
-        """Log threshold check to database"""
+        """Log threshold check to database (commit=False: ikut commit pemanggil)"""
         try:
             log = RaschThresholdLog(
                 rasch_analysis_id=analysis_id,
@@ -298,52 +382,140 @@ class RaschThresholdService:
                 reason=reason,
             )
             db.session.add(log)
-            db.session.commit()
+            if commit:
+                db.session.commit()
         except Exception as e:
             logger.error(f"Error logging threshold check: {e}")
             db.session.rollback()
     
-    def manual_trigger(self, quiz_id: int, min_persons: Optional[int] = None) -> Tuple[bool, str]:
+    def manual_trigger(
+        self,
+        quiz_id: int,
+        min_persons: Optional[int] = None,
+        estimator: Optional[str] = None,
+    ) -> Tuple[bool, str, Optional[int]]:
         """
         Manual trigger Rasch analysis (bypass threshold).
         
         Args:
             quiz_id: ID quiz
             min_persons: Override minimum persons threshold
+            estimator: Override estimator (jmle, prox, pairwise, cmle)
             
         Returns:
-            Tuple[bool, str]: (success, message)
+            Tuple[bool, str, Optional[int]]: (success, message, analysis_id)
+
+        Raises:
+            RaschQueueFullError: jika local executor penuh (tanpa broker)
         """
         try:
             # Get quiz
             quiz = Quiz.query.get(quiz_id)
             
             if not quiz:
-                return False, "Quiz not found"
+                return False, "Quiz not found", None
             
             # Get grade_item
             from app.models.gradebook import GradeItem
             grade_item = GradeItem.query.filter_by(quiz_id=quiz_id).first()
             
             if not grade_item or not grade_item.enable_rasch_analysis:
-                return False, "Rasch analysis not enabled for this quiz"
-            
-            # Get or create analysis
-            analysis = self._get_or_create_analysis(quiz_id, grade_item)
-            
-            # Override min_persons if specified
-            if min_persons:
-                analysis.min_persons = min_persons
-            
-            # Count current submissions
-            submission_count = QuizSubmission.query.filter_by(quiz_id=quiz_id).count()
-            analysis.num_persons = submission_count
-            
-            # Trigger analysis regardless of threshold
-            logger.info(f"Manual trigger for Rasch analysis {analysis.id} with {submission_count} submissions")
-            
-            return self._trigger_analysis(analysis, check_type='manual')
+                return False, "Rasch analysis not enabled for this quiz", None
             
+            from app.services.rasch_trigger import quiz_trigger_lock
+
+            with quiz_trigger_lock(quiz_id) as acquired:
+                if not acquired:
+                    return False, "Threshold check sedang berjalan untuk quiz ini, coba lagi", None
+
+                # Get or create analysis
+                analysis = self._get_or_create_analysis(quiz_id, grade_item)
+
+                # Jangan queue kalibrasi kedua selama yang pertama belum selesai
+                if analysis.status in (
+                    RaschAnalysisStatus.PROCESSING.value,
+                    RaschAnalysisStatus.QUEUED.value,
+                ):
+                    return False, "Analisis Rasch sedang berjalan", analysis.id
+
+                # Override min_persons if specified
+                if min_persons:
+                    analysis.min_persons = min_persons
+                if estimator:
+                    analysis.estimator = estimator
+
+                # Count current submissions
+                submission_count = QuizSubmission.query.filter_by(quiz_id=quiz_id).count()
+                analysis.num_persons = submission_count
+
+                # Trigger analysis regardless of threshold
+                logger.info(f"Manual trigger for Rasch analysis {analysis.id} with {submission_count} submissions")
+
+                success, message = self._trigger_analysis(analysis, check_type='manual')
+                return success, message, analysis.id
+
+        except RaschQueueFullError:
+            raise
         except Exception as e:
             logger.error(f"Error in manual trigger: {e}", exc_info=True)
-            return False, f"Error: {str(e)}"
+            return False, f"Error: {str(e)}", None
+
+    def trigger_combined(
+        self,
+        course_id: int,
+        created_by: int,
+        name: Optional[str] = None,
+    ) -> Tuple[bool, str, Optional[int]]:
+        """
+        Trigger combined analysis untuk semua quiz Rasch-enabled di course.
+
+        Combined analysis yang sudah ada untuk course dipakai ulang (measures
+        diganti saat hasil baru tersimpan).
+
+        Args:
+            course_id: ID course
+            created_by: User yang men-trigger
+            name: Optional nama analisis
+
+        Returns:
+            Tuple[bool, str, Optional[int]]: (success, message, analysis_id)
+
+        Raises:
+            RaschQueueFullError: jika local executor penuh (tanpa broker)
+        """
+        try:
+            analysis = RaschAnalysis.query.filter_by(
+                course_id=course_id,
+                analysis_type=RaschAnalysisType.COMBINED.value,
+            ).order_by(RaschAnalysis.id.desc()).first()
+
+            if analysis and analysis.status in [
+                RaschAnalysisStatus.PROCESSING.value,
+                RaschAnalysisStatus.QUEUED.value,
+            ]:
+                return False, "Combined analysis is already running", analysis.id
+
+            if not analysis:
+                analysis = RaschAnalysis(
+                    name=name or "Combined Rasch Analysis",
+                    course_id=course_id,
+                    analysis_type=RaschAnalysisType.COMBINED,
+                    status=RaschAnalysisStatus.PENDING,
+                    auto_trigger=False,
+                    created_by=created_by,
+                )
+                db.session.add(analysis)
+                db.session.commit()
+                logger.info(f"Created combined Rasch analysis {analysis.id} for course {course_id}")
+            elif name:
+                analysis.name = name
+
+            success, message = self._trigger_analysis(analysis, check_type='manual')
+            return success, message, analysis.id
+
+        except RaschQueueFullError:
+            raise
+        except Exception as e:
+            logger.error(f"Error triggering combined analysis: {e}", exc_info=True)
+            db.session.rollback()
+            return False, f"Error: {str(e)}", None
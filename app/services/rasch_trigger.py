@@ -0,0 +1,198 @@
+"""
+Rasch Trigger Coordination
+
+Koordinasi auto-trigger saat banyak siswa submit quiz yang sama dalam waktu
+singkat (mis. 300 submit dalam 2 menit di akhir ujian):
+
+    - Per-quiz lock: hanya satu request yang menjalankan threshold check dan
+      trigger untuk satu quiz pada satu waktu. Request lain tidak menunggu,
+      cukup menandai quiz sebagai "pending" supaya pemegang lock mengecek
+      ulang sekali sebelum melepas lock.
+    - Debounce ada di RaschThresholdService: analisis di-queue dengan
+      countdown sehingga seluruh burst masuk ke satu kalibrasi.
+
+Backend:
+    - Redis (``SET NX PX``) jika RASCH_TRIGGER_REDIS_URL di-set dan Redis bisa
+      dihubungi; lock berlaku lintas gunicorn worker dan host
+    - In-memory dict (per proses) sebagai fallback
+"""
+
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rasch:trigger:'
+DEFAULT_LOCK_TTL = 30  # detik
+
+# Lepas lock hanya jika token masih milik kita (lock bisa sudah expire dan
+# diambil request lain)
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class InMemoryTriggerStore:
+    """Stand-in per proses ketika Redis tidak tersedia"""
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry and entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[0] if entry else None
+
+    def set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._entries[key] = (value, time.monotonic() + ttl)
+            return True
+
+    def delete_if_equal(self, key: str, value: str):
+        with self._lock:
+            if self._get(key) == value:
+                del self._entries[key]
+
+    def pop(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._get(key)
+            self._entries.pop(key, None)
+            return value
+
+
+class RedisTriggerStore:
+    """Lock dan pending flag sebagai Redis key dengan TTL"""
+
+    def __init__(self, client):
+        self.client = client
+        self._release = client.register_script(RELEASE_SCRIPT)
+
+    def set_if_absent(self, key: str, value: str, ttl: float) -> bool:
+        return bool(self.client.set(key, value, nx=True, px=max(int(ttl * 1000), 1)))
+
+    def delete_if_equal(self, key: str, value: str):
+        self._release(keys=[key], args=[value])
+
+    def pop(self, key: str) -> Optional[str]:
+        pipe = self.client.pipeline()
+        pipe.get(key)
+        pipe.delete(key)
+        value, _ = pipe.execute()
+        return value.decode() if isinstance(value, bytes) else value
+
+
+_stores: Dict[str, object] = {}
+_stores_lock = threading.Lock()
+
+
+def get_trigger_store():
+    """
+    Store sesuai konfigurasi RASCH_TRIGGER_REDIS_URL.
+
+    Instance di-cache per URL; fallback ke InMemoryTriggerStore jika URL
+    kosong, package redis tidak ada, atau Redis tidak bisa dihubungi.
+    """
+    url = ''
+    if has_app_context():
+        url = current_app.config.get('RASCH_TRIGGER_REDIS_URL') or ''
+
+    with _stores_lock:
+        store = _stores.get(url)
+        if store is not None:
+            return store
+
+        store = None
+        if url:
+            try:
+                import redis
+                client = redis.from_url(url, socket_timeout=1)
+                client.ping()
+                store = RedisTriggerStore(client)
+            except Exception as e:
+                logger.warning(f"Redis trigger lock unavailable ({e}), using in-process lock")
+
+        if store is None:
+            store = InMemoryTriggerStore()
+
+        _stores[url] = store
+        return store
+
+
+def _lock_key(quiz_id: int) -> str:
+    return f"{KEY_PREFIX}lock:{quiz_id}"
+
+
+def _pending_key(quiz_id: int) -> str:
+    return f"{KEY_PREFIX}pending:{quiz_id}"
+
+
+def _lock_ttl() -> float:
+    if has_app_context():
+        return float(current_app.config.get('RASCH_TRIGGER_LOCK_TTL', DEFAULT_LOCK_TTL))
+    return DEFAULT_LOCK_TTL
+
+
+@contextmanager
+def quiz_trigger_lock(quiz_id: int, store=None, ttl: Optional[float] = None) -> Iterator[bool]:
+    """
+    Non-blocking lock per quiz.
+
+    Yields:
+        bool: True jika lock didapat. Jika False, request lain sedang
+        menjalankan threshold check untuk quiz ini.
+
+    Jika store error, lock dianggap didapat (perilaku lama: tanpa koordinasi)
+    supaya submit quiz tidak pernah gagal karena Redis.
+    """
+    store = store if store is not None else get_trigger_store()
+    key = _lock_key(quiz_id)
+    token = uuid.uuid4().hex
+    try:
+        acquired = store.set_if_absent(key, token, ttl if ttl is not None else _lock_ttl())
+    except Exception as e:
+        logger.warning(f"Trigger lock for quiz {quiz_id} unavailable: {e}")
+        yield True
+        return
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                store.delete_if_equal(key, token)
+            except Exception as e:
+                # Lock akan expire sendiri setelah TTL
+                logger.warning(f"Failed to release trigger lock for quiz {quiz_id}: {e}")
+
+
+def mark_pending(quiz_id: int, store=None, ttl: Optional[float] = None):
+    """Tandai ada submit baru selama lock dipegang request lain"""
+    store = store if store is not None else get_trigger_store()
+    try:
+        store.set_if_absent(_pending_key(quiz_id), '1', ttl if ttl is not None else _lock_ttl())
+    except Exception as e:
+        logger.warning(f"Failed to mark pending trigger for quiz {quiz_id}: {e}")
+
+
+def pop_pending(quiz_id: int, store=None) -> bool:
+    """Ambil dan hapus pending flag; True jika ada submit yang ter-coalesce"""
+    store = store if store is not None else get_trigger_store()
+    try:
+        return store.pop(_pending_key(quiz_id)) is not None
+    except Exception as e:
+        logger.warning(f"Failed to read pending trigger for quiz {quiz_id}: {e}")
+        return False
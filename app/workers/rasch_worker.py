@@ -2,14 +2,19 @@
 Celery Workers for Rasch Analysis
 
 Background tasks untuk menjalankan Rasch Model analysis.
+
+Task di-register saat modul ini di-import (lewat `include` di
+app.celery_app), sehingga `from app.workers.rasch_worker import rasch_analysis`
+selalu berhasil di web process maupun worker.
 """
 
 import logging
 from datetime import datetime
-from typing import Optional
 
-from app.celery_app import init_celery
-from app.models.rasch import RaschAnalysis, RaschAnalysisStatus, RaschThresholdLog, ThresholdCheckType, ThresholdAction
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.celery_app import celery
+from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
 
 logger = logging.getLogger(__name__)
 
@@ -17,106 +22,112 @@ logger = logging.getLogger(__name__)
 def run_rasch_analysis_task(analysis_id: int) -> dict:
     """
     Run Rasch analysis untuk analysis_id tertentu.
-    
+
     Task ini akan:
     1. Load data dari database
     2. Jalankan JMLE algorithm
     3. Save results
-    
+
+    Harus dipanggil di dalam app context (disediakan oleh ContextTask);
+    app dan DB engine milik worker process dipakai ulang antar task.
+
     Args:
         analysis_id: ID dari rasch_analyses record
-        
+
     Returns:
         dict: Result status
     """
-    from app import create_app, db
+    from app import db
     from app.services.rasch_analysis_service import RaschAnalysisService
-    
-    app = create_app()
-    
-    with app.app_context():
-        try:
-            # Get analysis record
-            analysis = RaschAnalysis.query.get(analysis_id)
-            
-            if not analysis:
-                logger.error(f"Analysis {analysis_id} not found")
-                return {'status': 'failed', 'error': 'Analysis not found'}
-            
-            # Update status
-            analysis.status = RaschAnalysisStatus.PROCESSING.value
-            analysis.started_at = datetime.utcnow()
-            analysis.status_message = "Starting JMLE algorithm..."
-            db.session.commit()
-            
-            logger.info(f"Starting Rasch analysis {analysis_id} for {analysis.name}")
-            
-            # Run analysis
-            service = RaschAnalysisService(analysis_id=analysis_id)
-            success = service.run_analysis()
-            
-            if success:
-                logger.info(f"Rasch analysis {analysis_id} completed successfully")
-                return {
-                    'status': 'completed',
-                    'analysis_id': analysis_id,
-                    'converged': analysis.status == RaschAnalysisStatus.COMPLETED.value,
-                    'num_persons': analysis.num_persons,
-                    'num_items': analysis.num_items,
-                }
-            else:
-                logger.warning(f"Rasch analysis {analysis_id} completed with issues")
-                return {
-                    'status': 'partial',
-                    'analysis_id': analysis_id,
-                    'error': analysis.error_message,
-                }
-                
-        except Exception as e:
-            logger.error(f"Rasch analysis {analysis_id} failed: {e}", exc_info=True)
-            
-            # Update analysis status
-            if analysis:
-                analysis.status = RaschAnalysisStatus.FAILED.value
-                analysis.error_message = str(e)
-                analysis.completed_at = datetime.utcnow()
-                db.session.commit()
-            
+
+    analysis = None
+    try:
+        # Get analysis record
+        analysis = db.session.get(RaschAnalysis, analysis_id)
+
+        if not analysis:
+            logger.error(f"Analysis {analysis_id} not found")
+            return {'status': 'failed', 'error': 'Analysis not found'}
+
+        logger.info(f"Starting Rasch analysis {analysis_id} for {analysis.name}")
+
+        # Run analysis (status PROCESSING di-set oleh service)
+        service = RaschAnalysisService(analysis_id=analysis_id)
+        success = service.run_analysis()
+
+        if success:
+            logger.info(f"Rasch analysis {analysis_id} completed successfully")
+            return {
+                'status': 'completed',
+                'analysis_id': analysis_id,
+                'converged': analysis.status == RaschAnalysisStatus.COMPLETED.value,
+                'unchanged': service.unchanged,
+                'num_persons': analysis.num_persons,
+                'num_items': analysis.num_items,
+            }
+        else:
+            logger.warning(f"Rasch analysis {analysis_id} completed with issues")
             return {
-                'status': 'failed',
+                'status': 'partial',
                 'analysis_id': analysis_id,
-                'error': str(e),
+                'error': analysis.error_message,
             }
 
+    except SoftTimeLimitExceeded:
+        # Biarkan PROCESSING; retry task melanjutkan dari checkpoint JMLE
+        raise
+
+    except Exception as e:
+        logger.error(f"Rasch analysis {analysis_id} failed: {e}", exc_info=True)
+        db.session.rollback()
+
+        # Update analysis status
+        if analysis:
+            analysis.status = RaschAnalysisStatus.FAILED.value
+            analysis.error_message = str(e)
+            analysis.completed_at = datetime.utcnow()
+            db.session.commit()
+
+        return {
+            'status': 'failed',
+            'analysis_id': analysis_id,
+            'error': str(e),
+        }
+
+
+# Hasil disimpan di rasch_analyses, result backend tidak dipakai
+@celery.task(
+    bind=True,
+    name='app.workers.rasch_worker.rasch_analysis',
+    ignore_result=True,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def rasch_analysis(self, analysis_id: int) -> dict:
+    """
+    Celery task untuk menjalankan Rasch analysis.
+
+    Usage:
+        rasch_analysis.delay(analysis_id=1)
+    """
+    try:
+        return run_rasch_analysis_task(analysis_id)
+    except Exception as exc:
+        # Retry dengan exponential backoff
+        raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
+
+
+@celery.task(
+    name='app.workers.rasch_worker.rasch_dif_analysis',
+    ignore_result=True,
+)
+def rasch_dif_analysis(dif_id: int) -> bool:
+    """
+    Celery task untuk analisis DIF (hasil disimpan di rasch_dif_analyses).
+
+    Usage:
+        rasch_dif_analysis.delay(dif_id=1)
+    """
+    from app.services.rasch_dif import run_dif_analysis
 
-# Celery task decorator (akan di-register saat autodiscover)
-try:
-    from app.celery_app import make_celery
-    from flask import current_app
-    
-    # Get celery instance from app
-    celery = None
-    
-    @current_app.before_first_request
-    def register_tasks():
-        global celery
-        celery = current_app.extensions.get('celery')
-        
-        if celery:
-            @celery.task(bind=True, max_retries=3, default_retry_delay=60)
-            def rasch_analysis(self, analysis_id: int) -> dict:
-                """
-                Celery task untuk menjalankan Rasch analysis.
-                
-                Usage:
-                    rasch_analysis.delay(analysis_id=1)
-                """
-                try:
-                    return run_rasch_analysis_task(analysis_id)
-                except Exception as exc:
-                    # Retry dengan exponential backoff
-                    raise self.retry(exc=exc, countdown=60 * (2 ** self.request.retries))
-
-except ImportError:
-    # Fallback untuk testing tanpa Celery
-    logger.info("Celery not configured, using sync execution")
+    return run_dif_analysis(dif_id)
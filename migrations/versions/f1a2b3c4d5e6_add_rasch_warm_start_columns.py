@@ -0,0 +1,40 @@
+"""add rasch warm start columns
+
+Revision ID: f1a2b3c4d5e6
+Revises: e1f2g3h4i5j7
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = 'e1f2g3h4i5j7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'iterations' not in columns:
+        op.add_column('rasch_analyses', sa.Column('iterations', sa.Integer(), nullable=True))
+    if 'warm_started' not in columns:
+        op.add_column('rasch_analyses', sa.Column('warm_started', sa.Boolean(), nullable=False, server_default=sa.false()))
+    if 'iterations_saved' not in columns:
+        op.add_column('rasch_analyses', sa.Column('iterations_saved', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'iterations_saved')
+    op.drop_column('rasch_analyses', 'warm_started')
+    op.drop_column('rasch_analyses', 'iterations')
@@ -0,0 +1,39 @@
+"""add rasch estimator column
+
+Revision ID: f2b3c4d5e6a7
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2b3c4d5e6a7'
+down_revision = 'f1a2b3c4d5e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'estimator' not in columns:
+        op.add_column('rasch_analyses', sa.Column(
+            'estimator',
+            sa.Enum('jmle', 'prox', 'pairwise', 'cmle', name='raschestimator'),
+            nullable=False,
+            server_default='jmle',
+        ))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'estimator')
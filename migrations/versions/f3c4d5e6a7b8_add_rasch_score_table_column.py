@@ -0,0 +1,34 @@
+"""add rasch score table column
+
+Revision ID: f3c4d5e6a7b8
+Revises: f2b3c4d5e6a7
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c4d5e6a7b8'
+down_revision = 'f2b3c4d5e6a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'score_table' not in columns:
+        op.add_column('rasch_analyses', sa.Column('score_table', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'score_table')
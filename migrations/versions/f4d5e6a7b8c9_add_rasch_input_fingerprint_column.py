@@ -0,0 +1,34 @@
+"""add rasch input fingerprint column
+
+Revision ID: f4d5e6a7b8c9
+Revises: f3c4d5e6a7b8
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4d5e6a7b8c9'
+down_revision = 'f3c4d5e6a7b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'input_fingerprint' not in columns:
+        op.add_column('rasch_analyses', sa.Column('input_fingerprint', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'input_fingerprint')
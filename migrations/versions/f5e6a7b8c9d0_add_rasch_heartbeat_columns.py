@@ -0,0 +1,37 @@
+"""add rasch heartbeat columns
+
+Revision ID: f5e6a7b8c9d0
+Revises: f4d5e6a7b8c9
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5e6a7b8c9d0'
+down_revision = 'f4d5e6a7b8c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'heartbeat_at' not in columns:
+        op.add_column('rasch_analyses', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    if 'requeue_count' not in columns:
+        op.add_column('rasch_analyses', sa.Column('requeue_count', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'requeue_count')
+    op.drop_column('rasch_analyses', 'heartbeat_at')
@@ -0,0 +1,34 @@
+"""add rasch convergence history column
+
+Revision ID: f6a7b8c9d0e1
+Revises: f5e6a7b8c9d0
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a7b8c9d0e1'
+down_revision = 'f5e6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'convergence_history' not in columns:
+        op.add_column('rasch_analyses', sa.Column('convergence_history', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'convergence_history')
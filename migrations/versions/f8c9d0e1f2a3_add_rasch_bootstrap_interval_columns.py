@@ -0,0 +1,43 @@
+"""add rasch bootstrap interval columns
+
+Revision ID: f8c9d0e1f2a3
+Revises: f7b8c9d0e1f2
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8c9d0e1f2a3'
+down_revision = 'f7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+INTERVAL_COLUMNS = {
+    'rasch_person_measures': ('theta_ci_low', 'theta_ci_high'),
+    'rasch_item_measures': ('delta_ci_low', 'delta_ci_high'),
+}
+
+
+def upgrade():
+    # Tabel rasch dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+
+    for table, names in INTERVAL_COLUMNS.items():
+        if table not in tables:
+            continue
+        columns = [col['name'] for col in inspector.get_columns(table)]
+        for name in names:
+            if name not in columns:
+                op.add_column(table, sa.Column(name, sa.Numeric(10, 6), nullable=True))
+
+
+def downgrade():
+    for table, names in INTERVAL_COLUMNS.items():
+        for name in names:
+            op.drop_column(table, name)
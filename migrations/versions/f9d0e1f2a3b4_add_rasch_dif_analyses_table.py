@@ -0,0 +1,56 @@
+"""add rasch dif analyses table
+
+Revision ID: f9d0e1f2a3b4
+Revises: f8c9d0e1f2a3
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f9d0e1f2a3b4'
+down_revision = 'f8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+ANALYSIS_STATUSES = ('pending', 'waiting', 'queued', 'processing', 'completed', 'failed', 'partial')
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+    if 'rasch_analyses' not in tables or 'rasch_dif_analyses' in tables:
+        return
+
+    op.create_table('rasch_dif_analyses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('rasch_analysis_id', sa.Integer(), nullable=False),
+    sa.Column('group_by', sa.Enum('course', 'field', 'custom', name='difgrouping'), nullable=False),
+    sa.Column('group_field', sa.String(length=50), nullable=True),
+    sa.Column('group_params', sa.JSON(), nullable=True),
+    sa.Column('reference_group', sa.String(length=100), nullable=True),
+    sa.Column('status', sa.Enum(*ANALYSIS_STATUSES, name='raschdifstatus'), nullable=False),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('groups', sa.JSON(), nullable=True),
+    sa.Column('items', sa.JSON(), nullable=True),
+    sa.Column('num_flagged', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['rasch_analysis_id'], ['rasch_analyses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_rasch_dif_analyses_rasch_analysis_id', 'rasch_dif_analyses', ['rasch_analysis_id'])
+    op.create_index('ix_rasch_dif_analyses_status', 'rasch_dif_analyses', ['status'])
+
+
+def downgrade():
+    op.drop_index('ix_rasch_dif_analyses_status', table_name='rasch_dif_analyses')
+    op.drop_index('ix_rasch_dif_analyses_rasch_analysis_id', table_name='rasch_dif_analyses')
+    op.drop_table('rasch_dif_analyses')
@@ -0,0 +1,34 @@
+"""add rasch residual pca column
+
+Revision ID: fae1f2a3b4c5
+Revises: f9d0e1f2a3b4
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fae1f2a3b4c5'
+down_revision = 'f9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    if 'rasch_analyses' not in inspector.get_table_names():
+        return
+
+    columns = [col['name'] for col in inspector.get_columns('rasch_analyses')]
+
+    if 'residual_pca' not in columns:
+        op.add_column('rasch_analyses', sa.Column('residual_pca', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('rasch_analyses', 'residual_pca')
@@ -0,0 +1,51 @@
+"""add rasch item bank table
+
+Revision ID: fb1f2a3b4c5d
+Revises: fae1f2a3b4c5
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fb1f2a3b4c5d'
+down_revision = 'fae1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # rasch_analyses dibuat oleh migrations/002_rasch_model*.sql; cek dulu (idempotent)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+    if 'rasch_analyses' not in tables or 'rasch_item_bank' in tables:
+        return
+
+    op.create_table('rasch_item_bank',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('content_fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('delta', sa.Numeric(precision=10, scale=6), nullable=True),
+    sa.Column('delta_se', sa.Numeric(precision=10, scale=6), nullable=True),
+    sa.Column('exposure_count', sa.Integer(), nullable=False),
+    sa.Column('calibration_count', sa.Integer(), nullable=False),
+    sa.Column('last_analysis_id', sa.Integer(), nullable=True),
+    sa.Column('fit_history', sa.JSON(), nullable=True),
+    sa.Column('calibrated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['last_analysis_id'], ['rasch_analyses.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('question_id')
+    )
+    op.create_index('ix_rasch_item_bank_content_fingerprint', 'rasch_item_bank', ['content_fingerprint'])
+
+
+def downgrade():
+    op.drop_index('ix_rasch_item_bank_content_fingerprint', table_name='rasch_item_bank')
+    op.drop_table('rasch_item_bank')
@@ -9,6 +9,9 @@ Or with specific queue:
 
 For development without Redis:
     python run_worker.py --without-gossip --without-mingle --without-heartbeat
+
+Production (satu lightweight app per worker process, dibuat saat process start):
+    celery -A app.celery_app worker --loglevel=info
 """
 
 import os
@@ -17,18 +20,16 @@ import sys
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import create_app
+from app import create_worker_app
+from app.celery_app import make_celery
 
-app = create_app()
+app = create_worker_app()
+celery = make_celery(app)
 
 if __name__ == '__main__':
     # Start Celery worker
     # Note: For production, use: celery -A run_worker.celery worker --loglevel=info
-    
-    from app.celery_app import make_celery
-    
-    celery = make_celery(app)
-    
+
     # Default worker arguments
     argv = sys.argv[1:] or [
         'worker',
@@ -0,0 +1,413 @@
+"""
+Rasch Accuracy & Speed Benchmark
+
+Membangun response data sintetis dari thetas/deltas yang diketahui, menulisnya
+ke database SQLite lokal, lalu menjalankan RaschAnalysisService untuk setiap
+estimator. Dilaporkan: wall time, peak memory (tracemalloc), iterasi, dan
+RMSE terhadap parameter generator.
+
+Usage:
+    # Grid cepat, tampilkan tabel
+    python scripts/benchmark_rasch.py
+
+    # Grid lengkap (30×10 s/d 5000×200), simpan sebagai baseline
+    python scripts/benchmark_rasch.py --grid full --output scripts/rasch_benchmark_baseline.json
+
+    # Bandingkan dengan baseline (exit code 1 jika ada regresi)
+    python scripts/benchmark_rasch.py --baseline scripts/rasch_benchmark_baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Tambahkan project root ke path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ESTIMATORS = ['jmle', 'prox', 'pairwise', 'cmle']
+# Reference implementation (engine python) hanya untuk data kecil
+PYTHON_ENGINE_MAX_CELLS = 50_000
+INSERT_CHUNK_SIZE = 50_000
+
+# Toleransi regresi terhadap baseline
+TIME_TOLERANCE = 0.5  # +50% wall time
+TIME_NOISE_FLOOR = 0.05  # detik; selisih lebih kecil diabaikan
+RMSE_TOLERANCE = 0.05  # logit
+
+
+@dataclass
+class Scenario:
+    persons: int
+    items: int
+    missing_rate: float = 0.0
+    extreme_rate: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"{self.persons}x{self.items}-m{self.missing_rate:g}-e{self.extreme_rate:g}"
+
+
+GRIDS = {
+    'quick': [
+        Scenario(30, 10),
+        Scenario(200, 30, missing_rate=0.1),
+        Scenario(1000, 50, missing_rate=0.1, extreme_rate=0.05),
+    ],
+    'full': [
+        Scenario(30, 10),
+        Scenario(30, 10, missing_rate=0.2, extreme_rate=0.1),
+        Scenario(200, 30),
+        Scenario(200, 30, missing_rate=0.2, extreme_rate=0.1),
+        Scenario(1000, 50, missing_rate=0.1, extreme_rate=0.05),
+        Scenario(2000, 100, missing_rate=0.1, extreme_rate=0.05),
+        Scenario(5000, 200),
+        Scenario(5000, 200, missing_rate=0.2, extreme_rate=0.05),
+    ],
+}
+
+
+@dataclass
+class SyntheticData:
+    thetas: np.ndarray
+    deltas: np.ndarray  # di-center ke 0
+    responses: np.ndarray  # 0/1 (persons × items)
+    observed: np.ndarray  # bool mask
+    forced_extreme: np.ndarray  # person yang dipaksa skor 0/sempurna
+
+
+def simulate_responses(scenario: Scenario, seed: int = 42) -> SyntheticData:
+    """Response matrix dari dichotomous Rasch model dengan parameter yang diketahui"""
+    rng = np.random.default_rng(seed)
+    thetas = rng.normal(0, 1, scenario.persons)
+    deltas = rng.normal(0, 1, scenario.items)
+    deltas -= deltas.mean()
+
+    probabilities = 1 / (1 + np.exp(-(thetas[:, None] - deltas[None, :])))
+    responses = (rng.random(probabilities.shape) < probabilities).astype(np.int8)
+    observed = rng.random(probabilities.shape) >= scenario.missing_rate
+    # Setiap person minimal menjawab satu soal
+    observed[np.arange(scenario.persons), rng.integers(0, scenario.items, scenario.persons)] = True
+
+    forced_extreme = rng.random(scenario.persons) < scenario.extreme_rate
+    responses[forced_extreme] = (rng.random(forced_extreme.sum()) < 0.5)[:, None]
+
+    return SyntheticData(thetas, deltas, responses, observed, forced_extreme)
+
+
+def _insert_chunked(db, table, rows: List[dict]):
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(table.insert(), rows[start:start + INSERT_CHUNK_SIZE])
+
+
+def load_into_database(db, data: SyntheticData) -> Dict[str, object]:
+    """
+    Tulis course, quiz, soal, siswa, submission dan jawaban (bulk insert).
+
+    ID ditentukan sendiri karena database selalu baru dibuat per scenario.
+
+    Returns:
+        dict dengan course_id, quiz_id, teacher_id, student_ids, question_ids
+    """
+    from app.models import AcademicYear, Course, Quiz, User, UserRole
+    from app.models.quiz import Answer, Option, Question, QuestionType, QuizSubmission
+
+    num_persons, num_items = data.responses.shape
+    password_hash = 'benchmark'
+
+    teacher_id = 1
+    student_ids = list(range(2, num_persons + 2))
+    _insert_chunked(db, User.__table__, [
+        {'id': teacher_id, 'name': 'Guru Benchmark', 'email': 'guru@benchmark.test',
+         'password_hash': password_hash, 'role': UserRole.GURU},
+    ] + [
+        {'id': sid, 'name': f'Siswa {sid}', 'email': f'siswa{sid}@benchmark.test',
+         'password_hash': password_hash, 'role': UserRole.MURID}
+        for sid in student_ids
+    ])
+
+    academic_year = AcademicYear(year='benchmark', is_active=True)
+    db.session.add(academic_year)
+    db.session.flush()
+    course = Course(name='Benchmark', class_code='BENCH', teacher_id=teacher_id,
+                    academic_year_id=academic_year.id)
+    db.session.add(course)
+    db.session.flush()
+    quiz = Quiz(name='Benchmark Quiz', course_id=course.id, points=num_items)
+    db.session.add(quiz)
+    db.session.flush()
+
+    question_ids = list(range(1, num_items + 1))
+    _insert_chunked(db, Question.__table__, [
+        {'id': qid, 'quiz_id': quiz.id, 'question_text': f'Soal {qid}',
+         'question_type': QuestionType.MULTIPLE_CHOICE, 'order': qid, 'points': 1}
+        for qid in question_ids
+    ])
+    # Option 2q-1 benar, 2q salah
+    _insert_chunked(db, Option.__table__, [
+        row for qid in question_ids for row in (
+            {'id': 2 * qid - 1, 'question_id': qid, 'option_text': 'Benar', 'is_correct': True},
+            {'id': 2 * qid, 'question_id': qid, 'option_text': 'Salah', 'is_correct': False},
+        )
+    ])
+
+    raw_scores = (data.responses * data.observed).sum(axis=1)
+    _insert_chunked(db, QuizSubmission.__table__, [
+        {'id': i + 1, 'quiz_id': quiz.id, 'user_id': sid,
+         'score': int(raw_scores[i]), 'total_points': num_items}
+        for i, sid in enumerate(student_ids)
+    ])
+
+    person_index, item_index = np.nonzero(data.observed)
+    correct = data.responses[person_index, item_index]
+    _insert_chunked(db, Answer.__table__, [
+        {'submission_id': int(i) + 1, 'question_id': int(j) + 1,
+         'selected_option_id': 2 * (int(j) + 1) - int(c)}
+        for i, j, c in zip(person_index, item_index, correct)
+    ])
+
+    db.session.commit()
+    return {
+        'course_id': course.id,
+        'quiz_id': quiz.id,
+        'teacher_id': teacher_id,
+        'student_ids': student_ids,
+        'question_ids': question_ids,
+    }
+
+
+def _rmse(estimated: np.ndarray, expected: np.ndarray) -> Optional[float]:
+    if estimated.size == 0:
+        return None
+    return round(float(np.sqrt(np.mean((estimated - expected) ** 2))), 4)
+
+
+def _create_analysis(db, fixture: dict, estimator: str, engine: str) -> int:
+    from app.models.rasch import RaschAnalysis, RaschAnalysisStatus, RaschAnalysisType
+
+    analysis = RaschAnalysis(
+        course_id=fixture['course_id'],
+        quiz_id=fixture['quiz_id'],
+        name=f'Benchmark {estimator} ({engine})',
+        analysis_type=RaschAnalysisType.QUIZ,
+        status=RaschAnalysisStatus.PENDING,
+        estimator=estimator,
+        created_by=fixture['teacher_id'],
+    )
+    db.session.add(analysis)
+    db.session.commit()
+    return analysis.id
+
+
+def _run_analysis(analysis_id: int, estimator: str, engine: str) -> bool:
+    from app.services.rasch_analysis_service import RaschAnalysisService
+
+    service = RaschAnalysisService(analysis_id, engine=engine, warm_start=False, estimator=estimator)
+    return service.run_analysis()
+
+
+def run_estimator(
+    db,
+    fixture: dict,
+    data: SyntheticData,
+    estimator: str,
+    engine: str,
+    measure_memory: bool = True,
+) -> dict:
+    """
+    Satu RaschAnalysis end-to-end (load, estimasi, fit, simpan).
+
+    Wall time diukur tanpa tracemalloc (overhead-nya bisa 2x); peak memory
+    diukur di run kedua pada analysis terpisah.
+    """
+    from app.models.rasch import RaschAnalysis, RaschItemMeasure, RaschPersonMeasure
+
+    analysis_id = _create_analysis(db, fixture, estimator, engine)
+    started = time.perf_counter()
+    success = _run_analysis(analysis_id, estimator, engine)
+    wall_time = time.perf_counter() - started
+
+    peak = None
+    if measure_memory:
+        traced_id = _create_analysis(db, fixture, estimator, engine)
+        tracemalloc.start()
+        _run_analysis(traced_id, estimator, engine)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    iterations, status = db.session.query(
+        RaschAnalysis.iterations, RaschAnalysis.status,
+    ).filter_by(id=analysis_id).one()
+
+    deltas = dict(db.session.query(RaschItemMeasure.question_id, RaschItemMeasure.delta)
+                  .filter_by(rasch_analysis_id=analysis_id))
+    thetas = dict(db.session.query(RaschPersonMeasure.student_id, RaschPersonMeasure.theta)
+                  .filter_by(rasch_analysis_id=analysis_id))
+
+    estimated_deltas = np.array([float(deltas[qid]) for qid in fixture['question_ids']])
+    estimated_thetas = np.array([float(thetas[sid]) for sid in fixture['student_ids']])
+
+    # Skala diidentifikasi lewat rata-rata difficulty (generator di-center ke 0)
+    shift = estimated_deltas.mean()
+    regular = ~data.forced_extreme
+
+    return {
+        'estimator': estimator,
+        'engine': engine,
+        'success': bool(success),
+        'status': getattr(status, 'value', status),
+        'wall_time': round(wall_time, 4),
+        'peak_memory_mb': round(peak / 2 ** 20, 2) if peak is not None else None,
+        'iterations': iterations,
+        'rmse_delta': _rmse(estimated_deltas - shift, data.deltas),
+        'rmse_theta': _rmse(estimated_thetas[regular] - shift, data.thetas[regular]),
+    }
+
+
+def run_scenario(
+    app,
+    scenario: Scenario,
+    estimators: List[str],
+    include_python: bool,
+    seed: int,
+    measure_memory: bool = True,
+) -> List[dict]:
+    from app.extensions import db
+
+    data = simulate_responses(scenario, seed=seed)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        fixture = load_into_database(db, data)
+
+        runs = [(estimator, 'numpy') for estimator in estimators]
+        if include_python and 'jmle' in estimators and scenario.persons * scenario.items <= PYTHON_ENGINE_MAX_CELLS:
+            runs.append(('jmle', 'python'))
+
+        results = []
+        for estimator, engine in runs:
+            result = run_estimator(db, fixture, data, estimator, engine, measure_memory)
+            result['scenario'] = scenario.name
+            results.append(result)
+            print(
+                f"{scenario.name:<24} {estimator:<9} {engine:<7} "
+                f"{result['wall_time']:>8.3f}s {result['peak_memory_mb'] or 0:>8.1f}MB "
+                f"iter={result['iterations']!s:<4} "
+                f"rmse_delta={result['rmse_delta']} rmse_theta={result['rmse_theta']}"
+            )
+        db.session.remove()
+    return results
+
+
+def compare_with_baseline(results: List[dict], baseline: dict) -> List[str]:
+    """Daftar regresi (wall time atau RMSE) terhadap baseline"""
+    previous = {
+        (r['scenario'], r['estimator'], r['engine']): r for r in baseline.get('results', [])
+    }
+    regressions = []
+    for result in results:
+        key = (result['scenario'], result['estimator'], result['engine'])
+        before = previous.get(key)
+        if before is None:
+            continue
+        label = '/'.join(key)
+
+        slower = result['wall_time'] - before['wall_time']
+        if slower > TIME_NOISE_FLOOR and result['wall_time'] > before['wall_time'] * (1 + TIME_TOLERANCE):
+            regressions.append(
+                f"{label}: wall time {before['wall_time']:.3f}s -> {result['wall_time']:.3f}s"
+            )
+        for metric in ('rmse_delta', 'rmse_theta'):
+            if result[metric] is None or before.get(metric) is None:
+                continue
+            if result[metric] > before[metric] + RMSE_TOLERANCE:
+                regressions.append(f"{label}: {metric} {before[metric]} -> {result[metric]}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Rasch accuracy & speed benchmark')
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick')
+    parser.add_argument('--estimators', default=','.join(ESTIMATORS),
+                        help='Comma-separated: jmle,prox,pairwise,cmle')
+    parser.add_argument('--include-python', action='store_true',
+                        help=f'Juga jalankan reference engine (<= {PYTHON_ENGINE_MAX_CELLS} cells)')
+    parser.add_argument('--skip-memory', action='store_true',
+                        help='Lewati run kedua dengan tracemalloc (peak memory)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database', help='Path SQLite (default: file sementara)')
+    parser.add_argument('--output', help='Tulis hasil ke file JSON (mis. baseline baru)')
+    parser.add_argument('--baseline', help='Bandingkan dengan baseline JSON')
+    args = parser.parse_args(argv)
+
+    estimators = [e.strip() for e in args.estimators.split(',') if e.strip()]
+    unknown = set(estimators) - set(ESTIMATORS)
+    if unknown:
+        parser.error(f"Unknown estimators: {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('app').setLevel(logging.WARNING)
+
+    from app import create_app
+
+    database = args.database or os.path.join(tempfile.mkdtemp(prefix='rasch-bench-'), 'bench.db')
+    app = create_app(test_config={
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(database)}',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+        'RASCH_WARM_START': False,
+    })
+
+    results = []
+    for scenario in GRIDS[args.grid]:
+        results.extend(run_scenario(
+            app, scenario, estimators, args.include_python, args.seed,
+            measure_memory=not args.skip_memory,
+        ))
+
+    report = {
+        'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'grid': args.grid,
+        'seed': args.seed,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'scenarios': [dict(asdict(s), name=s.name) for s in GRIDS[args.grid]],
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"Results written to {args.output}")
+
+    failed = [r for r in results if not r['success']]
+    for r in failed:
+        print(f"FAILED: {r['scenario']} {r['estimator']} ({r['engine']})")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -196,3 +196,1320 @@ class TestRaschAPI:
         assert response.status_code in [200, 202]
         data = response.get_json()
         assert 'success' in data or 'analysis_id' in data
+
+
+@pytest.fixture
+def rasch_quiz_data(app, quiz):
+    """Quiz dengan 3 soal pilihan ganda, 4 siswa, dan jawaban"""
+    from app.models import Option, QuestionType
+
+    questions = []
+    for n in range(3):
+        question = Question(
+            quiz_id=quiz.id,
+            question_text=f'Soal {n + 1}',
+            question_type=QuestionType.MULTIPLE_CHOICE,
+            order=n + 1,
+        )
+        db.session.add(question)
+        db.session.flush()
+        correct = Option(option_text='Benar', is_correct=True, question_id=question.id)
+        wrong = Option(option_text='Salah', is_correct=False, question_id=question.id)
+        db.session.add_all([correct, wrong])
+        db.session.flush()
+        questions.append((question, correct, wrong))
+
+    # Pola jawaban: 1 = benar, 0 = salah, None = tidak dijawab
+    patterns = [[1, 1, 0], [1, 0, 0], [0, None, 1], [1, 1, 1]]
+    students = []
+    for n, pattern in enumerate(patterns):
+        student = User(name=f'Siswa {n}', email=f'siswa{n}@test.com', role=UserRole.MURID)
+        student.set_password('password123')
+        db.session.add(student)
+        db.session.flush()
+        submission = QuizSubmission(quiz_id=quiz.id, user_id=student.id, score=0, total_points=3)
+        db.session.add(submission)
+        db.session.flush()
+        for (question, correct, wrong), value in zip(questions, pattern):
+            if value is None:
+                continue
+            option = correct if value else wrong
+            db.session.add(Answer(
+                submission_id=submission.id,
+                question_id=question.id,
+                selected_option_id=option.id,
+            ))
+        students.append(student)
+
+    db.session.commit()
+    return {
+        'quiz': quiz,
+        'questions': [q for q, _, _ in questions],
+        'students': students,
+        'patterns': patterns,
+    }
+
+
+class TestRaschDataLoader:
+    """Test bulk response-matrix loader"""
+
+    def test_load_quiz_responses_builds_matrix(self, rasch_quiz_data):
+        from app.services.rasch_data_loader import load_quiz_responses
+
+        data = load_quiz_responses(rasch_quiz_data['quiz'].id)
+        matrix = data.to_matrix()
+
+        assert data.num_persons == 4
+        assert data.num_items == 3
+        assert data.num_responses == 11
+
+        for student, pattern in zip(rasch_quiz_data['students'], rasch_quiz_data['patterns']):
+            row = data.person_lookup[student.id]
+            assert matrix.observed[row].tolist() == [value is not None for value in pattern]
+            assert matrix.responses[row].tolist() == [float(value or 0) for value in pattern]
+
+    def test_latest_attempt_wins(self, rasch_quiz_data):
+        from app.services.rasch_data_loader import load_quiz_responses
+
+        student = rasch_quiz_data['students'][1]
+        question = rasch_quiz_data['questions'][2]
+        correct = question.options.filter_by(is_correct=True).first()
+        retry = QuizSubmission(quiz_id=rasch_quiz_data['quiz'].id, user_id=student.id, score=0, total_points=3)
+        db.session.add(retry)
+        db.session.flush()
+        db.session.add(Answer(submission_id=retry.id, question_id=question.id, selected_option_id=correct.id))
+        db.session.commit()
+
+        data = load_quiz_responses(rasch_quiz_data['quiz'].id)
+
+        assert data.submission_ids[student.id] == retry.id
+        assert data.to_dict()[(student.id, question.id)] == 1
+        assert (student.id, rasch_quiz_data['questions'][0].id) not in data.to_dict()
+
+    def test_fingerprint_tracks_answer_key(self, rasch_quiz_data):
+        from app.services.rasch_data_loader import load_quiz_responses
+
+        quiz_id = rasch_quiz_data['quiz'].id
+        first = load_quiz_responses(quiz_id).fingerprint('jmle')
+
+        assert load_quiz_responses(quiz_id).fingerprint('jmle') == first
+        assert load_quiz_responses(quiz_id).fingerprint('prox') != first
+
+        # Kunci jawaban diganti: skor berubah walaupun tidak ada submission baru
+        for option in rasch_quiz_data['questions'][0].options:
+            option.is_correct = not option.is_correct
+        db.session.commit()
+        assert load_quiz_responses(quiz_id).fingerprint('jmle') != first
+
+    def test_checkbox_answers_from_submit_get_partial_credit(self, app, quiz):
+        from flask import g
+
+        from app.models import Option, QuestionType, QuizStatus
+        from app.models.school import School, SchoolStatus
+        from app.services.rasch_data_loader import load_quiz_responses
+
+        school = School(name='Sekolah', slug='sekolah', email='info@sekolah.id',
+                        admin_email='admin@sekolah.id', status=SchoolStatus.ACTIVE)
+        db.session.add(school)
+        db.session.flush()
+        quiz.course.academic_year.school_id = school.id
+        quiz.status = QuizStatus.PUBLISHED
+
+        def checkbox(text, points, key):
+            question = Question(quiz_id=quiz.id, question_text=text,
+                                question_type=QuestionType.CHECKBOX, points=points)
+            db.session.add(question)
+            db.session.flush()
+            options = [Option(option_text=label, is_correct=correct, question_id=question.id)
+                       for label, correct in key]
+            db.session.add_all(options)
+            db.session.flush()
+            return question, [option.id for option in options]
+
+        # 3 poin: A, B, C benar, D salah; 1 poin: A, B benar
+        multi, (a, b, c, d) = checkbox('Pilih tiga', 3, [('A', True), ('B', True), ('C', True), ('D', False)])
+        single, (x, y, z) = checkbox('Pilih dua', 1, [('X', True), ('Y', True), ('Z', False)])
+        db.session.commit()
+
+        picks = [([a, b, c], [x, y]), ([a, b], [x]), ([a, d], [x, y, z]), ([a, b, d], [y, x])]
+        students = []
+        for n, (multi_ids, single_ids) in enumerate(picks):
+            student = User(name=f'Siswa {n}', email=f'cb{n}@test.com', role=UserRole.MURID, school_id=school.id)
+            student.set_password('password123')
+            db.session.add(student)
+            db.session.commit()
+            students.append(student.id)
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(student.id)
+                session['_fresh'] = True
+            # Request memakai app context test; current_user di-cache di g
+            g.pop('_login_user', None)
+            response = client.post(f'/api/quiz/{quiz.id}/submit', json={'answers': [
+                {'question_id': multi.id, 'selected_option_ids': multi_ids},
+                {'question_id': single.id, 'selected_option_ids': single_ids},
+            ]})
+            assert response.status_code == 200
+
+        responses = load_quiz_responses(quiz.id, partial_credit=True).to_dict()
+        assert [responses[(sid, multi.id)] for sid in students] == [3, 2, 0, 1]
+        assert [responses[(sid, single.id)] for sid in students] == [1, 0, 0, 1]
+
+        # Tanpa partial credit checkbox dinilai benar/salah seperti skor submit
+        dichotomous = load_quiz_responses(quiz.id).to_dict()
+        assert [dichotomous[(sid, multi.id)] for sid in students] == [1, 0, 0, 0]
+
+
+@pytest.fixture
+def rasch_analysis_factory(app, rasch_quiz_data):
+    """Factory untuk RaschAnalysis pada rasch_quiz_data (mengembalikan id)"""
+    from app.models.rasch import RaschAnalysis, RaschAnalysisStatus, RaschAnalysisType
+
+    quiz = rasch_quiz_data['quiz']
+    course_id, quiz_id, teacher_id = quiz.course_id, quiz.id, quiz.course.teacher_id
+
+    def create(name='Analisis Rasch'):
+        analysis = RaschAnalysis(
+            course_id=course_id,
+            quiz_id=quiz_id,
+            name=name,
+            analysis_type=RaschAnalysisType.QUIZ,
+            status=RaschAnalysisStatus.PROCESSING,
+            created_by=teacher_id,
+        )
+        db.session.add(analysis)
+        db.session.commit()
+        return analysis.id
+
+    return create
+
+
+class TestRaschAnalysisService:
+    """End-to-end analysis: engine numpy vs python harus menyimpan hasil yang sama"""
+
+    def test_engines_persist_same_measures(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschPersonMeasure, RaschItemMeasure
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        results = {}
+        for engine in ('python', 'numpy'):
+            analysis_id = rasch_analysis_factory(name=f'Analisis {engine}')
+            assert RaschAnalysisService(analysis_id, engine=engine).run_analysis()
+
+            persons = db.session.query(
+                RaschPersonMeasure.student_id,
+                RaschPersonMeasure.raw_score,
+                RaschPersonMeasure.theta,
+                RaschPersonMeasure.ability_percentile,
+            ).filter_by(rasch_analysis_id=analysis_id)
+            items = db.session.query(
+                RaschItemMeasure.question_id,
+                RaschItemMeasure.point_biserial,
+                RaschItemMeasure.infit_mnsq,
+            ).filter_by(rasch_analysis_id=analysis_id)
+            alpha = db.session.query(RaschAnalysis.cronbach_alpha).filter_by(id=analysis_id).scalar()
+            results[engine] = (
+                {row.student_id: row for row in persons},
+                {row.question_id: row for row in items},
+                alpha,
+            )
+
+        persons_ref, items_ref, alpha_ref = results['python']
+        persons_vec, items_vec, alpha_vec = results['numpy']
+
+        assert set(persons_vec) == set(persons_ref)
+        for sid, person in persons_ref.items():
+            assert persons_vec[sid].raw_score == person.raw_score
+            assert float(persons_vec[sid].theta) == pytest.approx(float(person.theta), abs=1e-3)
+            assert float(persons_vec[sid].ability_percentile) == pytest.approx(float(person.ability_percentile))
+        for qid, item in items_ref.items():
+            assert float(items_vec[qid].point_biserial) == pytest.approx(float(item.point_biserial), abs=1e-3)
+            assert float(items_vec[qid].infit_mnsq) == pytest.approx(float(item.infit_mnsq), abs=1e-3)
+
+        assert float(alpha_vec) == pytest.approx(float(alpha_ref), abs=1e-3)
+
+    def test_rerun_replaces_measures(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import (
+            BloomLevel, QuestionBloomTaxonomy, RaschItemMeasure, RaschPersonMeasure,
+        )
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        question = rasch_quiz_data['questions'][0]
+        db.session.add(QuestionBloomTaxonomy(question_id=question.id, bloom_level=BloomLevel.APPLY))
+        db.session.commit()
+
+        analysis_id = rasch_analysis_factory()
+        for _ in range(2):
+            assert RaschAnalysisService(analysis_id).run_analysis()
+
+        person_count = db.session.query(RaschPersonMeasure.id).filter_by(rasch_analysis_id=analysis_id).count()
+        bloom_levels = dict(
+            db.session.query(RaschItemMeasure.question_id, RaschItemMeasure.bloom_level)
+            .filter_by(rasch_analysis_id=analysis_id)
+        )
+
+        assert person_count == len(rasch_quiz_data['students'])
+        assert len(bloom_levels) == len(rasch_quiz_data['questions'])
+        assert bloom_levels[question.id] == BloomLevel.APPLY
+
+    def test_unchanged_input_skips_estimation(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        fingerprint = db.session.query(RaschAnalysis.input_fingerprint).filter_by(id=analysis_id).scalar()
+        assert fingerprint == RaschAnalysisService(analysis_id).input_fingerprint()
+
+        db.session.query(RaschAnalysis).filter_by(id=analysis_id).update({'status': RaschAnalysisStatus.QUEUED})
+        db.session.commit()
+        service = RaschAnalysisService(analysis_id)
+        service.run_jmle = lambda: pytest.fail('estimation should be skipped')
+        assert service.run_analysis()
+        assert service.unchanged is True
+        assert db.session.get(RaschAnalysis, analysis_id).status == RaschAnalysisStatus.COMPLETED
+
+        add_late_submission(rasch_quiz_data, 10, [1, 0, 1])
+        service = RaschAnalysisService(analysis_id)
+        assert service.run_analysis()
+        assert service.unchanged is False
+        assert db.session.get(RaschAnalysis, analysis_id).input_fingerprint != fingerprint
+
+    def test_rerun_endpoint_leaves_unchanged_check_to_worker(self, app, monkeypatch, rasch_quiz_data, rasch_analysis_factory):
+        from flask import g
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_threshold_service import RaschThresholdService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        enqueued = []
+        monkeypatch.setattr(RaschThresholdService, '_enqueue_analysis',
+                            lambda self, analysis_id, countdown=None: enqueued.append(analysis_id))
+        monkeypatch.setattr(RaschAnalysisService, 'load_data', lambda self: pytest.fail('loaded in request'))
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(rasch_quiz_data['quiz'].course.teacher_id)
+            session['_fresh'] = True
+        g.pop('_login_user', None)
+        response = client.post(f'/api/rasch/analyses/{analysis_id}/re-run', json={})
+
+        assert response.status_code == 202
+        assert enqueued == [analysis_id]
+        assert db.session.get(RaschAnalysis, analysis_id).status == RaschAnalysisStatus.QUEUED
+
+        monkeypatch.undo()
+        service = RaschAnalysisService(analysis_id)
+        assert service.run_analysis()
+        assert service.unchanged is True
+
+    def test_convergence_history_recorded(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id, acceleration='squarem').run_analysis()
+
+        analysis = db.session.get(RaschAnalysis, analysis_id)
+        history = analysis.to_dict()['convergence_history']
+        assert len(history) == analysis.iterations
+        assert history[-1] < float(analysis.convergence_threshold)
+
+    def test_stores_residual_pca(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+
+        pca = db.session.get(RaschAnalysis, analysis_id).residual_pca
+        assert pca['item_ids'] == sorted(q.id for q in rasch_quiz_data['questions'])
+        assert 0 <= pca['variance_explained'] <= 1
+        assert 1 <= len(pca['contrasts']) <= 3
+        assert all(len(contrast['loadings']) == len(pca['item_ids']) for contrast in pca['contrasts'])
+        assert db.session.get(RaschAnalysis, analysis_id).to_dict()['residual_pca'] == pca
+
+    def test_records_stage_telemetry(self, app, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        registry = app.config['PROMETHEUS_METRICS']['registry']
+        observed = lambda: registry.get_sample_value('aldudu_rasch_stage_seconds_count', {'stage': 'jmle'}) or 0
+        before = observed()
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+
+        telemetry = db.session.get(RaschAnalysis, analysis_id).telemetry
+        assert set(telemetry['stages']) == {'load', 'init', 'jmle', 'fit', 'reliability', 'pca', 'save'}
+        assert telemetry['matrix']['persons'] == 4 and 0 < telemetry['matrix']['density'] <= 1
+        assert telemetry['iterations'] == db.session.get(RaschAnalysis, analysis_id).iterations
+        assert observed() == before + 1
+
+    def test_saves_bootstrap_intervals(self, app, monkeypatch, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschItemMeasure
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        monkeypatch.setitem(app.config, 'RASCH_BOOTSTRAP_REPLICATES', 25)
+        monkeypatch.setitem(app.config, 'RASCH_BOOTSTRAP_WORKERS', 1)
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+
+        items = RaschItemMeasure.query.filter_by(rasch_analysis_id=analysis_id).all()
+        assert items and all(item.delta_ci_low is not None for item in items)
+        for item in items:
+            assert float(item.delta_ci_low) <= float(item.delta) <= float(item.delta_ci_high)
+        telemetry = db.session.get(RaschAnalysis, analysis_id).telemetry
+        assert telemetry['bootstrap_replicates'] == 25 and 'bootstrap' in telemetry['stages']
+
+    def test_heartbeat_covers_post_jmle_stages(self, app, monkeypatch, rasch_quiz_data, rasch_analysis_factory):
+        import inspect
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        monkeypatch.setitem(app.config, 'RASCH_CHECKPOINT_INTERVAL', 1e-9)
+        monkeypatch.setitem(app.config, 'RASCH_BOOTSTRAP_REPLICATES', 25)
+        monkeypatch.setitem(app.config, 'RASCH_BOOTSTRAP_WORKERS', 1)
+        service = RaschAnalysisService(rasch_analysis_factory())
+        beat = service._heartbeat
+        callers = []
+
+        def recording_heartbeat():
+            callers.append(inspect.stack()[1].function)
+            beat()
+
+        monkeypatch.setattr(service, '_heartbeat', recording_heartbeat)
+        assert service.run_analysis()
+
+        assert callers.count('_save_results') == 4  # fit, PCA, bootstrap, save
+        assert callers.count('_run_seeds') == 25
+
+    def test_heartbeat_does_not_commit_session_changes(self, app, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        service = RaschAnalysisService(analysis_id)
+        service.load_data()
+        service.analysis.status_message = 'belum di-commit'
+
+        service._heartbeat()
+        db.session.rollback()
+
+        analysis = db.session.get(RaschAnalysis, analysis_id)
+        assert analysis.heartbeat_at is not None
+        assert analysis.status_message != 'belum di-commit'
+
+    def test_information_curve_cached_until_rerun(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.extensions import cache
+        from app.models.rasch import RaschAnalysis
+        from app.services import rasch_information
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        analysis = db.session.get(RaschAnalysis, analysis_id)
+
+        curve = rasch_information.get_information_curve(analysis)
+        assert curve['num_items'] == len(rasch_quiz_data['questions'])
+        assert len(curve['theta']) == len(curve['information']) == len(curve['sem'])
+        assert cache.get(rasch_information.cache_key(analysis_id))['curve'] == curve
+
+        # Input tidak berubah: hasil dipakai ulang, kurva cached tetap berlaku
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        assert cache.get(rasch_information.cache_key(analysis_id)) is not None
+
+        # Re-run yang menulis ulang hasil menghapus kurva cached
+        analysis.input_fingerprint = None
+        db.session.commit()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        assert cache.get(rasch_information.cache_key(analysis_id)) is None
+
+    def test_dif_analysis_by_custom_groups(self, app, monkeypatch, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysisStatus, RaschDifAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_dif import run_dif_analysis
+
+        monkeypatch.setitem(app.config, 'RASCH_DIF_MIN_GROUP_SIZE', 2)
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+
+        students = rasch_quiz_data['students']
+        dif = RaschDifAnalysis(
+            rasch_analysis_id=analysis_id,
+            group_by='custom',
+            group_params={'groups': {str(s.id): 'A' if n < 2 else 'B' for n, s in enumerate(students)}},
+        )
+        db.session.add(dif)
+        db.session.commit()
+
+        assert run_dif_analysis(dif.id)
+        db.session.refresh(dif)
+        assert dif.status == RaschAnalysisStatus.COMPLETED
+        assert [group['label'] for group in dif.groups] == ['A', 'B']
+        assert dif.reference_group == 'A'
+        assert sorted(item['question_id'] for item in dif.items) == sorted(q.id for q in rasch_quiz_data['questions'])
+        assert all(item['comparisons'][0]['focal'] == 'B' for item in dif.items)
+
+        # Group di bawah RASCH_DIF_MIN_GROUP_SIZE: tidak cukup untuk perbandingan
+        monkeypatch.setitem(app.config, 'RASCH_DIF_MIN_GROUP_SIZE', 3)
+        retry = RaschDifAnalysis(rasch_analysis_id=analysis_id, group_by='custom', group_params=dif.group_params)
+        db.session.add(retry)
+        db.session.commit()
+        assert not run_dif_analysis(retry.id)
+        assert db.session.get(RaschDifAnalysis, retry.id).status == RaschAnalysisStatus.FAILED
+
+    def test_dif_endpoint_uses_local_executor_without_broker(self, app, monkeypatch, rasch_quiz_data, rasch_analysis_factory):
+        from flask import g
+        from kombu.exceptions import OperationalError
+        from app.models.rasch import RaschDifAnalysis
+        from app.services import rasch_dif, rasch_executor
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_executor import RaschQueueFullError
+        from app.workers.rasch_worker import rasch_dif_analysis
+
+        def broker_down(*args, **kwargs):
+            raise OperationalError('Connection refused')
+
+        class RecordingExecutor:
+            submitted = []
+            full = False
+
+            def submit_dif(self, dif_id):
+                if self.full:
+                    raise RaschQueueFullError('Antrian analisis lokal penuh (1), coba lagi nanti')
+                self.submitted.append(dif_id)
+
+        monkeypatch.setattr(rasch_dif_analysis, 'apply_async', broker_down)
+        monkeypatch.setattr(rasch_executor, 'get_local_executor', RecordingExecutor)
+        monkeypatch.setattr(rasch_dif, 'run_dif_analysis', lambda dif_id: pytest.fail('ran in request'))
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(rasch_quiz_data['quiz'].course.teacher_id)
+            session['_fresh'] = True
+        g.pop('_login_user', None)
+        payload = {'group_by': 'custom', 'groups': {str(s.id): 'A' for s in rasch_quiz_data['students']}}
+
+        response = client.post(f'/api/rasch/analyses/{analysis_id}/dif', json=payload)
+        assert response.status_code == 202
+        data = response.get_json()
+        assert (data['status'], data['dispatch']) == ('queued', 'local')
+        assert RecordingExecutor.submitted == [data['dif_id']]
+
+        RecordingExecutor.full = True
+        response = client.post(f'/api/rasch/analyses/{analysis_id}/dif', json=payload)
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '60'
+        assert RaschDifAnalysis.query.filter_by(rasch_analysis_id=analysis_id).count() == 1
+
+    def test_resumes_from_checkpoint(self, app, monkeypatch, tmp_path, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_checkpoint import Checkpoint, CheckpointStore
+
+        monkeypatch.setitem(app.config, 'RASCH_CHECKPOINT_DIR', str(tmp_path))
+        analysis_id = rasch_analysis_factory()
+        interrupted = RaschAnalysisService(analysis_id)
+        interrupted.load_data()
+        interrupted.initialize_measures()
+        initial = interrupted.initial_measures
+        store = CheckpointStore()
+        store.save(analysis_id, Checkpoint(2, initial.thetas, initial.deltas, interrupted._fingerprint()))
+
+        service = RaschAnalysisService(analysis_id)
+        assert service.run_analysis()
+        assert service.resumed_from == 2
+        analysis = db.session.get(RaschAnalysis, analysis_id)
+        assert analysis.status == RaschAnalysisStatus.COMPLETED
+        assert 'resumed from iteration 2' in analysis.status_message
+        assert analysis.heartbeat_at is not None
+        assert store.load(analysis_id) is None
+
+    def test_progress_published_out_of_band(self, app, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_progress import get_progress_channel
+
+        analysis_id = rasch_analysis_factory()
+        service = RaschAnalysisService(analysis_id)
+        published = []
+        service._clear_progress = lambda: published.append(get_progress_channel().read(analysis_id))
+
+        assert service.run_analysis()
+
+        # Progress terakhir ada di channel sampai analisis selesai, row di-update sekali di akhir
+        assert published[0]['status_message'].startswith('Iteration')
+        progress, message = db.session.query(
+            RaschAnalysis.progress_percentage, RaschAnalysis.status_message,
+        ).filter_by(id=analysis_id).one()
+        assert float(progress) == 100
+        assert message.startswith('Converged') or message.startswith('Stopped')
+
+    def test_rerun_warm_starts_from_previous_calibration(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        first = RaschAnalysisService(analysis_id, warm_start=True)
+        assert first.run_analysis()
+        assert first.warm_started is False
+        cold_iterations = db.session.query(RaschAnalysis.iterations).filter_by(id=analysis_id).scalar()
+        # Input identik akan di-skip; paksa re-run seperti "force" di endpoint re-run
+        db.session.query(RaschAnalysis).filter_by(id=analysis_id).update({'input_fingerprint': None})
+        db.session.commit()
+
+        second = RaschAnalysisService(analysis_id, warm_start=True)
+        assert second.run_analysis()
+        assert second.warm_started is True
+
+        iterations, warm_started, saved = db.session.query(
+            RaschAnalysis.iterations, RaschAnalysis.warm_started, RaschAnalysis.iterations_saved,
+        ).filter_by(id=analysis_id).one()
+        assert warm_started is True
+        assert iterations <= cold_iterations
+        assert saved == cold_iterations - iterations
+
+    def test_completed_analysis_updates_item_bank(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschItemBank, RaschItemMeasure
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+
+        entries = {entry.question_id: entry for entry in RaschItemBank.query.all()}
+        measures = {m.question_id: m for m in RaschItemMeasure.query.filter_by(rasch_analysis_id=analysis_id)}
+        assert set(entries) == set(measures)
+        for question_id, entry in entries.items():
+            assert float(entry.delta) == pytest.approx(float(measures[question_id].delta_centered), abs=1e-6)
+            assert entry.last_analysis_id == analysis_id
+        # Delta JMLE mentah tidak berpusat di 0; bank menyimpan skala centered
+        assert abs(sum(float(m.delta) for m in measures.values()) / len(measures)) > 0.1
+        assert sum(float(entry.delta) for entry in entries.values()) == pytest.approx(0.0, abs=1e-5)
+        # Soal 2 tidak dijawab oleh satu siswa
+        assert [entries[q.id].exposure_count for q in rasch_quiz_data['questions']] == [4, 3, 4]
+
+        # Re-run analysis yang sama tidak menghitung exposure dua kali
+        db.session.query(RaschAnalysis).filter_by(id=analysis_id).update({'input_fingerprint': None})
+        db.session.commit()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        entry = db.session.get(RaschItemBank, entries[rasch_quiz_data['questions'][0].id].id)
+        assert entry.calibration_count == 1
+        assert entry.exposure_count == 4
+        assert len(entry.fit_history) == 1
+
+    def test_copied_questions_use_item_bank(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models import Option
+        from app.models.rasch import RaschAnalysis, RaschAnalysisType, RaschItemBank
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_anchor_service import RaschAnchorService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        origin_deltas = {entry.question_id: float(entry.delta) for entry in RaschItemBank.query.all()}
+
+        # Quiz baru berisi salinan soal, dijawab dengan pola yang sama
+        source = rasch_quiz_data['quiz']
+        copy_quiz = Quiz(name='Salinan Quiz', course_id=source.course_id, points=100)
+        db.session.add(copy_quiz)
+        db.session.flush()
+        copies = []
+        for original in rasch_quiz_data['questions']:
+            question = Question(
+                quiz_id=copy_quiz.id,
+                question_text=f'{original.question_text} (Salinan)',
+                question_type=original.question_type,
+                order=original.order,
+            )
+            db.session.add(question)
+            db.session.flush()
+            options = [
+                Option(option_text=option.option_text, is_correct=option.is_correct, question_id=question.id)
+                for option in original.options
+            ]
+            db.session.add_all(options)
+            copies.append((question, options))
+        for student, pattern in zip(rasch_quiz_data['students'], rasch_quiz_data['patterns']):
+            submission = QuizSubmission(quiz_id=copy_quiz.id, user_id=student.id, score=0, total_points=3)
+            db.session.add(submission)
+            db.session.flush()
+            for (question, options), value in zip(copies, pattern):
+                if value is not None:
+                    selected = next(o for o in options if o.is_correct == bool(value))
+                    db.session.add(Answer(
+                        submission_id=submission.id, question_id=question.id, selected_option_id=selected.id,
+                    ))
+        copy_analysis = RaschAnalysis(
+            course_id=source.course_id, quiz_id=copy_quiz.id, name='Analisis salinan',
+            analysis_type=RaschAnalysisType.QUIZ, created_by=source.course.teacher_id,
+        )
+        db.session.add(copy_analysis)
+        db.session.commit()
+
+        service = RaschAnalysisService(copy_analysis.id, warm_start=True)
+        assert service.run_analysis()
+        assert service.warm_started is True
+
+        # Salinan memperbarui entry soal asal, tidak membuat entry baru
+        entries = RaschItemBank.query.all()
+        assert {entry.question_id for entry in entries} == set(origin_deltas)
+        assert all(entry.calibration_count == 2 and entry.last_analysis_id == copy_analysis.id for entry in entries)
+
+        # Soal yang ditambahkan ke quiz asal setelah analisis di-anchor dari bank
+        late_copy = Question(
+            quiz_id=source.id,
+            question_text=f'{copies[0][0].question_text} (Salinan)',
+            question_type=copies[0][0].question_type,
+            order=4,
+        )
+        db.session.add(late_copy)
+        db.session.flush()
+        db.session.add_all([
+            Option(option_text=option.option_text, is_correct=option.is_correct, question_id=late_copy.id)
+            for option in copies[0][1]
+        ])
+        db.session.commit()
+
+        anchors = RaschAnchorService(analysis_id)
+        assert anchors.load_anchor_values()
+        assert late_copy.id in anchors.anchor_difficulties
+        assert set(anchors.anchor_difficulties) == set(origin_deltas) | {late_copy.id}
+
+    def test_partial_credit_items_persist_rating_scale(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models import QuestionType
+        from app.models.rasch import RaschPersonMeasure, RaschRatingScale
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        essay = Question(
+            quiz_id=rasch_quiz_data['quiz'].id,
+            question_text='Jelaskan jawabanmu',
+            question_type=QuestionType.LONG_TEXT,
+            points=3,
+            order=4,
+        )
+        db.session.add(essay)
+        db.session.flush()
+        submissions = QuizSubmission.query.filter_by(quiz_id=rasch_quiz_data['quiz'].id).all()
+        for submission, manual_score in zip(submissions, [2, 1, 0, 3]):
+            db.session.add(Answer(
+                submission_id=submission.id,
+                question_id=essay.id,
+                manual_score=manual_score,
+            ))
+        db.session.commit()
+        essay_id = essay.id
+
+        analysis_id = rasch_analysis_factory()
+        service = RaschAnalysisService(analysis_id, engine='python')
+        assert service.run_analysis()
+        assert service.engine == 'numpy'
+        assert service.is_polytomous
+
+        scales = db.session.query(
+            RaschRatingScale.scale_name,
+            RaschRatingScale.num_categories,
+            RaschRatingScale.thresholds,
+            RaschRatingScale.category_observations,
+        ).filter_by(rasch_analysis_id=analysis_id).all()
+        assert len(scales) == 1
+        name, num_categories, thresholds, observations = scales[0]
+        assert name == f'question_{essay_id}'
+        assert num_categories == 4
+        assert len(thresholds) == 3
+        assert observations == {'0': 1, '1': 1, '2': 1, '3': 1}
+
+        total_possible = {
+            row[0] for row in db.session.query(RaschPersonMeasure.total_possible)
+            .filter_by(rasch_analysis_id=analysis_id)
+        }
+        assert total_possible == {6}
+
+    def test_combined_analysis_spans_course_quizzes(self, rasch_quiz_data, grade_category):
+        from app.models import Option, Quiz, QuestionType
+        from app.models.gradebook import GradeItem
+        from app.models.rasch import (
+            RaschAnalysis, RaschAnalysisStatus, RaschAnalysisType,
+            RaschItemMeasure, RaschPersonMeasure,
+        )
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        first = rasch_quiz_data['quiz']
+        second = Quiz(name='Kuis 2', course_id=first.course_id, points=100)
+        db.session.add(second)
+        db.session.flush()
+        for quiz in (first, second):
+            db.session.add(GradeItem(
+                name=quiz.name, category_id=grade_category.id, course_id=first.course_id,
+                quiz_id=quiz.id, enable_rasch_analysis=True,
+            ))
+
+        # Hanya dua siswa pertama yang mengerjakan kuis kedua
+        question = Question(
+            quiz_id=second.id, question_text='Soal lanjutan',
+            question_type=QuestionType.MULTIPLE_CHOICE, order=1,
+        )
+        db.session.add(question)
+        db.session.flush()
+        correct = Option(option_text='Benar', is_correct=True, question_id=question.id)
+        wrong = Option(option_text='Salah', is_correct=False, question_id=question.id)
+        db.session.add_all([correct, wrong])
+        db.session.flush()
+        for student, option in zip(rasch_quiz_data['students'][:2], (correct, wrong)):
+            submission = QuizSubmission(quiz_id=second.id, user_id=student.id, score=0, total_points=1)
+            db.session.add(submission)
+            db.session.flush()
+            db.session.add(Answer(
+                submission_id=submission.id, question_id=question.id, selected_option_id=option.id,
+            ))
+
+        analysis = RaschAnalysis(
+            course_id=first.course_id,
+            name='Kalibrasi Course',
+            analysis_type=RaschAnalysisType.COMBINED,
+            status=RaschAnalysisStatus.PENDING,
+            created_by=first.course.teacher_id,
+        )
+        db.session.add(analysis)
+        db.session.commit()
+        analysis_id = analysis.id
+
+        service = RaschAnalysisService(analysis_id)
+        assert service.run_analysis()
+        assert service.is_sparse
+
+        assert db.session.query(RaschItemMeasure).filter_by(rasch_analysis_id=analysis_id).count() == 4
+        persons = db.session.query(
+            RaschPersonMeasure.student_id,
+            RaschPersonMeasure.total_possible,
+            RaschPersonMeasure.quiz_submission_id,
+        ).filter_by(rasch_analysis_id=analysis_id).all()
+        answered = {s.id: sum(v is not None for v in p) for s, p in
+                    zip(rasch_quiz_data['students'], rasch_quiz_data['patterns'])}
+        for student in rasch_quiz_data['students'][:2]:
+            answered[student.id] += 1
+        assert {sid: possible for sid, possible, _ in persons} == answered
+        assert all(submission_id is None for _, _, submission_id in persons)
+
+
+class TestRaschWorker:
+    """Celery task ter-register saat import dan memakai app context worker"""
+
+    def test_task_registered_at_import(self):
+        from app.celery_app import celery
+        from app.workers.rasch_worker import rasch_analysis
+
+        assert rasch_analysis.name in celery.tasks
+
+    def test_task_runs_without_rebuilding_app(self, monkeypatch, rasch_analysis_factory):
+        import app as app_package
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.workers.rasch_worker import rasch_analysis
+
+        def fail(*args, **kwargs):
+            raise AssertionError('create_app dipanggil per task')
+
+        monkeypatch.setattr(app_package, 'create_app', fail)
+        analysis_id = rasch_analysis_factory()
+
+        result = rasch_analysis.apply(kwargs={'analysis_id': analysis_id}).get()
+
+        assert result['status'] == 'completed'
+        status = db.session.query(RaschAnalysis.status).filter_by(id=analysis_id).scalar()
+        assert status == RaschAnalysisStatus.COMPLETED
+
+    def test_enqueue_falls_back_to_local_executor_when_broker_down(self, monkeypatch, rasch_analysis_factory):
+        from kombu.exceptions import OperationalError
+        from app.services import rasch_executor
+        from app.services.rasch_threshold_service import RaschThresholdService
+        from app.workers.rasch_worker import rasch_analysis
+
+        def broker_down(*args, **kwargs):
+            raise OperationalError('Connection refused')
+
+        class RecordingExecutor:
+            submitted = []
+
+            def submit(self, analysis_id, delay=0):
+                self.submitted.append((analysis_id, delay))
+
+        monkeypatch.setattr(rasch_analysis, 'apply_async', broker_down)
+        monkeypatch.setattr(rasch_executor, 'get_local_executor', RecordingExecutor)
+        service = RaschThresholdService()
+        monkeypatch.setattr(service, '_run_analysis_sync', lambda analysis_id: pytest.fail('ran in request'))
+
+        analysis_id = rasch_analysis_factory()
+        service._enqueue_analysis(analysis_id, countdown=5)
+
+        assert RecordingExecutor.submitted == [(analysis_id, 5)]
+
+
+class TestRaschLocalExecutor:
+    """Fallback tanpa broker: process pool lokal dengan back-pressure"""
+
+    def test_queue_limit_rejects_and_dedupes(self, monkeypatch):
+        from concurrent.futures import Future
+        from app.services.rasch_executor import LocalAnalysisExecutor, RaschQueueFullError
+
+        class IdlePool:
+            def submit(self, fn, *args):
+                return Future()
+
+        executor = LocalAnalysisExecutor(max_workers=1, queue_limit=2)
+        monkeypatch.setattr(executor, '_get_pool', IdlePool)
+
+        first = executor.submit(1)
+        assert executor.submit(1) is first
+        executor.submit(2)
+        with pytest.raises(RaschQueueFullError):
+            executor.submit(3)
+
+        first.set_result({'status': 'completed'})
+        executor.submit(3)
+        assert executor.in_flight == 2
+
+    def test_debounce_waits_in_parent_without_holding_a_slot(self, monkeypatch):
+        import time
+        from concurrent.futures import Future
+        from app.services.rasch_executor import LocalAnalysisExecutor
+
+        submitted = []
+
+        class RecordingPool:
+            def submit(self, fn, *args):
+                submitted.append(args)
+                return Future()
+
+        executor = LocalAnalysisExecutor(max_workers=1, queue_limit=2)
+        monkeypatch.setattr(executor, '_get_pool', RecordingPool)
+
+        delayed = executor.submit(1, delay=0.2)
+        assert submitted == []
+        assert executor.submit(1, delay=0.2) is delayed
+
+        deadline = time.monotonic() + 5
+        while not submitted and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert submitted == [(1,)]
+        assert not delayed.done()
+
+    def test_cancelled_or_crashed_analysis_returns_to_pending(self, app, monkeypatch, rasch_analysis_factory):
+        from concurrent.futures import Future
+        from concurrent.futures.process import BrokenProcessPool
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_executor import LocalAnalysisExecutor
+
+        pool_futures = []
+
+        class IdlePool:
+            def submit(self, fn, *args):
+                pool_futures.append(Future())
+                return pool_futures[-1]
+
+        executor = LocalAnalysisExecutor(max_workers=1, queue_limit=2, app=app)
+        monkeypatch.setattr(executor, '_get_pool', IdlePool)
+
+        crashed, debounced = rasch_analysis_factory('Crash'), rasch_analysis_factory('Debounce')
+        db.session.query(RaschAnalysis).update({'status': RaschAnalysisStatus.QUEUED.value})
+        db.session.commit()
+
+        executor.submit(crashed)
+        pending = executor.submit(debounced, delay=60)
+        pool_futures[0].set_exception(BrokenProcessPool('child terminated'))
+        executor.shutdown()
+
+        assert pending.cancelled()
+        assert executor.in_flight == 0
+        db.session.expire_all()
+        for analysis_id in (crashed, debounced):
+            assert db.session.get(RaschAnalysis, analysis_id).status == RaschAnalysisStatus.PENDING
+
+    def test_dif_jobs_share_the_queue_limit(self, app, monkeypatch, rasch_analysis_factory):
+        from concurrent.futures import Future
+        from app.models.rasch import RaschAnalysisStatus, RaschDifAnalysis
+        from app.services.rasch_executor import LocalAnalysisExecutor, RaschQueueFullError
+
+        pool_futures = []
+
+        class IdlePool:
+            def submit(self, fn, *args):
+                pool_futures.append(Future())
+                return pool_futures[-1]
+
+        executor = LocalAnalysisExecutor(max_workers=1, queue_limit=2, app=app)
+        monkeypatch.setattr(executor, '_get_pool', IdlePool)
+        analysis_id = rasch_analysis_factory()
+        dif = RaschDifAnalysis(rasch_analysis_id=analysis_id, group_by='custom')
+        db.session.add(dif)
+        db.session.commit()
+
+        executor.submit(analysis_id)
+        executor.submit_dif(dif.id)
+        with pytest.raises(RaschQueueFullError):
+            executor.submit_dif(dif.id + 1)
+
+        pool_futures[1].cancel()
+        assert executor.in_flight == 1
+        db.session.expire_all()
+        assert db.session.get(RaschDifAnalysis, dif.id).status == RaschAnalysisStatus.FAILED
+
+    def test_runs_analysis_in_child_process(self, app, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_executor import LocalAnalysisExecutor
+
+        executor = LocalAnalysisExecutor(max_workers=1, queue_limit=1, config={
+            key: app.config[key] for key in ('SQLALCHEMY_DATABASE_URI', 'SQLALCHEMY_ENGINE_OPTIONS')
+        })
+        analysis_id = rasch_analysis_factory()
+        try:
+            result = executor.submit(analysis_id).result(timeout=120)
+        finally:
+            executor.shutdown(wait=True)
+
+        assert result['status'] == 'completed'
+        db.session.expire_all()
+        status = db.session.query(RaschAnalysis.status).filter_by(id=analysis_id).scalar()
+        assert status == RaschAnalysisStatus.COMPLETED
+
+
+@pytest.fixture
+def rasch_grade_item(rasch_quiz_data, grade_category):
+    """GradeItem Rasch-enabled untuk quiz di rasch_quiz_data"""
+    from app.models.gradebook import GradeItem
+
+    quiz = rasch_quiz_data['quiz']
+    grade_item = GradeItem(
+        name=quiz.name, category_id=grade_category.id, course_id=quiz.course_id,
+        quiz_id=quiz.id, enable_rasch_analysis=True,
+    )
+    db.session.add(grade_item)
+    db.session.commit()
+    return grade_item
+
+
+def add_blank_submission(quiz_id, n):
+    """Submission tanpa jawaban dari siswa baru (untuk mencapai min_persons)"""
+    student = User(name=f'Siswa {n}', email=f'siswa{n}@test.com', role=UserRole.MURID)
+    student.set_password('password123')
+    db.session.add(student)
+    db.session.flush()
+    db.session.add(QuizSubmission(quiz_id=quiz_id, user_id=student.id, score=0, total_points=3))
+    db.session.commit()
+    return student
+
+
+class TestRaschTriggerCoalescing:
+    """Burst submit untuk satu quiz menghasilkan satu kalibrasi"""
+
+    def test_lock_is_exclusive_per_quiz(self):
+        from app.services.rasch_trigger import InMemoryTriggerStore, quiz_trigger_lock
+
+        store = InMemoryTriggerStore()
+        with quiz_trigger_lock(1, store=store) as first:
+            with quiz_trigger_lock(1, store=store) as second, quiz_trigger_lock(2, store=store) as other:
+                assert (first, second, other) == (True, False, True)
+        with quiz_trigger_lock(1, store=store) as again:
+            assert again
+
+    def test_burst_enqueues_one_debounced_analysis(self, app, monkeypatch, rasch_quiz_data, rasch_grade_item):
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus, RaschThresholdLog
+        from app.services.rasch_threshold_service import RaschThresholdService
+        from app.workers.rasch_worker import rasch_analysis
+
+        enqueued = []
+        monkeypatch.setattr(rasch_analysis, 'apply_async', lambda **kwargs: enqueued.append(kwargs))
+        app.config.update(RASCH_TRIGGER_DEBOUNCE=45, RASCH_THRESHOLD_LOG_EVERY=10)
+
+        quiz_id = rasch_quiz_data['quiz'].id
+        assert RaschThresholdService().check_and_trigger(quiz_id)[0] is False
+        analysis = RaschAnalysis.query.filter_by(quiz_id=quiz_id).one()
+        analysis.min_persons = 5
+        add_blank_submission(quiz_id, 4)
+
+        results = [RaschThresholdService().check_and_trigger(quiz_id)[0] for _ in range(20)]
+
+        assert results.count(True) == 1
+        assert len(enqueued) == 1
+        assert enqueued[0]['countdown'] == 45
+        assert analysis.status == RaschAnalysisStatus.QUEUED
+        # Check yang belum memenuhi threshold (4 dari 5 submission) tidak di-log; hanya aksi 'queued'
+        logs = RaschThresholdLog.query.filter_by(rasch_analysis_id=analysis.id).all()
+        assert [log.threshold_met for log in logs] == [True]
+
+    def test_contended_check_is_coalesced(self, monkeypatch, rasch_quiz_data, rasch_grade_item):
+        from app.services import rasch_trigger
+        from app.services.rasch_threshold_service import RaschThresholdService
+
+        store = rasch_trigger.InMemoryTriggerStore()
+        monkeypatch.setattr(rasch_trigger, 'get_trigger_store', lambda: store)
+        quiz_id = rasch_quiz_data['quiz'].id
+
+        with rasch_trigger.quiz_trigger_lock(quiz_id):
+            threshold_met, message = RaschThresholdService().check_and_trigger(quiz_id)
+
+        assert threshold_met is False
+        assert 'sedang berjalan' in message
+        assert rasch_trigger.pop_pending(quiz_id, store=store)
+
+
+class TestRaschScheduledBatch:
+    """Nightly batch: satu query kandidat, dispatch paralel, summary teragregasi"""
+
+    def test_candidates_loaded_in_one_query(self, app, rasch_quiz_data, rasch_grade_item):
+        from sqlalchemy import event
+        from app.services.rasch_scheduled_service import RaschScheduledBatchService
+
+        quiz_id, course_id = rasch_quiz_data['quiz'].id, rasch_quiz_data['quiz'].course_id
+        statements = []
+        engine = db.engine
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            candidates = RaschScheduledBatchService()._load_candidates(course_id)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+        assert len(statements) == 1
+        assert [(c.quiz_id, c.submission_count, c.analysis_id) for c in candidates] == [(quiz_id, 4, None)]
+
+    def test_retakes_are_not_late_submissions(self, rasch_quiz_data, rasch_grade_item, rasch_analysis_factory):
+        from app.services.rasch_analysis_service import RaschAnalysisService
+        from app.services.rasch_scheduled_service import RaschScheduledBatchService
+
+        quiz = rasch_quiz_data['quiz']
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        rasch_grade_item.rasch_analysis_id = analysis_id
+        for student in rasch_quiz_data['students']:
+            for _ in range(2):
+                db.session.add(QuizSubmission(quiz_id=quiz.id, user_id=student.id, score=0, total_points=3))
+        db.session.commit()
+
+        service = RaschScheduledBatchService()
+        service.late_submission_threshold = 1
+        candidate, = service._load_candidates(quiz.course_id)
+        assert (candidate.submission_count, candidate.measure_count) == (4, 4)
+
+        result = service._process_quiz(candidate)
+        assert (result['action'], result['late_count']) == ('skipped', 0)
+
+    def test_nightly_batch_runs_and_aggregates(self, monkeypatch, rasch_quiz_data, rasch_grade_item):
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_scheduled_service import RaschScheduledBatchService
+
+        quiz = rasch_quiz_data['quiz']
+        add_blank_submission(quiz.id, 4)
+        service = RaschScheduledBatchService(concurrency=2)
+        service.default_min_persons = 5
+        monkeypatch.setattr(service, '_dispatch_celery', lambda analysis_ids: False)
+
+        summary = service.run_nightly_batch(course_id=quiz.course_id)
+
+        assert summary['success'] is True
+        assert (summary['new_analyses'], summary['analyses_completed']) == (1, 1)
+        assert summary['dispatch'] == 'sync'
+        detail = summary['details'][0]
+        assert detail['run_status'] == 'completed'
+        analysis = db.session.get(RaschAnalysis, detail['analysis_id'])
+        assert analysis.status == RaschAnalysisStatus.COMPLETED
+        assert db.session.get(type(rasch_grade_item), rasch_grade_item.id).rasch_analysis_id == analysis.id
+
+    def test_dispatch_fans_out_to_pool(self, monkeypatch):
+        from app.services import rasch_executor
+        from app.services.rasch_scheduled_service import RaschScheduledBatchService
+
+        calls = []
+
+        def fake_pool(analysis_ids, max_workers):
+            calls.append((list(analysis_ids), max_workers))
+            return {analysis_id: {'status': 'completed'} for analysis_id in analysis_ids}
+
+        monkeypatch.setattr(rasch_executor, 'run_analyses_in_pool', fake_pool)
+        service = RaschScheduledBatchService(concurrency=4)
+        monkeypatch.setattr(service, '_dispatch_celery', lambda analysis_ids: False)
+
+        dispatch, results = service._dispatch([3, 1, 2])
+
+        assert dispatch == 'local'
+        assert calls == [([3, 1, 2], 4)]
+        assert set(results) == {1, 2, 3}
+
+    def test_janitor_requeues_then_fails_stuck_analysis(self, monkeypatch, rasch_analysis_factory):
+        from datetime import datetime, timedelta
+        from app.models.rasch import RaschAnalysis, RaschAnalysisStatus
+        from app.services.rasch_scheduled_service import RaschScheduledBatchService
+        from app.services.rasch_threshold_service import RaschThresholdService
+
+        stuck_id = rasch_analysis_factory('Stuck')
+        alive_id = rasch_analysis_factory('Alive')
+        now = datetime.utcnow()
+        db.session.get(RaschAnalysis, stuck_id).heartbeat_at = now - timedelta(hours=1)
+        db.session.get(RaschAnalysis, alive_id).heartbeat_at = now
+        db.session.commit()
+
+        enqueued = []
+        monkeypatch.setattr(RaschThresholdService, '_enqueue_analysis', lambda self, analysis_id: enqueued.append(analysis_id))
+        service = RaschScheduledBatchService()
+        service.stuck_timeout, service.max_requeues = 600, 1
+
+        result = service.requeue_stuck_analyses()
+        assert (result['requeued'], result['failed'], enqueued) == ([stuck_id], [], [stuck_id])
+        analysis = db.session.get(RaschAnalysis, stuck_id)
+        assert (analysis.status, analysis.requeue_count) == (RaschAnalysisStatus.QUEUED, 1)
+        assert db.session.get(RaschAnalysis, alive_id).status == RaschAnalysisStatus.PROCESSING
+
+        # Worker mati lagi: batas requeue tercapai
+        analysis.status = RaschAnalysisStatus.PROCESSING
+        db.session.commit()
+        result = service.requeue_stuck_analyses()
+        assert (result['requeued'], result['failed']) == ([], [stuck_id])
+        assert db.session.get(RaschAnalysis, stuck_id).status == RaschAnalysisStatus.FAILED
+
+
+def add_late_submission(rasch_quiz_data, n, pattern):
+    """Submission dari siswa baru dengan pola jawaban (1 benar, 0 salah, None kosong)"""
+    student = add_blank_submission(rasch_quiz_data['quiz'].id, n)
+    submission = QuizSubmission.query.filter_by(user_id=student.id).one()
+    for question, value in zip(rasch_quiz_data['questions'], pattern):
+        if value is None:
+            continue
+        option = question.options.filter_by(is_correct=bool(value)).first()
+        db.session.add(Answer(submission_id=submission.id, question_id=question.id, selected_option_id=option.id))
+    db.session.commit()
+    return submission.id
+
+
+class TestRaschAnchorScoring:
+    """Late submissions di-score sekaligus terhadap anchor deltas"""
+
+    PATTERNS = [[1, 0, 1], [0, 1, None], [1, 1, 1], [0, 0, 0], [1, 0, 0]]
+
+    def _calibrate(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.services.rasch_analysis_service import RaschAnalysisService
+
+        analysis_id = rasch_analysis_factory()
+        assert RaschAnalysisService(analysis_id).run_analysis()
+        return analysis_id
+
+    def test_bulk_matches_per_student_reference(self, rasch_quiz_data, rasch_analysis_factory):
+        from sqlalchemy import event
+        from app.models.rasch import RaschPersonMeasure
+        from app.services.rasch_anchor_service import RaschAnchorService
+
+        analysis_id = self._calibrate(rasch_quiz_data, rasch_analysis_factory)
+        submission_ids = [
+            add_late_submission(rasch_quiz_data, 10 + n, pattern)
+            for n, pattern in enumerate(self.PATTERNS)
+        ]
+
+        expected = {}
+        for submission_id in submission_ids:
+            reference = RaschAnchorService(analysis_id)
+            assert reference.load_anchor_values()
+            assert reference.load_student_responses(submission_id)
+            expected[reference.student_id] = reference.calculate_ability()
+
+        inserts = []
+        listener = lambda conn, cursor, statement, *args: inserts.append(statement) \
+            if statement.startswith('INSERT INTO rasch_person_measures') else None
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            results = RaschAnchorService(analysis_id).score_submissions(submission_ids)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        assert len(results) == len(self.PATTERNS)
+        assert len(inserts) == 1
+        for result in results:
+            assert result['theta'] == pytest.approx(expected[result['student_id']], abs=1e-3)
+
+        measures = db.session.query(
+            RaschPersonMeasure.student_id, RaschPersonMeasure.ability_percentile,
+        ).filter_by(rasch_analysis_id=analysis_id).all()
+        assert len(measures) == len(rasch_quiz_data['students']) + len(self.PATTERNS)
+
+    def test_complete_patterns_use_score_table(self, rasch_quiz_data, rasch_analysis_factory):
+        from app.models.rasch import RaschAnalysis, RaschPersonMeasure
+        from app.services.rasch_anchor_service import RaschAnchorService
+        from app.services.rasch_score_table import get_score_table
+
+        analysis_id = self._calibrate(rasch_quiz_data, rasch_analysis_factory)
+        analysis = db.session.get(RaschAnalysis, analysis_id)
+        stored = analysis.score_table
+        assert stored['item_ids'] == sorted(q.id for q in rasch_quiz_data['questions'])
+        assert len(stored['theta']) == 4
+
+        # Analisis lama tanpa tabel: dibangun ulang dari measures tersimpan
+        analysis.score_table = None
+        db.session.commit()
+        rebuilt = get_score_table(analysis)
+        assert rebuilt['theta'] == pytest.approx(stored['theta'], abs=1e-3)
+
+        perfect = rasch_quiz_data['students'][3]
+        perfect_theta = db.session.query(RaschPersonMeasure.theta).filter_by(
+            rasch_analysis_id=analysis_id, student_id=perfect.id,
+        ).scalar()
+        submission_ids = [
+            add_late_submission(rasch_quiz_data, 10, [1, 1, 1]),
+            add_late_submission(rasch_quiz_data, 11, [1, 0, 1]),
+        ]
+        results = RaschAnchorService(analysis_id).score_submissions(submission_ids)
+
+        thetas = [result['theta'] for result in results]
+        assert thetas == pytest.approx([rebuilt['theta'][3], rebuilt['theta'][2]])
+        assert thetas[0] == pytest.approx(float(perfect_theta), abs=1e-3)
+
+    def test_process_late_submissions_scores_only_new_students(
+        self, rasch_quiz_data, rasch_analysis_factory, rasch_grade_item,
+    ):
+        from app.models.rasch import RaschAnalysis, RaschPersonMeasure
+        from app.services.rasch_anchor_service import process_late_submissions
+
+        analysis_id = self._calibrate(rasch_quiz_data, rasch_analysis_factory)
+        quiz = rasch_quiz_data['quiz']
+        rasch_grade_item.rasch_analysis_id = analysis_id
+        db.session.commit()
+        late = {add_late_submission(rasch_quiz_data, 10 + n, pattern) for n, pattern in enumerate(self.PATTERNS)}
+
+        result = process_late_submissions(quiz.id)
+
+        assert result['success'] is True
+        assert (result['processed'], result['failed'], result['total_late']) == (5, 0, 5)
+        assert {r['submission_id'] for r in result['results']} == late
+        assert process_late_submissions(quiz.id)['processed'] == 0
+        assert db.session.query(RaschAnalysis.num_persons).filter_by(id=analysis_id).scalar() == 9
+        assert db.session.query(RaschPersonMeasure).filter_by(rasch_analysis_id=analysis_id).count() == 9
+
+    def test_late_student_with_two_attempts_uses_latest(
+        self, rasch_quiz_data, rasch_analysis_factory, rasch_grade_item,
+    ):
+        from app.models.rasch import RaschAnalysis, RaschPersonMeasure
+        from app.services.rasch_anchor_service import process_late_submissions
+        from app.services.rasch_score_table import get_score_table
+
+        analysis_id = self._calibrate(rasch_quiz_data, rasch_analysis_factory)
+        quiz = rasch_quiz_data['quiz']
+        rasch_grade_item.rasch_analysis_id = analysis_id
+        db.session.commit()
+
+        # Attempt pertama 0/3, attempt kedua 3/3
+        first = add_late_submission(rasch_quiz_data, 10, [0, 0, 0])
+        student_id = db.session.get(QuizSubmission, first).user_id
+        retry = QuizSubmission(quiz_id=quiz.id, user_id=student_id, score=0, total_points=3)
+        db.session.add(retry)
+        db.session.flush()
+        for question in rasch_quiz_data['questions']:
+            option = question.options.filter_by(is_correct=True).first()
+            db.session.add(Answer(submission_id=retry.id, question_id=question.id, selected_option_id=option.id))
+        db.session.commit()
+
+        result = process_late_submissions(quiz.id)
+
+        assert (result['processed'], result['total_late']) == (1, 1)
+        assert result['results'][0]['submission_id'] == retry.id
+        measure = RaschPersonMeasure.query.filter_by(rasch_analysis_id=analysis_id, student_id=student_id).one()
+        assert (measure.raw_score, measure.total_possible) == (3, 3)
+        assert measure.quiz_submission_id == retry.id
+        table = get_score_table(db.session.get(RaschAnalysis, analysis_id))
+        assert float(measure.theta) == pytest.approx(table['theta'][3], abs=1e-3)
@@ -0,0 +1,53 @@
+"""
+Test Rasch benchmark helpers (scripts/benchmark_rasch.py)
+"""
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[1] / 'scripts' / 'benchmark_rasch.py'
+
+
+@pytest.fixture(scope='module')
+def benchmark():
+    spec = importlib.util.spec_from_file_location('benchmark_rasch', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestBenchmarkHelpers:
+
+    def test_simulated_responses_follow_scenario(self, benchmark):
+        scenario = benchmark.Scenario(400, 20, missing_rate=0.3, extreme_rate=0.1)
+        data = benchmark.simulate_responses(scenario, seed=1)
+
+        assert data.responses.shape == (400, 20)
+        assert data.deltas.mean() == pytest.approx(0.0, abs=1e-12)
+        assert data.observed.any(axis=1).all()
+        assert 1 - data.observed.mean() == pytest.approx(0.3, abs=0.03)
+        forced = data.responses[data.forced_extreme]
+        assert np.all((forced == forced[:, :1]))
+
+    def test_compare_flags_slowdowns_and_accuracy_loss(self, benchmark):
+        baseline = {'results': [
+            {'scenario': 's', 'estimator': 'jmle', 'engine': 'numpy',
+             'wall_time': 1.0, 'rmse_delta': 0.10, 'rmse_theta': 0.30},
+            {'scenario': 's', 'estimator': 'prox', 'engine': 'numpy',
+             'wall_time': 0.01, 'rmse_delta': 0.10, 'rmse_theta': 0.30},
+        ]}
+        results = [
+            {'scenario': 's', 'estimator': 'jmle', 'engine': 'numpy',
+             'wall_time': 2.0, 'rmse_delta': 0.20, 'rmse_theta': 0.31},
+            # Lebih lambat 3x tapi di bawah noise floor
+            {'scenario': 's', 'estimator': 'prox', 'engine': 'numpy',
+             'wall_time': 0.03, 'rmse_delta': 0.10, 'rmse_theta': 0.30},
+        ]
+
+        regressions = benchmark.compare_with_baseline(results, baseline)
+
+        assert len(regressions) == 2
+        assert any('wall time' in line for line in regressions)
+        assert any('rmse_delta' in line for line in regressions)
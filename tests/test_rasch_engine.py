@@ -0,0 +1,814 @@
+"""
+Test Rasch Array Engine (vectorized JMLE vs pure-Python reference)
+"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.services import rasch_engine
+from app.services.rasch_analysis_service import RaschAnalysisService
+
+
+def build_service(engine, num_persons=80, num_items=15, seed=7, missing_rate=0.0):
+    """Create service with synthetic responses (tanpa database)"""
+    rng = random.Random(seed)
+    thetas = [rng.gauss(0, 1) for _ in range(num_persons)]
+    deltas = [rng.gauss(0, 1) for _ in range(num_items)]
+
+    service = RaschAnalysisService(analysis_id=0, engine=engine)
+    service.students = list(range(1, num_persons + 1))
+    service.questions = list(range(101, 101 + num_items))
+
+    for p, theta in enumerate(thetas):
+        for i, delta in enumerate(deltas):
+            if rng.random() < missing_rate:
+                continue
+            prob = 1 / (1 + math.exp(-(theta - delta)))
+            service.response_matrix[(p + 1, 101 + i)] = 1 if rng.random() < prob else 0
+
+    # Add extreme persons
+    service.students += [900, 901]
+    for qid in service.questions:
+        service.response_matrix[(900, qid)] = 1
+        service.response_matrix[(901, qid)] = 0
+
+    service._update_progress = lambda iteration: None
+    service._save_results = lambda iterations, converged: None
+    return service
+
+
+class TestResponseMatrix:
+    """Test dense response matrix construction"""
+
+    def test_from_dict_builds_mask(self):
+        matrix = rasch_engine.ResponseMatrix.from_dict(
+            {(1, 10): 1, (2, 11): 0, (1, 11): 1},
+            person_ids=[1, 2, 1],
+            item_ids=[10, 11],
+        )
+
+        assert matrix.person_ids == [1, 2]
+        assert matrix.observed.tolist() == [[True, True], [False, True]]
+        assert matrix.raw_scores.tolist() == [2.0, 0.0]
+        assert matrix.p_values.tolist() == [1.0, 0.5]
+
+    def test_probability_matrix_clamps_extremes(self):
+        p = rasch_engine.probability_matrix(np.array([25.0, 0.0]), np.array([0.0, 25.0]))
+
+        assert p[0, 0] == 1.0
+        assert p[1, 1] == 0.0
+        assert p[1, 0] == pytest.approx(0.5)
+
+
+class TestVectorizedJMLE:
+    """Vectorized JMLE harus sama dengan reference implementation"""
+
+    @pytest.mark.parametrize('missing_rate', [0.0, 0.15])
+    def test_matches_reference_implementation(self, missing_rate):
+        reference = build_service('python', missing_rate=missing_rate)
+        reference.initialize_measures()
+        reference_converged = reference.run_jmle()
+
+        vectorized = build_service('numpy', missing_rate=missing_rate)
+        vectorized.initialize_measures()
+        vectorized_converged = vectorized.run_jmle()
+
+        assert vectorized_converged == reference_converged
+        assert set(vectorized.extreme_high_students) == set(reference.extreme_high_students)
+        assert set(vectorized.extreme_low_students) == set(reference.extreme_low_students)
+
+        for qid in reference.questions:
+            assert vectorized.difficulties[qid] == pytest.approx(reference.difficulties[qid], abs=1e-6)
+        for sid in reference.students:
+            assert vectorized.abilities[sid] == pytest.approx(reference.abilities[sid], abs=1e-6)
+
+    def test_extreme_persons_are_extrapolated(self):
+        service = build_service('numpy')
+        service.initialize_measures()
+        service.run_jmle()
+
+        non_extreme = [service.abilities[s] for s in service.non_extreme_students]
+        assert service.abilities[900] == pytest.approx(np.mean(non_extreme) + 2 * np.std(non_extreme, ddof=1))
+        assert service.abilities[901] == pytest.approx(np.mean(non_extreme) - 2 * np.std(non_extreme, ddof=1))
+
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError):
+            RaschAnalysisService(analysis_id=0, engine='fortran')
+
+
+class TestScoreToMeasure:
+    """Score-to-measure table untuk complete response pattern"""
+
+    def test_table_matches_calibrated_persons(self):
+        from app.services.rasch_score_table import build_score_table, lookup
+
+        service = build_service('numpy')
+        service.initialize_measures()
+        service.run_jmle()
+        table = build_score_table(
+            service.difficulties,
+            [service.abilities[s] for s in service.non_extreme_students],
+        )
+
+        assert table['item_ids'] == sorted(service.questions)
+        assert len(table['theta']) == len(service.questions) + 1
+        assert np.all(np.diff(table['theta'][1:-1]) > 0)
+        # Semua person menjawab semua item: theta hasil JMLE = lookup raw score
+        for sid in service.students:
+            theta, _ = lookup(table, service._calculate_raw_score(sid))
+            assert theta == pytest.approx(service.abilities[sid], abs=1e-3)
+        assert lookup(table, len(service.questions) + 1) is None
+
+    def test_expected_score_equals_raw_score(self):
+        deltas = np.array([-1.5, -0.5, 0.0, 0.7, 2.0])
+        thetas, theta_se = rasch_engine.score_to_measure(deltas, (-3.0, 3.0))
+
+        expected = rasch_engine.probability_matrix(thetas, deltas).sum(axis=1)
+        assert expected[1:-1] == pytest.approx(np.arange(1, 5), abs=1e-6)
+        assert (thetas[0], thetas[-1]) == (-3.0, 3.0)
+        assert np.all(theta_se > 0)
+
+
+class TestVectorizedFitStatistics:
+    """Post-estimation statistics harus sama dengan dict-of-dicts implementation"""
+
+    @pytest.mark.parametrize('missing_rate', [0.0, 0.15])
+    def test_fit_statistics_match_reference(self, missing_rate):
+        reference = build_service('python', missing_rate=missing_rate)
+        reference.initialize_measures()
+        reference.run_jmle()
+        reference.calculate_fit_statistics()
+
+        vectorized = build_service('numpy', missing_rate=missing_rate)
+        vectorized.initialize_measures()
+        vectorized.run_jmle()
+        vectorized.calculate_fit_statistics()
+
+        for sid, expected in reference.person_results.items():
+            actual = vectorized.person_results[sid]
+            for key, value in expected.items():
+                if isinstance(value, str):
+                    assert actual[key] == value
+                else:
+                    assert actual[key] == pytest.approx(value, abs=1e-6)
+
+        for qid, expected in reference.item_results.items():
+            actual = vectorized.item_results[qid]
+            for key, value in expected.items():
+                if isinstance(value, str):
+                    assert actual[key] == value
+                else:
+                    assert actual[key] == pytest.approx(value, abs=1e-6)
+
+        expected_reliability = reference.calculate_reliability()
+        actual_reliability = vectorized.calculate_reliability()
+        for key, value in expected_reliability.items():
+            assert actual_reliability[key] == pytest.approx(value, abs=1e-6)
+
+    def test_point_biserial_degenerate_items(self):
+        # Item 0: semua benar, item 1: rest score konstan
+        matrix = rasch_engine.ResponseMatrix(
+            responses=np.array([[1.0, 1.0], [1.0, 0.0]]),
+            observed=np.ones((2, 2), dtype=bool),
+            person_ids=[1, 2],
+            item_ids=[10, 11],
+        )
+
+        assert rasch_engine.point_biserial(matrix).tolist() == [0.0, 0.0]
+
+    def test_wilson_hilferty_zero_count(self):
+        zstd = rasch_engine.wilson_hilferty_zstd(np.array([1.0, 0.0, 1.0]), np.array([0, 5, 6]))
+
+        assert zstd[0] == 0.0
+        assert zstd[1] == 0.0
+        assert zstd[2] == pytest.approx(1 / 3)
+
+    def test_percentiles_below_with_ties(self):
+        percentiles = rasch_engine.percentiles_below(np.array([0.5, -1.0, 0.5, 2.0]))
+
+        assert percentiles.tolist() == [25.0, 0.0, 25.0, 75.0]
+
+
+class TestProgressReporter:
+    """Out-of-band JMLE progress"""
+
+    def test_rate_limited_publish(self):
+        from app.services.rasch_progress import InMemoryProgressChannel, ProgressReporter
+
+        channel = InMemoryProgressChannel()
+        reporter = ProgressReporter(42, channel=channel, interval=60)
+
+        assert reporter.report(1, 100) is True
+        assert reporter.report(2, 100) is False
+        assert channel.read(42)['status_message'] == 'Iteration 1/100'
+
+        # Iterasi terakhir selalu dipublikasikan
+        assert reporter.report(100, 100) is True
+        assert channel.read(42)['progress_percentage'] == 100.0
+
+        reporter.clear()
+        assert channel.read(42) is None
+
+    def test_publish_errors_are_swallowed(self):
+        from app.services.rasch_progress import ProgressReporter
+
+        class BrokenChannel:
+            def publish(self, *args, **kwargs):
+                raise ConnectionError('redis down')
+
+        assert ProgressReporter(1, channel=BrokenChannel(), interval=0).report(1, 10) is False
+
+
+class TestTelemetry:
+    """Durasi stage eksklusif dan ringkasan telemetry"""
+
+    def test_nested_stages_are_exclusive(self, monkeypatch):
+        from app.services import rasch_telemetry
+
+        clock = iter([0.0, 0.0, 1.0, 3.0, 4.0, 4.0, 4.5, 10.0])
+        monkeypatch.setattr(rasch_telemetry.time, 'perf_counter', lambda: next(clock))
+        telemetry = rasch_telemetry.AnalysisTelemetry()
+
+        with telemetry.stage('jmle'):  # 0.0
+            with telemetry.stage('fit'):  # 1.0 .. 3.0
+                pass
+        # jmle berakhir di 4.0; load 4.0 .. 4.5
+        with telemetry.stage('load'):
+            pass
+        telemetry.set_matrix(40, 10, 300)
+        summary = telemetry.finish(iterations=7, converged=True)
+
+        assert summary['stages'] == {'jmle': 2.0, 'fit': 2.0, 'load': 0.5}
+        assert summary['total_seconds'] == 10.0
+        assert summary['matrix'] == {'persons': 40, 'items': 10, 'responses': 300, 'density': 0.75}
+        assert (summary['iterations'], summary['converged']) == (7, True)
+
+
+class TestWarmStart:
+    """Warm start dari kalibrasi sebelumnya"""
+
+    def test_warm_start_converges_faster(self):
+        full = build_service('numpy', num_persons=200, num_items=20)
+        full.initialize_measures()
+        full.run_jmle()
+
+        # Kalibrasi sebelumnya: sama, tanpa 10 siswa terakhir (late submissions)
+        previous_thetas = {sid: theta for sid, theta in full.abilities.items() if sid <= 190}
+        matrix = full.matrix
+        initial = rasch_engine.initialize_measures(matrix)
+
+        cold = rasch_engine.run_jmle(matrix, initial)
+        warm_initial = rasch_engine.warm_start_measures(matrix, initial, previous_thetas, full.difficulties)
+        warm = rasch_engine.run_jmle(matrix, warm_initial)
+
+        assert warm.converged
+        assert warm.iterations < cold.iterations
+        np.testing.assert_allclose(warm.deltas, cold.deltas, atol=0.01)
+
+    def test_warm_start_requires_same_items(self):
+        service = build_service('numpy', num_items=5)
+        service.initialize_measures()
+
+        with pytest.raises(ValueError):
+            rasch_engine.warm_start_measures(service.matrix, service.initial_measures, {}, {101: 0.0})
+
+
+class TestAcceleration:
+    """SQUAREM: iterasi lebih sedikit, estimasi tetap dalam toleransi"""
+
+    @staticmethod
+    def dispersed_matrix(num_persons=60, num_items=8, seed=0):
+        """Abilities dan difficulties menyebar lebar (SD 2.5): JMLE biasa merayap"""
+        rng = np.random.default_rng(seed)
+        thetas = rng.normal(0, 2.5, num_persons)
+        deltas = rng.normal(0, 2.5, num_items)
+        probabilities = 1 / (1 + np.exp(-(thetas[:, None] - deltas[None, :])))
+        responses = (rng.random((num_persons, num_items)) < probabilities).astype(np.float64)
+        return rasch_engine.ResponseMatrix(
+            responses, np.ones_like(responses, dtype=bool),
+            list(range(num_persons)), list(range(num_items)),
+        )
+
+    def test_squarem_converges_in_fewer_iterations(self):
+        matrix = self.dispersed_matrix()
+        initial = rasch_engine.initialize_measures(matrix)
+
+        plain = rasch_engine.run_jmle(matrix, initial)
+        accelerated = rasch_engine.run_jmle(matrix, initial, acceleration=rasch_engine.ACCELERATION_SQUAREM)
+        exact = rasch_engine.run_jmle(matrix, initial, convergence_threshold=1e-8, max_iterations=2000)
+
+        assert plain.converged and accelerated.converged
+        assert accelerated.accelerated_steps > 0
+        assert accelerated.iterations * 2 <= plain.iterations
+        assert len(accelerated.max_changes) == accelerated.iterations
+        # Lokasi JMLE tidak teridentifikasi; bandingkan measures relatif terhadap mean item
+        center = lambda result: (result.deltas - result.deltas.mean(), result.thetas - result.deltas.mean())
+        for actual, expected in zip(center(accelerated), center(exact)):
+            np.testing.assert_allclose(actual, expected, atol=0.005)
+
+    def test_sparse_engine_accelerates_identically(self):
+        from app.services import rasch_sparse
+
+        matrix = self.dispersed_matrix()
+        dense = rasch_engine.run_jmle(
+            matrix, rasch_engine.initialize_measures(matrix),
+            acceleration=rasch_engine.ACCELERATION_SQUAREM,
+        )
+        sparse_matrix = to_sparse(matrix)
+        sparse = rasch_sparse.run_jmle(
+            sparse_matrix, rasch_sparse.initialize_measures(sparse_matrix),
+            acceleration=rasch_engine.ACCELERATION_SQUAREM,
+        )
+
+        assert sparse.iterations == dense.iterations
+        np.testing.assert_allclose(sparse.deltas, dense.deltas, atol=1e-6)
+
+    def test_unknown_acceleration_rejected(self):
+        with pytest.raises(ValueError):
+            RaschAnalysisService(analysis_id=0, acceleration='aitken')
+
+
+class TestBootstrap:
+    """Percentile bootstrap interval untuk deltas dan thetas"""
+
+    @staticmethod
+    def calibrated(num_persons=40, num_items=10):
+        matrix = TestAcceleration.dispersed_matrix(num_persons, num_items, seed=3)
+        initial = rasch_engine.initialize_measures(matrix)
+        result = rasch_engine.run_jmle(matrix, initial)
+        thetas = rasch_engine.extrapolate_extreme_abilities(
+            result.thetas, initial.non_extreme, initial.extreme_high, initial.extreme_low
+        )
+        return matrix, initial, thetas, result.deltas
+
+    def test_intervals_bracket_estimates(self):
+        from app.services import rasch_bootstrap
+
+        matrix, initial, thetas, deltas = self.calibrated()
+        intervals = rasch_bootstrap.bootstrap_intervals(matrix, initial, thetas, deltas, replicates=60, seed=1)
+
+        assert intervals.replicates == 60
+        assert intervals.delta_low.shape == deltas.shape and intervals.theta_low.shape == thetas.shape
+        assert np.all(intervals.delta_low < deltas) and np.all(deltas < intervals.delta_high)
+        assert np.all(intervals.theta_low <= thetas) and np.all(thetas <= intervals.theta_high)
+
+        again = rasch_bootstrap.bootstrap_intervals(matrix, initial, thetas, deltas, replicates=60, seed=1)
+        np.testing.assert_array_equal(again.delta_low, intervals.delta_low)
+
+    def test_reports_progress_per_replicate(self):
+        from app.services import rasch_bootstrap
+
+        matrix, initial, thetas, deltas = self.calibrated()
+        calls = []
+        rasch_bootstrap.bootstrap_intervals(
+            matrix, initial, thetas, deltas, replicates=25, seed=1, on_progress=lambda: calls.append(1)
+        )
+
+        assert len(calls) == 25
+
+    def test_pool_failure_falls_back_in_process(self, monkeypatch):
+        from app.services import rasch_bootstrap
+
+        def unavailable(*args):
+            raise AssertionError('daemonic processes are not allowed to have children')
+
+        matrix, initial, thetas, deltas = self.calibrated()
+        expected = rasch_bootstrap.bootstrap_intervals(matrix, initial, thetas, deltas, replicates=30, seed=2)
+        monkeypatch.setattr(rasch_bootstrap, 'POOL_MIN_SECONDS', 0.0)
+        monkeypatch.setattr(rasch_bootstrap, '_run_in_pool', unavailable)
+        fallback = rasch_bootstrap.bootstrap_intervals(
+            matrix, initial, thetas, deltas, replicates=30, workers=4, seed=2
+        )
+
+        np.testing.assert_array_equal(fallback.theta_high, expected.theta_high)
+
+    def test_time_budget_limits_replicates(self, monkeypatch):
+        from app.services import rasch_bootstrap
+
+        clock = iter(range(0, 1000, 10))  # setiap panggilan time.time() maju 10 detik
+        monkeypatch.setattr(rasch_bootstrap.time, 'time', lambda: next(clock))
+        matrix, initial, thetas, deltas = self.calibrated()
+
+        assert rasch_bootstrap.bootstrap_intervals(
+            matrix, initial, thetas, deltas, replicates=100, time_budget=100.0
+        ) is None
+
+
+class TestResidualPCA:
+    """Dimensionality check dari standardized residuals"""
+
+    @staticmethod
+    def pca_for(abilities, deltas, seed=1):
+        rng = np.random.default_rng(seed)
+        probabilities = 1 / (1 + np.exp(-(abilities - deltas[None, :])))
+        responses = (rng.random(probabilities.shape) < probabilities).astype(np.float64)
+        matrix = rasch_engine.ResponseMatrix(
+            responses, np.ones_like(responses, dtype=bool),
+            list(range(responses.shape[0])), list(range(responses.shape[1])),
+        )
+        initial = rasch_engine.initialize_measures(matrix)
+        result = rasch_engine.run_jmle(matrix, initial)
+        expected = rasch_engine.probability_matrix(result.thetas, result.deltas)
+        return rasch_engine.residual_pca(
+            matrix.responses, matrix.observed, expected, expected * (1 - expected), initial.non_extreme
+        )
+
+    def test_unidimensional_data(self):
+        rng = np.random.default_rng(0)
+        thetas = rng.normal(0, 1, (800, 1))
+        pca = self.pca_for(thetas, rng.normal(0, 1, 30))
+
+        assert pca.unidimensional
+        assert pca.loadings.shape == (3, 30)
+        assert np.all(np.diff(pca.eigenvalues) <= 0)
+        assert 0 < pca.variance_explained < 1
+
+    def test_detects_secondary_dimension(self):
+        rng = np.random.default_rng(0)
+        primary, secondary = rng.normal(0, 1, 800), rng.normal(0, 1, 800)
+        # 10 item pertama mengukur dimensi lain
+        abilities = np.where(np.arange(30) < 10, secondary[:, None], primary[:, None])
+        pca = self.pca_for(abilities, rng.normal(0, 1, 30))
+
+        assert not pca.unidimensional
+        first = pca.loadings[0]
+        assert np.all(first[:10] > 0) and np.all(first[10:] < 0)
+
+    def test_missing_responses_use_pairwise_correlations(self):
+        service = build_service('numpy', num_persons=200, num_items=12, missing_rate=0.3)
+        service.run_analysis = None
+        service.initialize_measures()
+        service.run_jmle()
+        service.calculate_fit_statistics()
+        pca = service.calculate_residual_pca()
+
+        assert pca['item_ids'] == service.questions
+        assert len(pca['contrasts']) == 3
+        assert all(np.isfinite(contrast['eigenvalue']) for contrast in pca['contrasts'])
+
+
+class TestInformationCurve:
+    """Test information function dan conditional SEM dari item measures"""
+
+    def test_sem_is_inverse_sqrt_information(self):
+        from app.services.rasch_information import build_information_curve
+
+        curve = build_information_curve({1: -1.0, 2: 0.0, 3: 1.0})
+        information = np.array(curve['information'])
+        sem = np.array(curve['sem'])
+
+        assert curve['theta'][0] == -4.0 and curve['theta'][-1] == 4.0
+        np.testing.assert_allclose(sem, 1 / np.sqrt(information), rtol=1e-4)
+        assert curve['peak_theta'] == 0.0
+        # Tiga item: I <= 0.75, SEM tidak pernah <= 0.5
+        assert curve['precise_range'] is None
+
+    def test_grid_covers_extreme_items(self):
+        from app.services.rasch_information import build_information_curve
+
+        curve = build_information_curve({1: 5.3, 2: 4.8})
+        assert curve['theta'][-1] >= 7.3
+        assert curve['peak_theta'] == pytest.approx(5.0, abs=0.1)
+
+    def test_partial_credit_items_use_thresholds(self):
+        from app.services.rasch_information import build_information_curve
+
+        # Item PCM dengan satu step identik dengan item dichotomous
+        dichotomous = build_information_curve({1: 0.5, 2: -0.5})
+        mixed = build_information_curve({1: 0.5, 2: 99.0}, {2: [-0.5]})
+        np.testing.assert_allclose(mixed['information'], dichotomous['information'], atol=1e-6)
+        assert mixed['num_polytomous'] == 1
+
+        two_steps = build_information_curve({1: 0.0}, {1: [-1.0, 1.0]})
+        # Variance skor 0..2 lebih besar dari P(1-P) max 0.25
+        assert two_steps['max_information'] > 0.25
+
+
+class TestItemBank:
+    """Content fingerprint dan penyelarasan skala item bank"""
+
+    def test_fingerprint_ignores_copy_suffix_and_markup(self):
+        from app.services.rasch_item_bank import content_fingerprint
+
+        options = [('Benar', True), ('Salah', False)]
+        original = content_fingerprint('multiple_choice', '<p>Ibu kota  Indonesia?</p>', 1, options)
+        copy = content_fingerprint('multiple_choice', 'ibu kota Indonesia? (Salinan) (Salinan)', 1, options)
+        assert original == copy
+        assert content_fingerprint('multiple_choice', 'Ibu kota Indonesia?', 1, options[::-1]) == original
+
+        # Kunci jawaban atau poin berbeda = item berbeda
+        assert content_fingerprint(
+            'multiple_choice', 'Ibu kota Indonesia?', 1, [('Benar', False), ('Salah', True)]
+        ) != original
+        assert content_fingerprint('multiple_choice', 'Ibu kota Indonesia?', 2, options) != original
+
+    def test_align_to_scale_uses_common_items(self):
+        from app.services.rasch_item_bank import align_to_scale
+
+        aligned = align_to_scale({1: 0.0, 2: 1.0, 3: -2.0}, {1: 0.5, 2: 1.5, 4: 0.0})
+        assert aligned == pytest.approx({1: 0.5, 2: 1.5, 3: -1.5})
+        # Tanpa item bersama nilai bank dipakai apa adanya
+        assert align_to_scale({3: -2.0}, {4: 0.0}) == {3: -2.0}
+
+
+class TestDif:
+    """Differential Item Functioning: anchored group difficulties dan Mantel-Haenszel"""
+
+    @staticmethod
+    def grouped_responses(num_persons=900, num_items=12, shift=1.0, seed=5):
+        """Tiga group; item 3 lebih sulit `shift` logit untuk group 1"""
+        from app.services.rasch_sparse import SparseResponseMatrix
+
+        rng = np.random.default_rng(seed)
+        thetas = rng.normal(0, 1, num_persons)
+        deltas = rng.normal(0, 1, num_items)
+        groups = rng.integers(0, 3, num_persons)
+        group_deltas = np.tile(deltas, (3, 1))
+        group_deltas[1, 3] += shift
+        probabilities = 1 / (1 + np.exp(-(thetas[:, None] - group_deltas[groups])))
+        responses = (rng.random((num_persons, num_items)) < probabilities).astype(np.float64)
+
+        dense = rasch_engine.ResponseMatrix(
+            responses, np.ones_like(responses, dtype=bool),
+            list(range(num_persons)), list(range(num_items)),
+        )
+        initial = rasch_engine.initialize_measures(dense)
+        result = rasch_engine.run_jmle(dense, initial)
+        person_index, item_index = np.nonzero(dense.observed)
+        matrix = SparseResponseMatrix(
+            person_index, item_index, responses[person_index, item_index], dense.person_ids, dense.item_ids,
+        )
+        return matrix, result.thetas, result.deltas, groups
+
+    def test_flags_shifted_item(self):
+        from app.services import rasch_dif
+
+        matrix, thetas, deltas, groups = self.grouped_responses()
+        items = rasch_dif.dif_statistics(matrix, thetas, deltas, groups, ['a', 'b', 'c'], reference=0)
+
+        assert [item['question_id'] for item in items if item['dif']] == [3]
+        shifted = {c['focal']: c for c in items[3]['comparisons']}
+        assert shifted['b']['contrast'] > 0.64 and shifted['b']['flag'] == 'C'
+        # Lebih sulit untuk focal: odds ratio reference > 1, D-DIF negatif
+        assert shifted['b']['mh_d_dif'] < -1.5 and shifted['b']['mh_flag'] == 'C'
+        assert shifted['c']['flag'] == 'A'
+
+    def test_group_difficulties_anchor_on_person_scale(self):
+        from app.services import rasch_dif
+
+        matrix, thetas, deltas, groups = self.grouped_responses(shift=0.0)
+        single_group = np.zeros_like(groups)
+        estimates = rasch_dif.group_difficulties(matrix, thetas, deltas, single_group, 1)
+
+        # Satu group dengan theta JMLE: kembali ke delta kalibrasi
+        np.testing.assert_allclose(estimates.deltas[0], deltas, atol=1e-3)
+        assert np.all(estimates.standard_errors > 0)
+
+    def test_mantel_haenszel_matches_reference_formula(self):
+        from app.services import rasch_dif
+
+        matrix, thetas, deltas, groups = self.grouped_responses(num_persons=300, num_items=5)
+        persons = rasch_dif.dif_persons(matrix, groups)
+        strata = rasch_dif.score_strata(matrix, thetas, persons)
+        mh = rasch_dif.mantel_haenszel(matrix, strata, persons & (groups == 0), persons & (groups == 1))
+
+        responses = np.zeros((matrix.num_persons, matrix.num_items))
+        responses[matrix.person_index, matrix.item_index] = matrix.responses
+        j = 3
+        numerator = denominator = 0.0
+        for k in np.unique(strata[persons]):
+            in_stratum = persons & (strata == k)
+            reference, focal = in_stratum & (groups == 0), in_stratum & (groups == 1)
+            n = reference.sum() + focal.sum()
+            if not reference.any() or not focal.any() or n < 2:
+                continue
+            a, c = responses[reference, j].sum(), responses[focal, j].sum()
+            numerator += a * (focal.sum() - c) / n
+            denominator += (reference.sum() - a) * c / n
+        assert mh.alpha[j] == pytest.approx(numerator / denominator)
+
+
+class TestCheckpoints:
+    """Checkpoint JMLE dan resume setelah worker mati"""
+
+    def test_resume_matches_uninterrupted_run(self):
+        service = build_service('numpy', num_persons=200, num_items=20)
+        service.initialize_measures()
+        matrix, initial = service.matrix, service.initial_measures
+
+        states = {}
+        full = rasch_engine.run_jmle(
+            matrix, initial,
+            on_checkpoint=lambda iteration, thetas, deltas: states.setdefault(iteration, (thetas.copy(), deltas.copy())),
+        )
+        thetas, deltas = states[3]
+        resumed = rasch_engine.run_jmle(
+            matrix,
+            rasch_engine.InitialMeasures(thetas, deltas, initial.extreme_low, initial.extreme_high),
+            start_iteration=3,
+        )
+
+        assert resumed.iterations == full.iterations
+        np.testing.assert_allclose(resumed.deltas, full.deltas)
+        np.testing.assert_allclose(resumed.thetas, full.thetas)
+
+    def test_store_round_trip_and_stale_fingerprint(self, tmp_path):
+        from app.services.rasch_checkpoint import CheckpointStore, CheckpointWriter
+
+        store = CheckpointStore(str(tmp_path))
+        writer = CheckpointWriter(7, 'abc', store=store, interval=1)
+        writer._last_written -= 2
+        assert writer.write(4, np.zeros(3), np.ones(2))
+        assert not writer.write(5, np.zeros(3), np.ones(2))  # rate-limited
+
+        checkpoint = writer.resume(3, 2)
+        assert checkpoint.iteration == 4
+        np.testing.assert_array_equal(checkpoint.deltas, np.ones(2))
+
+        assert CheckpointWriter(7, 'other', store=store, interval=1).resume(3, 2) is None
+        assert store.load(7) is None  # stale checkpoint dihapus
+
+
+def simulated_matrix(num_persons=1500, num_items=20, seed=3, missing_rate=0.1):
+    """Response matrix dari parameter yang diketahui (difficulties di-center)"""
+    rng = np.random.default_rng(seed)
+    thetas = rng.normal(0, 1, num_persons)
+    deltas = rng.normal(0, 1, num_items)
+    deltas -= deltas.mean()
+    probabilities = 1 / (1 + np.exp(-(thetas[:, None] - deltas[None, :])))
+    responses = (rng.random((num_persons, num_items)) < probabilities).astype(np.float64)
+    observed = rng.random((num_persons, num_items)) >= missing_rate
+    matrix = rasch_engine.ResponseMatrix(
+        responses * observed, observed,
+        list(range(num_persons)), list(range(num_items)),
+    )
+    return matrix, deltas
+
+
+class TestEstimators:
+    """PROX, pairwise dan CMLE memakai result format yang sama dengan JMLE"""
+
+    @pytest.mark.parametrize('name', ['prox', 'pairwise', 'cmle'])
+    def test_recovers_generating_difficulties(self, name):
+        from app.services import rasch_estimators
+
+        matrix, true_deltas = simulated_matrix()
+        initial = rasch_engine.initialize_measures(matrix)
+        result = rasch_estimators.get_estimator(name)(matrix, initial)
+
+        assert result.converged
+        assert result.thetas.shape == (matrix.num_persons,)
+        assert result.deltas.mean() == pytest.approx(0.0, abs=1e-9)
+        assert np.sqrt(np.mean((result.deltas - true_deltas) ** 2)) < 0.15
+
+    def test_elementary_symmetric_functions(self):
+        from itertools import combinations
+        from app.services.rasch_estimators import elementary_symmetric_functions
+
+        easiness = np.array([0.5, 1.2, 2.0, 0.8])
+        gammas = elementary_symmetric_functions(easiness)
+
+        for r in range(1, 5):
+            expected = sum(np.prod(c) for c in combinations(easiness, r))
+            assert gammas[0, r] == pytest.approx(expected)
+        without_second = np.delete(easiness, 1)
+        assert gammas[2, 2] == pytest.approx(sum(np.prod(c) for c in combinations(without_second, 2)))
+        assert gammas[2, 4] == 0.0
+
+    def test_service_runs_selected_estimator(self):
+        service = RaschAnalysisService(analysis_id=0, engine='numpy', estimator='prox')
+        reference = build_service('numpy')
+        service.students, service.questions = reference.students, reference.questions
+        service.response_matrix = reference.response_matrix
+        service._update_progress = lambda iteration: None
+        service._save_results = lambda iterations, converged: None
+
+        service.initialize_measures()
+        assert service.run_jmle()
+        assert sum(service.difficulties.values()) == pytest.approx(0.0, abs=1e-9)
+        assert service.abilities[900] > max(service.abilities[s] for s in service.non_extreme_students)
+
+    def test_unknown_or_unsupported_estimator_rejected(self):
+        with pytest.raises(ValueError):
+            RaschAnalysisService(analysis_id=0, estimator='bayes')
+        with pytest.raises(ValueError):
+            RaschAnalysisService(analysis_id=0, engine='python', estimator='cmle')
+
+
+class TestPartialCreditModel:
+    """Polytomous PCM dengan layout array yang sama"""
+
+    def simulated_polytomous(self, num_persons=1500, seed=5):
+        from app.services import rasch_pcm
+
+        rng = np.random.default_rng(seed)
+        max_scores = np.array([3] * 8 + [1] * 8)
+        thresholds = np.full((len(max_scores), 3), np.nan)
+        for j, m in enumerate(max_scores):
+            thresholds[j, :m] = np.sort(rng.normal(0, 1, m))
+        thetas = rng.normal(0, 1, num_persons)
+
+        probabilities = rasch_pcm.category_probabilities(thetas, thresholds, max_scores)
+        draws = rng.random((num_persons, len(max_scores), 1))
+        responses = (probabilities.cumsum(axis=2) < draws).sum(axis=2).astype(np.float64)
+        observed = np.ones_like(responses, dtype=bool)
+        matrix = rasch_engine.ResponseMatrix(
+            responses, observed, list(range(num_persons)), list(range(len(max_scores))),
+        )
+        return matrix, thresholds, max_scores
+
+    def test_recovers_generating_thresholds(self):
+        from app.services import rasch_pcm
+
+        matrix, true_thresholds, max_scores = self.simulated_polytomous()
+        initial = rasch_pcm.initialize_measures(matrix, max_scores)
+        result = rasch_pcm.run_pcm(matrix, initial, max_scores)
+
+        assert result.converged
+        assert np.isnan(result.thresholds[8:, 1:]).all()
+        estimated = result.thresholds - np.nanmean(result.thresholds)
+        expected = true_thresholds - np.nanmean(true_thresholds)
+        valid = ~np.isnan(expected)
+        assert np.sqrt(np.mean((estimated[valid] - expected[valid]) ** 2)) < 0.2
+
+        fit = rasch_pcm.calculate_fit_statistics(matrix, result.thetas, result.thresholds, max_scores)
+        assert fit.item_infit_mnsq == pytest.approx(np.ones(len(max_scores)), abs=0.15)
+        assert (fit.p_values > 0).all() and (fit.p_values < 1).all()
+
+    def test_dichotomous_items_match_jmle(self):
+        from app.services import rasch_pcm
+
+        matrix, _ = simulated_matrix(num_persons=400, missing_rate=0.0)
+        max_scores = np.ones(matrix.num_items, dtype=np.int64)
+
+        jmle = rasch_engine.run_jmle(matrix, rasch_engine.initialize_measures(matrix))
+        pcm = rasch_pcm.run_pcm(matrix, rasch_pcm.initialize_measures(matrix, max_scores), max_scores)
+
+        offset = jmle.deltas.mean() - pcm.deltas.mean()
+        assert pcm.deltas + offset == pytest.approx(jmle.deltas, abs=1e-3)
+        assert pcm.thetas + offset == pytest.approx(jmle.thetas, abs=1e-2)
+
+        expected = rasch_engine.calculate_fit_statistics(matrix, jmle.thetas, jmle.deltas)
+        actual = rasch_pcm.calculate_fit_statistics(
+            matrix, jmle.thetas, jmle.deltas[:, None], max_scores
+        )
+        assert actual.item_infit_mnsq == pytest.approx(expected.item_infit_mnsq)
+        assert actual.point_biserial == pytest.approx(expected.point_biserial)
+
+
+def to_sparse(matrix):
+    """Dense ResponseMatrix -> SparseResponseMatrix (hanya sel teramati)"""
+    from app.services.rasch_sparse import SparseResponseMatrix
+
+    person_index, item_index = np.nonzero(matrix.observed)
+    return SparseResponseMatrix(
+        person_index, item_index, matrix.responses[person_index, item_index],
+        matrix.person_ids, matrix.item_ids,
+    )
+
+
+class TestSparseEngine:
+    """Combined analysis: JMLE dan fit statistics hanya atas observasi"""
+
+    def test_matches_dense_engine_on_complete_data(self):
+        from app.services import rasch_sparse
+
+        matrix, _ = simulated_matrix(num_persons=300, missing_rate=0.0)
+        sparse = to_sparse(matrix)
+
+        dense = rasch_engine.run_jmle(matrix, rasch_engine.initialize_measures(matrix))
+        result = rasch_sparse.run_jmle(sparse, rasch_sparse.initialize_measures(sparse))
+
+        assert result.iterations == dense.iterations
+        assert result.thetas == pytest.approx(dense.thetas)
+        assert result.deltas == pytest.approx(dense.deltas)
+
+    def test_fit_statistics_match_dense_with_missing_data(self):
+        from app.services import rasch_sparse
+
+        matrix, deltas = simulated_matrix(num_persons=300, missing_rate=0.4)
+        thetas = np.random.default_rng(0).normal(0, 1, matrix.num_persons)
+
+        expected = rasch_engine.calculate_fit_statistics(matrix, thetas, deltas)
+        actual = rasch_sparse.calculate_fit_statistics(to_sparse(matrix), thetas, deltas)
+
+        for name in ('theta_se', 'person_infit_mnsq', 'person_outfit_zstd', 'delta_se',
+                     'item_infit_zstd', 'item_outfit_mnsq', 'p_values', 'point_biserial'):
+            assert getattr(actual, name) == pytest.approx(getattr(expected, name)), name
+
+    def test_course_sized_sparse_calibration(self):
+        from app.services import rasch_sparse
+
+        matrix, true_deltas = simulated_matrix(num_persons=900, num_items=400, missing_rate=0.9)
+        sparse = to_sparse(matrix)
+        assert sparse.density == pytest.approx(0.1, abs=0.01)
+
+        initial = rasch_sparse.initialize_measures(sparse)
+        assert initial.extreme_high.sum() < 5
+        result = rasch_sparse.run_jmle(sparse, initial)
+
+        assert result.converged
+        estimated = result.deltas - result.deltas.mean()
+        assert np.corrcoef(estimated, true_deltas)[0, 1] > 0.9